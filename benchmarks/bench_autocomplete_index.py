@@ -0,0 +1,162 @@
+"""
+Compares p50/p99 latencies of top-k completion lookups with a LIKE prefix scan of autocomplete_lexicon versus the prefix index.
+
+Example usage:
+    python benchmarks/bench_autocomplete_index.py --words 200000 --lookups 5000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from scribe_data.load import autocomplete_index
+from scribe_data.load.data_to_sqlite import (
+    connect_for_build,
+    create_table,
+    finalize_database,
+    insert_rows,
+)
+
+SYLLABLES = ["ha", "be", "ri", "sch", "en", "un", "ter", "ge", "st", "ei", "ö", "ü"]
+
+
+def make_words(n_words: int, rng: random.Random) -> list[str]:
+    """
+    Returns unique made up words, some of which are capitalized like German nouns.
+    """
+    words = set()
+    while len(words) < n_words:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        words.add(word.capitalize() if rng.random() < 0.3 else word)
+
+    return sorted(words)
+
+
+def build(db_path: Path, words: list[str], rng: random.Random) -> float:
+    """
+    Writes autocomplete_lexicon and its prefix index and returns the seconds taken to build the index.
+    """
+    # Zipf distributed weights for a tenth of the words, as only common words are autosuggestions.
+    weights = Counter(
+        {
+            autocomplete_index.word_key(w): int(1000 / (i + 1)) + 1
+            for i, w in enumerate(rng.sample(words, len(words) // 10))
+        }
+    )
+
+    connection = connect_for_build(db_path)
+    cursor = connection.cursor()
+    create_table(cursor=cursor, data_type="autocomplete_lexicon", cols=["word"])
+    insert_rows(cursor, "autocomplete_lexicon", ([w] for w in words), n_cols=1)
+
+    start = time.perf_counter()
+    ranked_words = autocomplete_index.rank_words(words, weights)
+    cursor.execute(autocomplete_index.WORDS_CREATE)
+    insert_rows(
+        cursor,
+        autocomplete_index.WORDS_TABLE,
+        autocomplete_index.word_rows(ranked_words, weights),
+        n_cols=len(autocomplete_index.WORDS_COLS),
+    )
+    cursor.execute(autocomplete_index.WORDS_INDEX)
+    cursor.execute(autocomplete_index.PREFIXES_CREATE)
+    insert_rows(
+        cursor,
+        autocomplete_index.PREFIXES_TABLE,
+        autocomplete_index.prefix_rows(ranked_words),
+        n_cols=len(autocomplete_index.PREFIXES_COLS),
+    )
+    build_seconds = time.perf_counter() - start
+    finalize_database(connection)
+    connection.close()
+
+    return build_seconds
+
+
+def percentiles(latencies: list[float]) -> str:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return f"p50 {quantiles[49] * 1e6:8.1f} µs  p99 {quantiles[98] * 1e6:8.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    parser.add_argument("--k", type=int, default=autocomplete_index.TOP_K)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = make_words(args.words, rng)
+    # Prefixes as they're typed, with some that match no words.
+    prefixes = [
+        rng.choice(words)[: rng.randint(1, 6)] if rng.random() < 0.9 else "qx"
+        for _ in range(args.lookups)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "lexicon.sqlite"
+        build_seconds = build(db_path, words, rng)
+        print(
+            f"{len(words):,} words, prefix index built in {build_seconds:.2f}s, "
+            f"{db_path.stat().st_size / 1e6:.1f} MB database"
+        )
+
+        connection = connect_for_build(db_path)
+        cursor = connection.cursor()
+        lookups = {
+            "LIKE scan": lambda p: [
+                w
+                for (w,) in cursor.execute(
+                    "SELECT word FROM autocomplete_lexicon WHERE word LIKE ? LIMIT ?",
+                    (p + "%", args.k),
+                )
+            ],
+            "prefix index": lambda p: autocomplete_index.lookup_completions(
+                cursor, p, k=args.k
+            ),
+        }
+        for name, lookup in lookups.items():
+            latencies = {1: [], 3: [], 6: []}
+            for prefix in prefixes:
+                start = time.perf_counter()
+                lookup(prefix)
+                elapsed = time.perf_counter() - start
+                latencies[next(n for n in latencies if len(prefix) <= n)].append(
+                    elapsed
+                )
+
+            print(
+                f"{name:<12} all {percentiles(sum(latencies.values(), []))}  |  "
+                + "  |  ".join(
+                    f"≤{n} chars {percentiles(values)}"
+                    for n, values in latencies.items()
+                )
+            )
+
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compares counting the successors of the top words of a synthetic corpus by rescanning it for each word versus a single pass of bigram counting.
+
+Example usage:
+    python benchmarks/bench_autosuggestions.py --tokens 10000000 --num-words 500
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import time
+from collections import Counter
+from itertools import chain, islice
+
+import numpy as np
+
+from scribe_data.wikipedia.process_wiki import BigramCounts
+
+
+def make_corpus(n_tokens: int, vocab_size: int, text_length: int) -> list[list[str]]:
+    """
+    Returns texts of Zipf distributed words as they're output by clean.
+    """
+    rng = np.random.default_rng(0)
+    vocab = np.array([f"wort{i}" for i in range(vocab_size)], dtype=object)
+    ids = np.minimum(rng.zipf(1.2, size=n_tokens), vocab_size) - 1
+    tokens = vocab[ids].tolist()
+
+    return [tokens[i : i + text_length] for i in range(0, n_tokens, text_length)]
+
+
+def rescan_successors(text_corpus, top_words):
+    """
+    Counts successors as gen_autosuggestions did before, rescanning the corpus for each word.
+    """
+    successors = {}
+    for w in top_words:
+        words_after_w = [
+            [tup[1] for tup in zip(text, text[1:]) if w == tup[0]]
+            for text in text_corpus
+        ]
+        flat_words_after_w = [item for sublist in words_after_w for item in sublist]
+        successors[w] = [tup[0] for tup in Counter(flat_words_after_w).most_common(3)]
+
+    return successors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tokens", type=int, default=10_000_000)
+    parser.add_argument("--vocab", type=int, default=500_000)
+    parser.add_argument("--text-length", type=int, default=400)
+    parser.add_argument("--num-words", type=int, default=500)
+    parser.add_argument(
+        "--rescan-words",
+        type=int,
+        default=3,
+        help="The number of words that rescanning is timed for, as it's extrapolated to all words.",
+    )
+    args = parser.parse_args()
+
+    text_corpus = make_corpus(args.tokens, args.vocab, args.text_length)
+    print(f"{args.tokens:,} tokens in {len(text_corpus):,} texts")
+
+    start = time.perf_counter()
+    bigram_counts = BigramCounts(text_corpus, num_words=args.num_words)
+    single_pass = {
+        w: list(islice(bigram_counts.successors(w), 3))
+        for w in bigram_counts.top_words
+    }
+    single_pass_seconds = time.perf_counter() - start
+    print(
+        f"single pass  {single_pass_seconds:8.2f}s for {len(single_pass)} words "
+        f"({len(bigram_counts.words):,} distinct words)"
+    )
+
+    start = time.perf_counter()
+    counter_obj = Counter(chain.from_iterable(text_corpus))
+    top_words = [item[0] for item in counter_obj.most_common()][: args.num_words]
+    count_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rescan = rescan_successors(text_corpus, top_words[: args.rescan_words])
+    per_word_seconds = (time.perf_counter() - start) / args.rescan_words
+    print(
+        f"rescan       {count_seconds + per_word_seconds * len(top_words):8.2f}s for {len(top_words)} words "
+        f"(extrapolated from {per_word_seconds:.2f}s per word)"
+    )
+
+    assert top_words == bigram_counts.top_words
+    assert all(single_pass[w] == rescan[w] for w in rescan)
+
+
+if __name__ == "__main__":
+    main()
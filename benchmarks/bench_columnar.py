@@ -0,0 +1,130 @@
+"""
+Compares the size and load time of JSON, CSV, Parquet and Feather exports of nouns, verbs and emoji keywords.
+
+Example usage:
+    python benchmarks/bench_columnar.py --entries 500000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from bench_convert import write_export
+
+from scribe_data.cli.convert import (
+    iter_file_members,
+    iter_json_object_items,
+    write_csv_rows,
+)
+from scribe_data.load.columnar import read_columnar, write_columnar
+
+
+def write_csv(json_path: Path, csv_path: Path, data_type: str) -> None:
+    with open(json_path, encoding="utf-8") as in_file:
+        members = iter_json_object_items(in_file)
+        first_member = next(members)
+        with open(csv_path, "w", newline="", encoding="utf-8") as out_file:
+            write_csv_rows(
+                csv.writer(out_file),
+                itertools.chain([first_member], members),
+                first_member,
+                data_type,
+            )
+
+
+def load_json(path: Path) -> int:
+    with open(path, encoding="utf-8") as f:
+        return len(json.load(f))
+
+
+def load_csv(path: Path) -> int:
+    with open(path, newline="", encoding="utf-8") as f:
+        return len(list(csv.DictReader(f)))
+
+
+def load_columnar(path: Path) -> int:
+    return read_columnar(path).num_rows
+
+
+def best_of(n: int, fn, *args) -> float:
+    """
+    Returns the fastest of n timed calls of a function so that file caching doesn't skew the first format.
+    """
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for data_type in ["nouns", "verbs", "emoji-keywords"]:
+            paths = {fmt: tmp / f"{data_type}.{fmt}" for fmt in ["json", "csv"]}
+            write_export(paths["json"], data_type, args.entries)
+            write_csv(paths["json"], paths["csv"], data_type)
+
+            write_seconds = {}
+            for output_type in ["parquet", "feather"]:
+                paths[output_type] = tmp / f"{data_type}.{output_type}"
+                start = time.perf_counter()
+                write_columnar(
+                    lambda: iter_file_members(paths["json"]),
+                    paths[output_type],
+                    data_type=data_type,
+                    output_type=output_type,
+                )
+                write_seconds[output_type] = time.perf_counter() - start
+
+            print(f"\n{data_type}: {args.entries:,} entries")
+            loaders = {
+                "json": load_json,
+                "csv": load_csv,
+                "parquet": load_columnar,
+                "feather": load_columnar,
+            }
+            for fmt, loader in loaders.items():
+                elapsed = best_of(args.repeats, loader, paths[fmt])
+                size_mb = paths[fmt].stat().st_size / 1e6
+                written = (
+                    f"  (written in {write_seconds[fmt]:.2f}s)"
+                    if fmt in write_seconds
+                    else ""
+                )
+                print(
+                    f"  {fmt:<8} {size_mb:7.2f} MB  load {elapsed * 1000:8.1f} ms{written}"
+                )
+
+
+if __name__ == "__main__":
+    main()
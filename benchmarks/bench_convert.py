@@ -0,0 +1,182 @@
+"""
+Compares peak memory and throughput of converting exports between JSON and CSV at once versus streaming them for nouns, verbs and emoji keywords.
+
+Example usage:
+    python benchmarks/bench_convert.py --entries 500000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from scribe_data.cli.convert import (
+    JSONObjectWriter,
+    iter_csv_members,
+    iter_json_object_items,
+    write_csv_rows,
+)
+
+EMOJIS = ["😀", "😅", "🐱", "👋", "❤️"]
+
+
+def make_entry(data_type: str, i: int):
+    """
+    Returns the value of an export entry with the shape of the given data type.
+    """
+    if data_type == "nouns":
+        return {"plural": f"Wörter{i}", "gender": ["masculine", "feminine"][i % 2]}
+
+    if data_type == "verbs":
+        return {
+            f"{tense}{person}": f"form-{tense}-{person}-{i}"
+            for tense in ["pres", "pret", "perf"]
+            for person in ["FPS", "SPS", "TPS", "FPP", "SPP", "TPP"]
+        }
+
+    return [
+        {"emoji": EMOJIS[(i + j) % len(EMOJIS)], "is_base": j == 0, "rank": i + j}
+        for j in range(3)
+    ]
+
+
+def write_export(path: Path, data_type: str, n_entries: int) -> None:
+    """
+    Writes a JSON export of a data type with the given number of entries.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        writer = JSONObjectWriter(f)
+        for i in range(n_entries):
+            writer.write(f"wort{i}", make_entry(data_type, i))
+
+        writer.close()
+
+
+def json_to_csv_at_once(json_path: Path, csv_path: Path, data_type: str) -> None:
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        members = iter(data.items())
+        write_csv_rows(csv.writer(f), members, next(iter(data.items())), data_type)
+
+
+def json_to_csv_streaming(json_path: Path, csv_path: Path, data_type: str) -> None:
+    with open(json_path, encoding="utf-8") as in_file:
+        members = iter_json_object_items(in_file)
+        first_member = next(members)
+        with open(csv_path, "w", newline="", encoding="utf-8") as out_file:
+            write_csv_rows(
+                csv.writer(out_file),
+                itertools.chain([first_member], members),
+                first_member,
+                data_type,
+            )
+
+
+def csv_to_json_at_once(csv_path: Path, json_path: Path, data_type: str) -> None:
+    with open(csv_path, encoding="utf-8") as f:
+        data = dict(iter_csv_members(f, delimiter=","))
+
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def csv_to_json_streaming(csv_path: Path, json_path: Path, data_type: str) -> None:
+    with open(csv_path, encoding="utf-8") as in_file:
+        with open(json_path, "w", encoding="utf-8") as out_file:
+            writer = JSONObjectWriter(out_file)
+            for key, value in iter_csv_members(in_file, delimiter=","):
+                writer.write(key, value)
+
+            writer.close()
+
+
+def measure(fn, *args) -> tuple:
+    """
+    Returns the seconds of calling a function and the peak traced memory in MB of a second call, as tracing slows down allocations.
+    """
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for data_type in ["nouns", "verbs", "emoji-keywords"]:
+            json_path = tmp / f"{data_type}.json"
+            write_export(json_path, data_type, args.entries)
+            size_mb = json_path.stat().st_size / 1e6
+            print(f"\n{data_type}: {args.entries:,} entries, {size_mb:.1f} MB of JSON")
+
+            for direction, conversions in [
+                (
+                    "json -> csv",
+                    [
+                        ("at once", json_to_csv_at_once),
+                        ("stream", json_to_csv_streaming),
+                    ],
+                ),
+                (
+                    "csv -> json",
+                    [
+                        ("at once", csv_to_json_at_once),
+                        ("stream", csv_to_json_streaming),
+                    ],
+                ),
+            ]:
+                outputs = []
+                for name, fn in conversions:
+                    if direction == "json -> csv":
+                        in_path, out_path = json_path, tmp / f"{data_type} {name}.csv"
+
+                    else:
+                        in_path = tmp / f"{data_type} stream.csv"
+                        out_path = tmp / f"{data_type} {name}.json"
+
+                    elapsed, peak = measure(fn, in_path, out_path, data_type)
+                    outputs.append(out_path.read_bytes())
+                    print(
+                        f"  {direction}  {name:<7} {elapsed:6.2f}s  "
+                        f"{args.entries / elapsed:10,.0f} entries/sec  peak {peak:7.1f} MB"
+                    )
+
+                assert outputs[0] == outputs[1]
+
+
+if __name__ == "__main__":
+    main()
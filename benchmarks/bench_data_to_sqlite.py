@@ -0,0 +1,130 @@
+"""
+Compares rows per second of inserting nouns row by row with default settings versus batched inserts with build PRAGMAs.
+
+Example usage:
+    python benchmarks/bench_data_to_sqlite.py --rows 1000000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from scribe_data.load.data_to_sqlite import (
+    connect_for_build,
+    finalize_database,
+    insert_rows,
+)
+
+COLS = ["noun", "plural", "form"]
+CREATE_TABLE = "CREATE TABLE nouns (noun Text, plural Text, form Text, UNIQUE(noun))"
+
+
+def write_nouns(path: Path, n_rows: int) -> None:
+    """
+    Writes a nouns JSON file as exported by Scribe-Data with the given number of nouns.
+    """
+    nouns = {
+        f"Substantiv{i}": {"plural": f"Substantive{i}", "form": ("F", "M", "N")[i % 3]}
+        for i in range(n_rows)
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(nouns, f, ensure_ascii=False)
+
+
+def row_by_row(json_path: Path, db_path: Path) -> tuple[int, float]:
+    with open(json_path, encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    connection = sqlite3.connect(db_path)
+    cursor = connection.cursor()
+    cursor.execute(CREATE_TABLE)
+    start = time.perf_counter()
+    for row in json_data:
+        cursor.execute(
+            "INSERT OR IGNORE INTO nouns values(?, ?, ?)",
+            [row, json_data[row]["plural"], json_data[row]["form"]],
+        )
+
+    connection.commit()
+    insert_seconds = time.perf_counter() - start
+    connection.close()
+
+    return len(json_data), insert_seconds
+
+
+def batched(json_path: Path, db_path: Path) -> tuple[int, float]:
+    with open(json_path, encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    connection = connect_for_build(db_path)
+    cursor = connection.cursor()
+    cursor.execute(CREATE_TABLE)
+    start = time.perf_counter()
+    n_rows = insert_rows(
+        cursor=cursor,
+        table="nouns",
+        rows=(
+            [row, json_data[row]["plural"], json_data[row]["form"]] for row in json_data
+        ),
+        n_cols=len(COLS),
+    )
+    connection.commit()
+    insert_seconds = time.perf_counter() - start
+    finalize_database(connection)
+    connection.close()
+
+    return n_rows, insert_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = Path(tmp_dir) / "nouns.json"
+        write_nouns(json_path, args.rows)
+        print(f"{args.rows:,} nouns, {json_path.stat().st_size / 1e6:.1f} MB JSON")
+
+        for name, fn in [("row by row", row_by_row), ("batched", batched)]:
+            db_path = Path(tmp_dir) / f"{name}.sqlite"
+            start = time.perf_counter()
+            n, insert_seconds = fn(json_path, db_path)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<11} inserts {insert_seconds:6.2f}s ({n / insert_seconds:10,.0f} rows/s)  "
+                f"total {elapsed:6.2f}s  {db_path.stat().st_size / 1e6:6.1f} MB"
+            )
+
+        counts = [
+            sqlite3.connect(Path(tmp_dir) / f"{name}.sqlite")
+            .execute("SELECT COUNT(*) FROM nouns")
+            .fetchone()[0]
+            for name in ("row by row", "batched")
+        ]
+        assert counts == [args.rows, args.rows]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmarks concurrent WDQS querying against a local stub endpoint.
+
+Example usage:
+    python benchmarks/bench_query_scheduler.py --languages German French Spanish --workers 1 4
+
+Pass --record once with network access to save real WDQS responses to --responses-dir for later replay.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from stub_endpoint import StubEndpoint, record_responses
+
+from scribe_data.utils import LANGUAGE_DATA_EXTRACTION_DIR
+from scribe_data.wikidata.query_data import get_query_groups
+from scribe_data.wikidata.query_scheduler import QueryScheduler
+from scribe_data.wikidata.response_cache import configure_response_cache
+
+
+def collect_query_files(languages: list[str] = None) -> list[Path]:
+    """
+    Returns the query files of the given languages, or of all languages if none are given.
+    """
+    return [
+        f
+        for f in Path(LANGUAGE_DATA_EXTRACTION_DIR).rglob("*.sparql")
+        if languages is None
+        or f.parent.parent.name in [lang.lower() for lang in languages]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--languages", nargs="*", default=None)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--responses-dir", type=Path, default=None)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    # Responses are always requested from the stub so that the runs are comparable.
+    configure_response_cache(enabled=False)
+    query_files = collect_query_files(args.languages)
+    if args.record:
+        if args.responses_dir is None:
+            parser.error("--record requires --responses-dir")
+
+        record_responses(query_files, args.responses_dir)
+
+    groups = get_query_groups(query_files)
+    print(
+        f"{len(query_files)} queries in {len(groups)} groups, {args.latency}s latency per request"
+    )
+
+    baseline = None
+    with StubEndpoint(responses_dir=args.responses_dir, latency=args.latency) as stub:
+        for workers in args.workers:
+            scheduler = QueryScheduler(
+                endpoint=stub.url,
+                max_workers=workers,
+                max_requests_per_second=None,
+                page_size=args.page_size,
+            )
+            start = time.perf_counter()
+            rows = sum(
+                len(results)
+                for _, parts in scheduler.run(groups)
+                for results in parts
+                if results is not None
+            )
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers:<3} {elapsed:8.2f}s  {rows} rows  speedup x{baseline / elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compares the write time, read time and size of exports of nouns, verbs and emoji keywords with each serializer and compression.
+
+Example usage:
+    python benchmarks/bench_serializers.py --entries 500000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from bench_convert import make_entry
+
+from scribe_data import serializers
+from scribe_data.serializers import export_suffix, read_data, write_data
+
+FORMATS = [
+    ("json", None),
+    ("json", "gzip"),
+    ("json", "zstd"),
+    ("msgpack", None),
+    ("msgpack", "zstd"),
+    ("cbor", "zstd"),
+]
+
+
+def write_indented_json(path: Path, data: dict) -> None:
+    """
+    Writes data as export_formatted_data did before serializers, with a newline per value.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=0)
+
+
+def read_json(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument(
+        "--no-orjson", action="store_true", help="Write JSON with the stdlib."
+    )
+    args = parser.parse_args()
+    if args.no_orjson:
+        serializers.orjson_installed = False
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        totals = {}
+        for data_type in ["nouns", "verbs", "emoji-keywords"]:
+            data = {f"wort{i}": make_entry(data_type, i) for i in range(args.entries)}
+            print(f"\n{data_type}: {args.entries:,} entries")
+
+            baseline = tmp / f"{data_type}.indent0.json"
+            write_seconds, _ = timed(write_indented_json, baseline, data)
+            read_seconds, _ = timed(read_json, baseline)
+            size_mb = baseline.stat().st_size / 1e6
+            print(
+                f"  {'json indent=0 (before)':<24} {size_mb:7.2f} MB  "
+                f"write {write_seconds:5.2f}s  read {read_seconds:5.2f}s"
+            )
+            totals.setdefault("json indent=0 (before)", [0, 0])
+            totals["json indent=0 (before)"][0] += size_mb
+            totals["json indent=0 (before)"][1] += write_seconds
+
+            for serializer, compression in FORMATS:
+                try:
+                    serializers.get_serializer(serializer)
+                    serializers.check_format_installed(compression)
+
+                except ImportError as e:
+                    print(f"  {serializer} {compression or ''}: skipped ({e})")
+                    continue
+
+                name = f"{serializer} {compression or ''}".strip()
+                if serializer == "json":
+                    name += " (orjson)" if serializers.orjson_installed else " (stdlib)"
+
+                path = tmp / f"{data_type}{export_suffix(serializer, compression)}"
+                write_seconds, _ = timed(write_data, path, data)
+                read_seconds, result = timed(read_data, path)
+                assert result == data
+
+                size_mb = path.stat().st_size / 1e6
+                print(
+                    f"  {name:<24} {size_mb:7.2f} MB  "
+                    f"write {write_seconds:5.2f}s  read {read_seconds:5.2f}s"
+                )
+                totals.setdefault(name, [0, 0])
+                totals[name][0] += size_mb
+                totals[name][1] += write_seconds
+
+        print("\nAll data types:")
+        for name, (size_mb, write_seconds) in totals.items():
+            print(f"  {name:<24} {size_mb:7.2f} MB  write {write_seconds:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares peak memory and time of loading SPARQL JSON results at once versus parsing them incrementally.
+
+Example usage:
+    python benchmarks/bench_sparql_results.py --rows 500000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from scribe_data.wikidata.query_scheduler import flatten_bindings
+from scribe_data.wikidata.sparql_results import (
+    JSONRowWriter,
+    iter_rows,
+    read_spooled_rows,
+    spool_rows,
+)
+
+VARIABLES = ["lexemeID", "nomSingular", "nomPlural", "gender"]
+
+
+def write_response(path: Path, n_rows: int) -> None:
+    """
+    Writes a WDQS style JSON response with the given number of rows.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '{"head": {"vars": %s}, "results": {"bindings": [\n' % json.dumps(VARIABLES)
+        )
+        for i in range(n_rows):
+            binding = {
+                v: {"type": "literal", "xml:lang": "de", "value": f"{v}-{i}"}
+                for v in VARIABLES
+            }
+            f.write(("," if i else "") + json.dumps(binding) + "\n")
+
+        f.write("]}}")
+
+
+def load_all(response_path: Path, output_path: Path) -> int:
+    with open(response_path, encoding="utf-8") as f:
+        rows = flatten_bindings(json.load(f))
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=0)
+
+    return len(rows)
+
+
+def stream(response_path: Path, output_path: Path) -> int:
+    with open(response_path, "rb") as f:
+        spooled = spool_rows(iter_rows(f))
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        writer = JSONRowWriter(f)
+        for row in read_spooled_rows(spooled):
+            writer.write(row)
+
+        writer.close()
+
+    return writer.rows_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        response_path = Path(tmp_dir) / "response.json"
+        write_response(response_path, args.rows)
+        size_mb = response_path.stat().st_size / 1e6
+        print(f"{args.rows:,} rows, {size_mb:.1f} MB response")
+
+        for name, fn in [("load all", load_all), ("stream", stream)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            n = fn(response_path, Path(tmp_dir) / f"{name}.json")
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<9} {elapsed:7.2f}s  peak {peak / 1e6:8.1f} MB  {n:,} rows")
+
+        assert (Path(tmp_dir) / "load all.json").read_bytes() == (
+            Path(tmp_dir) / "stream.json"
+        ).read_bytes()
+
+
+if __name__ == "__main__":
+    main()
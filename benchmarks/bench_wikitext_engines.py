@@ -0,0 +1,140 @@
+"""
+Compares the throughput in articles per second and the accuracy of the fast and mwparser wikitext engines on the pages of a dump file or synthetic pages.
+
+Example usage:
+    python benchmarks/bench_wikitext_engines.py --pages 2000
+    python benchmarks/bench_wikitext_engines.py --dump-file dewiki-20240101-pages-articles-multistream1.xml-p1p297012.bz2 --pages 5000
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import argparse
+import bz2
+import random
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from scribe_data.wikipedia.process_wiki import clean
+from scribe_data.wikipedia.strip_wikitext import WIKITEXT_ENGINES, strip_code
+
+WORDS = ["Stadt", "liegt", "an", "der", "Spree", "und", "hat", "viele", "Einwohner"]
+
+
+def read_dump_pages(dump_file: str, n_pages: int) -> list[str]:
+    """
+    Returns the wikitext of the first articles of a pages-articles dump file.
+    """
+    texts = []
+    with bz2.open(dump_file, "rb") as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag.rsplit("}", 1)[-1] == "text" and elem.text:
+                if not elem.text.lstrip().lower().startswith("#redirect"):
+                    texts.append(elem.text)
+
+                if len(texts) == n_pages:
+                    break
+
+            elif elem.tag.rsplit("}", 1)[-1] == "page":
+                elem.clear()
+
+    return texts
+
+
+def make_page(rng: random.Random) -> str:
+    """
+    Returns a synthetic article with the markup that's common in Wikipedia articles.
+    """
+
+    def sentence():
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 15))]
+        i = rng.randrange(len(words))
+        words[i] = f"[[{words[i]}|{rng.choice(WORDS)}]]"
+        return (
+            " ".join(words)
+            + "."
+            + ("<ref>{{Literatur|Titel=Quelle}}</ref>" * rng.randint(0, 1))
+        )
+
+    sections = ["{{Infobox Ort\n| Name = Ort\n| Einwohner = {{formatnum:1234}}\n}}"]
+    for i in range(rng.randint(3, 8)):
+        sections.append(f"== Abschnitt {i} ==")
+        if rng.random() < 0.3:
+            sections.append("[[Datei:Bild.jpg|mini|Ein [[Bild]] vom Ort]]")
+
+        sections.append(" ".join(sentence() for _ in range(rng.randint(3, 10))))
+        if rng.random() < 0.2:
+            sections.append(
+                '{| class="wikitable"\n! Jahr !! Wert\n|-\n| 1900 || 12\n|}'
+            )
+
+    sections.append("[[Kategorie:Ort]]")
+    return "\n\n".join(sections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dump-file", type=str, default=None)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--language", type=str, default="german")
+    args = parser.parse_args()
+
+    if args.dump_file:
+        pages = read_dump_pages(args.dump_file, args.pages)
+
+    else:
+        rng = random.Random(0)
+        pages = [make_page(rng) for _ in range(args.pages)]
+
+    print(f"{len(pages):,} pages with {sum(map(len, pages)) / 1e6:.1f} MB of wikitext")
+
+    texts = {}
+    for engine in WIKITEXT_ENGINES:
+        start = time.perf_counter()
+        texts[engine] = [strip_code(page, engine=engine) for page in pages]
+        seconds = time.perf_counter() - start
+        print(f"{engine:<8} {len(pages) / seconds:10,.0f} articles/sec")
+
+    # Accuracy is measured on the words that are left after clean, as these are what autosuggestions are generated from.
+    precisions, recalls = [], []
+    for fast_text, mwparser_text in zip(texts["fast"], texts["mwparser"]):
+        fast_words, mwparser_words = (
+            Counter(
+                re.findall(
+                    r"\w+",
+                    " ".join(clean([t], language=args.language, verbose=False)[0]),
+                )
+            )
+            for t in (fast_text, mwparser_text)
+        )
+        common = sum((fast_words & mwparser_words).values())
+        precisions.append(common / max(sum(fast_words.values()), 1))
+        recalls.append(common / max(sum(mwparser_words.values()), 1))
+
+    identical = sum(f == m for f, m in zip(texts["fast"], texts["mwparser"]))
+    print(
+        f"fast vs mwparser: {identical / len(pages):.1%} identical texts, "
+        f"cleaned word precision {sum(precisions) / len(pages):.1%}, "
+        f"recall {sum(recalls) / len(pages):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+A local SPARQL endpoint that replays recorded WDQS responses for offline benchmarks.
+
+Responses are stored as JSON files named after the SHA-256 hash of the query that produced them.
+Use ``record_responses`` once with network access to populate the directory and then benchmark against ``StubEndpoint``.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from scribe_data.wikidata.wikidata_utils import sparql_context
+
+PAGE_SUFFIX = re.compile(r"\nORDER BY [^\n]*\nLIMIT (\d+)\nOFFSET (\d+)\n$")
+
+
+def query_key(query: str) -> str:
+    """
+    Returns the file name stem under which the response to a query is recorded.
+    """
+    return hashlib.sha256(query.strip().encode("utf-8")).hexdigest()
+
+
+def record_responses(query_files: list[Path], responses_dir: Path) -> None:
+    """
+    Queries WDQS once for each file and saves the raw JSON responses for replay.
+
+    Parameters
+    ----------
+        query_files : list[Path]
+            The SPARQL queries to record.
+
+        responses_dir : Path
+            The directory to save the responses to.
+    """
+    responses_dir.mkdir(parents=True, exist_ok=True)
+    context = sparql_context()
+
+    for query_file in query_files:
+        query = query_file.read_text(encoding="utf-8")
+        context.setQuery(query)
+        results = context.query().convert()
+        with open(responses_dir / f"{query_key(query)}.json", "w") as f:
+            json.dump(results, f, ensure_ascii=False)
+
+
+def synthetic_results(query: str, n_rows: int = 200) -> dict:
+    """
+    Builds plausible results for queries that have not been recorded using the variables they select.
+    """
+    key = query_key(query)[:8]
+    select = re.search(r"SELECT(.*?)WHERE", query, re.DOTALL | re.IGNORECASE)
+    variables = list(dict.fromkeys(re.findall(r"\?(\w+)", select[1]))) if select else []
+    variables = variables or ["lexemeID", "lemma"]
+
+    return {
+        "head": {"vars": variables},
+        "results": {
+            "bindings": [
+                {v: {"type": "literal", "value": f"{v}-{key}-{i}"} for v in variables}
+                for i in range(n_rows)
+            ]
+        },
+    }
+
+
+class StubEndpoint:
+    """
+    Serves recorded responses over HTTP with a fixed latency per request in a background thread.
+    """
+
+    def __init__(self, responses_dir: Path = None, latency: float = 0.5) -> None:
+        """
+        Parameters
+        ----------
+            responses_dir : Path
+                A directory of recorded responses, with synthetic responses used for missing queries.
+
+            latency : float (default=0.5)
+                The seconds that each request takes to mimic the time WDQS spends on a query.
+        """
+        self.responses_dir = responses_dir
+        self.latency = latency
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                query = form.get("query", [""])[0]
+                body = endpoint.response_for(query)
+                time.sleep(endpoint.latency)
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/sparql-results+json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/sparql"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def response_for(self, query: str) -> bytes:
+        """
+        Returns the recorded response for a query or a synthetic one if it was not recorded.
+
+        Pages requested with ORDER BY ... LIMIT ... OFFSET are sliced from the response to the full query.
+        """
+        with self._lock:
+            self.requests_served += 1
+
+        page = PAGE_SUFFIX.search(query)
+        if page:
+            query = query[: page.start()] + "\n"
+
+        recorded = (
+            self.responses_dir / f"{query_key(query)}.json"
+            if self.responses_dir is not None
+            else None
+        )
+        if recorded is not None and recorded.is_file():
+            if not page:
+                return recorded.read_bytes()
+
+            results = json.loads(recorded.read_bytes())
+
+        else:
+            results = synthetic_results(query)
+
+        if page:
+            limit, offset = int(page[1]), int(page[2])
+            bindings = results["results"]["bindings"]
+            results["results"]["bindings"] = bindings[offset : offset + limit]
+
+        return json.dumps(results, ensure_ascii=False).encode("utf-8")
+
+    def __enter__(self) -> "StubEndpoint":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
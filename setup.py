@@ -41,7 +41,16 @@ setup_args = dict(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
-    package_data={"": ["2021_ranked.tsv"]},
+    extras_require={
+        "columnar": ["pyarrow>=14.0.0"],
+        "serializers": [
+            "cbor2>=5.4.0",
+            "msgpack>=1.0.0",
+            "orjson>=3.9.0",
+            "zstandard>=0.21.0",
+        ],
+    },
+    package_data={"": ["2021_ranked.tsv", "emoji_keywords.sqlite"]},
     include_package_data=True,
     description="Wikidata, Wiktionary and Wikipedia language data extraction",
     long_description=long_description,
@@ -29,8 +29,8 @@ import sys
 
 from scribe_data.utils import (
     LANGUAGE_DATA_EXTRACTION_DIR,
-    _languages,
     data_type_metadata,
+    language_metadata,
 )
 
 all_data_types = tuple(data_type_metadata.keys())
@@ -183,7 +183,9 @@ def check_language_metadata():
         SystemExit:
             If any missing languages or properties are found, the function exits the script with a status code of 1.
     """
-    languages_in_metadata = {key.lower(): value for key, value in _languages.items()}
+    languages_in_metadata = {
+        key.lower(): value for key, value in language_metadata.items()
+    }
 
     languages_in_directory = get_available_languages()
 
@@ -112,7 +112,7 @@ def check_data_type_folders(
 
     Any files not matching these patterns (except '__init__.py') are reported as unexpected.
     """
-    existing_data_types = set(os.listdir(path)) - {"__init__.py"}
+    existing_data_types = set(os.listdir(path)) - {"__init__.py", "__pycache__"}
     missing_data_types = DATA_TYPES - existing_data_types - {"emoji_keywords"}
 
     for missing_type in missing_data_types:
@@ -137,7 +137,12 @@ def check_data_type_folders(
 
             valid_files = [
                 f for f in os.listdir(item_path) if f.endswith(".sparql")
-            ] + [f"format_{item}.py", f"{item}_queried.json", "__init__.py"]
+            ] + [
+                f"format_{item}.py",
+                f"{item}_queried.json",
+                "__init__.py",
+                "__pycache__",
+            ]
 
             for file in os.listdir(item_path):
                 if file not in valid_files:
@@ -188,7 +193,7 @@ def check_project_structure():
             item
             for item in os.listdir(language_path)
             if os.path.isdir(os.path.join(language_path, item))
-            and item != "__init__.py"
+            and item not in ["__init__.py", "__pycache__"]
         }
 
         if language in SUB_DIRECTORIES:
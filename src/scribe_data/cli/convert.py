@@ -21,20 +21,407 @@ Functions to convert data returned from the Scribe-Data CLI to other file types.
 """
 
 import csv
+import itertools
 import json
+import json.scanner
+import re
 import shutil
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
 from pathlib import Path
-from typing import List, Union
+from typing import List, TextIO, Union
 
 from scribe_data.load.data_to_sqlite import data_to_sqlite
+from scribe_data.serializers import (
+    EXPORT_SUFFIXES,
+    open_json_text,
+    parse_export_path,
+    read_data,
+)
 from scribe_data.utils import (
     DEFAULT_CSV_EXPORT_DIR,
+    DEFAULT_FEATHER_EXPORT_DIR,
     DEFAULT_JSON_EXPORT_DIR,
+    DEFAULT_PARQUET_EXPORT_DIR,
     DEFAULT_SQLITE_EXPORT_DIR,
     DEFAULT_TSV_EXPORT_DIR,
     get_language_iso,
 )
 
+JSON_CHUNK_SIZE = 64 * 1024
+EMOJI_COLUMNS = ["emoji", "is_base", "rank"]
+
+# The key of an object member up to the start of its value, and what follows a value.
+MEMBER_START = re.compile(r'\s*("(?:[^"\\]|\\.)*")\s*:\s*', re.DOTALL)
+MEMBER_END = re.compile(r"\s*([,}])")
+OBJECT_START = re.compile(r"\s*\{\s*(\}?)")
+VALUE_DELIMITERS = frozenset(" \t\r\n,}")
+
+_decoder = json.JSONDecoder()
+_scan_once = json.scanner.make_scanner(_decoder)
+_key_encoder = json.JSONEncoder(ensure_ascii=False)
+_value_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+# MARK: Streaming
+
+
+def iter_json_object_items(
+    file: TextIO, chunk_size: int = JSON_CHUNK_SIZE
+) -> Iterator[tuple]:
+    """
+    Yields the members of a JSON object one at a time as the file is read.
+
+    Parameters
+    ----------
+        file : TextIO
+            The open JSON file, which should contain a single object.
+
+        chunk_size : int (default=JSON_CHUNK_SIZE)
+            The number of characters to read from the file at once.
+
+    Returns
+    -------
+        Iterator[tuple]
+            The keys and values of the object in order.
+
+    Raises
+    ------
+        json.JSONDecodeError
+            If the file isn't a valid JSON object.
+    """
+    buffer = file.read(chunk_size)
+    eof = not buffer
+
+    # The opening brace is found first, reading more while the buffer ends within whitespace around it.
+    while True:
+        match = OBJECT_START.match(buffer)
+        if match is None and buffer.strip():
+            raise json.JSONDecodeError("Expecting '{'", buffer, 0)
+
+        if match is not None and (match.end() < len(buffer) or eof):
+            break
+
+        if eof:
+            raise json.JSONDecodeError("Expecting '{'", buffer, 0)
+
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+    if match.group(1):
+        return
+
+    idx = match.end()
+    while True:
+        # Note: A member is only parsed once the buffer has what follows its value, as numbers could otherwise be cut off.
+        if (key_match := MEMBER_START.match(buffer, idx)) is not None:
+            try:
+                value, end = _scan_once(buffer, key_match.end())
+
+            except (StopIteration, json.JSONDecodeError):
+                end = None
+
+            if (
+                end is not None
+                and (end < len(buffer) and buffer[end] in VALUE_DELIMITERS or eof)
+                and (end_match := MEMBER_END.match(buffer, end)) is not None
+            ):
+                key = key_match.group(1)
+                yield json.loads(key) if "\\" in key else key[1:-1], value
+
+                if end_match.group(1) == "}":
+                    return
+
+                idx = end_match.end()
+                continue
+
+        if eof:
+            raise json.JSONDecodeError(
+                "Invalid or incomplete object member", buffer, idx
+            )
+
+        # The member is split across chunks, so drop what has been parsed and read more.
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[idx:] + chunk
+        idx = 0
+
+
+class JSONObjectWriter:
+    """
+    Writes the members of an object to a file one at a time with the same output as json.dump(data, f, ensure_ascii=False, indent=2).
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        """
+        Parameters
+        ----------
+            file : TextIO
+                The open file to write to.
+        """
+        self.file = file
+        self.members_written = 0
+
+    def write(self, key: str, value) -> None:
+        """
+        Writes a single member.
+        """
+        self.file.write(
+            f"{',' if self.members_written else '{'}\n  {_key_encoder.encode(key)}: "
+            f"{_value_encoder.encode(value).replace(chr(10), chr(10) + '  ')}"
+        )
+        self.members_written += 1
+
+    def close(self) -> None:
+        """
+        Closes the JSON object, leaving closing the file to the caller.
+        """
+        self.file.write("\n}" if self.members_written else "{}")
+
+
+def _emoji_entry(row: dict) -> dict:
+    """
+    Returns the emoji keyword entry of a CSV/TSV row.
+    """
+    rank = row.get("rank", None)
+    return {
+        "emoji": row.get("emoji", "").strip(),
+        "is_base": row.get("is_base", "false").strip().lower() == "true",
+        "rank": int(rank) if rank and rank.isdigit() else None,
+    }
+
+
+def _has_contiguous_keys(rows: Iterator[dict], key_column: str) -> bool:
+    """
+    Checks whether all rows of each key follow each other so that they can be grouped as they're read.
+    """
+    seen_keys = set()
+    previous_key = None
+    for row in rows:
+        key = row[key_column]
+        if key != previous_key:
+            if key in seen_keys:
+                return False
+
+            seen_keys.add(key)
+            previous_key = key
+
+    return True
+
+
+def iter_csv_members(file: TextIO, delimiter: str) -> Iterator[tuple]:
+    """
+    Yields the JSON object members of the rows of a CSV/TSV file as they're read, with the shape of the data found from the first row.
+
+    Parameters
+    ----------
+        file : TextIO
+            The open CSV/TSV file, which must be seekable for emoji keywords.
+
+        delimiter : str
+            The delimiter of the file.
+
+    Returns
+    -------
+        Iterator[tuple]
+            The keys and values of the JSON object.
+    """
+    reader = csv.DictReader(file, delimiter=delimiter)
+    first_row = next(reader, None)
+    if first_row is None:
+        return
+
+    keys = list(first_row.keys())
+    rows = itertools.chain([first_row], reader)
+
+    if len(keys) == 1:
+        # Handle Case: { key: None }.
+        for row in rows:
+            yield row[keys[0]], None
+
+    elif len(keys) == 2:
+        # Handle Case: { key: value }.
+        for row in rows:
+            yield row[keys[0]], row[keys[1]]
+
+    elif all(col in first_row for col in EMOJI_COLUMNS):
+        # Handle Case: { key: [ { emoji: ..., is_base: ..., rank: ... }, { emoji: ..., is_base: ..., rank: ... } ] }.
+        key_column = reader.fieldnames[0]
+        file.seek(0)
+        contiguous = _has_contiguous_keys(
+            csv.DictReader(file, delimiter=delimiter), key_column
+        )
+        file.seek(0)
+        reader = csv.DictReader(file, delimiter=delimiter)
+
+        if not contiguous:
+            # The rows of keys are scattered, so they're grouped in memory as they can't be written in order.
+            groups = {}
+            for row in reader:
+                groups.setdefault(row.get(key_column), []).append(_emoji_entry(row))
+
+            yield from groups.items()
+            return
+
+        key, entries = None, []
+        for row in reader:
+            if entries and row.get(key_column) != key:
+                yield key, entries
+                entries = []
+
+            key = row.get(key_column)
+            entries.append(_emoji_entry(row))
+
+        if entries:
+            yield key, entries
+
+    else:
+        # Handle Case: { key: { value1: ..., value2: ... } }.
+        for row in rows:
+            yield row[keys[0]], {k: row[k] for k in keys[1:]}
+
+
+def write_csv_rows(writer, members: Iterator[tuple], first_member: tuple, dtype: str):
+    """
+    Writes the members of a JSON object as CSV/TSV rows, with the shape of the data found from the first member.
+
+    Parameters
+    ----------
+        writer : csv.writer
+            The writer of the CSV/TSV file.
+
+        members : Iterator[tuple]
+            The keys and values of the JSON object including the first member.
+
+        first_member : tuple
+            The key and value of the first member of the JSON object.
+
+        dtype : str
+            The data type of the JSON object, whose singular is the header of the key column.
+    """
+    _, first_value = first_member
+
+    if isinstance(first_value, dict):
+        # Handle case: { key: { value1: ..., value2: ... } }.
+        columns = sorted(first_value.keys())
+        writer.writerow([dtype[:-1]] + columns)
+
+        for key, value in members:
+            row = [key] + [value.get(col, "") for col in columns]
+            writer.writerow(row)
+
+    elif isinstance(first_value, list):
+        if all(isinstance(item, dict) for item in first_value):
+            # Handle case: { key: [ { value1: ..., value2: ... } ] }.
+            if "emoji" in first_value[0]:  # emoji specific case
+                columns = ["word", "emoji", "is_base", "rank"]
+                writer.writerow(columns)
+
+                for key, value in members:
+                    for item in value:
+                        row = [
+                            key,
+                            item.get("emoji", ""),
+                            item.get("is_base", ""),
+                            item.get("rank", ""),
+                        ]
+                        writer.writerow(row)
+
+            else:
+                columns = [dtype[:-1]] + list(first_value[0].keys())
+                writer.writerow(columns)
+
+                for key, value in members:
+                    for item in value:
+                        row = [key] + [item.get(col, "") for col in columns[1:]]
+                        writer.writerow(row)
+
+        elif all(isinstance(item, str) for item in first_value):
+            # Handle case: { key: [value1, value2, ...] }.
+            writer.writerow(
+                [dtype[:-1]]
+                + [f"autosuggestion_{i + 1}" for i in range(len(first_value))]
+            )
+            for key, value in members:
+                row = [key] + value
+                writer.writerow(row)
+
+    else:
+        # Handle case: { key: value }.
+        writer.writerow([dtype[:-1], "value"])
+        for key, value in members:
+            writer.writerow([key, value])
+
+
+def iter_file_members(input_file: Path) -> Iterator[tuple]:
+    """
+    Yields the JSON object members of a CSV, TSV or export file as it's read.
+
+    Parameters
+    ----------
+        input_file : Path
+            The file to read, with its type found from its extensions.
+
+    Returns
+    -------
+        Iterator[tuple]
+            The keys and values of the JSON object.
+    """
+    suffix = input_file.suffix.lower()
+    if suffix in {".csv", ".tsv"}:
+        with input_file.open("r", encoding="utf-8") as file:
+            yield from iter_csv_members(
+                file, delimiter="," if suffix == ".csv" else "\t"
+            )
+
+    elif suffix == ".json":
+        with input_file.open("r", encoding="utf-8") as file:
+            yield from iter_json_object_items(file)
+
+    elif (parsed := parse_export_path(input_file)) is None:
+        raise ValueError(
+            f"Unsupported file extension '{input_file.suffix}' for {input_file}. Please provide a '.csv' or '.tsv' file or one of: {', '.join(EXPORT_SUFFIXES)}."
+        )
+
+    elif parsed[1] == "json":
+        # Compressed JSON is also parsed as it's decompressed.
+        with open_json_text(input_file) as file:
+            yield from iter_json_object_items(file)
+
+    else:
+        yield from read_data(input_file).items()
+
+
+@contextmanager
+def open_partial_output(output_file: Path, **open_kwargs) -> Iterator[TextIO]:
+    """
+    Opens a text file at <name>.partial that replaces the output file once it's been written completely.
+
+    Parameters
+    ----------
+        output_file : Path
+            The file to write.
+
+        **open_kwargs
+            Arguments for opening the file, e.g. its encoding.
+
+    Returns
+    -------
+        Iterator[TextIO]
+            The partial file, which is removed if writing it fails so that a truncated output is never left behind.
+    """
+    tmp_file = output_file.with_name(f"{output_file.name}.partial")
+    try:
+        with tmp_file.open("w", **open_kwargs) as file:
+            yield file
+
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    tmp_file.replace(output_file)
+
+
 # MARK: JSON
 
 
@@ -99,75 +486,36 @@ def convert_to_json(
                 f"Unsupported file extension '{input_file_path.suffix}' for {input_file}. Please provide a '.csv' or '.tsv' file."
             )
 
+        # Define output file path
+        output_file = json_output_dir / f"{dtype}.{output_type}"
+
         try:
             with input_file_path.open("r", encoding="utf-8") as file:
-                reader = csv.DictReader(file, delimiter=delimiter)
-                rows = list(reader)
+                members = iter_csv_members(file, delimiter=delimiter)
+                first_member = next(members, None)
 
-                if not rows:
+                if first_member is None:
                     print(f"No data found in '{input_file_path}'.")
                     continue
 
-                # Use the first row to inspect column headers.
-                first_row = rows[0]
-                keys = list(first_row.keys())
-                data = {}
-
-                if len(keys) == 1:
-                    # Handle Case: { key: None }.
-                    data[first_row[keys[0]]] = None
-
-                elif len(keys) == 2:
-                    # Handle Case: { key: value }.
-                    for row in rows:
-                        key = row[keys[0]]
-                        value = row[keys[1]]
-                        data[key] = value
-
-                elif len(keys) > 2:
-                    if all(col in first_row for col in ["emoji", "is_base", "rank"]):
-                        # Handle Case: { key: [ { emoji: ..., is_base: ..., rank: ... }, { emoji: ..., is_base: ..., rank: ... } ] }.
-                        for row in rows:
-                            key = row.get(reader.fieldnames[0])
-                            emoji = row.get("emoji", "").strip()
-                            is_base = (
-                                row.get("is_base", "false").strip().lower() == "true"
-                            )
-                            rank = row.get("rank", None)
-                            rank = int(rank) if rank and rank.isdigit() else None
-
-                            entry = {"emoji": emoji, "is_base": is_base, "rank": rank}
-
-                            if key not in data:
-                                data[key] = []
-                            data[key].append(entry)
-
-                    else:
-                        # Handle Case: { key: { value1: ..., value2: ... } }.
-                        for row in rows:
-                            data[row[keys[0]]] = {k: row[k] for k in keys[1:]}
+                if output_file.exists() and not overwrite:
+                    user_input = input(
+                        f"File '{output_file}' already exists. Overwrite? (y/n): "
+                    )
+                    if user_input.lower() != "y":
+                        print(f"Skipping {normalized_language} - {dtype}")
+                        continue
 
-        except (IOError, csv.Error) as e:
-            print(f"Error reading '{input_file_path}': {e}")
-            continue
-
-        # Define output file path
-        output_file = json_output_dir / f"{dtype}.{output_type}"
-
-        if output_file.exists() and not overwrite:
-            user_input = input(
-                f"File '{output_file}' already exists. Overwrite? (y/n): "
-            )
-            if user_input.lower() != "y":
-                print(f"Skipping {normalized_language['language']} - {dtype}")
-                continue
+                # Members are written as rows are read so that memory use doesn't grow with the size of the file.
+                with open_partial_output(output_file, encoding="utf-8") as out_file:
+                    writer = JSONObjectWriter(out_file)
+                    for key, value in itertools.chain([first_member], members):
+                        writer.write(key, value)
 
-        try:
-            with output_file.open("w", encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
+                    writer.close()
 
-        except IOError as e:
-            print(f"Error writing to '{output_file}': {e}")
+        except (IOError, csv.Error) as e:
+            print(f"Error converting '{input_file_path}' to '{output_file}': {e}")
             continue
 
         print(f"Data for {language.capitalize()} {dtype} written to {output_file}")
@@ -185,7 +533,7 @@ def convert_to_csv_or_tsv(
     overwrite: bool = False,
 ) -> None:
     """
-    Convert a JSON File to CSV/TSV file.
+    Convert a JSON or other export file to CSV/TSV file.
 
     Parameters
     ----------
@@ -199,7 +547,7 @@ def convert_to_csv_or_tsv(
             The output format, should be "csv" or "tsv".
 
         input_file : str
-            The input JSON file path.
+            The input JSON file path, which can also be MessagePack, CBOR or compressed.
 
         output_dir : str
             The output directory path for results.
@@ -228,14 +576,6 @@ def convert_to_csv_or_tsv(
             print(f"No data found for {dtype} conversion at '{input_file}'.")
             continue
 
-        try:
-            with input_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-
-        except (IOError, json.JSONDecodeError) as e:
-            print(f"Error reading '{input_file}': {e}")
-            continue
-
         # Determine the delimiter based on output type.
         delimiter = "," if output_type == "csv" else "\t"
 
@@ -250,79 +590,37 @@ def convert_to_csv_or_tsv(
         final_output_dir.mkdir(parents=True, exist_ok=True)
 
         output_file = final_output_dir / f"{dtype}.{output_type}"
-        if output_file.exists() and not overwrite:
-            user_input = input(
-                f"File '{output_file}' already exists. Overwrite? (y/n): "
-            )
-            if user_input.lower() != "y":
-                print(f"Skipping {dtype}")
-                continue
 
         try:
-            with output_file.open("w", newline="", encoding="utf-8") as file:
-                writer = csv.writer(file, delimiter=delimiter)
-                # Handle different JSON structures based on the format.
-
-                if isinstance(data, dict):
-                    first_key = list(data.keys())[0]
-
-                    if isinstance(data[first_key], dict):
-                        # Handle case: { key: { value1: ..., value2: ... } }.
-                        columns = sorted(next(iter(data.values())).keys())
-                        writer.writerow([dtype[:-1]] + columns)
-
-                        for key, value in data.items():
-                            row = [key] + [value.get(col, "") for col in columns]
-                            writer.writerow(row)
-
-                    elif isinstance(data[first_key], list):
-                        if all(isinstance(item, dict) for item in data[first_key]):
-                            # Handle case: { key: [ { value1: ..., value2: ... } ] }.
-                            if "emoji" in data[first_key][0]:  # emoji specific case
-                                columns = ["word", "emoji", "is_base", "rank"]
-                                writer.writerow(columns)
-
-                                for key, value in data.items():
-                                    for item in value:
-                                        row = [
-                                            key,
-                                            item.get("emoji", ""),
-                                            item.get("is_base", ""),
-                                            item.get("rank", ""),
-                                        ]
-                                        writer.writerow(row)
-                            else:
-                                columns = [dtype[:-1]] + list(data[first_key][0].keys())
-                                writer.writerow(columns)
-
-                                for key, value in data.items():
-                                    for item in value:
-                                        row = [key] + [
-                                            item.get(col, "") for col in columns[1:]
-                                        ]
-                                        writer.writerow(row)
-
-                        elif all(isinstance(item, str) for item in data[first_key]):
-                            # Handle case: { key: [value1, value2, ...] }.
-                            writer.writerow(
-                                [dtype[:-1]]
-                                + [
-                                    f"autosuggestion_{i+1}"
-                                    for i in range(len(data[first_key]))
-                                ]
-                            )
-                            for key, value in data.items():
-                                row = [key] + value
-                                writer.writerow(row)
-
-                    else:
-                        # Handle case: { key: value }.
-                        writer.writerow([dtype[:-1], "value"])
-                        for key, value in data.items():
-                            writer.writerow([key, value])
-
-        except IOError as e:
-            print(f"Error writing to '{output_file}': {e}")
+            with closing(iter_file_members(input_file)) as members:
+                first_member = next(members, None)
+
+                if first_member is None:
+                    print(f"No data found in '{input_file}'.")
+                    continue
+
+                if output_file.exists() and not overwrite:
+                    user_input = input(
+                        f"File '{output_file}' already exists. Overwrite? (y/n): "
+                    )
+                    if user_input.lower() != "y":
+                        print(f"Skipping {dtype}")
+                        continue
+
+                # Rows are written as members are read so that memory use doesn't grow with the size of the file.
+                with open_partial_output(
+                    output_file, newline="", encoding="utf-8"
+                ) as file:
+                    writer = csv.writer(file, delimiter=delimiter)
+                    write_csv_rows(
+                        writer=writer,
+                        members=itertools.chain([first_member], members),
+                        first_member=first_member,
+                        dtype=dtype,
+                    )
+
+        except (IOError, ValueError) as e:
+            print(f"Error converting '{input_file}' to '{output_file}': {e}")
             continue
 
         print(f"Data for {language} {dtype} written to '{output_file}'")
@@ -407,6 +705,96 @@ def convert_to_sqlite(
     print("SQLite file conversion complete.")
 
 
+# MARK: Parquet or Feather
+
+
+def convert_to_columnar(
+    language: str,
+    data_type: Union[str, List[str]],
+    output_type: str,
+    input_file: str,
+    output_dir: str = None,
+    overwrite: bool = False,
+) -> None:
+    """
+    Convert a JSON, CSV or TSV file to a Parquet or Feather file.
+
+    Parameters
+    ----------
+        language : str
+            The language of the file to convert.
+
+        data_type : Union[str, List[str]]
+            The data type of the file to convert.
+
+        output_type : str
+            The output format, should be "parquet" or "feather".
+
+        input_file : str
+            The input JSON, CSV or TSV file path.
+
+        output_dir : str
+            The output directory path for results.
+
+        overwrite : bool
+            Whether to overwrite existing files.
+
+    Returns
+    -------
+        None
+    """
+    from scribe_data.load.columnar import check_pyarrow_installed, write_columnar
+
+    check_pyarrow_installed()
+
+    data_types = [data_type] if isinstance(data_type, str) else data_type
+
+    if output_dir is None:
+        output_dir = (
+            DEFAULT_PARQUET_EXPORT_DIR
+            if output_type == "parquet"
+            else DEFAULT_FEATHER_EXPORT_DIR
+        )
+
+    final_output_dir = Path(output_dir) / language.capitalize()
+    final_output_dir.mkdir(parents=True, exist_ok=True)
+
+    input_file = Path(input_file)
+    if not input_file.exists():
+        raise FileNotFoundError(f"Input file '{input_file}' does not exist.")
+
+    for dtype in data_types:
+        dtype = dtype.strip()
+        output_file = final_output_dir / f"{dtype}.{output_type}"
+
+        if output_file.exists() and not overwrite:
+            user_input = input(
+                f"File '{output_file}' already exists. Overwrite? (y/n): "
+            )
+            if user_input.lower() != "y":
+                print(f"Skipping {dtype}")
+                continue
+
+        try:
+            n_rows = write_columnar(
+                lambda: iter_file_members(input_file),
+                output_file=output_file,
+                data_type=dtype,
+                output_type=output_type,
+            )
+
+        # Note: ValueError includes JSON decoding errors, entries with another shape and values that Arrow can't convert.
+        except (IOError, csv.Error, ValueError) as e:
+            print(f"Error converting '{input_file}' to '{output_file}': {e}")
+            continue
+
+        if n_rows == 0:
+            print(f"No data found in '{input_file}'.")
+            continue
+
+        print(f"Data for {language} {dtype} written to '{output_file}'")
+
+
 def convert_wrapper(
     language: str,
     data_type: Union[str, List[str]],
@@ -416,7 +804,7 @@ def convert_wrapper(
     overwrite: bool = False,
 ):
     """
-    Convert data to the specified output type: JSON, CSV/TSV, or SQLite.
+    Convert data to the specified output type: JSON, CSV/TSV, SQLite, Parquet or Feather.
 
     Parameters
     ----------
@@ -427,7 +815,7 @@ def convert_wrapper(
         The data type(s) of the data to convert.
 
     output_type : str
-        The desired output format. It can be 'json', 'csv', 'tsv', or 'sqlite'.
+        The desired output format. It can be 'json', 'csv', 'tsv', 'sqlite', 'parquet' or 'feather'.
 
     input_file : str
         The path to the input file.
@@ -476,7 +864,17 @@ def convert_wrapper(
             overwrite=overwrite,
         )
 
+    elif output_type in {"parquet", "feather"}:
+        convert_to_columnar(
+            language=language,
+            data_type=data_type,
+            output_type=output_type,
+            input_file=input_file,
+            output_dir=output_dir,
+            overwrite=overwrite,
+        )
+
     else:
         raise ValueError(
-            f"Unsupported output type '{output_type}'. Must be 'json', 'csv', 'tsv' or 'sqlite'."
+            f"Unsupported output type '{output_type}'. Must be 'json', 'csv', 'tsv', 'sqlite', 'parquet' or 'feather'."
         )
@@ -0,0 +1,291 @@
+"""
+Batched translations of words and phrases from Wikidata labels over a pooled HTTP session.
+
+All words of a batch are resolved with a single query with a VALUES clause, and translations are memoized so that repeated words aren't queried again.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import socket
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import requests
+
+from scribe_data.wikidata.wikidata_utils import WDQS_ENDPOINT
+
+DEFAULT_TARGET_LANGUAGES = ("fr", "es", "de", "pt")
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_CACHE_SIZE = 10_000
+REQUEST_TIMEOUT_SECONDS = 60
+
+
+@lru_cache(maxsize=None)
+def check_internet_connection() -> bool:
+    """
+    Checks once per process whether there's an internet connection.
+
+    Returns
+    -------
+        bool
+            Whether a DNS server could be reached.
+    """
+    try:
+        socket.create_connection(("1.1.1.1", 53), timeout=3).close()
+        return True
+
+    except OSError:
+        return False
+
+
+def sparql_string(value: str, lang: str) -> str:
+    """
+    Returns a SPARQL language-tagged string literal with quotes and backslashes escaped.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"@{lang}'
+
+
+def _qid_number(item: str) -> int:
+    """
+    Returns the number of the QID of an item URI so that the lowest QID of a label can be chosen.
+    """
+    qid = item.rsplit("/", 1)[-1]
+    return int(qid[1:]) if qid[1:].isdigit() else float("inf")
+
+
+class BatchTranslator:
+    """
+    Translates words with one Wikidata query per batch, memoizing the translations of the most recent words.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = WDQS_ENDPOINT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+            endpoint : str (default=WDQS_ENDPOINT)
+                The URL of the SPARQL endpoint to query.
+
+            batch_size : int (default=DEFAULT_BATCH_SIZE)
+                The number of distinct words that are resolved by a single query.
+
+            cache_size : int (default=DEFAULT_CACHE_SIZE)
+                The number of translated words that are kept, with the least recently used being dropped first.
+
+            session : requests.Session (default=None)
+                A session whose pooled keep-alive connections are used for queries, with a new one by default.
+        """
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.session = session or requests.Session()
+        self.queries = 0
+        self._cache = OrderedDict()
+
+    def query(self, query: str) -> list[dict]:
+        """
+        Sends a query over the session and returns the bindings of its results.
+        """
+        if self.endpoint == WDQS_ENDPOINT and not check_internet_connection():
+            raise ConnectionError(
+                "No internet connection. Please check your network settings."
+            )
+
+        self.queries += 1
+        response = self.session.post(
+            self.endpoint,
+            data={"query": query},
+            headers={"Accept": "application/sparql-results+json"},
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+
+        return response.json()["results"]["bindings"]
+
+    def _query_batch(
+        self, words: list[str], source_lang: str, target_langs: tuple[str, ...]
+    ) -> dict:
+        """
+        Returns the translations of the item with the lowest QID that has each word as its label.
+        """
+        word_values = " ".join(sparql_string(w, source_lang) for w in words)
+        language_filter = ", ".join(f'"{lang}"' for lang in target_langs)
+        query = f"""
+        SELECT ?word ?item ?languageCode ?translation WHERE {{
+            VALUES ?word {{ {word_values} }}
+            ?item rdfs:label ?word ;
+                rdfs:label ?translation .
+            FILTER (LANG(?translation) IN ({language_filter}))
+            BIND (LANG(?translation) AS ?languageCode)
+        }}
+        """
+
+        items = {}
+        for result in self.query(query):
+            word = result["word"]["value"]
+            item = result["item"]["value"]
+            if word not in items or _qid_number(item) < _qid_number(items[word][0]):
+                items[word] = (item, {})
+
+            if items[word][0] == item:
+                items[word][1].setdefault(
+                    result["languageCode"]["value"], result["translation"]["value"]
+                )
+
+        return {w: items[w][1] if w in items else None for w in words}
+
+    def translate_words(
+        self,
+        words: Iterable[str],
+        source_lang: str = "en",
+        target_langs: Iterable[str] = DEFAULT_TARGET_LANGUAGES,
+    ) -> dict:
+        """
+        Translates words, querying only those that haven't been translated recently.
+
+        Parameters
+        ----------
+            words : Iterable[str]
+                The words to translate, which can include repeats.
+
+            source_lang : str (default=en)
+                The language code of the words.
+
+            target_langs : Iterable[str] (default=DEFAULT_TARGET_LANGUAGES)
+                The language codes to translate the words to.
+
+        Returns
+        -------
+            translations : dict
+                The translations of each distinct word by language code, or None if no item has the word as its label.
+        """
+        target_langs = tuple(target_langs)
+        translations = {}
+        missing = []
+        for word in dict.fromkeys(words):
+            key = (word, source_lang, target_langs)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                translations[word] = self._cache[key]
+
+            else:
+                missing.append(word)
+
+        for i in range(0, len(missing), self.batch_size):
+            batch = self._query_batch(
+                missing[i : i + self.batch_size], source_lang, target_langs
+            )
+            for word, word_translations in batch.items():
+                translations[word] = word_translations
+                self._cache[(word, source_lang, target_langs)] = word_translations
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return translations
+
+    def translate_phrases(
+        self,
+        phrases: Iterable[str],
+        source_lang: str = "en",
+        target_langs: Iterable[str] = DEFAULT_TARGET_LANGUAGES,
+    ) -> list[dict]:
+        """
+        Translates the words of phrases, with the words of all phrases resolved together.
+
+        Parameters
+        ----------
+            phrases : Iterable[str]
+                The phrases to translate word by word.
+
+            source_lang : str (default=en)
+                The language code of the phrases.
+
+            target_langs : Iterable[str] (default=DEFAULT_TARGET_LANGUAGES)
+                The language codes to translate the words to.
+
+        Returns
+        -------
+            list[dict]
+                For each phrase, the phrase and the translations of each of its words as returned by get_sentence_translations.
+        """
+        phrases = list(phrases)
+        translations = self.translate_words(
+            (word for phrase in phrases for word in phrase.split()),
+            source_lang=source_lang,
+            target_langs=target_langs,
+        )
+
+        return [
+            {
+                "phrase": phrase,
+                **{
+                    word: translations[word] or f"No translations found for '{word}'."
+                    for word in phrase.split()
+                },
+            }
+            for phrase in phrases
+        ]
+
+    def translate_file(
+        self,
+        path: Path,
+        source_lang: str = "en",
+        target_langs: Iterable[str] = DEFAULT_TARGET_LANGUAGES,
+    ) -> list[dict]:
+        """
+        Translates a file with one phrase per line, skipping empty lines.
+
+        Parameters
+        ----------
+            path : Path
+                The UTF-8 text file of phrases.
+
+            source_lang : str (default=en)
+                The language code of the phrases.
+
+            target_langs : Iterable[str] (default=DEFAULT_TARGET_LANGUAGES)
+                The language codes to translate the words to.
+
+        Returns
+        -------
+            list[dict]
+                The translations of each phrase as returned by translate_phrases.
+        """
+        with open(path, encoding="utf-8") as f:
+            phrases = [line.strip() for line in f if line.strip()]
+
+        return self.translate_phrases(
+            phrases, source_lang=source_lang, target_langs=target_langs
+        )
+
+
+@lru_cache(maxsize=None)
+def default_translator() -> BatchTranslator:
+    """
+    Returns the translator that's shared within a process so that its session and memoized translations are reused.
+    """
+    return BatchTranslator()
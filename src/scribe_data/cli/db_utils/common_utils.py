@@ -1,19 +1,18 @@
 import os
-import socket
 import psycopg2
 from SPARQLWrapper import SPARQLWrapper, JSON
 
-def check_internet_connection():
-    """Check if there is an active internet connection."""
-    try:
-        socket.create_connection(("1.1.1.1", 53))
-        return True
-    except OSError:
-        return False
+from scribe_data.cli.db_utils.batch_translations import (
+    DEFAULT_TARGET_LANGUAGES,
+    check_internet_connection,
+    default_translator,
+)
+from scribe_data.wikidata.wikidata_utils import sparql_context
+
 
 def get_q_number(word):
     """Fetch the Q-number for the given word from Wikidata."""
-    sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
+    sparql = sparql_context()
     query = f"""
     SELECT ?item WHERE {{
         ?item rdfs:label "{word}"@en.
@@ -126,6 +125,17 @@ def get_translations_for_word_by_q_number(word_q, target_languages):
         print(f"Error in query execution: {e}")
         return None
 
+def _translation_languages(input_data):
+    """Get the source and target languages of a translation request, defaulting to English and the default target languages."""
+    if isinstance(input_data, dict):
+        return (
+            input_data.get("source_lang") or "en",
+            input_data.get("target_lang") or DEFAULT_TARGET_LANGUAGES,
+        )
+
+    return "en", DEFAULT_TARGET_LANGUAGES
+
+
 def get_word_translations(input_data):
     """Get translations for a single word and return a dictionary."""
     # Check if input_data is a dict and extract 'phrase' if it is
@@ -138,8 +148,14 @@ def get_word_translations(input_data):
         print(f"Invalid input: '{word}' is not a valid string.")
         return {str(word): "Error: word must be a non-empty string."}
 
-    target_languages = ['fr', 'es', 'de', 'pt']  # Specify the target languages here
-    translations = get_translations_for_word(word, target_languages)
+    source_lang, target_languages = _translation_languages(input_data)
+    try:
+        translations = default_translator().translate_words(
+            [word], source_lang=source_lang, target_langs=target_languages
+        )[word]
+    except OSError as e:
+        print(f"Error in query execution: {e}")
+        translations = None
 
     if translations:
         return {word: translations}
@@ -148,7 +164,9 @@ def get_word_translations(input_data):
 
 
 def get_sentence_translations(phrase):
-    """Get translations for a given phrase and return a single dictionary."""
+    """Get translations for all words of a given phrase with one query and return a single dictionary."""
+    source_lang, target_languages = _translation_languages(phrase)
+
     # Ensure phrase is extracted correctly
     if isinstance(phrase, dict):
         phrase = phrase.get('phrase', '')  # Ensure to extract the correct key
@@ -156,15 +174,10 @@ def get_sentence_translations(phrase):
     if not isinstance(phrase, str) or not phrase.strip():
         return {"phrase": phrase, "error": "Phrase must be a non-empty string."}
 
-    words = phrase.split()
-    translations_dict = {"phrase": phrase}
-
-    for word in words:
-        print(f"Translating word: '{word}'")
-        word_translations = get_word_translations(word)
-        if word_translations:
-            translations_dict.update(word_translations)
-        else:
-            translations_dict[word] = "No translation found."
-
-    return translations_dict
+    try:
+        return default_translator().translate_phrases(
+            [phrase], source_lang=source_lang, target_langs=target_languages
+        )[0]
+    except OSError as e:
+        print(f"Error in query execution: {e}")
+        return {"phrase": phrase, "error": str(e)}
@@ -26,10 +26,16 @@ from pathlib import Path
 from typing import List, Union
 
 from scribe_data.cli.convert import convert_wrapper
-from scribe_data.unicode.generate_emoji_keywords import generate_emoji
+from scribe_data.serializers import find_export_file
+from scribe_data.unicode.generate_emoji_keywords import (
+    generate_emoji,
+    generate_emoji_for_all_languages,
+)
 from scribe_data.utils import (
     DEFAULT_CSV_EXPORT_DIR,
+    DEFAULT_FEATHER_EXPORT_DIR,
     DEFAULT_JSON_EXPORT_DIR,
+    DEFAULT_PARQUET_EXPORT_DIR,
     DEFAULT_SQLITE_EXPORT_DIR,
     DEFAULT_TSV_EXPORT_DIR,
 )
@@ -45,6 +51,10 @@ def get_data(
     outputs_per_entry: int = None,
     all: bool = False,
     interactive: bool = False,
+    source: str = "wdqs",
+    dump_file: str = None,
+    page_size: int = None,
+    jobs: int = None,
 ) -> None:
     """
     Function for controlling the data get process for the CLI.
@@ -75,6 +85,18 @@ def get_data(
         interactive : bool (default: False)
             Whether it's running in interactive mode.
 
+        source : str (default: wdqs)
+            Where the data comes from, either 'wdqs' or 'dump' for a Wikidata lexeme JSON dump.
+
+        dump_file : str (default: None)
+            The path to the lexeme dump if the source is 'dump'.
+
+        page_size : int (default: None)
+            The number of rows per page of lexeme queries, with None querying all rows at once.
+
+        jobs : int (default: None)
+            The number of processes for generating emoji keywords for all languages.
+
     Returns
     -------
         The requested data saved locally given file type and location arguments.
@@ -91,23 +113,51 @@ def get_data(
             output_dir = DEFAULT_SQLITE_EXPORT_DIR
         elif output_type == "tsv":
             output_dir = DEFAULT_TSV_EXPORT_DIR
+        elif output_type == "parquet":
+            output_dir = DEFAULT_PARQUET_EXPORT_DIR
+        elif output_type == "feather":
+            output_dir = DEFAULT_FEATHER_EXPORT_DIR
 
     languages = [language] if language else None
     data_types = [data_type] if data_type else None
 
     subprocess_result = False
 
-    # MARK: Get All
+    # MARK: Dump
 
-    if all:
-        print("Updating all languages and data types ...")
-        query_data(None, None, None, overwrite)
+    if source == "dump":
+        if not dump_file:
+            raise ValueError(
+                "You must provide the path to a lexeme dump with --dump-file (-df) when using --source dump."
+            )
+
+        print(f"Selecting data from the lexeme dump {dump_file} ...")
+        query_data(
+            languages=None if all else languages,
+            data_type=None if all else data_types,
+            output_dir=output_dir,
+            overwrite=overwrite,
+            interactive=interactive,
+            source=source,
+            dump_file=dump_file,
+        )
         subprocess_result = True
 
     # MARK: Emojis
 
     elif data_type in {"emoji-keywords", "emoji_keywords"}:
-        generate_emoji(language=language, output_dir=output_dir)
+        if language and not all:
+            generate_emoji(language=language, output_dir=output_dir)
+
+        else:
+            generate_emoji_for_all_languages(output_dir=output_dir, jobs=jobs)
+
+    # MARK: Get All
+
+    elif all:
+        print("Updating all languages and data types ...")
+        query_data(None, None, None, overwrite, page_size=page_size)
+        subprocess_result = True
 
     # MARK: Query Data
 
@@ -123,6 +173,7 @@ def get_data(
             output_dir=output_dir,
             overwrite=overwrite,
             interactive=interactive,
+            page_size=page_size,
         )
         subprocess_result = True
 
@@ -141,6 +192,13 @@ def get_data(
 
         # Proceed with conversion only if the output type is not JSON.
         if output_type != "json":
+            # The queried data can have been exported in any format.
+            if language and data_type:
+                json_input_path = (
+                    find_export_file(Path(output_dir) / language, data_type)
+                    or json_input_path
+                )
+
             if json_input_path.exists():
                 convert_wrapper(
                     language=language,
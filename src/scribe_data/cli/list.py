@@ -82,7 +82,11 @@ def list_data_types(language: str = None) -> None:
         if not language_data:
             raise ValueError(f"Language '{language.capitalize()}' is not recognized.")
 
-        data_types = {f.name for f in language_dir.iterdir() if f.is_dir()}
+        data_types = {
+            f.name
+            for f in language_dir.iterdir()
+            if f.is_dir() and f.name != "__pycache__"
+        }
 
         # Add emoji keywords if available.
         iso = get_language_iso(language=language)
@@ -109,7 +113,11 @@ def list_data_types(language: str = None) -> None:
                 lang, language_metadata
             )
             if language_dir.is_dir():
-                data_types.update(f.name for f in language_dir.iterdir() if f.is_dir())
+                data_types.update(
+                    f.name
+                    for f in language_dir.iterdir()
+                    if f.is_dir() and f.name != "__pycache__"
+                )
 
         data_types.add("emoji-keywords")
 
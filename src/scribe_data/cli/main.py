@@ -1,20 +1,8 @@
 #!/usr/bin/env python3
 import argparse
 from pathlib import Path
-from scribe_data.cli.cli_utils import validate_language_and_data_type
-from scribe_data.cli.convert import convert_wrapper
-from scribe_data.cli.get import get_data
-from scribe_data.cli.interactive import start_interactive_mode
-from scribe_data.cli.list import list_wrapper
-from scribe_data.cli.total import total_wrapper
-from scribe_data.cli.upgrade import upgrade_cli
-from scribe_data.cli.version import get_version_message
-from scribe_data.cli.db_utils.insert_translation import insert_translation
-from scribe_data.cli.db_utils.meli_search_db import create_index, check_index_exists, add_documents
-from scribe_data.cli.db_utils.search_database import search_by_meilisearch
-from scribe_data.cli.db_utils.postgrel import create_table
-from scribe_data.cli.db_utils.common_utils import get_q_number, get_word_translations, get_sentence_translations
-from scribe_data.cli.db_utils.search_wiki_db import check_internet_connection, get_translations_for_word
+
+# Note: Subcommands and the version check are imported when they're run so that the CLI doesn't load libraries or query GitHub for commands that don't need them.
 
 
 def main() -> None:
@@ -36,8 +24,7 @@ def main() -> None:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"{get_version_message()}",
+        action="store_true",
         help="Show the version of the Scribe-Data CLI.",
     )
 
@@ -96,12 +83,20 @@ def main() -> None:
     )
     get_parser.add_argument("-lang", "--language", type=str, help="The language(s) to get data for.")
     get_parser.add_argument("-dt", "--data-type", type=str, help="The data type(s) to get data for (e.g., nouns, verbs).")
-    get_parser.add_argument("-ot", "--output-type", type=str, choices=["json", "csv", "tsv", "sqlite"], help="The output file type.")
+    get_parser.add_argument("-ot", "--output-type", type=str, choices=["json", "csv", "tsv", "sqlite", "parquet", "feather"], help="The output file type.")
     get_parser.add_argument("-od", "--output-dir", type=str, help="The output directory path for results.")
     get_parser.add_argument("-ope", "--outputs-per-entry", type=int, help="How many outputs should be generated per data entry.")
     get_parser.add_argument("-o", "--overwrite", action="store_true", help="Whether to overwrite existing files (default: False).")
     get_parser.add_argument("-a", "--all", action=argparse.BooleanOptionalAction, help="Get all languages and data types.")
     get_parser.add_argument("-i", "--interactive", action="store_true", help="Run in interactive mode")
+    get_parser.add_argument("-s", "--source", type=str, choices=["wdqs", "dump"], default="wdqs", help="Whether to query WDQS or select data from a lexeme dump (default: wdqs).")
+    get_parser.add_argument("-df", "--dump-file", type=str, help="The path to a Wikidata lexeme JSON dump (e.g. latest-lexemes.json.bz2) for --source dump.")
+    get_parser.add_argument("-nc", "--no-cache", action="store_true", help="Don't read or save Wikidata responses in the local cache.")
+    get_parser.add_argument("-r", "--refresh", action="store_true", help="Query Wikidata again and replace cached responses.")
+    get_parser.add_argument("-ps", "--page-size", type=int, help="Split lexeme queries into ordered pages of this many rows that are fetched concurrently (default: no pages).")
+    get_parser.add_argument("-j", "--jobs", type=int, help="The number of processes for generating emoji keywords for all languages (default: the number of CPUs).")
+    get_parser.add_argument("-sr", "--serializer", type=str, choices=["json", "msgpack", "cbor"], default="json", help="The serializer of exported data, with JSON written by orjson if it's installed (default: json).")
+    get_parser.add_argument("-cp", "--compression", type=str, choices=["gzip", "zstd"], help="Compress exported data with gzip (.gz) or zstd (.zst) (default: no compression).")
 
     # MARK: Total
     total_parser = subparsers.add_parser(
@@ -115,6 +110,8 @@ def main() -> None:
     total_parser.add_argument("-lang", "--language", type=str, help="The language(s) to check totals for.")
     total_parser.add_argument("-dt", "--data-type", type=str, help="The data type(s) to check totals for (e.g., nouns, verbs).")
     total_parser.add_argument("-a", "--all", action=argparse.BooleanOptionalAction, help="Check for all languages and data types.")
+    total_parser.add_argument("-nc", "--no-cache", action="store_true", help="Don't read or save Wikidata responses in the local cache.")
+    total_parser.add_argument("-r", "--refresh", action="store_true", help="Query Wikidata again and replace cached responses.")
 
     # MARK: Convert
     convert_parser = subparsers.add_parser(
@@ -128,7 +125,7 @@ def main() -> None:
     convert_parser.add_argument("-lang", "--language", type=str, required=True, help="The language of the file to convert.")
     convert_parser.add_argument("-dt", "--data-type", type=str, required=True, help="The data type(s) of the file to convert (e.g., nouns, verbs).")
     convert_parser.add_argument("-if", "--input-file", type=Path, required=True, help="The path to the input file to convert.")
-    convert_parser.add_argument("-ot", "--output-type", type=str, choices=["json", "csv", "tsv", "sqlite"], required=True, help="The output file type.")
+    convert_parser.add_argument("-ot", "--output-type", type=str, choices=["json", "csv", "tsv", "sqlite", "parquet", "feather"], required=True, help="The output file type.")
     convert_parser.add_argument("-od", "--output-dir", type=str, help="The directory where the output file will be saved.")
     convert_parser.add_argument("-o", "--overwrite", action="store_true", help="Whether to overwrite existing files (default: False).")
     convert_parser.add_argument("-ko", "--keep-original", action="store_true", default=True, help="Whether to keep the original file to be converted (default: True).")
@@ -136,6 +133,12 @@ def main() -> None:
     # Parse arguments
     args = parser.parse_args()
 
+    if args.version:
+        from scribe_data.cli.version import LATEST_VERSION_CACHE_FILE, get_version_message
+
+        print(get_version_message(cache_file=LATEST_VERSION_CACHE_FILE))
+        return
+
     # Safely check for data_type presence
     if hasattr(args, 'data_type') and args.data_type and isinstance(args.data_type, str):
         args.data_type = args.data_type.replace("-", "_")
@@ -143,12 +146,16 @@ def main() -> None:
     try:
         # Check for presence of 'language' before validation
         if (hasattr(args, 'language') and args.language) or (hasattr(args, 'data_type') and args.data_type):
+            from scribe_data.cli.cli_utils import validate_language_and_data_type
+
             validate_language_and_data_type(language=args.language, data_type=args.data_type)
     except ValueError as e:
         print(f"Input validation failed with error: {e}")
         return
 
     if args.upgrade:
+        from scribe_data.cli.upgrade import upgrade_cli
+
         upgrade_cli()
         return
 
@@ -170,6 +177,9 @@ def main() -> None:
             "phrase": args.phrase,
         }
 
+        from scribe_data.cli.db_utils.common_utils import get_sentence_translations, get_word_translations
+        from scribe_data.cli.db_utils.search_database import search_by_meilisearch
+
         # Search the database for an existing translation
         existing_translation = search_by_meilisearch(args_dict)
 
@@ -190,14 +200,60 @@ def main() -> None:
             print(f"Found existing translation: {existing_translation}")
 
     # Handle other commands
-    elif args.command == "list":
-        list_wrapper(args)
-    elif args.command == "get":
-        get_data(args)
-    elif args.command == "total":
-        total_wrapper(args)
-    elif args.command == "convert":
-        convert_wrapper(args)
+    elif args.command in ["list", "l"]:
+        from scribe_data.cli.list import list_wrapper
+
+        list_wrapper(language=args.language, data_type=args.data_type, all_bool=args.all)
+
+    elif args.command in ["get", "g", "total", "t"]:
+        from scribe_data.wikidata.response_cache import configure_response_cache, response_cache
+
+        configure_response_cache(enabled=not args.no_cache, refresh=args.refresh)
+
+        if args.command in ["get", "g"] and args.interactive:
+            from scribe_data.cli.interactive import start_interactive_mode
+
+            start_interactive_mode()
+
+        elif args.command in ["get", "g"]:
+            from scribe_data.cli.get import get_data
+            from scribe_data.serializers import configure_export_format
+
+            configure_export_format(serializer=args.serializer, compression=args.compression)
+
+            get_data(
+                language=args.language,
+                data_type=args.data_type,
+                output_type=args.output_type,
+                output_dir=args.output_dir,
+                overwrite=args.overwrite,
+                outputs_per_entry=args.outputs_per_entry,
+                all=args.all,
+                source=args.source,
+                dump_file=args.dump_file,
+                page_size=args.page_size,
+                jobs=args.jobs,
+            )
+
+        else:
+            from scribe_data.cli.total import total_wrapper
+
+            total_wrapper(language=args.language, data_type=args.data_type, all_bool=args.all)
+
+        response_cache.report()
+
+    elif args.command in ["convert", "c"]:
+        from scribe_data.cli.convert import convert_wrapper
+
+        convert_wrapper(
+            language=args.language,
+            data_type=args.data_type,
+            output_type=args.output_type,
+            input_file=args.input_file,
+            output_dir=args.output_dir,
+            overwrite=args.overwrite,
+        )
+
     else:
         print("Invalid command. Please check your inputs.")
 
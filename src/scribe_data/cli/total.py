@@ -20,6 +20,8 @@ Functions to check the total language data available on Wikidata.
     -->
 """
 
+from itertools import chain
+
 from SPARQLWrapper import JSON
 
 from scribe_data.utils import (
@@ -77,13 +79,19 @@ def get_datatype_list(language):
 
     if language.lower() in languages:
         language_data = language_map.get(language.lower())
-        languages = format_sublanguage_name(language, language_metadata)
-        language_dir = LANGUAGE_DATA_EXTRACTION_DIR / language
-
         if not language_data:
             raise ValueError(f"Language '{language}' is not recognized.")
 
-        data_types = [f.name for f in language_dir.iterdir() if f.is_dir()]
+        # Sub-languages are in the directories of their main languages.
+        language_dir = LANGUAGE_DATA_EXTRACTION_DIR / format_sublanguage_name(
+            language.lower(), language_metadata
+        )
+
+        data_types = [
+            f.name
+            for f in language_dir.iterdir()
+            if f.is_dir() and f.name != "__pycache__"
+        ]
         if not data_types:
             raise ValueError(
                 f"No data types available for language '{language.capitalize()}'."
@@ -122,7 +130,7 @@ def print_total_lexemes(language: str = None):
     if language is None:
         print("Returning total counts for all languages and data types...\n")
 
-    elif language.startswith("Q") and language[1:].isdigit():
+    elif is_qid(language):
         print(f"Wikidata QID {language} passed. Checking all data types.\n")
 
     else:
@@ -132,43 +140,35 @@ def print_total_lexemes(language: str = None):
     print("=" * 64)
 
     if language is None:  # all languages
-        languages = list_all_languages(language_metadata)
-
-        for lang in languages:
-            data_types = get_datatype_list(lang)
+        data_types_by_language = {
+            lang: get_datatype_list(lang)
+            for lang in list_all_languages(language_metadata)
+        }
 
-            first_row = True
-            for dt in data_types:
-                total_lexemes = get_total_lexemes(lang, dt, False)
-                total_lexemes = f"{total_lexemes:,}"
-                if first_row:
-                    print(
-                        f"{lang.capitalize():<15} {dt.replace('_', '-'): <25} {total_lexemes:<25}"
-                    )
-                    first_row = False
+    elif is_qid(language):
+        data_types_by_language = {
+            language: [dt for dt in data_type_metadata if data_type_metadata[dt]]
+        }
 
-                else:
-                    print(f"{'':<15} {dt.replace('_', ' '): <25} {total_lexemes:<25}")
+    else:
+        data_types_by_language = {language: get_datatype_list(language)}
 
-            print()
+    # All counts of the table are returned by a single query.
+    totals = get_grouped_total_lexemes(
+        languages=list(data_types_by_language),
+        data_types=sorted(set(chain.from_iterable(data_types_by_language.values()))),
+    )
 
-    else:  # individual language
+    for lang, data_types in data_types_by_language.items():
         first_row = True
-        if language.startswith("Q") and language[1:].isdigit():
-            data_types = data_type_metadata
-            for t in ["autosuggestions", "emoji_keywords"]:
-                if t in data_types:
-                    del data_types[t]
-
-        else:
-            data_types = get_datatype_list(language)
-
         for dt in data_types:
-            total_lexemes = get_total_lexemes(language, dt, False)
-            total_lexemes = f"{total_lexemes:,}"
+            total_lexemes = totals.get((lang, dt))
+            total_lexemes = (
+                "Not found" if total_lexemes is None else f"{total_lexemes:,}"
+            )
             if first_row:
                 print(
-                    f"{language.capitalize():<15} {dt.replace('_', '-'): <25} {total_lexemes:<25}"
+                    f"{lang.capitalize():<15} {dt.replace('_', '-'): <25} {total_lexemes:<25}"
                 )
                 first_row = False
 
@@ -181,6 +181,86 @@ def print_total_lexemes(language: str = None):
 # MARK: Get Total
 
 
+def is_qid(value):
+    """
+    Returns whether a language or data type argument is a Wikidata QID rather than a name.
+    """
+    return value is not None and value.startswith("Q") and value[1:].isdigit()
+
+
+def get_grouped_total_lexemes(languages, data_types):
+    """
+    Get the total number of lexemes for all pairs of the given languages and data types with a single grouped query.
+
+    Parameters
+    ----------
+        languages : list[str]
+            The names or QIDs of the languages to count lexemes of.
+
+        data_types : list[str]
+            The names or QIDs of the data types to count lexemes of.
+
+    Returns
+    -------
+        totals : dict
+            The number of lexemes for each (language, data type) pair, with None for languages or data types without a QID.
+    """
+    language_qids = {
+        lang: lang if is_qid(lang) else get_qid_by_input(lang) for lang in languages
+    }
+    data_type_qids = {
+        dt: dt if is_qid(dt) else get_qid_by_input(dt) for dt in data_types
+    }
+    totals = {
+        (lang, dt): 0 if language_qids[lang] and data_type_qids[dt] else None
+        for lang in languages
+        for dt in data_types
+    }
+
+    language_values = " ".join(sorted({f"wd:{q}" for q in language_qids.values() if q}))
+    data_type_values = " ".join(
+        sorted({f"wd:{q}" for q in data_type_qids.values() if q})
+    )
+    if not language_values or not data_type_values:
+        return totals
+
+    # Note: Only lexemes have languages and lexical categories, so they're not also filtered by type.
+    query = f"""
+    SELECT
+        ?language
+        ?category
+        (COUNT(DISTINCT ?lexeme) as ?total)
+
+    WHERE {{
+        VALUES ?language {{ {language_values} }}
+        VALUES ?category {{ {data_type_values} }}
+
+        ?lexeme dct:language ?language ;
+            wikibase:lexicalCategory ?category .
+    }}
+
+    GROUP BY ?language ?category
+    """
+
+    sparql.setQuery(query)
+    sparql.setReturnFormat(JSON)
+    results = sparql.query().convert()
+
+    # Pairs without lexemes have no rows and keep their total of zero.
+    counts = {
+        (
+            r["language"]["value"].split("/")[-1],
+            r["category"]["value"].split("/")[-1],
+        ): int(r["total"]["value"])
+        for r in results.get("results", {}).get("bindings", [])
+    }
+    for lang, dt in totals:
+        if (language_qids[lang], data_type_qids[dt]) in counts:
+            totals[lang, dt] = counts[language_qids[lang], data_type_qids[dt]]
+
+    return totals
+
+
 def get_total_lexemes(language, data_type, doPrint=True):
     """
     Get the total number of lexemes for a given language and data type from Wikidata.
@@ -20,9 +20,22 @@ Functions for checking current version of the Scribe-Data CLI.
     -->
 """
 
+import json
+import os
+import time
+from pathlib import Path
+
 import pkg_resources
 import requests
 
+LATEST_VERSION_CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "scribe-data"
+    / "latest_version.json"
+)
+LATEST_VERSION_TTL_SECONDS = 24 * 60 * 60
+LATEST_VERSION_TIMEOUT_SECONDS = 5
+
 
 def get_local_version():
     try:
@@ -32,20 +45,85 @@ def get_local_version():
         return "Unknown (Not installed via pip)"
 
 
-def get_latest_version():
+def _read_cached_latest_version(cache_file):
+    """
+    Returns the latest version saved in the cache file if it's younger than LATEST_VERSION_TTL_SECONDS.
+    """
+    try:
+        if time.time() - cache_file.stat().st_mtime > LATEST_VERSION_TTL_SECONDS:
+            return None
+
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)["name"]
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_latest_version(cache_file, latest_version):
+    """
+    Saves the latest version so that it's not fetched again until the cache expires.
+    """
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({"name": latest_version}, f)
+
+    except OSError:
+        pass
+
+
+def get_latest_version(cache_file=None):
+    """
+    Returns the name of the latest release of Scribe-Data on GitHub.
+
+    Parameters
+    ----------
+        cache_file : pathlib.Path (default=None)
+            A file that the latest version is read from and saved to for a day, with None always fetching it.
+
+    Returns
+    -------
+        str
+            The name of the latest release or a message that it couldn't be fetched.
+    """
+    if cache_file is not None and (
+        cached_version := _read_cached_latest_version(cache_file)
+    ):
+        return cached_version
+
     try:
         response = requests.get(
-            "https://api.github.com/repos/scribe-org/Scribe-Data/releases/latest"
+            "https://api.github.com/repos/scribe-org/Scribe-Data/releases/latest",
+            timeout=LATEST_VERSION_TIMEOUT_SECONDS,
         )
-        return response.json()["name"]
+        latest_version = response.json()["name"]
 
     except Exception:
         return "Unknown (Unable to fetch version)"
 
+    if cache_file is not None:
+        _write_cached_latest_version(cache_file, latest_version)
+
+    return latest_version
+
+
+def get_version_message(cache_file=None):
+    """
+    Returns the local version and whether an upgrade is available.
+
+    Parameters
+    ----------
+        cache_file : pathlib.Path (default=None)
+            A file that the latest version is cached in (see get_latest_version).
 
-def get_version_message():
+    Returns
+    -------
+        str
+            The message that's shown for the --version option.
+    """
     local_version = f"Scribe-Data v{get_local_version()}"
-    latest_version = get_latest_version()
+    latest_version = get_latest_version(cache_file=cache_file)
 
     if (
         local_version == "Unknown (Not installed via pip)"
@@ -0,0 +1,187 @@
+"""
+Prefix indexes of autocomplete_lexicon that return the top completions of a prefix without scanning the lexicon.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import sqlite3
+from collections import Counter
+from typing import Iterable, Iterator, List
+
+# Prefixes up to this length have their completions stored, with longer ones being looked up in the sorted words table.
+MAX_PREFIX_LENGTH = 3
+TOP_K = 10
+
+WORDS_TABLE = "autocomplete_words"
+WORDS_COLS = ["word", "key", "weight"]
+# Note: Keys are lower cased in Python rather than with COLLATE NOCASE, which only folds ASCII letters.
+WORDS_CREATE = (
+    f"CREATE TABLE IF NOT EXISTS {WORDS_TABLE} "
+    "(word Text, key Text, weight Integer, UNIQUE(word))"
+)
+WORDS_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS {WORDS_TABLE}_key ON {WORDS_TABLE} (key, weight)"
+)
+
+PREFIXES_TABLE = "autocomplete_prefixes"
+PREFIXES_COLS = ["prefix", "completions"]
+PREFIXES_CREATE = (
+    f"CREATE TABLE IF NOT EXISTS {PREFIXES_TABLE} "
+    "(prefix Text PRIMARY KEY, completions Text) WITHOUT ROWID"
+)
+
+# The largest code point, which sorts after all keys that start with a prefix.
+MAX_CHAR = "\U0010ffff"
+
+
+def word_key(word: str) -> str:
+    """
+    Returns the key that a word is matched to prefixes by.
+    """
+    return word.lower()
+
+
+def word_weights(cursor: sqlite3.Cursor) -> Counter:
+    """
+    Returns how often each lower cased word is an autosuggestion key or suggestion, which is derived from Wikipedia word frequencies.
+
+    Parameters
+    ----------
+        cursor : sqlite3.Cursor
+            The cursor of a language database.
+
+    Returns
+    -------
+        Counter
+            The weights of words by their keys, which are zero for words that aren't autosuggestions.
+    """
+    weights = Counter()
+    has_autosuggestions = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'autosuggestions'"
+    ).fetchone()
+    if has_autosuggestions:
+        for row in cursor.execute("SELECT * FROM autosuggestions"):
+            weights.update(word_key(w) for w in row if w)
+
+    return weights
+
+
+def rank_words(words: Iterable[str], weights: Counter) -> List[str]:
+    """
+    Sorts words by descending weight with shorter and then alphabetically earlier words first for equal weights.
+    """
+    return sorted(words, key=lambda w: (-weights[word_key(w)], len(w), word_key(w), w))
+
+
+def word_rows(ranked_words: List[str], weights: Counter) -> Iterator[list]:
+    """
+    Yields the rows of the words table.
+    """
+    for word in ranked_words:
+        key = word_key(word)
+        yield [word, key, weights[key]]
+
+
+def prefix_rows(
+    ranked_words: List[str],
+    top_k: int = TOP_K,
+    max_prefix_length: int = MAX_PREFIX_LENGTH,
+) -> Iterator[list]:
+    """
+    Yields the rows of the prefixes table, which are the top completions of each prefix as a JSON list.
+
+    Parameters
+    ----------
+        ranked_words : list of strings
+            The words of the lexicon from best to worst completion.
+
+        top_k : int (default=TOP_K)
+            The number of completions stored for each prefix.
+
+        max_prefix_length : int (default=MAX_PREFIX_LENGTH)
+            The length of the longest prefixes that are stored.
+
+    Returns
+    -------
+        Iterator[list]
+            The prefix and completions of each row sorted by prefix.
+    """
+    completions = {}
+    for word in ranked_words:
+        key = word_key(word)
+        for length in range(1, min(len(key), max_prefix_length) + 1):
+            prefix_completions = completions.setdefault(key[:length], [])
+            if len(prefix_completions) < top_k:
+                prefix_completions.append(word)
+
+    for prefix in sorted(completions):
+        yield [prefix, json.dumps(completions[prefix], ensure_ascii=False)]
+
+
+def lookup_completions(
+    cursor: sqlite3.Cursor,
+    prefix: str,
+    k: int = TOP_K,
+    max_prefix_length: int = MAX_PREFIX_LENGTH,
+) -> List[str]:
+    """
+    Returns the top completions of a prefix using a single lookup of a primary key or index range.
+
+    Parameters
+    ----------
+        cursor : sqlite3.Cursor
+            The cursor of a language database with prefix indexes.
+
+        prefix : str
+            The characters that have been typed, which are matched regardless of case.
+
+        k : int (default=TOP_K)
+            The number of completions to return, which is at most the top_k of the index for short prefixes.
+
+        max_prefix_length : int (default=MAX_PREFIX_LENGTH)
+            The length of the longest prefixes whose completions were stored.
+
+    Returns
+    -------
+        list of strings
+            The completions from best to worst.
+    """
+    key = word_key(prefix)
+    if not key:
+        return []
+
+    if len(key) <= max_prefix_length:
+        row = cursor.execute(
+            f"SELECT completions FROM {PREFIXES_TABLE} WHERE prefix = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0])[:k] if row else []
+
+    return [
+        word
+        for (word,) in cursor.execute(
+            f"""
+            SELECT word FROM {WORDS_TABLE}
+            WHERE key >= ? AND key < ?
+            ORDER BY weight DESC, LENGTH(word), key, word
+            LIMIT ?
+            """,
+            (key, key + MAX_CHAR, k),
+        )
+    ]
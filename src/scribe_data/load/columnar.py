@@ -0,0 +1,498 @@
+"""
+Columnar Parquet and Arrow IPC (Feather) files of formatted Scribe-Data outputs.
+
+Each column is typed from the values of the data, string columns with few distinct values are dictionary encoded, and files are compressed and written in row groups so that memory use doesn't grow with the size of the data.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    pyarrow_installed = True
+
+except ImportError:
+    pyarrow_installed = False
+
+COLUMNAR_OUTPUT_TYPES = {"parquet": ".parquet", "feather": ".feather"}
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 64 * 1024
+
+# String columns are dictionary encoded if they have at most this many distinct values that are at most half of their values.
+DICTIONARY_MAX_SIZE = 4096
+
+# Keys of the schema metadata that columnar_to_dict restores the shape of the data from.
+SHAPE_METADATA_KEY = b"scribe_data_shape"
+KEY_COLUMN_METADATA_KEY = b"scribe_data_key_column"
+# Columns with mixed or nested values are stored as JSON strings that are marked with this field metadata.
+JSON_ENCODING_METADATA = {b"scribe_data_encoding": b"json"}
+
+
+def check_pyarrow_installed() -> None:
+    """
+    Raises an error with installation instructions if pyarrow isn't installed.
+    """
+    if not pyarrow_installed:
+        raise ImportError(
+            "Parquet and Feather outputs require pyarrow. Please install it with 'pip install scribe-data[columnar]'."
+        )
+
+
+# MARK: Rows
+
+
+def get_shape(first_value) -> str:
+    """
+    Returns the shape of formatted data from the value of its first entry.
+
+    Parameters
+    ----------
+        first_value : Any
+            The value of the first entry of the data.
+
+    Returns
+    -------
+        str
+            'object' for { key: { field: value } }, 'records' for { key: [ { field: value } ] }, 'list' for { key: [value1, value2] } and 'value' for { key: value }.
+    """
+    if isinstance(first_value, dict):
+        return "object"
+
+    if isinstance(first_value, list):
+        if first_value and all(isinstance(item, dict) for item in first_value):
+            return "records"
+
+        return "list"
+
+    return "value"
+
+
+def get_key_column(shape: str, first_value, data_type: str) -> str:
+    """
+    Returns the name of the column of the keys of the data, which matches the header of CSV outputs.
+    """
+    if shape == "records" and "emoji" in first_value[0]:
+        return "word"
+
+    return data_type[:-1]
+
+
+def iter_rows(members: Iterable[tuple], shape: str) -> Iterator[dict]:
+    """
+    Yields the rows of the entries of formatted data, with one row per item of each entry for the 'records' shape.
+
+    Parameters
+    ----------
+        members : Iterable[tuple]
+            The keys and values of the entries.
+
+        shape : str
+            The shape of the data as returned by get_shape.
+
+    Returns
+    -------
+        Iterator[dict]
+            The key of each row under None and its values by column.
+
+    Raises
+    ------
+        ValueError
+            If the value of an entry doesn't have the shape of the data.
+    """
+    for key, value in members:
+        if shape == "object":
+            if not isinstance(value, dict):
+                raise ValueError(
+                    f"The value of '{key}' is not an object as the values of the other entries are."
+                )
+
+            yield {None: key, **value}
+
+        elif shape == "records":
+            if not isinstance(value, list) or not all(
+                isinstance(item, dict) for item in value
+            ):
+                raise ValueError(
+                    f"The value of '{key}' is not a list of objects as the values of the other entries are."
+                )
+
+            for item in value:
+                yield {None: key, **item}
+
+        else:
+            yield {None: key, "value": value}
+
+
+# MARK: Schema
+
+
+class ColumnStats:
+    """
+    The kinds of the values of a column and its distinct strings, which the type of the column is chosen from.
+    """
+
+    def __init__(self) -> None:
+        self.kinds = set()
+        self.n_values = 0
+        self.distinct = set()
+        self.too_many_distinct = False
+
+    def add(self, value) -> None:
+        """
+        Adds a value of the column, with None being a missing value.
+        """
+        if value is None:
+            return
+
+        self.n_values += 1
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            self.kinds.add("str_list")
+
+        else:
+            self.kinds.add(type(value).__name__)
+
+        if isinstance(value, str) and not self.too_many_distinct:
+            self.distinct.add(value)
+            if len(self.distinct) > DICTIONARY_MAX_SIZE:
+                self.too_many_distinct = True
+                self.distinct = set()
+
+    def field(self, name: str) -> "pa.Field":
+        """
+        Returns the Arrow field of the column.
+        """
+        if not self.kinds:
+            return pa.field(name, pa.string())
+
+        if self.kinds == {"bool"}:
+            return pa.field(name, pa.bool_())
+
+        if self.kinds == {"int"}:
+            return pa.field(name, pa.int64())
+
+        if self.kinds <= {"int", "float"}:
+            return pa.field(name, pa.float64())
+
+        if self.kinds == {"str_list"}:
+            return pa.field(name, pa.list_(pa.string()))
+
+        if self.kinds == {"str"}:
+            if not self.too_many_distinct and len(self.distinct) * 2 <= self.n_values:
+                return pa.field(name, pa.dictionary(pa.int32(), pa.string()))
+
+            return pa.field(name, pa.string())
+
+        return pa.field(name, pa.string(), metadata=JSON_ENCODING_METADATA)
+
+
+def infer_schema(rows: Iterable[dict], key_column: str, shape: str) -> tuple:
+    """
+    Returns the schema of rows, with columns in the order that they're first found, and the values of its dictionary encoded columns.
+
+    Parameters
+    ----------
+        rows : Iterable[dict]
+            The rows as returned by iter_rows.
+
+        key_column : str
+            The name of the column of the keys.
+
+        shape : str
+            The shape of the data, which is saved in the metadata of the schema.
+
+    Returns
+    -------
+        schema, dictionaries : pa.Schema, dict
+            The typed fields of the columns and the sorted distinct values of each dictionary encoded column.
+    """
+    stats = {None: ColumnStats()}
+    for row in rows:
+        for column, value in row.items():
+            if column not in stats:
+                stats[column] = ColumnStats()
+
+            stats[column].add(value)
+
+    fields = [
+        stats[column].field(key_column if column is None else column)
+        for column in stats
+    ]
+
+    schema = pa.schema(
+        fields,
+        metadata={
+            SHAPE_METADATA_KEY: shape.encode(),
+            KEY_COLUMN_METADATA_KEY: key_column.encode(),
+        },
+    )
+    # Note: Batches share the dictionaries of their columns, as Arrow IPC files can't replace them.
+    dictionaries = {
+        field.name: pa.array(sorted(column_stats.distinct), type=pa.string())
+        for field, column_stats in zip(fields, stats.values())
+        if pa.types.is_dictionary(field.type)
+    }
+
+    return schema, dictionaries
+
+
+def _column_array(
+    values: list, field: "pa.Field", dictionary: Optional["pa.Array"]
+) -> "pa.Array":
+    """
+    Returns the Arrow array of the values of a column in the type of its field.
+    """
+    if dictionary is not None:
+        indices = pa.compute.index_in(pa.array(values, type=pa.string()), dictionary)
+        return pa.DictionaryArray.from_arrays(indices.cast(pa.int32()), dictionary)
+
+    if field.metadata == JSON_ENCODING_METADATA:
+        values = [
+            None if v is None else json.dumps(v, ensure_ascii=False) for v in values
+        ]
+
+    return pa.array(values, type=field.type)
+
+
+def _record_batch(
+    rows: List[dict], schema: "pa.Schema", dictionaries: dict
+) -> "pa.RecordBatch":
+    """
+    Returns the record batch of rows in the given schema.
+    """
+    # The keys of the rows are under None rather than the name of the key column.
+    columns = [None] + schema.names[1:]
+    return pa.record_batch(
+        [
+            _column_array(
+                [row.get(column) for row in rows],
+                field,
+                dictionaries.get(field.name),
+            )
+            for column, field in zip(columns, schema)
+        ],
+        schema=schema,
+    )
+
+
+def _batches(
+    rows: Iterable[dict], schema: "pa.Schema", dictionaries: dict, batch_size: int
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Yields record batches of rows in the given schema.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield _record_batch(batch, schema, dictionaries)
+            batch = []
+
+    if batch:
+        yield _record_batch(batch, schema, dictionaries)
+
+
+# MARK: Write
+
+
+def write_columnar(
+    open_members: Callable[[], Iterable[tuple]],
+    output_file: Path,
+    data_type: str,
+    output_type: str = "parquet",
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> int:
+    """
+    Writes formatted data to a Parquet or Feather file.
+
+    The data is read twice, first to type its columns and then to write it in row groups.
+
+    Parameters
+    ----------
+        open_members : Callable[[], Iterable[tuple]]
+            A function that returns the keys and values of the entries of the data each time it's called.
+
+        output_file : Path
+            The file to write.
+
+        data_type : str
+            The data type of the data, whose singular is the name of the key column.
+
+        output_type : str (default=parquet)
+            Either 'parquet' or 'feather' for the Arrow IPC file format.
+
+        row_group_size : int (default=ROW_GROUP_SIZE)
+            The number of rows of each row group or record batch.
+
+    Returns
+    -------
+        int
+            The number of rows that were written.
+    """
+    check_pyarrow_installed()
+    if output_type not in COLUMNAR_OUTPUT_TYPES:
+        raise ValueError(
+            f"Unsupported columnar output type '{output_type}'. Must be 'parquet' or 'feather'."
+        )
+
+    members = iter(open_members())
+    first_member = next(members, None)
+    if first_member is None:
+        return 0
+
+    first_value = first_member[1]
+    shape = get_shape(first_value)
+    key_column = get_key_column(shape, first_value, data_type)
+
+    schema, dictionaries = infer_schema(
+        iter_rows(itertools.chain([first_member], members), shape), key_column, shape
+    )
+
+    n_rows = 0
+    tmp_file = output_file.with_name(f"{output_file.name}.partial")
+    if output_type == "parquet":
+        writer = pq.ParquetWriter(
+            str(tmp_file),
+            schema,
+            compression=COMPRESSION,
+            use_dictionary=True,
+            write_statistics=True,
+        )
+
+    else:
+        writer = pa.ipc.new_file(
+            str(tmp_file),
+            schema,
+            options=pa.ipc.IpcWriteOptions(compression=COMPRESSION),
+        )
+
+    completed = False
+    try:
+        for batch in _batches(
+            iter_rows(open_members(), shape),
+            schema,
+            dictionaries,
+            batch_size=row_group_size,
+        ):
+            if output_type == "parquet":
+                writer.write_batch(batch, row_group_size=row_group_size)
+
+            else:
+                writer.write_batch(batch)
+
+            n_rows += batch.num_rows
+
+        completed = True
+
+    finally:
+        writer.close()
+        if not completed:
+            tmp_file.unlink(missing_ok=True)
+
+    # The file is replaced once it's complete so that a failed conversion doesn't leave a partial file.
+    tmp_file.replace(output_file)
+
+    return n_rows
+
+
+# MARK: Read
+
+
+def read_columnar(
+    path: Path, columns: Optional[List[str]] = None, filters=None
+) -> "pa.Table":
+    """
+    Reads a Parquet or Feather file written by write_columnar.
+
+    Parameters
+    ----------
+        path : Path
+            The file to read, with its type found from its suffix.
+
+        columns : list[str] (default=None)
+            The columns to read, with all columns read by default.
+
+        filters : Any (default=None)
+            Filters of Parquet files such as [("gender", "=", "feminine")], which skip row groups using their statistics.
+
+    Returns
+    -------
+        pa.Table
+            The columns of the file.
+    """
+    check_pyarrow_installed()
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pq.read_table(path, columns=columns, filters=filters)
+
+    if filters is not None:
+        raise ValueError("Filters can only be used to read Parquet files.")
+
+    return feather.read_table(path, columns=columns)
+
+
+def columnar_to_dict(table: "pa.Table") -> dict:
+    """
+    Restores the formatted data of a table read by read_columnar.
+
+    Parameters
+    ----------
+        table : pa.Table
+            A table with all of the columns of a file written by write_columnar.
+
+    Returns
+    -------
+        dict
+            The formatted data, with missing values of 'object' data left out of their entries.
+    """
+    metadata = table.schema.metadata or {}
+    shape = metadata.get(SHAPE_METADATA_KEY, b"object").decode()
+    key_column = metadata.get(
+        KEY_COLUMN_METADATA_KEY, table.schema.names[0].encode()
+    ).decode()
+
+    json_columns = {
+        field.name for field in table.schema if field.metadata == JSON_ENCODING_METADATA
+    }
+    value_columns = [c for c in table.schema.names if c != key_column]
+
+    data = {}
+    for row in table.to_pylist():
+        for column in json_columns:
+            if row[column] is not None:
+                row[column] = json.loads(row[column])
+
+        key = row[key_column]
+        if shape == "object":
+            data[key] = {c: row[c] for c in value_columns if row[c] is not None}
+
+        elif shape == "records":
+            data.setdefault(key, []).append({c: row[c] for c in value_columns})
+
+        else:
+            data[key] = row["value"]
+
+    return data
@@ -20,395 +20,1075 @@ Converts all or desired JSON data generated by Scribe-Data into SQLite databases
     -->
 """
 
+import argparse
 import ast
-import json
+import itertools
+import multiprocessing
 import os
+import queue
 import sqlite3
-import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
 
 from tqdm.auto import tqdm
 
+from scribe_data.load import autocomplete_index
+from scribe_data.load.sqlite_sync import (
+    DEFAULT_BATCH_SIZE,
+    Changeset,
+    SyncCounts,
+    TableSync,
+    changeset_path,
+)
+from scribe_data.serializers import find_export_file, parse_export_path, read_data
 from scribe_data.utils import (
     DEFAULT_JSON_EXPORT_DIR,
     DEFAULT_SQLITE_EXPORT_DIR,
+    data_type_metadata,
     get_language_iso,
     list_all_languages,
 )
 
+# Note: Rebuilt databases are written from scratch, so durability is traded for speed while they're written.
+BUILD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -256 * 1024,  # KiB, so 256 MiB
+    "temp_store": "MEMORY",
+}
+
+# Incremental updates change existing databases, so they keep a rollback journal to stay atomic.
+INCREMENTAL_PRAGMAS = {**BUILD_PRAGMAS, "journal_mode": "DELETE"}
+
+
+def connect_for_build(db_path: Path, incremental: bool = False) -> sqlite3.Connection:
+    """
+    Opens a database with the PRAGMAs used while it's being built.
+
+    Parameters
+    ----------
+        db_path : Path
+            The path to the SQLite database.
+
+        incremental : bool (default=False)
+            Whether the existing database is updated rather than rebuilt.
 
-def data_to_sqlite(
-    languages: Optional[List[str]] = None, specific_tables: Optional[List[str]] = None
-) -> None:
-    PATH_TO_SCRIBE_DATA = Path(__file__).parent.parent
-
-    with open(
-        PATH_TO_SCRIBE_DATA / "resources" / "language_metadata.json",
-        encoding="utf-8",
-    ) as f_languages, open(
-        PATH_TO_SCRIBE_DATA / "resources" / "data_type_metadata.json",
-        encoding="utf-8",
-    ) as f_data_types:
-        current_language_data = json.load(f_languages)
-        data_types = json.load(f_data_types).keys()
+    Returns
+    -------
+        sqlite3.Connection
+            The connection to the database.
+    """
+    connection = sqlite3.connect(db_path)
+    pragmas = INCREMENTAL_PRAGMAS if incremental else BUILD_PRAGMAS
+    for pragma, value in pragmas.items():
+        connection.execute(f"PRAGMA {pragma} = {value}")
+
+    return connection
+
+
+def insert_rows(
+    cursor: sqlite3.Cursor,
+    table: str,
+    rows: Iterable[Sequence],
+    n_cols: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Inserts rows into a table in batches, ignoring rows whose first value is already present.
+
+    Parameters
+    ----------
+        cursor : sqlite3.Cursor
+            The cursor of the database, whose transaction should be committed by the caller.
+
+        table : str
+            The name of the table to insert into.
+
+        rows : Iterable[Sequence]
+            The values of each row, which can be a generator so that rows are only created as they're inserted.
+
+        n_cols : int
+            The number of columns of the table.
+
+        batch_size : int (default=DEFAULT_BATCH_SIZE)
+            The number of rows that are passed to executemany at once.
+
+    Returns
+    -------
+        int
+            The number of rows that were passed.
+    """
+    insert_question_marks = ", ".join(["?"] * n_cols)
+    sql = f"INSERT OR IGNORE INTO {table} values({insert_question_marks})"
+
+    rows = iter(rows)
+    n_rows = 0
+    while batch := list(itertools.islice(rows, batch_size)):
+        cursor.executemany(sql, batch)
+        n_rows += len(batch)
+
+    return n_rows
+
+
+def finalize_database(connection: sqlite3.Connection, vacuum: bool = True) -> None:
+    """
+    Commits a built database and gathers statistics and compacts it for the apps.
+
+    Parameters
+    ----------
+        connection : sqlite3.Connection
+            The connection to the database.
+
+        vacuum : bool (default=True)
+            Whether to rewrite the database to compact it, which incremental updates skip to keep I/O low.
+    """
+    connection.commit()
+    connection.execute("ANALYZE")
+    if vacuum:
+        connection.execute("VACUUM")
+
+
+def create_table_sql(data_type: str, cols: List[str]) -> str:
+    """
+    Returns the statement that creates a table given a data type for its title and column names.
+    """
+    return f"CREATE TABLE IF NOT EXISTS {data_type} ({' Text, '.join(cols)} Text, UNIQUE({cols[0]}))"
+
+
+def create_table(cursor: sqlite3.Cursor, data_type: str, cols: List[str]) -> None:
+    """
+    Creates a table in a database given a data type for its title and column names.
+
+    Parameters
+    ----------
+        cursor : sqlite3.Cursor
+            The cursor of the database.
+
+        data_type : str
+            The name of the table to be created.
+
+        cols : list of strings
+            The names of columns for the new table.
+    """
+    cursor.execute(create_table_sql(data_type=data_type, cols=cols))
+
+
+class TableRebuild:
+    """
+    Replaces the contents of a table, which is used when databases are rebuilt from scratch.
+    """
+
+    def __init__(
+        self,
+        cursor: sqlite3.Cursor,
+        table: str,
+        cols: List[str],
+        create_statement: Optional[str] = None,
+    ) -> None:
+        self.cursor = cursor
+        self.table = table
+        self.cols = cols
+        self.counts = SyncCounts()
+        cursor.execute(create_statement or create_table_sql(data_type=table, cols=cols))
+        cursor.execute(f"DELETE FROM {table}")  # clear existing data
+
+    def add(self, rows: Iterable[Sequence]) -> None:
+        self.counts.inserted += insert_rows(
+            cursor=self.cursor, table=self.table, rows=rows, n_cols=len(self.cols)
+        )
 
-    # TODO: Switch to all languages.
-    current_languages = list_all_languages(current_language_data)
-    current_languages = [
-        "english",
-        "french",
-        "german",
-        "italian",
-        "portuguese",
-        "russian",
-        "spanish",
-        "swedish",
-    ]
+    def finish(self) -> SyncCounts:
+        return self.counts
+
+
+def table_writer(
+    cursor: sqlite3.Cursor,
+    table: str,
+    cols: List[str],
+    changeset: Optional[Changeset] = None,
+    create_statement: Optional[str] = None,
+):
+    """
+    Returns the writer that sets the rows of a table, which updates it incrementally if there's a changeset to record changes in.
+
+    Parameters
+    ----------
+        cursor : sqlite3.Cursor
+            The cursor of the database.
+
+        table : str
+            The name of the table.
+
+        cols : list of strings
+            The names of the columns of the table.
+
+        changeset : Changeset (default=None)
+            The changeset of an incremental update, with None rebuilding the table.
+
+        create_statement : str (default=None)
+            The statement that creates the table, with None creating Text columns that are unique by the first.
+
+    Returns
+    -------
+        TableSync or TableRebuild
+            An object whose add method takes rows and whose finish method returns the counts of changes.
+    """
+    create_statement = create_statement or create_table_sql(data_type=table, cols=cols)
+    if changeset is None:
+        return TableRebuild(
+            cursor=cursor, table=table, cols=cols, create_statement=create_statement
+        )
 
-    if not languages:
-        languages = current_languages
+    return TableSync(
+        cursor=cursor,
+        table=table,
+        cols=cols,
+        create_statement=create_statement,
+        changeset=changeset,
+    )
 
-    elif isinstance(languages, str):
-        languages = languages.lower()
 
-    elif isinstance(languages, list):
-        languages = [lang.lower() for lang in languages]
+def remove_existing(db_path: Path) -> str:
+    """
+    Removes a database that's about to be rebuilt.
 
-    if not set(languages).issubset(current_languages):
-        raise ValueError(
-            f"Invalid language(s) specified. Available languages are: {', '.join(current_languages)}"
+    Returns
+    -------
+        str
+            "over" if a database was removed for the output messages and otherwise "".
+    """
+    if db_path.exists():
+        os.remove(db_path)
+        return "over"
+
+    return ""
+
+
+def print_report(message: str, step: bool = False) -> None:
+    """
+    Prints a progress message, which is the default for reporting while databases are built.
+    """
+    print(message)
+
+
+# MARK: Translations
+
+# Sent to write_translations in place of the end of the messages when building the databases fails.
+ABORT_MESSAGE = ("abort", None, None)
+
+
+def translation_messages(
+    lang: str,
+    current_languages: List[str],
+    report: Callable = print_report,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[tuple]:
+    """
+    Yields the table definition and batches of rows of a language's translations for write_translations.
+
+    Parameters
+    ----------
+        lang : str
+            The language whose translations.json is read.
+
+        current_languages : list of strings
+            The languages that translations are saved for.
+
+        report : Callable (default=print_report)
+            Receives progress messages.
+
+        batch_size : int (default=DEFAULT_BATCH_SIZE)
+            The number of rows per batch.
+
+    Returns
+    -------
+        Iterator[tuple]
+            ("create", lang, cols), then ("rows", lang, batch) for each batch and finally ("done", lang, None).
+    """
+    report(f"Creating/Updating {lang} translations table...")
+    json_file_path = find_export_file(
+        Path(DEFAULT_JSON_EXPORT_DIR) / lang, "translations"
+    )
+
+    if json_file_path is None:
+        report(
+            f"Skipping {lang} translations table creation as JSON file not found.",
+            step=True,
         )
+        return
 
-    # Prepare data types to process.
-    language_data_type_dict = {
-        lang: [
-            f.split(".json")[0]
-            for f in os.listdir(Path(DEFAULT_JSON_EXPORT_DIR) / lang)
-            if f.split(".json")[0] in (specific_tables or data_types)
-        ]
-        for lang in languages
-    }
+    json_data = read_data(json_file_path)
 
-    if specific_tables and "autocomplete_lexicon" in specific_tables:
-        for lang in language_data_type_dict:
-            if "autocomplete_lexicon" not in language_data_type_dict[lang]:
-                language_data_type_dict[lang].append("autocomplete_lexicon")
+    target_cols = [
+        get_language_iso(language) for language in current_languages if language != lang
+    ]
+    cols = ["word"] + target_cols
+    yield "create", lang, cols
 
-    print(
-        f"Creating/Updating SQLite databases for the following languages: {', '.join(languages)}"
+    rows = iter(
+        [row] + [json_data[row][col_name] for col_name in cols[1:]] for row in json_data
     )
-    if specific_tables:
-        print(f"Updating only the following tables: {', '.join(specific_tables)}")
+    while batch := list(itertools.islice(rows, batch_size)):
+        yield "rows", lang, batch
 
-    def create_table(data_type, cols):
-        """
-        Creates a table in the language database given a data type for its title and column names.
+    yield "done", lang, None
 
-        Parameters
-        ----------
-            data_type : str
-                The name of the table to be created
 
-            cols : list of strings
-                The names of columns for the new table
-        """
-        cursor.execute(
-            f"CREATE TABLE IF NOT EXISTS {data_type} ({' Text, '.join(cols)} Text, UNIQUE({cols[0]}))"
+def write_translations(
+    messages: Iterable[tuple],
+    db_path: Path,
+    report: Callable = print_report,
+    incremental: bool = False,
+) -> None:
+    """
+    Writes the translations database from the messages of translation_messages.
+
+    Parameters
+    ----------
+        messages : Iterable[tuple]
+            The messages of all languages, where those of different languages can be interleaved and ABORT_MESSAGE stops the update without saving it.
+
+        db_path : Path
+            The path to the translations database.
+
+        report : Callable (default=print_report)
+            Receives progress messages.
+
+        incremental : bool (default=False)
+            Whether to apply only changed rows to the existing database in one transaction and record them in a changeset.
+    """
+    if incremental:
+        changeset = Changeset(changeset_path(db_path))
+        report("Database for translations opened for an incremental update.")
+
+    else:
+        changeset = None
+        maybe_over = remove_existing(db_path)  # output string formatting variable
+        report(f"Database for translations {maybe_over}written and connection made.")
+
+    connection = connect_for_build(db_path, incremental=incremental)
+    cursor = connection.cursor()
+
+    try:
+        writers = {}
+        for kind, lang, payload in messages:
+            if kind == "abort":
+                raise RuntimeError(
+                    "The translations database wasn't updated as building the language databases failed."
+                )
+
+            if kind == "create":
+                writers[lang] = table_writer(
+                    cursor=cursor, table=lang, cols=payload, changeset=changeset
+                )
+
+            elif kind == "rows":
+                writers[lang].add(payload)
+
+            elif kind == "done":
+                counts = writers.pop(lang).finish()
+                if incremental:
+                    report(f"{lang} translations table: {counts}.", step=True)
+                    continue
+
+                try:
+                    connection.commit()
+                    report(
+                        f"{lang} translations table created/updated successfully.\n",
+                        step=True,
+                    )
+
+                except sqlite3.Error as e:
+                    report(
+                        f"Error creating/updating {lang} translations table: {e}",
+                        step=True,
+                    )
+
+        finalize_database(connection, vacuum=not incremental)
+
+    except BaseException:
+        if changeset is not None:
+            changeset.discard()
+
+        raise
+
+    finally:
+        connection.close()
+
+    if changeset is not None:
+        changeset.close()
+
+    report("Translations database processing completed.")
+
+
+# MARK: Language Databases
+
+
+def build_language_database(
+    lang: str,
+    data_types: List[str],
+    specific_tables: Optional[List[str]] = None,
+    report: Callable = print_report,
+    incremental: bool = False,
+) -> None:
+    """
+    Builds the database of a language from its JSON data.
+
+    Parameters
+    ----------
+        lang : str
+            The language to build the database for.
+
+        data_types : list of strings
+            The data types with JSON files that should be added as tables.
+
+        specific_tables : list of strings (default=None)
+            The tables that are being updated, with None updating all of them.
+
+        report : Callable (default=print_report)
+            Receives progress messages.
+
+        incremental : bool (default=False)
+            Whether to apply only changed rows to the existing database in one transaction and record them in a changeset.
+    """
+    if data_types == []:
+        report(
+            f"Skipping {lang} database creation/update as no relevant JSON data files were found.",
+            step=True,
         )
+        return
+
+    db_path = (
+        Path(DEFAULT_SQLITE_EXPORT_DIR)
+        / f"{get_language_iso(lang).upper()}LanguageData.sqlite"
+    )
+    if incremental:
+        changeset = Changeset(changeset_path(db_path))
+        report(f"Database for {lang} opened for an incremental update.")
+
+    else:
+        changeset = None
+        maybe_over = remove_existing(db_path)  # output string formatting variable
+        report(f"Database for {lang} {maybe_over}written and connection made.")
+
+    connection = connect_for_build(db_path, incremental=incremental)
+    try:
+        _fill_language_database(
+            lang=lang,
+            data_types=data_types,
+            specific_tables=specific_tables,
+            connection=connection,
+            changeset=changeset,
+            report=report,
+        )
+        finalize_database(connection, vacuum=not incremental)
+
+    except BaseException:
+        if changeset is not None:
+            changeset.discard()
 
-    def table_insert(data_type, keys):
+        raise
+
+    finally:
+        connection.close()
+
+    if changeset is not None:
+        changeset.close()
+
+    report(f"{lang} database processing completed.", step=True)
+
+
+def _fill_language_database(
+    lang: str,
+    data_types: List[str],
+    specific_tables: Optional[List[str]],
+    connection: sqlite3.Connection,
+    changeset: Optional[Changeset],
+    report: Callable,
+) -> None:
+    """
+    Sets the tables of a language database, committing after each table unless it's an incremental update.
+    """
+    cursor = connection.cursor()
+
+    def commit():
+        # Incremental updates are applied in a single transaction that's committed once all tables are set.
+        if changeset is None:
+            connection.commit()
+
+    def table_insert(data_type, cols, rows, create_statement=None):
         """
-        Inserts a row into a language database table.
+        Sets the rows of a language database table.
 
         Parameters
         ----------
             data_type : str
                 The name of the table to be inserted into
 
-            keys : list of strings
-                The values to be inserted into the table row
+            cols : list of strings
+                The names of the columns of the table
+
+            rows : iterable of lists
+                The values of each row to be inserted
+
+            create_statement : str (default=None)
+                The statement that creates the table if its columns aren't all Text
         """
-        insert_question_marks = ", ".join(["?"] * len(keys))
-        cursor.execute(
-            f"INSERT OR IGNORE INTO {data_type} values({insert_question_marks})",
-            keys,
+        writer = table_writer(
+            cursor=cursor,
+            table=data_type,
+            cols=cols,
+            changeset=changeset,
+            create_statement=create_statement,
         )
+        writer.add(rows)
+        counts = writer.finish()
+        if changeset is not None:
+            report(f"{lang} {data_type} table: {counts}.")
 
-    maybe_over = ""  # output string formatting variable (see below)
-    if (Path(DEFAULT_SQLITE_EXPORT_DIR) / "TranslationData.sqlite").exists():
-        os.remove(Path(DEFAULT_SQLITE_EXPORT_DIR) / "TranslationData.sqlite")
-        maybe_over = "over"
+    for dt in data_types:
+        if dt == "autocomplete_lexicon":
+            continue  # handled separately
 
-    connection = sqlite3.connect(
-        Path(DEFAULT_SQLITE_EXPORT_DIR) / "TranslationData.sqlite"
-    )
-    cursor = connection.cursor()
+        report(f"Creating/Updating {lang} {dt} table...")
+        json_file_path = find_export_file(Path(DEFAULT_JSON_EXPORT_DIR) / lang, dt)
 
-    print(f"Database for translations {maybe_over}written and connection made.")
+        if json_file_path is None:
+            report(f"Skipping {lang} {dt} table creation as JSON file not found.")
+            continue
 
-    for lang in tqdm(
-        language_data_type_dict,
-        desc="Tables added",
-        unit="tables",
-    ):
-        print(f"Creating/Updating {lang} translations table...")
-        json_file_path = Path(DEFAULT_JSON_EXPORT_DIR) / lang / "translations.json"
+        json_data = read_data(json_file_path)
 
-        if not json_file_path.exists():
-            print(
-                f"Skipping {lang} translations table creation as JSON file not found."
+        if dt == "nouns":
+            cols = ["noun", "plural", "form"]
+            rows = (
+                [row, json_data[row]["plural"], json_data[row]["form"]]
+                for row in json_data
+            )
+            if "Scribe" not in json_data and lang != "Russian":
+                rows = itertools.chain(rows, [["Scribe", "Scribes", ""]])
+
+            table_insert(data_type=dt, cols=cols, rows=rows)
+
+        elif dt == "verbs":
+            cols = ["verb"]
+            cols += json_data[list(json_data.keys())[0]].keys()
+            table_insert(
+                data_type=dt,
+                cols=cols,
+                rows=(
+                    [row] + [json_data[row][col_name] for col_name in cols[1:]]
+                    for row in json_data
+                ),
             )
-            continue
 
-        with open(json_file_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-
-        target_cols = [
-            get_language_iso(language)
-            for language in current_languages
-            if language != lang
-        ]
-        cols = ["word"] + target_cols
-        create_table(data_type=lang, cols=cols)
-        cursor.execute(f"DELETE FROM {lang}")  # clear existing data
-        for row in json_data:
-            keys = [row]
-            keys += [json_data[row][col_name] for col_name in cols[1:]]
-            table_insert(data_type=lang, keys=keys)
+        elif dt == "prepositions":
+            cols = ["preposition", "form"]
+            table_insert(
+                data_type=dt,
+                cols=cols,
+                rows=([row, json_data[row]] for row in json_data),
+            )
 
-        try:
-            connection.commit()
-            print(f"{lang} translations table created/updated successfully.\n")
+        elif dt in ["autosuggestions", "emoji_keywords"]:
+            cols = ["word"] + [f"{dt[:-1]}_{i}" for i in range(3)]
+
+            def suggestion_rows(json_data, dt, n_cols):
+                for row in json_data:
+                    keys = [row]
+                    if dt == "autosuggestions":
+                        keys += [json_data[row][i] for i in range(len(json_data[row]))]
+                    else:  # emoji_keywords
+                        keys += [
+                            json_data[row][i]["emoji"]
+                            for i in range(len(json_data[row]))
+                        ]
+                    keys += [""] * (n_cols - len(keys))
+                    yield keys
+
+            table_insert(
+                data_type=dt,
+                cols=cols,
+                rows=suggestion_rows(json_data=json_data, dt=dt, n_cols=len(cols)),
+            )
 
-        except sqlite3.Error as e:
-            print(f"Error creating/updating {lang} translations table: {e}")
-
-    connection.close()
-    print("Translations database processing completed.")
-
-    for lang in tqdm(
-        language_data_type_dict,
-        desc="Databases created",
-        unit="dbs",
-    ):
-        if language_data_type_dict[lang] != []:
-            maybe_over = ""  # output string formatting variable (see below)
-            if (
-                Path(DEFAULT_SQLITE_EXPORT_DIR)
-                / f"{get_language_iso(lang).upper()}LanguageData.sqlite"
-            ).exists():
-                os.remove(
-                    Path(DEFAULT_SQLITE_EXPORT_DIR)
-                    / f"{get_language_iso(lang).upper()}LanguageData.sqlite"
-                )
-                maybe_over = "over"
+        commit()
 
-            connection = sqlite3.connect(
-                Path(DEFAULT_SQLITE_EXPORT_DIR)
-                / f"{get_language_iso(lang).upper()}LanguageData.sqlite"
-            )
-            cursor = connection.cursor()
-            print(f"Database for {lang} {maybe_over}written and connection made.")
+    # Handle autocomplete_lexicon separately.
+    if (not specific_tables or "autocomplete_lexicon" in specific_tables) and {
+        "nouns",
+        "prepositions",
+        "autosuggestions",
+        "emoji_keywords",
+    }.issubset(set(data_types + (specific_tables or []))):
+        report(f"Creating/Updating {lang} autocomplete_lexicon table...")
+        cols = ["word"]
 
-            for dt in language_data_type_dict[lang]:
-                if dt == "autocomplete_lexicon":
-                    continue  # handled separately
+        lexicon_query = """
+        WITH full_lexicon AS (
+            SELECT
+                noun AS word
 
-                print(f"Creating/Updating {lang} {dt} table...")
-                json_file_path = Path(DEFAULT_JSON_EXPORT_DIR) / lang / f"{dt}.json"
+            FROM
+                nouns
 
-                if not json_file_path.exists():
-                    print(
-                        f"Skipping {lang} {dt} table creation as JSON file not found."
-                    )
-                    continue
+            WHERE
+                LENGTH(noun) > 2
 
-                with open(json_file_path, "r", encoding="utf-8") as f:
-                    json_data = json.load(f)
+            UNION
 
-                if dt == "nouns":
-                    cols = ["noun", "plural", "form"]
-                    create_table(data_type=dt, cols=cols)
-                    cursor.execute(f"DELETE FROM {dt}")  # clear existing data
-                    for row in json_data:
-                        keys = [row, json_data[row]["plural"], json_data[row]["form"]]
-                        table_insert(data_type=dt, keys=keys)
+            SELECT
+                preposition AS word
 
-                    if "Scribe" not in json_data and lang != "Russian":
-                        table_insert(data_type=dt, keys=["Scribe", "Scribes", ""])
+            FROM
+                prepositions
 
-                    connection.commit()
+            WHERE
+                LENGTH(preposition) > 2
+
+            UNION
+
+            SELECT DISTINCT
+                -- For autosuggestion keys we want lower case versions.
+                -- The SELECT DISTINCT cases later will make sure that nouns are appropriately selected.
+                LOWER(word) AS word
+
+            FROM
+                autosuggestions
+
+            WHERE
+                LENGTH(word) > 2
+
+            UNION
+
+            SELECT
+                word AS word
+
+            FROM
+                emoji_keywords
+        )
+
+        SELECT DISTINCT
+            -- Select an upper case noun if it's available.
+            CASE
+                WHEN
+                    UPPER(SUBSTR(lex.word, 1, 1)) || SUBSTR(lex.word, 2) = nouns_cap.noun
+
+                THEN
+                    nouns_cap.noun
+
+                WHEN
+                    UPPER(lex.word) = nouns_upper.noun
+
+                THEN
+                    nouns_upper.noun
+
+                ELSE
+                    lex.word
+
+            END
+
+        FROM
+            full_lexicon AS lex
+
+        LEFT JOIN
+            nouns AS nouns_cap
+
+        ON
+            UPPER(SUBSTR(lex.word, 1, 1)) || SUBSTR(lex.word, 2) = nouns_cap.noun
+
+        LEFT JOIN
+            nouns AS nouns_upper
+
+        ON
+            UPPER(lex.word) = nouns_upper.noun
+
+        WHERE
+            LENGTH(lex.word) > 1
+            AND lex.word NOT LIKE '%-%'
+            AND lex.word NOT LIKE '%/%'
+            AND lex.word NOT LIKE '%(%'
+            AND lex.word NOT LIKE '%)%'
+            AND lex.word NOT LIKE '%"%'
+            AND lex.word NOT LIKE '%“%'
+            AND lex.word NOT LIKE '%„%'
+            AND lex.word NOT LIKE '%”%'
+            AND lex.word NOT LIKE "%'%"
+        """
 
-                elif dt == "verbs":
-                    cols = ["verb"] if dt == "verbs" else ["word"]
-                    cols += json_data[list(json_data.keys())[0]].keys()
-                    create_table(data_type=dt, cols=cols)
-                    cursor.execute(f"DELETE FROM {dt}")  # clear existing data
-                    for row in json_data:
-                        keys = [row]
-                        keys += [json_data[row][col_name] for col_name in cols[1:]]
-                        table_insert(data_type=dt, keys=keys)
-
-                elif dt == "prepositions":
-                    cols = ["preposition", "form"]
-                    create_table(data_type=dt, cols=cols)
-                    cursor.execute(f"DELETE FROM {dt}")  # clear existing data
-                    for row in json_data:
-                        keys = [row, json_data[row]]
-                        table_insert(data_type=dt, keys=keys)
-
-                elif dt in ["autosuggestions", "emoji_keywords"]:
-                    cols = ["word"] + [f"{dt[:-1]}_{i}" for i in range(3)]
-                    create_table(data_type=dt, cols=cols)
-                    cursor.execute(f"DELETE FROM {dt}")  # clear existing data
-                    for row in json_data:
-                        keys = [row]
-                        if dt == "autosuggestions":
-                            keys += [
-                                json_data[row][i] for i in range(len(json_data[row]))
-                            ]
-                        else:  # emoji_keywords
-                            keys += [
-                                json_data[row][i]["emoji"]
-                                for i in range(len(json_data[row]))
-                            ]
-                        keys += [""] * (len(cols) - len(keys))
-                        table_insert(data_type=dt, keys=keys)
-
-                connection.commit()
-
-            # Handle autocomplete_lexicon separately.
-            if (not specific_tables or "autocomplete_lexicon" in specific_tables) and {
-                "nouns",
-                "prepositions",
-                "autosuggestions",
-                "emoji_keywords",
-            }.issubset(set(language_data_type_dict[lang] + (specific_tables or []))):
-                print(f"Creating/Updating {lang} autocomplete_lexicon table...")
-                cols = ["word"]
-                create_table(data_type="autocomplete_lexicon", cols=cols)
+        try:
+            if changeset is None:
+                create_table(cursor=cursor, data_type="autocomplete_lexicon", cols=cols)
                 cursor.execute(
                     "DELETE FROM autocomplete_lexicon"
                 )  # clear existing data
+                cursor.execute(
+                    f"INSERT INTO autocomplete_lexicon (word)\n{lexicon_query}"
+                )
 
-                sql_query = """
-                INSERT INTO
-                    autocomplete_lexicon (word)
+            else:
+                table_insert(
+                    data_type="autocomplete_lexicon",
+                    cols=cols,
+                    rows=cursor.execute(lexicon_query).fetchall(),
+                )
 
-                WITH full_lexicon AS (
-                    SELECT
-                        noun AS word
+            commit()
+            report(f"{lang} autocomplete_lexicon table created/updated successfully.")
 
-                    FROM
-                        nouns
+        except sqlite3.Error as e:
+            report(f"Error creating/updating autocomplete_lexicon table: {e}")
+            return
+
+        # MARK: Prefix Index
+
+        report(f"Creating/Updating {lang} autocomplete prefix index...")
+        weights = autocomplete_index.word_weights(cursor)
+        ranked_words = autocomplete_index.rank_words(
+            (
+                word
+                for (word,) in cursor.execute("SELECT word FROM autocomplete_lexicon")
+            ),
+            weights=weights,
+        )
+        table_insert(
+            data_type=autocomplete_index.WORDS_TABLE,
+            cols=autocomplete_index.WORDS_COLS,
+            rows=autocomplete_index.word_rows(ranked_words, weights=weights),
+            create_statement=autocomplete_index.WORDS_CREATE,
+        )
+        cursor.execute(autocomplete_index.WORDS_INDEX)
+        if changeset is not None:
+            changeset.write(autocomplete_index.WORDS_INDEX)
+
+        table_insert(
+            data_type=autocomplete_index.PREFIXES_TABLE,
+            cols=autocomplete_index.PREFIXES_COLS,
+            rows=autocomplete_index.prefix_rows(ranked_words),
+            create_statement=autocomplete_index.PREFIXES_CREATE,
+        )
+        commit()
+        report(f"{lang} autocomplete prefix index created/updated successfully.")
 
-                    WHERE
-                        LENGTH(noun) > 2
 
-                    UNION
+# MARK: Workers
 
-                    SELECT
-                        preposition AS word
 
-                    FROM
-                        prepositions
+# How often a worker waiting for space in the translation queue checks whether the writer process has failed.
+WRITER_CHECK_SECONDS = 1.0
 
-                    WHERE
-                        LENGTH(preposition) > 2
+_progress_queue = None
+_translation_queue = None
+_writer_failed = None
 
-                    UNION
 
-                    SELECT DISTINCT
-                        -- For autosuggestion keys we want lower case versions.
-                        -- The SELECT DISTINCT cases later will make sure that nouns are appropriately selected.
-                        LOWER(word) AS word
+def _queue_report(message: str, step: bool = False) -> None:
+    _progress_queue.put((message, step))
 
-                    FROM
-                        autosuggestions
 
-                    WHERE
-                        LENGTH(word) > 2
+def _init_worker(progress_queue, translation_queue, writer_failed=None) -> None:
+    global _progress_queue, _translation_queue, _writer_failed
+    _progress_queue = progress_queue
+    _translation_queue = translation_queue
+    _writer_failed = writer_failed
 
-                    UNION
 
-                    SELECT
-                        word AS word
+def _send_translations(message) -> None:
+    """
+    Puts a message on the translation queue, giving up if the writer process fails so that a full queue doesn't block the worker forever.
+    """
+    while True:
+        try:
+            _translation_queue.put(message, timeout=WRITER_CHECK_SECONDS)
+            return
+
+        except queue.Full:
+            if _writer_failed is not None and _writer_failed.is_set():
+                # Messages that can't be sent anymore mustn't stop the worker from exiting.
+                _translation_queue.cancel_join_thread()
+                raise RuntimeError(
+                    "The translations database writer process failed."
+                ) from None
+
+
+def _build_language(
+    lang: str,
+    data_types: List[str],
+    specific_tables: Optional[List[str]],
+    current_languages: List[str],
+    incremental: bool,
+) -> None:
+    """
+    Sends a language's translations to the writer process and then builds its database.
+    """
+    for message in translation_messages(lang, current_languages, report=_queue_report):
+        _send_translations(message)
+
+    build_language_database(
+        lang,
+        data_types,
+        specific_tables,
+        report=_queue_report,
+        incremental=incremental,
+    )
 
-                    FROM
-                        emoji_keywords
-                )
 
-                SELECT DISTINCT
-                    -- Select an upper case noun if it's available.
-                    CASE
-                        WHEN
-                            UPPER(SUBSTR(lex.word, 1, 1)) || SUBSTR(lex.word, 2) = nouns_cap.noun
+def _write_translations_from_queue(
+    translation_queue, progress_queue, db_path, incremental
+) -> None:
+    _init_worker(progress_queue, translation_queue)
+    write_translations(
+        iter(translation_queue.get, None),
+        db_path=db_path,
+        report=_queue_report,
+        incremental=incremental,
+    )
 
-                        THEN
-                            nouns_cap.noun
 
-                        WHEN
-                            UPPER(lex.word) = nouns_upper.noun
+def data_to_sqlite(
+    languages: Optional[List[str]] = None,
+    specific_tables: Optional[List[str]] = None,
+    jobs: int = 1,
+    incremental: bool = False,
+) -> None:
+    """
+    Converts the JSON data of languages into their SQLite databases and the shared translations database.
 
-                        THEN
-                            nouns_upper.noun
+    Parameters
+    ----------
+        languages : list of strings (default=None)
+            A subset of Scribe's languages that the user wants to update.
 
-                        ELSE
-                            lex.word
+        specific_tables : list of strings (default=None)
+            The tables that should be updated, with None updating all of them.
 
-                    END
+        jobs : int (default=1)
+            The number of processes that build language databases at the same time, with translations written by a separate process if more than one.
 
-                FROM
-                    full_lexicon AS lex
+        incremental : bool (default=False)
+            Whether to update existing databases with only the rows that changed, recording them in a changeset next to each database.
+    """
+    data_types = data_type_metadata.keys()
 
-                LEFT JOIN
-                    nouns AS nouns_cap
+    # TODO: Switch to all languages.
+    current_languages = list_all_languages()
+    current_languages = [
+        "english",
+        "french",
+        "german",
+        "italian",
+        "portuguese",
+        "russian",
+        "spanish",
+        "swedish",
+    ]
 
-                ON
-                    UPPER(SUBSTR(lex.word, 1, 1)) || SUBSTR(lex.word, 2) = nouns_cap.noun
+    if not languages:
+        languages = current_languages
 
-                LEFT JOIN
-                    nouns AS nouns_upper
+    elif isinstance(languages, str):
+        languages = languages.lower()
 
-                ON
-                    UPPER(lex.word) = nouns_upper.noun
+    elif isinstance(languages, list):
+        languages = [lang.lower() for lang in languages]
 
-                WHERE
-                    LENGTH(lex.word) > 1
-                    AND lex.word NOT LIKE '%-%'
-                    AND lex.word NOT LIKE '%/%'
-                    AND lex.word NOT LIKE '%(%'
-                    AND lex.word NOT LIKE '%)%'
-                    AND lex.word NOT LIKE '%"%'
-                    AND lex.word NOT LIKE '%“%'
-                    AND lex.word NOT LIKE '%„%'
-                    AND lex.word NOT LIKE '%”%'
-                    AND lex.word NOT LIKE "%'%"
-                """
+    if not set(languages).issubset(current_languages):
+        raise ValueError(
+            f"Invalid language(s) specified. Available languages are: {', '.join(current_languages)}"
+        )
 
-                try:
-                    cursor.execute(sql_query)
-                    connection.commit()
-                    print(
-                        f"{lang} autocomplete_lexicon table created/updated successfully."
-                    )
+    # Prepare data types to process, which can be exported in any format.
+    language_data_type_dict = {
+        lang: list(
+            dict.fromkeys(
+                parsed[0]
+                for f in os.listdir(Path(DEFAULT_JSON_EXPORT_DIR) / lang)
+                if (parsed := parse_export_path(Path(f)))
+                and parsed[0] in (specific_tables or data_types)
+            )
+        )
+        for lang in languages
+    }
 
-                except sqlite3.Error as e:
-                    print(f"Error creating/updating autocomplete_lexicon table: {e}")
+    if specific_tables and "autocomplete_lexicon" in specific_tables:
+        for lang in language_data_type_dict:
+            if "autocomplete_lexicon" not in language_data_type_dict[lang]:
+                language_data_type_dict[lang].append("autocomplete_lexicon")
+
+    print(
+        f"Creating/Updating SQLite databases for the following languages: {', '.join(languages)}"
+    )
+    if specific_tables:
+        print(f"Updating only the following tables: {', '.join(specific_tables)}")
+
+    translations_db_path = Path(DEFAULT_SQLITE_EXPORT_DIR) / "TranslationData.sqlite"
+    jobs = max(1, min(jobs or 1, len(language_data_type_dict)))
+
+    # MARK: Serial
+
+    if jobs == 1:
+        with tqdm(
+            total=2 * len(language_data_type_dict), desc="Databases built", unit="steps"
+        ) as progress_bar:
 
-            connection.close()
-            print(f"{lang} database processing completed.")
-        else:
-            print(
-                f"Skipping {lang} database creation/update as no relevant JSON data files were found."
+            def report(message: str, step: bool = False) -> None:
+                tqdm.write(message)
+                progress_bar.update(step)
+
+            write_translations(
+                itertools.chain.from_iterable(
+                    translation_messages(lang, current_languages, report=report)
+                    for lang in language_data_type_dict
+                ),
+                db_path=translations_db_path,
+                report=report,
+                incremental=incremental,
             )
 
+            for lang, data_types_to_build in language_data_type_dict.items():
+                build_language_database(
+                    lang,
+                    data_types_to_build,
+                    specific_tables,
+                    report=report,
+                    incremental=incremental,
+                )
+
+        print("Database creation/update process completed.")
+        return
+
+    # MARK: Parallel
+
+    # Language databases are independent, while translations are sent to a single writer as SQLite allows one writer per database.
+    context = multiprocessing.get_context()
+    progress_queue = context.Queue()
+    translation_queue = context.Queue(maxsize=4 * jobs)
+    writer_failed = context.Event()
+    writer = context.Process(
+        target=_write_translations_from_queue,
+        args=(translation_queue, progress_queue, translations_db_path, incremental),
+        name="translations-writer",
+    )
+    writer.start()
+
+    with tqdm(
+        total=2 * len(language_data_type_dict), desc="Databases built", unit="steps"
+    ) as progress_bar:
+
+        def drain(timeout: float) -> None:
+            """
+            Shows the messages that the processes have reported so far.
+            """
+            try:
+                message, step = progress_queue.get(timeout=timeout)
+                while True:
+                    tqdm.write(message)
+                    progress_bar.update(step)
+                    message, step = progress_queue.get_nowait()
+
+            except queue.Empty:
+                pass
+
+        def check_writer() -> None:
+            """
+            Raises an error if the writer process has failed, letting workers that wait on it know.
+            """
+            if writer.exitcode not in (None, 0):
+                writer_failed.set()
+                raise RuntimeError("The translations database writer process failed.")
+
+        failed = True
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(progress_queue, translation_queue, writer_failed),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _build_language,
+                        lang,
+                        data_types_to_build,
+                        specific_tables,
+                        current_languages,
+                        incremental,
+                    )
+                    for lang, data_types_to_build in language_data_type_dict.items()
+                ]
+                try:
+                    while not all(f.done() for f in futures):
+                        drain(timeout=0.1)
+                        check_writer()
+
+                    for future in futures:
+                        future.result()
+
+                except BaseException:
+                    # Languages that haven't started are cancelled, while running ones stop once they see that the writer failed.
+                    executor.shutdown(cancel_futures=True)
+                    raise
+
+            failed = False
+
+        finally:
+            # The writer rolls back an incremental update if any language failed so that the translations are never partly updated.
+            end_message = ABORT_MESSAGE if failed else None
+            while writer.is_alive():
+                try:
+                    translation_queue.put(end_message, timeout=WRITER_CHECK_SECONDS)
+                    break
+
+                except queue.Full:
+                    drain(timeout=0)
+
+            # Waiting for the writer makes sure it has finished before an error is raised.
+            while writer.is_alive():
+                drain(timeout=0.1)
+
+            writer.join()
+            drain(timeout=0)
+
+        check_writer()
+
     print("Database creation/update process completed.")
 
 
 if __name__ == "__main__":
-    languages = ast.literal_eval(sys.argv[1]) if len(sys.argv) >= 2 else None
-    specific_tables = ast.literal_eval(sys.argv[2]) if len(sys.argv) == 3 else None
+    parser = argparse.ArgumentParser(
+        description="Converts JSON data generated by Scribe-Data into SQLite databases."
+    )
+    parser.add_argument(
+        "languages",
+        nargs="?",
+        type=ast.literal_eval,
+        help='The languages to convert (e.g. \'["French", "German"]\').',
+    )
+    parser.add_argument(
+        "specific_tables",
+        nargs="?",
+        type=ast.literal_eval,
+        help="The tables to update (e.g. '[\"nouns\"]').",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of language databases that are built in parallel (default: 1).",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Apply only the rows that changed to existing databases and write a changeset of them.",
+    )
+    args = parser.parse_args()
 
-    data_to_sqlite(languages, specific_tables)
+    data_to_sqlite(
+        args.languages,
+        args.specific_tables,
+        jobs=args.jobs,
+        incremental=args.incremental,
+    )
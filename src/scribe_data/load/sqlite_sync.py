@@ -0,0 +1,249 @@
+"""
+Incremental updates of SQLite tables that apply only the rows that changed and record them as a changeset.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import hashlib
+import itertools
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def changeset_path(db_path: Path) -> Path:
+    """
+    Returns the path of the changeset that's written next to a database (e.g. DELanguageData.changeset.sql).
+    """
+    return Path(db_path).with_suffix(".changeset.sql")
+
+
+def sql_literal(value) -> str:
+    """
+    Returns a value as an SQLite literal.
+    """
+    if value is None:
+        return "NULL"
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def text_values(row: Sequence) -> list[Optional[str]]:
+    """
+    Returns the values of a row as they're stored in Text columns.
+    """
+    return [None if v is None else str(v) for v in row]
+
+
+def row_hash(row: Sequence) -> bytes:
+    """
+    Returns a hash of the content of a row.
+    """
+    return hashlib.blake2b(
+        json.dumps(text_values(row), ensure_ascii=False).encode("utf-8"),
+        digest_size=16,
+    ).digest()
+
+
+class Changeset:
+    """
+    Writes the statements that were applied to a database as an SQL script that applies them as one transaction.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Parameters
+        ----------
+            path : Path
+                The path to the changeset, which is overwritten.
+        """
+        self.path = Path(path)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write("BEGIN TRANSACTION;\n")
+
+    def write(self, statement: str, params: Sequence = ()) -> None:
+        """
+        Writes a statement with its ? placeholders replaced by the given values.
+        """
+        parts = statement.split("?")
+        if len(parts) != len(params) + 1:
+            raise ValueError(
+                f"The statement has {len(parts) - 1} placeholders but {len(params)} values were given: {statement}"
+            )
+
+        values = [sql_literal(v) for v in params] + [""]
+        self.file.write("".join(p + v for p, v in zip(parts, values)) + ";\n")
+
+    def close(self) -> None:
+        self.file.write("COMMIT;\n")
+        self.file.close()
+
+    def discard(self) -> None:
+        """
+        Removes the changeset of an update that wasn't applied.
+        """
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class SyncCounts:
+    """
+    The number of rows of a table that were inserted, updated and deleted.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, {self.deleted} deleted"
+        )
+
+
+class TableSync:
+    """
+    Updates a table to new rows by comparing them to its current rows by primary key and content hash.
+
+    The first column is the primary key, with later rows with the same key being ignored as with INSERT OR IGNORE. Tables whose columns changed are recreated.
+    """
+
+    def __init__(
+        self,
+        cursor: sqlite3.Cursor,
+        table: str,
+        cols: List[str],
+        create_statement: str,
+        changeset: Optional[Changeset] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Parameters
+        ----------
+            cursor : sqlite3.Cursor
+                The cursor of the database, whose transaction should be committed by the caller.
+
+            table : str
+                The name of the table.
+
+            cols : list of strings
+                The columns of the table.
+
+            create_statement : str
+                The statement that creates the table if it doesn't exist or has different columns.
+
+            changeset : Changeset (default=None)
+                Where applied statements are recorded.
+
+            batch_size : int (default=DEFAULT_BATCH_SIZE)
+                The number of rows that are compared and applied at once.
+        """
+        self.cursor = cursor
+        self.table = table
+        self.cols = list(cols)
+        self.changeset = changeset
+        self.batch_size = batch_size
+        self.counts = SyncCounts()
+        self._seen = set()
+
+        current_cols = [
+            r[1] for r in cursor.execute(f"PRAGMA table_info({table})").fetchall()
+        ]
+        if current_cols == self.cols:
+            self._current = {
+                row[0]: row_hash(row)
+                for row in cursor.execute(f"SELECT * FROM {table}")
+            }
+
+        else:
+            if current_cols:
+                self._execute(f"DROP TABLE {table}")
+
+            self._execute(create_statement)
+            self._current = {}
+
+        placeholders = ", ".join(["?"] * len(self.cols))
+        assignments = ", ".join(f"{c} = ?" for c in self.cols[1:])
+        self._insert = f"INSERT INTO {table} VALUES ({placeholders})"
+        self._update = f"UPDATE {table} SET {assignments} WHERE {self.cols[0]} = ?"
+        self._delete = f"DELETE FROM {table} WHERE {self.cols[0]} = ?"
+
+    def _execute(self, statement: str) -> None:
+        self.cursor.execute(statement)
+        if self.changeset is not None:
+            self.changeset.write(statement)
+
+    def _apply(self, statement: str, rows: list[list]) -> None:
+        if not rows:
+            return
+
+        self.cursor.executemany(statement, rows)
+        if self.changeset is not None:
+            for row in rows:
+                self.changeset.write(statement, row)
+
+    def add(self, rows: Iterable[Sequence]) -> None:
+        """
+        Inserts the rows that are new and updates those whose content changed.
+
+        Parameters
+        ----------
+            rows : Iterable[Sequence]
+                The new rows, which can be passed over several calls.
+        """
+        rows = iter(rows)
+        while batch := list(itertools.islice(rows, self.batch_size)):
+            inserts, updates = [], []
+            for row in batch:
+                key = row[0]
+                if key in self._seen:
+                    continue
+
+                self._seen.add(key)
+                current_hash = self._current.pop(key, None)
+                if current_hash is None:
+                    inserts.append(text_values(row))
+
+                elif current_hash != row_hash(row):
+                    values = text_values(row)
+                    updates.append(values[1:] + values[:1])
+
+            self._apply(self._insert, inserts)
+            self._apply(self._update, updates)
+            self.counts.inserted += len(inserts)
+            self.counts.updated += len(updates)
+
+    def finish(self) -> SyncCounts:
+        """
+        Deletes the rows whose keys weren't passed and returns the counts of all changes.
+        """
+        deletes = [[key] for key in self._current]
+        self._apply(self._delete, deletes)
+        self.counts.deleted += len(deletes)
+        self._current = {}
+
+        return self.counts
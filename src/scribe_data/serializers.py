@@ -0,0 +1,536 @@
+"""
+Serializer backends and compression of the formatted data that Scribe-Data exports.
+
+Exports are JSON by default, which is written with orjson when it's installed, and can also be MessagePack or CBOR. Any of these can be compressed with gzip or zstd, with the format of a file being found from its extensions (e.g. nouns.json.gz or verbs.msgpack.zst).
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import gzip
+import io
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Optional, TextIO
+
+try:
+    import orjson
+
+    orjson_installed = True
+
+except ImportError:
+    orjson_installed = False
+
+try:
+    import msgpack
+
+    msgpack_installed = True
+
+except ImportError:
+    msgpack_installed = False
+
+try:
+    import cbor2
+
+    cbor2_installed = True
+
+except ImportError:
+    cbor2_installed = False
+
+try:
+    import zstandard
+
+    zstandard_installed = True
+
+except ImportError:
+    zstandard_installed = False
+
+SERIALIZER_EXTENSIONS = {"json": ".json", "msgpack": ".msgpack", "cbor": ".cbor"}
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# The install instructions of the optional packages of each serializer and compression.
+OPTIONAL_PACKAGES = {
+    "msgpack": ("msgpack", lambda: msgpack_installed),
+    "cbor": ("cbor2", lambda: cbor2_installed),
+    "zstd": ("zstandard", lambda: zstandard_installed),
+}
+
+
+@dataclass(frozen=True)
+class Serializer:
+    """
+    A format that formatted data is exported in.
+    """
+
+    name: str
+    extension: str
+    dump: Callable[[Any, BinaryIO], None]
+    loads: Callable[[bytes], Any]
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    """
+    Returns compact UTF-8 JSON from orjson, using the stdlib for data that orjson doesn't support (e.g. integers beyond 64 bits).
+    """
+    try:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    except TypeError:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+def _json_dump(data: Any, file: BinaryIO) -> None:
+    """
+    Writes UTF-8 JSON to a file, which is compact if orjson is installed and has a newline per value as with indent=0 otherwise.
+    """
+    if not orjson_installed:
+        text = io.TextIOWrapper(file, encoding="utf-8")
+        try:
+            json.dump(data, text, ensure_ascii=False, indent=0)
+            text.flush()
+
+        finally:
+            # Detaching leaves the file open for the caller to close.
+            text.detach()
+
+        return
+
+    # Each entry is encoded on its own so that the encoded data is never in memory all at once.
+    if isinstance(data, dict):
+        file.write(b"{")
+        for i, (key, value) in enumerate(data.items()):
+            file.write(b"," if i else b"")
+            file.write(_orjson_dumps({key: value})[1:-1])
+
+        file.write(b"}")
+
+    elif isinstance(data, list):
+        file.write(b"[")
+        for i, value in enumerate(data):
+            file.write(b"," if i else b"")
+            file.write(_orjson_dumps(value))
+
+        file.write(b"]")
+
+    else:
+        file.write(_orjson_dumps(data))
+
+
+def _msgpack_dump(data: Any, file: BinaryIO) -> None:
+    """
+    Writes MessagePack to a file, packing the entries of a dictionary one at a time.
+    """
+    packer = msgpack.Packer(use_bin_type=True)
+    if not isinstance(data, dict):
+        file.write(packer.pack(data))
+        return
+
+    file.write(packer.pack_map_header(len(data)))
+    for key, value in data.items():
+        file.write(packer.pack(key))
+        file.write(packer.pack(value))
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Returns the data of UTF-8 JSON, using orjson if it's installed.
+    """
+    return orjson.loads(data) if orjson_installed else json.loads(data)
+
+
+def check_format_installed(name: str) -> None:
+    """
+    Raises an error with installation instructions if the package of a serializer or compression isn't installed.
+
+    Parameters
+    ----------
+        name : str
+            The name of a serializer or compression.
+    """
+    if name in OPTIONAL_PACKAGES:
+        package, is_installed = OPTIONAL_PACKAGES[name]
+        if not is_installed():
+            raise ImportError(
+                f"The '{name}' export format requires {package}. Please install it with 'pip install {package}' or 'pip install scribe-data[serializers]'."
+            )
+
+
+def get_serializer(name: str = "json") -> Serializer:
+    """
+    Returns a serializer by name.
+
+    Parameters
+    ----------
+        name : str (default=json)
+            Either 'json', 'msgpack' or 'cbor'.
+
+    Returns
+    -------
+        Serializer
+            The extension and functions of the serializer.
+    """
+    if name not in SERIALIZER_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported serializer '{name}'. Must be one of: {', '.join(SERIALIZER_EXTENSIONS)}."
+        )
+
+    check_format_installed(name)
+    if name == "msgpack":
+        return Serializer(
+            name=name,
+            extension=SERIALIZER_EXTENSIONS[name],
+            dump=_msgpack_dump,
+            loads=lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+        )
+
+    if name == "cbor":
+        return Serializer(
+            name=name,
+            extension=SERIALIZER_EXTENSIONS[name],
+            dump=cbor2.dump,
+            loads=cbor2.loads,
+        )
+
+    return Serializer(
+        name=name,
+        extension=SERIALIZER_EXTENSIONS[name],
+        dump=_json_dump,
+        loads=_json_loads,
+    )
+
+
+def decompress(data: bytes, compression: Optional[str]) -> bytes:
+    """
+    Returns data decompressed with gzip or zstd, or the data itself if there's no compression.
+    """
+    if compression is None:
+        return data
+
+    check_format_installed(compression)
+    if compression == "gzip":
+        return gzip.decompress(data)
+
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+# MARK: Paths
+
+
+def export_suffix(serializer: str = "json", compression: Optional[str] = None) -> str:
+    """
+    Returns the extensions of files of a serializer and compression, e.g. '.json.gz'.
+    """
+    return SERIALIZER_EXTENSIONS[serializer] + (
+        COMPRESSION_EXTENSIONS[compression] if compression else ""
+    )
+
+
+# All export extensions, with uncompressed JSON first as it's the default.
+EXPORT_SUFFIXES = [
+    export_suffix(serializer, compression)
+    for serializer in SERIALIZER_EXTENSIONS
+    for compression in [None, *COMPRESSION_EXTENSIONS]
+]
+
+
+def parse_export_path(path: Path) -> Optional[tuple]:
+    """
+    Returns the name and the serializer and compression of an export file from its extensions.
+
+    Parameters
+    ----------
+        path : Path
+            The path of a file.
+
+    Returns
+    -------
+        name, serializer, compression : str, str, Optional[str]
+            The name of the file without its extensions, e.g. the data type, and its format, or None if it's not an export file.
+    """
+    name = Path(path).name
+    for serializer in SERIALIZER_EXTENSIONS:
+        for compression in [None, *COMPRESSION_EXTENSIONS]:
+            suffix = export_suffix(serializer, compression)
+            if name.endswith(suffix) and len(name) > len(suffix):
+                return name[: -len(suffix)], serializer, compression
+
+    return None
+
+
+def find_export_file(directory: Path, data_type: str) -> Optional[Path]:
+    """
+    Returns the export file of a data type in a directory in any format.
+
+    Parameters
+    ----------
+        directory : Path
+            The directory of the exports of a language.
+
+        data_type : str
+            The data type, with dashes being written as underscores.
+
+    Returns
+    -------
+        Optional[Path]
+            The first file that exists in the order of EXPORT_SUFFIXES, or None if there is none.
+    """
+    data_type = data_type.replace("-", "_")
+    for suffix in EXPORT_SUFFIXES:
+        if (path := Path(directory) / f"{data_type}{suffix}").is_file():
+            return path
+
+    return None
+
+
+# MARK: Read and Write
+
+
+@contextmanager
+def open_export_file(
+    path: Path, compression: Optional[str] = None
+) -> Iterator[BinaryIO]:
+    """
+    Opens an export file for writing so that data is compressed as it's written.
+
+    The data is written to a partial file that replaces the export once it's complete, so readers never see a partial export, and which is removed if writing fails.
+
+    Parameters
+    ----------
+        path : Path
+            The file to write.
+
+        compression : str (default=None)
+            Either 'gzip', 'zstd' or None for an uncompressed file.
+
+    Returns
+    -------
+        Iterator[BinaryIO]
+            A binary file that compresses what's written to it.
+    """
+    if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported compression '{compression}'. Must be one of: {', '.join(COMPRESSION_EXTENSIONS)}."
+        )
+
+    check_format_installed(compression)
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.partial")
+    try:
+        with open(tmp_path, "wb") as raw:
+            if compression is None:
+                yield raw
+
+            elif compression == "gzip":
+                # The name and modification time are left out so that the same data is compressed to the same bytes.
+                with gzip.GzipFile(
+                    filename="",
+                    mode="wb",
+                    compresslevel=GZIP_LEVEL,
+                    fileobj=raw,
+                    mtime=0,
+                ) as file:
+                    yield file
+
+            else:
+                with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+                    raw, closefd=False
+                ) as file:
+                    yield file
+
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    tmp_path.replace(path)
+
+
+def write_data(
+    path: Path,
+    data: Any,
+    serializer: Optional[str] = None,
+    compression: Optional[str] = None,
+) -> Path:
+    """
+    Writes data to a file in the format given by its extensions or the given serializer and compression.
+
+    Parameters
+    ----------
+        path : Path
+            The file to write.
+
+        data : Any
+            The data to write.
+
+        serializer : str (default=None)
+            The serializer, which is found from the extensions of the path by default.
+
+        compression : str (default=None)
+            The compression, which is found from the extensions of the path if no serializer is given.
+
+    Returns
+    -------
+        Path
+            The path of the written file.
+    """
+    path = Path(path)
+    if serializer is None:
+        if (parsed := parse_export_path(path)) is None:
+            raise ValueError(
+                f"Unsupported file extension for {path}. Please provide one of: {', '.join(EXPORT_SUFFIXES)}."
+            )
+
+        _, serializer, compression = parsed
+
+    dump = get_serializer(serializer).dump
+    with open_export_file(path, compression=compression) as file:
+        dump(data, file)
+
+    return path
+
+
+def read_data(path: Path) -> Any:
+    """
+    Reads data from a file in the format given by its extensions.
+
+    Parameters
+    ----------
+        path : Path
+            The file to read.
+
+    Returns
+    -------
+        Any
+            The data of the file.
+    """
+    path = Path(path)
+    if (parsed := parse_export_path(path)) is None:
+        raise ValueError(
+            f"Unsupported file extension for {path}. Please provide one of: {', '.join(EXPORT_SUFFIXES)}."
+        )
+
+    _, serializer, compression = parsed
+
+    return get_serializer(serializer).loads(decompress(path.read_bytes(), compression))
+
+
+@contextmanager
+def open_json_text(path: Path) -> Iterator[TextIO]:
+    """
+    Opens a JSON file that can be compressed as text so that it can be parsed as it's read.
+
+    Parameters
+    ----------
+        path : Path
+            A JSON file with any of the compression extensions.
+
+    Returns
+    -------
+        Iterator[TextIO]
+            The decompressed text of the file.
+    """
+    path = Path(path)
+    parsed = parse_export_path(path)
+    compression = parsed[2] if parsed else None
+
+    if compression is None:
+        with path.open("r", encoding="utf-8") as file:
+            yield file
+
+    elif compression == "gzip":
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            yield file
+
+    else:
+        check_format_installed(compression)
+        with open(path, "rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw)
+            with io.TextIOWrapper(reader, encoding="utf-8") as file:
+                yield file
+
+
+# MARK: Export Format
+
+
+class ExportFormat:
+    """
+    The serializer and compression of the files of formatted data that Scribe-Data writes.
+    """
+
+    def __init__(
+        self, serializer: str = "json", compression: Optional[str] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+            serializer : str (default=json)
+                Either 'json', 'msgpack' or 'cbor'.
+
+            compression : str (default=None)
+                Either 'gzip', 'zstd' or None for uncompressed files.
+        """
+        self.serializer = serializer
+        self.compression = compression
+
+    @property
+    def suffix(self) -> str:
+        """
+        The extensions of the files, e.g. '.json.gz'.
+        """
+        return export_suffix(self.serializer, self.compression)
+
+
+# The export format shared within a process, which the CLI configures and passes to formatting scripts that run in their own process.
+export_format = ExportFormat(
+    serializer=os.environ.get("SCRIBE_DATA_SERIALIZER", "json"),
+    compression=os.environ.get("SCRIBE_DATA_COMPRESSION") or None,
+)
+
+
+def configure_export_format(
+    serializer: str = "json", compression: Optional[str] = None
+) -> None:
+    """
+    Sets the serializer and compression of the formatted data that's exported.
+
+    Parameters
+    ----------
+        serializer : str (default=json)
+            Either 'json', 'msgpack' or 'cbor'.
+
+        compression : str (default=None)
+            Either 'gzip', 'zstd' or None for uncompressed files.
+    """
+    get_serializer(serializer)
+    if compression is not None:
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(
+                f"Unsupported compression '{compression}'. Must be one of: {', '.join(COMPRESSION_EXTENSIONS)}."
+            )
+
+        check_format_installed(compression)
+
+    export_format.serializer = serializer
+    export_format.compression = compression
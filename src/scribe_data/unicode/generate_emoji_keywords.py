@@ -21,14 +21,30 @@ Centralized keyword-emoji generation file to generated emoji for a specified Lan
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import List, Optional
+
+from tqdm.auto import tqdm
 
 from scribe_data.check.check_pyicu import (
     check_and_install_pyicu,
     check_if_pyicu_installed,
 )
-from scribe_data.unicode.process_unicode import gen_emoji_lexicon
-from scribe_data.utils import export_formatted_data, get_language_iso
+from scribe_data.unicode.process_unicode import (
+    EMOJI_KEYWORDS_DB_PATH,
+    gen_emoji_lexicon,
+    get_emoji_keywords_isos,
+    get_emoji_popularity,
+    get_emojis_to_include,
+)
+from scribe_data.utils import (
+    DEFAULT_JSON_EXPORT_DIR,
+    export_formatted_data,
+    get_language_iso,
+    list_all_languages,
+)
 
 DATA_TYPE = "emoji-keywords"
 EMOJI_KEYWORDS_DICT = 3
@@ -38,8 +54,8 @@ def generate_emoji(language, output_dir: str = None):
     """
     Generates emoji keywords for a specified language and exports the data to the given directory.
 
-    This function first checks and installs the PyICU package, which is necessary for the script to run.
-    If the installation is successful, it proceeds with generating emoji keywords based on the specified language.
+    Emoji keywords are read from the prebuilt emoji keywords database if it exists.
+    Otherwise this function first checks and installs the PyICU package, which is then necessary for the script to run.
     The results are then exported to the provided output directory.
 
     Parameters
@@ -55,15 +71,13 @@ def generate_emoji(language, output_dir: str = None):
     -------
         None: The function does not return any value but outputs data to the specified directory.
     """
-    if check_and_install_pyicu() and check_if_pyicu_installed() is False:
-        print("Thank you.")
+    if not EMOJI_KEYWORDS_DB_PATH.is_file():
+        if check_and_install_pyicu() and check_if_pyicu_installed() is False:
+            print("Thank you.")
 
-    if check_if_pyicu_installed():
+    if EMOJI_KEYWORDS_DB_PATH.is_file() or check_if_pyicu_installed():
         iso = get_language_iso(language=language)
-        path_to_cldr_annotations = (
-            Path(__file__).parent / "cldr-annotations-full" / "annotations"
-        )
-        if iso in os.listdir(path_to_cldr_annotations):
+        if iso in get_emoji_keywords_isos():
             print(f"Emoji Generation for language {language} is supported")
 
         else:
@@ -85,3 +99,124 @@ def generate_emoji(language, output_dir: str = None):
                 language=language.capitalize(),
                 data_type=DATA_TYPE,
             )
+
+
+def _gen_language_emoji_lexicon(
+    language: str, db_path: Path, popularity_dict: Optional[dict]
+):
+    """
+    Generates the emoji keywords of a language in a worker process.
+    """
+    return language, gen_emoji_lexicon(
+        language=language,
+        emojis_per_keyword=EMOJI_KEYWORDS_DICT,
+        db_path=db_path,
+        popularity_dict=popularity_dict,
+        verbose=False,
+    )
+
+
+def generate_emoji_for_all_languages(
+    output_dir: str = DEFAULT_JSON_EXPORT_DIR,
+    languages: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+    db_path: Path = EMOJI_KEYWORDS_DB_PATH,
+) -> dict:
+    """
+    Generates emoji keywords for many languages in a pool of processes and exports them to the given directory.
+
+    Parameters
+    ----------
+        output_dir : str (default=DEFAULT_JSON_EXPORT_DIR)
+            The directory where the generated data will be saved.
+
+        languages : list[str] (default=None)
+            The languages to generate emoji keywords for, with all Scribe-Data languages with CLDR annotations by default.
+
+        jobs : int (default=None)
+            The number of processes to generate emoji keywords in, with the number of CPUs by default.
+
+        db_path : Path (default=EMOJI_KEYWORDS_DB_PATH)
+            The path of the prebuilt database of emoji keywords.
+
+    Returns
+    -------
+        keyword_counts : dict
+            The number of emoji keywords that were written for each language.
+    """
+    if not db_path.is_file():
+        if check_and_install_pyicu() and check_if_pyicu_installed() is False:
+            print("Thank you.")
+
+        if not check_if_pyicu_installed():
+            return {}
+
+    # The supported languages and shared inputs are resolved once rather than for each language.
+    supported_isos = get_emoji_keywords_isos(db_path=db_path)
+    languages = languages or list_all_languages()
+    supported_languages = [
+        lang for lang in languages if get_language_iso(lang) in supported_isos
+    ]
+    if unsupported_languages := sorted(set(languages) - set(supported_languages)):
+        print(
+            f"Emoji Generation is not supported for: {', '.join(unsupported_languages)}"
+        )
+
+    if not supported_languages:
+        return {}
+
+    if db_path.is_file():
+        popularity_dict = None
+
+    else:
+        popularity_dict = get_emoji_popularity()
+        # Computed before the pool is started so that forked workers inherit it.
+        get_emojis_to_include()
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(supported_languages)))
+    keyword_counts = {}
+    with tqdm(
+        total=len(supported_languages), desc="Languages processed", unit="languages"
+    ) as progress_bar:
+
+        def export(results):
+            for language, emoji_keywords_dict in results:
+                export_dir = Path(output_dir) / language.capitalize()
+                export_dir.mkdir(parents=True, exist_ok=True)
+                export_formatted_data(
+                    file_path=output_dir,
+                    formatted_data=emoji_keywords_dict,
+                    query_data_in_use=True,
+                    language=language.capitalize(),
+                    data_type=DATA_TYPE,
+                    verbose=False,
+                )
+                keyword_counts[language] = len(emoji_keywords_dict)
+                progress_bar.update()
+
+        if jobs == 1:
+            export(
+                map(
+                    _gen_language_emoji_lexicon,
+                    supported_languages,
+                    repeat(db_path),
+                    repeat(popularity_dict),
+                )
+            )
+
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                export(
+                    executor.map(
+                        _gen_language_emoji_lexicon,
+                        supported_languages,
+                        repeat(db_path),
+                        repeat(popularity_dict),
+                    )
+                )
+
+    print(
+        f"Wrote emoji keywords for {len(keyword_counts)} languages with {sum(keyword_counts.values()):,} keywords to {Path(output_dir).resolve()}."
+    )
+
+    return keyword_counts
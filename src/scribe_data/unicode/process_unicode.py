@@ -23,7 +23,11 @@ Module for processing Unicode based corpuses for autosuggestion and autocompleti
 
 import csv
 import json
+import os
+import sqlite3
+from functools import cache
 from pathlib import Path
+from typing import Optional
 
 import emoji
 
@@ -37,6 +41,7 @@ except ImportError:
 
 from tqdm.auto import tqdm
 
+from scribe_data.serializers import find_export_file, read_data
 from scribe_data.unicode.unicode_utils import (
     get_emoji_codes_to_ignore,
 )
@@ -45,147 +50,383 @@ from scribe_data.utils import (
     get_language_iso,
 )
 
-emoji_codes_to_ignore = get_emoji_codes_to_ignore()
+UNICODE_DIR = Path(__file__).parent
+EMOJI_KEYWORDS_DB_PATH = UNICODE_DIR / "emoji_keywords.sqlite"
 
+emoji_codes_to_ignore = set(get_emoji_codes_to_ignore())
 
-def gen_emoji_lexicon(
-    language: str,
-    emojis_per_keyword: int,
-):
+
+@cache
+def get_emojis_to_include() -> frozenset:
     """
-    Generates a dictionary of keywords (keys) and emoji unicode(s) associated with them (values).
+    Returns the fully-qualified emojis that aren't ignored, which is computed once per process.
+    """
+    return frozenset(
+        char
+        for char, data in emoji.EMOJI_DATA.items()
+        if data["status"] == emoji.STATUS["fully_qualified"]
+        and char.encode("utf-8") not in emoji_codes_to_ignore
+    )
+
+
+def is_emoji_modifier_base(char: str) -> bool:
+    """
+    Returns whether a character has the Unicode Emoji_Modifier_Base property, which requires PyICU.
+    """
+    return Char.hasBinaryProperty(char, UProperty.EMOJI_MODIFIER_BASE)
+
+
+def get_cldr_file_paths(iso: str, unicode_dir: Path = UNICODE_DIR) -> dict:
+    """
+    Returns the paths of the CLDR annotations files for a language by the key of their annotations.
+    """
+    return {
+        "annotations": unicode_dir
+        / "cldr-annotations-full"
+        / "annotations"
+        / f"{iso}"
+        / "annotations.json",
+        "annotationsDerived": unicode_dir
+        / "cldr-annotations-derived-full"
+        / "annotationsDerived"
+        / f"{iso}"
+        / "annotations.json",
+    }
+
+
+def get_emoji_popularity(unicode_dir: Path = UNICODE_DIR) -> dict:
+    """
+    Returns the popularity rank of emojis.
+    """
+    popularity_dict = {}
+    with (unicode_dir / "2021_ranked.tsv").open(encoding="utf-8") as popularity_file:
+        tsv_reader = csv.DictReader(popularity_file, delimiter="\t")
+        for tsv_row in tsv_reader:
+            popularity_dict[tsv_row["Emoji"]] = int(tsv_row["Rank"])
+
+    return popularity_dict
+
+
+def gen_cldr_emoji_keywords(
+    iso: str,
+    popularity_dict: dict,
+    unicode_dir: Path = UNICODE_DIR,
+    verbose: bool = True,
+) -> dict:
+    """
+    Generates the unsorted emojis of the keywords of a language from the CLDR annotations, which requires PyICU.
 
     Parameters
     ----------
-        language : string (default=None)
-            The language keywords are being generated for.
+        iso : str
+            The ISO code of the language.
 
-        emojis_per_keyword : int (default=None)
-            The limit for number of emoji keywords that should be generated per keyword.
+        popularity_dict : dict
+            The popularity rank of emojis from get_emoji_popularity.
+
+        unicode_dir : Path (default=UNICODE_DIR)
+            The directory with the CLDR annotations.
+
+        verbose : bool (default=True)
+            Whether to show the progress of processing characters.
 
     Returns
     -------
-        Keywords dictionary for emoji keywords-to-unicode are saved locally or uploaded to Scribe apps.
+        keyword_dict : dict
+            The emojis of each keyword with whether they're a modifier base and their rank.
     """
     if not icu_installed:
         raise ImportError("Could not import required PyICU functionality.")
 
+    emojis_to_include = get_emojis_to_include()
     keyword_dict = {}
 
-    iso = get_language_iso(language)
-    # Pre-set up the emoji popularity data.
-    popularity_dict = {}
-
-    with (Path(__file__).parent / "2021_ranked.tsv").open(
-        encoding="utf-8"
-    ) as popularity_file:
-        tsv_reader = csv.DictReader(popularity_file, delimiter="\t")
-        for tsv_row in tsv_reader:
-            popularity_dict[tsv_row["Emoji"]] = int(tsv_row["Rank"])
-
     # Pre-set up handling flags and tags (subdivision flags).
     # emoji_flags = Char.getBinaryPropertySet(UProperty.RGI_EMOJI_FLAG_SEQUENCE)
     # emoji_tags = Char.getBinaryPropertySet(UProperty.RGI_EMOJI_TAG_SEQUENCE)
     # regexp_flag_keyword = re.compile(r".*\: (?P<flag_keyword>.*)")
 
-    annotations_file_path = (
-        Path(__file__).parent
-        / "cldr-annotations-full"
-        / "annotations"
-        / f"{iso}"
-        / "annotations.json"
-    )
-
-    annotations_derived_file_path = (
-        Path(__file__).parent
-        / "cldr-annotations-derived-full"
-        / "annotationsDerived"
-        / f"{iso}"
-        / "annotations.json"
-    )
-
-    cldr_file_paths = {
-        "annotations": annotations_file_path,
-        "annotationsDerived": annotations_derived_file_path,
-    }
-
-    for cldr_file_key, cldr_file_path in cldr_file_paths.items():
+    for cldr_file_key, cldr_file_path in get_cldr_file_paths(
+        iso=iso, unicode_dir=unicode_dir
+    ).items():
         with open(cldr_file_path, "r", encoding="utf-8") as file:
             cldr_data = json.load(file)
 
-        cldr_dict = cldr_data[cldr_file_key]["annotations"]
+        # Note: Some locales (e.g. und) have no annotations of their own.
+        cldr_dict = cldr_data[cldr_file_key].get("annotations", {})
 
         for cldr_char in tqdm(
             iterable=cldr_dict,
-            desc=f"Characters processed from '{cldr_file_key}' CLDR file for {language}",
+            desc=f"Characters processed from '{cldr_file_key}' CLDR file for {iso}",
             unit="cldr characters",
+            disable=not verbose,
         ):
-            # Filter CLDR data for emoji characters while not including certain emojis.
-            if (
-                cldr_char in emoji.EMOJI_DATA
-                and cldr_char.encode("utf-8") not in emoji_codes_to_ignore
-            ):
+            # Filter CLDR data for fully-qualified emoji characters while not including certain emojis.
+            # Only fully-qualified emoji should be generated by keyboards.
+            # See www.unicode.org/reports/tr51/#Emoji_Implementation_Notes.
+            if cldr_char in emojis_to_include:
                 emoji_rank = popularity_dict.get(cldr_char)
 
                 # Process for emoji variants.
-                has_modifier_base = Char.hasBinaryProperty(
-                    cldr_char, UProperty.EMOJI_MODIFIER_BASE
-                )
+                has_modifier_base = is_emoji_modifier_base(cldr_char)
                 if has_modifier_base and len(cldr_char) > 1:
                     continue
 
-                # Only fully-qualified emoji should be generated by keyboards.
-                # See www.unicode.org/reports/tr51/#Emoji_Implementation_Notes.
-                if (
-                    emoji.EMOJI_DATA[cldr_char]["status"]
-                    == emoji.STATUS["fully_qualified"]
-                ):
-                    emoji_annotations = cldr_dict[cldr_char]
-
-                    # # Process for flag keywords.
-                    # if cldr_char in emoji_flags or cldr_char in emoji_tags:
-                    #     flag_keyword_match = regexp_flag_keyword.match(
-                    #         emoji_annotations["tts"][0]
-                    #     )
-                    #     flag_keyword = flag_keyword_match.group("flag_keyword")
-                    #     keyword_dict.setdefault(flag_keyword, []).append(
-                    #         {
-                    #             "emoji": cldr_char,
-                    #             "is_base": has_modifier_base,
-                    #             "rank": emoji_rank,
-                    #         }
-                    #     )
-
-                    for emoji_keyword in emoji_annotations["default"]:
-                        emoji_keyword = emoji_keyword.lower()  # lower case the key
-                        if (
-                            # Use single-word annotations as keywords.
-                            len(emoji_keyword.split()) == 1
-                        ):
-                            keyword_dict.setdefault(emoji_keyword, []).append(
-                                {
-                                    "emoji": cldr_char,
-                                    "is_base": has_modifier_base,
-                                    "rank": emoji_rank,
-                                }
-                            )
+                emoji_annotations = cldr_dict[cldr_char]
+
+                # # Process for flag keywords.
+                # if cldr_char in emoji_flags or cldr_char in emoji_tags:
+                #     flag_keyword_match = regexp_flag_keyword.match(
+                #         emoji_annotations["tts"][0]
+                #     )
+                #     flag_keyword = flag_keyword_match.group("flag_keyword")
+                #     keyword_dict.setdefault(flag_keyword, []).append(
+                #         {
+                #             "emoji": cldr_char,
+                #             "is_base": has_modifier_base,
+                #             "rank": emoji_rank,
+                #         }
+                #     )
+
+                for emoji_keyword in emoji_annotations.get("default", []):
+                    emoji_keyword = emoji_keyword.lower()  # lower case the key
+                    if (
+                        # Use single-word annotations as keywords.
+                        len(emoji_keyword.split()) == 1
+                    ):
+                        keyword_dict.setdefault(emoji_keyword, []).append(
+                            {
+                                "emoji": cldr_char,
+                                "is_base": has_modifier_base,
+                                "rank": emoji_rank,
+                            }
+                        )
 
-    # Check nouns files for plurals and update their data with the emojis for their singular forms.
-    language_nouns_path = Path(DEFAULT_JSON_EXPORT_DIR) / f"{language}" / "nouns.json"
-    if not language_nouns_path.is_file():
-        print(
-            "\nNote: Getting a language's nouns before emoji keywords allows for plurals to be linked to the emojis for their singulars.\n"
+    return keyword_dict
+
+
+# MARK: Emoji Keywords DB
+
+
+def build_emoji_keywords_db(
+    db_path: Path = EMOJI_KEYWORDS_DB_PATH,
+    isos: Optional[list] = None,
+    unicode_dir: Path = UNICODE_DIR,
+):
+    """
+    Builds the prebuilt SQLite database of the emojis of keywords for all languages with CLDR annotations.
+
+    Notes
+    -----
+        The ICU modifier base property, the ignored emojis and the emoji statuses are resolved when building, so that reading the database needs neither PyICU nor the CLDR files.
+
+    Parameters
+    ----------
+        db_path : Path (default=EMOJI_KEYWORDS_DB_PATH)
+            The path of the database to write.
+
+        isos : list (default=None)
+            The ISO codes of the languages to include, with all languages with both CLDR annotations files by default.
+
+        unicode_dir : Path (default=UNICODE_DIR)
+            The directory with the CLDR annotations.
+
+    Returns
+    -------
+        isos : list
+            The ISO codes of the languages in the database.
+    """
+    if isos is None:
+        isos = sorted(
+            iso
+            for iso in os.listdir(unicode_dir / "cldr-annotations-full" / "annotations")
+            if all(
+                p.is_file()
+                for p in get_cldr_file_paths(iso=iso, unicode_dir=unicode_dir).values()
+            )
         )
 
+    popularity_dict = get_emoji_popularity(unicode_dir=unicode_dir)
+
+    db_path = Path(db_path)
+    partial_path = db_path.with_name(f"{db_path.name}.partial")
+    partial_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(partial_path)
+    try:
+        connection.execute(
+            """
+            CREATE TABLE emoji_keywords (
+                iso TEXT NOT NULL,
+                keyword_index INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                emoji TEXT NOT NULL,
+                is_base INTEGER NOT NULL,
+                rank INTEGER,
+                PRIMARY KEY (iso, keyword_index, position)
+            ) WITHOUT ROWID
+            """
+        )
+        for iso in tqdm(isos, desc="Languages processed", unit="languages"):
+            keyword_dict = gen_cldr_emoji_keywords(
+                iso=iso,
+                popularity_dict=popularity_dict,
+                unicode_dir=unicode_dir,
+                verbose=False,
+            )
+            # Keywords are numbered in the order they're found so that reading them gives the same order as the CLDR files.
+            connection.executemany(
+                "INSERT INTO emoji_keywords VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        iso,
+                        keyword_index,
+                        position,
+                        keyword,
+                        e["emoji"],
+                        e["is_base"],
+                        e["rank"],
+                    )
+                    for keyword_index, (keyword, emojis) in enumerate(
+                        keyword_dict.items()
+                    )
+                    for position, e in enumerate(emojis)
+                ),
+            )
+
+        connection.commit()
+        connection.execute("VACUUM")
+
+    finally:
+        connection.close()
+
+    os.replace(partial_path, db_path)
+
+    return isos
+
+
+def read_emoji_keywords(iso: str, db_path: Path = EMOJI_KEYWORDS_DB_PATH) -> dict:
+    """
+    Reads the unsorted emojis of the keywords of a language from the prebuilt database.
+
+    Parameters
+    ----------
+        iso : str
+            The ISO code of the language.
+
+        db_path : Path (default=EMOJI_KEYWORDS_DB_PATH)
+            The path of the database built by build_emoji_keywords_db.
+
+    Returns
+    -------
+        keyword_dict : dict
+            The emojis of each keyword in the same form and order as gen_cldr_emoji_keywords, which is empty if the language isn't in the database.
+    """
+    keyword_dict = {}
+    connection = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+    try:
+        for keyword, emoji_char, is_base, rank in connection.execute(
+            "SELECT keyword, emoji, is_base, rank FROM emoji_keywords WHERE iso = ? ORDER BY keyword_index, position",
+            (iso,),
+        ):
+            keyword_dict.setdefault(keyword, []).append(
+                {"emoji": emoji_char, "is_base": bool(is_base), "rank": rank}
+            )
+
+    finally:
+        connection.close()
+
+    return keyword_dict
+
+
+def get_emoji_keywords_isos(db_path: Path = EMOJI_KEYWORDS_DB_PATH) -> set:
+    """
+    Returns the ISO codes of the languages that emoji keywords can be generated for, from the prebuilt database if it exists.
+    """
+    if Path(db_path).is_file():
+        connection = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+        try:
+            return {
+                iso
+                for (iso,) in connection.execute(
+                    "SELECT DISTINCT iso FROM emoji_keywords"
+                )
+            }
+
+        finally:
+            connection.close()
+
+    return set(os.listdir(UNICODE_DIR / "cldr-annotations-full" / "annotations"))
+
+
+# MARK: Emoji Lexicon
+
+
+def gen_emoji_lexicon(
+    language: str,
+    emojis_per_keyword: int,
+    db_path: Path = EMOJI_KEYWORDS_DB_PATH,
+    popularity_dict: Optional[dict] = None,
+    verbose: bool = True,
+):
+    """
+    Generates a dictionary of keywords (keys) and emoji unicode(s) associated with them (values).
+
+    Notes
+    -----
+        The emojis are read from the prebuilt database if it exists, and otherwise they're generated from the CLDR annotations with PyICU.
+
+    Parameters
+    ----------
+        language : string (default=None)
+            The language keywords are being generated for.
+
+        emojis_per_keyword : int (default=None)
+            The limit for number of emoji keywords that should be generated per keyword.
+
+        db_path : Path (default=EMOJI_KEYWORDS_DB_PATH)
+            The path of the prebuilt database of emoji keywords.
+
+        popularity_dict : dict (default=None)
+            The popularity rank of emojis from get_emoji_popularity if it's already been loaded, which is only needed without the prebuilt database.
+
+        verbose : bool (default=True)
+            Whether to show progress and notes on linking plurals.
+
+    Returns
+    -------
+        Keywords dictionary for emoji keywords-to-unicode are saved locally or uploaded to Scribe apps.
+    """
+    iso = get_language_iso(language)
+
+    if Path(db_path).is_file():
+        keyword_dict = read_emoji_keywords(iso=iso, db_path=db_path)
+
     else:
-        print(
-            "\nNouns file detected in the same export directory. Linking singular word emojis to their plurals.\n"
+        keyword_dict = gen_cldr_emoji_keywords(
+            iso=iso,
+            popularity_dict=popularity_dict or get_emoji_popularity(),
+            verbose=verbose,
         )
-        with open(
-            language_nouns_path,
-            encoding="utf-8",
-        ) as f:
-            noun_data = json.load(f)
+
+    # Check nouns files for plurals and update their data with the emojis for their singular forms.
+    language_nouns_path = find_export_file(
+        Path(DEFAULT_JSON_EXPORT_DIR) / f"{language}", "nouns"
+    )
+    if language_nouns_path is None:
+        if verbose:
+            print(
+                "\nNote: Getting a language's nouns before emoji keywords allows for plurals to be linked to the emojis for their singulars.\n"
+            )
+
+    else:
+        if verbose:
+            print(
+                "\nNouns file detected in the same export directory. Linking singular word emojis to their plurals.\n"
+            )
+
+        noun_data = read_data(language_nouns_path)
 
         plurals_to_singulars_dict = {
             noun_data[row]["plural"].lower(): row.lower()
@@ -1,5 +1,9 @@
 """
-Script to update the Scribe-Data unicode data from CLDR.
+Script to update the Scribe-Data unicode data from CLDR and build the prebuilt emoji keywords database from it.
+
+Notes
+-----
+    Building the emoji keywords database requires PyICU, which users generating emoji keywords then don't need.
 
 Example
 -------
@@ -28,6 +32,11 @@ Example
 import os
 from pathlib import Path
 
+from scribe_data.unicode.process_unicode import (
+    EMOJI_KEYWORDS_DB_PATH,
+    build_emoji_keywords_db,
+)
+
 
 def check_install_node_modules():
     """
@@ -47,5 +56,17 @@ def check_install_node_modules():
     os.system("rm -rf node_modules")
 
 
+def update_emoji_keywords_db():
+    """
+    Builds the prebuilt emoji keywords database from the CLDR files within Scribe-Data.
+    """
+    print("Building the emoji keywords database from the CLDR annotations.")
+    isos = build_emoji_keywords_db(db_path=EMOJI_KEYWORDS_DB_PATH)
+    print(
+        f"Emoji keywords for {len(isos)} languages saved to {EMOJI_KEYWORDS_DB_PATH}."
+    )
+
+
 if __name__ == "__main__":
     check_install_node_modules()
+    update_emoji_keywords_db()
@@ -23,9 +23,10 @@ Utility functions for data extraction, formatting and loading.
 
 import ast
 import json
-from importlib import resources
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 # MARK: Utils Variables
 
@@ -34,6 +35,8 @@ DEFAULT_JSON_EXPORT_DIR = "scribe_data_json_export"
 DEFAULT_CSV_EXPORT_DIR = "scribe_data_csv_export"
 DEFAULT_TSV_EXPORT_DIR = "scribe_data_tsv_export"
 DEFAULT_SQLITE_EXPORT_DIR = "scribe_data_sqlite_export"
+DEFAULT_PARQUET_EXPORT_DIR = "scribe_data_parquet_export"
+DEFAULT_FEATHER_EXPORT_DIR = "scribe_data_feather_export"
 
 LANGUAGE_DATA_EXTRACTION_DIR = (
     Path(__file__).parent / "wikidata" / "language_data_extraction"
@@ -71,59 +74,113 @@ except (IOError, json.JSONDecodeError) as e:
     print(f"Error reading lexeme form metadata: {e}")
 
 
-language_map = {}
-language_to_qid = {}
+# MARK: Language Index
 
-# Process each language and its potential sub-languages in one pass.
-for lang, lang_data in language_metadata.items():
-    lang_lower = lang.lower()
-
-    if "sub_languages" in lang_data:
-        for sub_lang, sub_lang_data in lang_data["sub_languages"].items():
-            sub_lang_lower = sub_lang.lower()
-            sub_qid = sub_lang_data.get("qid")
-
-            if sub_qid is None:
-                print(f"Warning: 'qid' missing for sub-language {sub_lang} of {lang}")
-
-            else:
-                language_map[sub_lang_lower] = sub_lang_data
-                language_to_qid[sub_lang_lower] = sub_qid
 
-    else:
-        qid = lang_data.get("qid")
-        if qid is None:
-            print(f"Warning: 'qid' missing for language {lang}")
+@dataclass(frozen=True)
+class LanguageIndex:
+    """
+    Read-only lookups of the language metadata that are built once rather than searched on every call.
+    """
 
-        else:
-            language_map[lang_lower] = lang_data
-            language_to_qid[lang_lower] = qid
+    # Lowercase queryable languages and sub-languages and their metadata.
+    entries: Mapping[str, dict]
+    # Lowercase main languages and the names of their sub-languages.
+    sub_languages: Mapping[str, tuple[str, ...]]
+    # Lowercase sub-languages and the names of their main languages.
+    parents: Mapping[str, str]
+    iso_to_language: Mapping[str, str]
+    qid_to_language: Mapping[str, str]
+    # Sorted names of the queryable languages and sub-languages.
+    languages: tuple[str, ...]
 
 
-def _load_json(package_path: str, file_name: str) -> Any:
+def build_language_index(metadata: dict) -> LanguageIndex:
     """
-    Loads a JSON resource from a package into a python entity.
+    Builds the lookups of languages and sub-languages of language metadata.
 
     Parameters
     ----------
-        package_path : str
-            The fully qualified package that contains the resource.
-
-        file_name : str
-            The name of the file (resource) that contains the JSON data.
+        metadata : dict
+            The language metadata, where languages either have an ISO and QID or sub-languages that do.
 
     Returns
     -------
-        A python entity representing the JSON content.
+        LanguageIndex
+            The lookups with the first language for an ISO or QID kept as metadata order is used for precedence.
+    """
+    entries = {}
+    sub_languages = {}
+    parents = {}
+    iso_to_language = {}
+    qid_to_language = {}
+
+    def add(language, entry):
+        entries.setdefault(language.lower(), entry)
+        if (iso := entry.get("iso")) is not None:
+            iso_to_language.setdefault(iso, language)
+
+        if (qid := entry.get("qid")) is not None:
+            qid_to_language.setdefault(qid, language)
+
+    for lang, lang_data in metadata.items():
+        if "sub_languages" in lang_data:
+            sub_languages[lang.lower()] = tuple(lang_data["sub_languages"])
+            for sub_lang, sub_lang_data in lang_data["sub_languages"].items():
+                parents.setdefault(sub_lang.lower(), lang)
+                add(sub_lang, sub_lang_data)
+
+        else:
+            add(lang, lang_data)
+
+    return LanguageIndex(
+        entries=MappingProxyType(entries),
+        sub_languages=MappingProxyType(sub_languages),
+        parents=MappingProxyType(parents),
+        iso_to_language=MappingProxyType(iso_to_language),
+        qid_to_language=MappingProxyType(qid_to_language),
+        languages=tuple(
+            sorted(
+                name
+                for lang, lang_data in metadata.items()
+                for name in lang_data.get("sub_languages", [lang])
+            )
+        ),
+    )
+
+
+def _language_index(metadata: dict) -> LanguageIndex:
     """
-    with resources.files(package_path).joinpath(file_name).open(
-        encoding="utf-8"
-    ) as in_stream:
-        return json.load(in_stream)
+    Returns the prebuilt index for the package's language metadata and builds one for other metadata.
+    """
+    if metadata is language_metadata:
+        return LANGUAGE_INDEX
+
+    return build_language_index(metadata)
 
 
-_languages = _load_json(
-    package_path="scribe_data.resources", file_name="language_metadata.json"
+LANGUAGE_INDEX = build_language_index(language_metadata)
+
+for lang, lang_data in LANGUAGE_INDEX.entries.items():
+    if lang_data.get("qid") is None:
+        if lang in LANGUAGE_INDEX.parents:
+            print(
+                f"Warning: 'qid' missing for sub-language {lang} of {LANGUAGE_INDEX.parents[lang]}"
+            )
+
+        else:
+            print(f"Warning: 'qid' missing for language {lang}")
+
+# Queryable languages and sub-languages with QIDs.
+language_map = MappingProxyType(
+    {
+        lang: lang_data
+        for lang, lang_data in LANGUAGE_INDEX.entries.items()
+        if lang_data.get("qid") is not None
+    }
+)
+language_to_qid = MappingProxyType(
+    {lang: lang_data["qid"] for lang, lang_data in language_map.items()}
 )
 
 
@@ -155,26 +212,20 @@ def _find(source_key: str, source_value: str, target_key: str, error_msg: str) -
     ------
         ValueError : when a source_value is not supported or the language only has sub-languages.
     """
-    # Check if we're searching by language name.
     if source_key == "language":
         norm_source_value = source_value.lower()
 
-        # First, check the main language entries (e.g., mandarin, french, etc.).
-        for language, entry in _languages.items():
-            # If the language name matches the top-level key, return the target value.
-            if language.lower() == norm_source_value:
-                if "sub_languages" in entry:
-                    sub_languages = ", ".join(entry["sub_languages"].keys())
-                    raise ValueError(
-                        f"'{language}' has sub-languages, but is not queryable directly. Available sub-languages: {sub_languages}"
-                    )
-                return entry.get(target_key)
-
-            # If there are sub-languages, check them too.
-            if "sub_languages" in entry:
-                for sub_language, sub_entry in entry["sub_languages"].items():
-                    if sub_language.lower() == norm_source_value:
-                        return sub_entry.get(target_key)
+        if norm_source_value in LANGUAGE_INDEX.entries:
+            return LANGUAGE_INDEX.entries[norm_source_value].get(target_key)
+
+        if norm_source_value in LANGUAGE_INDEX.sub_languages:
+            language = next(
+                lang for lang in language_metadata if lang.lower() == norm_source_value
+            )
+            sub_languages = ", ".join(LANGUAGE_INDEX.sub_languages[norm_source_value])
+            raise ValueError(
+                f"'{language}' has sub-languages, but is not queryable directly. Available sub-languages: {sub_languages}"
+            )
 
     # If no match was found, raise an error.
     raise ValueError(error_msg)
@@ -239,19 +290,9 @@ def get_language_from_iso(iso: str) -> str:
         str
             The name for the language which has an ISO value of iso.
     """
-    # Iterate over the languages and their properties.
-    for language, properties in _languages.items():
-        # Check if the current language's ISO matches the provided ISO.
-        if properties.get("iso") == iso:
-            return language.capitalize()
+    if iso in LANGUAGE_INDEX.iso_to_language:
+        return LANGUAGE_INDEX.iso_to_language[iso].capitalize()
 
-        # If there are sub-languages, check those as well.
-        if "sub_languages" in properties:
-            for sub_lang, sub_properties in properties["sub_languages"].items():
-                if sub_properties.get("iso") == iso:
-                    return sub_lang.capitalize()
-
-    # If no match is found, raise a ValueError.
     raise ValueError(f"{iso.upper()} is currently not a supported ISO language.")
 
 
@@ -259,7 +300,7 @@ def load_queried_data(
     file_path: str, language: str, data_type: str
 ) -> tuple[Any, bool, str]:
     """
-    Loads queried data from a JSON file for a specific language and data type.
+    Loads queried data from a file for a specific language and data type in any export format.
 
     Parameters
     ----------
@@ -277,10 +318,13 @@ def load_queried_data(
         tuple(Any, str)
             A tuple containing the loaded data and the path to the data file.
     """
-    data_path = Path(file_path) / language / f"{data_type}.json"
+    from scribe_data.serializers import find_export_file, read_data
+
+    data_path = find_export_file(Path(file_path) / language, data_type) or (
+        Path(file_path) / language / f"{data_type}.json"
+    )
 
-    with open(data_path, encoding="utf-8") as f:
-        return json.load(f), data_path
+    return read_data(data_path), data_path
 
 
 def export_formatted_data(
@@ -289,9 +333,14 @@ def export_formatted_data(
     language: str,
     data_type: str,
     query_data_in_use: bool = False,
-) -> None:
+    verbose: bool = True,
+    serializer: Optional[str] = None,
+    compression: Optional[str] = None,
+) -> Path:
     """
-    Exports formatted data to a JSON file for a specific language and data type.
+    Exports formatted data to a file for a specific language and data type.
+
+    Files of the data type in other export formats are removed so that readers don't find outdated data.
 
     Parameters
     ----------
@@ -307,20 +356,48 @@ def export_formatted_data(
         data_type : str
             The type of data being exported (e.g. 'nouns', 'verbs').
 
+        verbose : bool (default=True)
+            Whether to print the file that was written.
+
+        serializer : str (default=None)
+            Either 'json', 'msgpack' or 'cbor', with the configured export format being used by default.
+
+        compression : str (default=None)
+            Either 'gzip' or 'zstd', with the configured export format being used if no serializer is given.
+
     Returns
     -------
-        None
-    """
-    export_path = Path(file_path) / language / f"{data_type.replace('-', '_')}.json"
+        Path
+            The path of the exported file.
+    """
+    from scribe_data.serializers import (
+        EXPORT_SUFFIXES,
+        export_format,
+        export_suffix,
+        write_data,
+    )
 
-    with open(export_path, "w", encoding="utf-8") as file:
-        json.dump(formatted_data, file, ensure_ascii=False, indent=0)
-        file.write("\n")
+    if serializer is None:
+        serializer, compression = export_format.serializer, export_format.compression
 
-    print(
-        f"Wrote file {language}/{data_type.replace('-', '_')}.json with {len(formatted_data):,} {data_type}."
+    file_name = f"{data_type.replace('-', '_')}{export_suffix(serializer, compression)}"
+    export_path = Path(file_path) / language / file_name
+    write_data(
+        export_path, formatted_data, serializer=serializer, compression=compression
     )
 
+    for suffix in EXPORT_SUFFIXES:
+        outdated_path = export_path.with_name(f"{data_type.replace('-', '_')}{suffix}")
+        if outdated_path != export_path:
+            outdated_path.unlink(missing_ok=True)
+
+    if verbose:
+        print(
+            f"Wrote file {language}/{file_name} with {len(formatted_data):,} {data_type}."
+        )
+
+    return export_path
+
 
 def get_ios_data_path(language: str) -> str:
     """
@@ -547,7 +624,7 @@ def order_annotations(annotation: str) -> str:
     return "/".join(annotation_split)
 
 
-def format_sublanguage_name(lang, language_metadata=_languages):
+def format_sublanguage_name(lang, language_metadata=language_metadata):
     """
     Formats the name of a sub-language by appending its main language
     in the format 'MAIN_LANG/SUB_LANG'. If the language is not a sub-language,
@@ -579,43 +656,39 @@ def format_sublanguage_name(lang, language_metadata=_languages):
         > format_sublanguage_name("english", language_metadata)
         'English'
     """
-    for main_lang, lang_data in language_metadata.items():
-        # If it's not a sub-language, return the original name.
-        if main_lang == lang.lower():
-            return lang
+    index = _language_index(language_metadata)
+    lang_lower = lang.lower()
 
-        # Check if the main language has sub-languages.
-        if "sub_languages" in lang_data:
-            # Check if the provided language is a sub-language.
-            for sub_lang in lang_data["sub_languages"]:
-                if lang.lower() == sub_lang.lower():
-                    # Return the formatted name MAIN_LANG/SUB_LANG.
-                    return f"{main_lang}/{sub_lang}"
+    # If it's not a sub-language, return the original name.
+    if lang_lower in index.entries and lang_lower not in index.parents:
+        return lang
+
+    # Main languages with sub-languages are also returned as they are.
+    if lang_lower in index.sub_languages:
+        return lang
+
+    if lang_lower in index.parents:
+        main_lang = index.parents[lang_lower]
+        sub_lang = next(
+            sub_lang
+            for sub_lang in language_metadata[main_lang]["sub_languages"]
+            if sub_lang.lower() == lang_lower
+        )
+        # Return the formatted name MAIN_LANG/SUB_LANG.
+        return f"{main_lang}/{sub_lang}"
 
     # Raise ValueError if no match is found.
     raise ValueError(f"{lang.upper()} is not a valid language or sub-language.")
 
 
-def list_all_languages(language_metadata=_languages):
+def list_all_languages(language_metadata=language_metadata):
     """
     Returns a sorted list of all languages from the provided metadata dictionary, including sub-languages.
     """
-    current_languages = []
-
-    # Iterate through the language metadata.
-    for lang_key, lang_data in language_metadata.items():
-        # Check if there are sub-languages.
-        if "sub_languages" in lang_data:
-            # Add the sub-languages to current_languages.
-            current_languages.extend(lang_data["sub_languages"].keys())
-        else:
-            # If no sub-languages, add the main language.
-            current_languages.append(lang_key)
-
-    return sorted(current_languages)
+    return list(_language_index(language_metadata).languages)
 
 
-def list_languages_with_metadata_for_data_type(language_metadata=_languages):
+def list_languages_with_metadata_for_data_type(language_metadata=language_metadata):
     """
     Returns a sorted list of languages and their metadata (name, iso, qid) for a specific data type.
     The list includes sub-languages where applicable.
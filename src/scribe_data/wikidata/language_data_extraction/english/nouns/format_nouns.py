@@ -22,85 +22,105 @@ Formats the English nouns queried from Wikidata using query_nouns.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import export_formatted_data, load_queried_data
 
 LANGUAGE = "English"
 DATA_TYPE = "nouns"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
-
-nouns_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-nouns_formatted = {}
-
-for noun_vals in nouns_list:
-    if "singular" in noun_vals.keys():
-        if noun_vals["singular"] not in nouns_formatted:
-            if "plural" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]] = {
-                    "plural": noun_vals["plural"],
-                    "form": "",
-                }
-
-                # Assign plural as a new entry after checking if it's its own plural.
-                if noun_vals["plural"] not in nouns_formatted:
-                    if noun_vals["singular"] != noun_vals["plural"]:
-                        nouns_formatted[noun_vals["plural"]] = {
-                            "plural": "isPlural",
-                            "form": "PL",
-                        }
 
+def format_nouns(nouns_list: Iterable[dict]) -> dict:
+    """
+    Formats the English nouns queried from Wikidata.
+
+    Parameters
+    ----------
+        nouns_list : Iterable[dict]
+            The results of the nouns queries with one dictionary per lexeme form.
+
+    Returns
+    -------
+        dict
+            The formatted nouns sorted alphabetically.
+    """
+    nouns_formatted = {}
+
+    for noun_vals in nouns_list:
+        if "singular" in noun_vals.keys():
+            if noun_vals["singular"] not in nouns_formatted:
+                if "plural" in noun_vals.keys():
+                    nouns_formatted[noun_vals["singular"]] = {
+                        "plural": noun_vals["plural"],
+                        "form": "",
+                    }
+
+                    # Assign plural as a new entry after checking if it's its own plural.
+                    if noun_vals["plural"] not in nouns_formatted:
+                        if noun_vals["singular"] != noun_vals["plural"]:
+                            nouns_formatted[noun_vals["plural"]] = {
+                                "plural": "isPlural",
+                                "form": "PL",
+                            }
+
+                        else:
+                            nouns_formatted[noun_vals["plural"]] = {
+                                "plural": noun_vals["plural"],
+                                "form": "PL",
+                            }
                     else:
-                        nouns_formatted[noun_vals["plural"]] = {
-                            "plural": noun_vals["plural"],
-                            "form": "PL",
-                        }
+                        # Mark plural as a possible form if it isn't already.
+                        if nouns_formatted[noun_vals["plural"]]["form"] == "":
+                            nouns_formatted[noun_vals["plural"]]["form"] = "PL"
+
+                        # Assign itself as a plural if possible (maybe wasn't for prior versions).
+                        if noun_vals["singular"] == noun_vals["plural"]:
+                            nouns_formatted[noun_vals["plural"]]["plural"] = noun_vals[
+                                "plural"
+                            ]
                 else:
-                    # Mark plural as a possible form if it isn't already.
-                    if nouns_formatted[noun_vals["plural"]]["form"] == "":
-                        nouns_formatted[noun_vals["plural"]]["form"] = "PL"
-
-                    # Assign itself as a plural if possible (maybe wasn't for prior versions).
-                    if noun_vals["singular"] == noun_vals["plural"]:
-                        nouns_formatted[noun_vals["plural"]]["plural"] = noun_vals[
-                            "plural"
-                        ]
-            else:
-                nouns_formatted[noun_vals["singular"]] = {
-                    "plural": "",
-                    "form": "",
+                    nouns_formatted[noun_vals["singular"]] = {
+                        "plural": "",
+                        "form": "",
+                    }
+
+        elif "plural" in noun_vals.keys():
+            if noun_vals["plural"] not in nouns_formatted:
+                nouns_formatted[noun_vals["plural"]] = {
+                    "plural": "isPlural",
+                    "form": "PL",
                 }
 
-    elif "plural" in noun_vals.keys():
-        if noun_vals["plural"] not in nouns_formatted:
-            nouns_formatted[noun_vals["plural"]] = {
-                "plural": "isPlural",
-                "form": "PL",
-            }
-
-        else:
-            # Mark plural as a possible form if it isn't already.
-            if (
-                "PL" not in nouns_formatted[noun_vals["plural"]]["form"]
-                and nouns_formatted[noun_vals["plural"]]["form"] != ""
-            ):
-                nouns_formatted[noun_vals["plural"]]["form"] = (
-                    nouns_formatted[noun_vals["plural"]]["form"] + "/PL"
-                )
-
-            elif nouns_formatted[noun_vals["plural"]]["form"] == "":
-                nouns_formatted[noun_vals["plural"]]["form"] = "PL"
-
-nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=nouns_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+            else:
+                # Mark plural as a possible form if it isn't already.
+                if (
+                    "PL" not in nouns_formatted[noun_vals["plural"]]["form"]
+                    and nouns_formatted[noun_vals["plural"]]["form"] != ""
+                ):
+                    nouns_formatted[noun_vals["plural"]]["form"] = (
+                        nouns_formatted[noun_vals["plural"]]["form"] + "/PL"
+                    )
+
+                elif nouns_formatted[noun_vals["plural"]]["form"] == "":
+                    nouns_formatted[noun_vals["plural"]]["form"] = "PL"
+
+    nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
+
+    return nouns_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    nouns_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_nouns(nouns_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
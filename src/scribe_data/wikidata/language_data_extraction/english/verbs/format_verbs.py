@@ -22,128 +22,122 @@ Formats the English verbs queried from Wikidata using query_verbs.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import export_formatted_data, load_queried_data
 
 LANGUAGE = "English"
 DATA_TYPE = "verbs"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
-
-verbs_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-verbs_formatted = {}
-
-all_conjugations = [
-    "presSimp",
-    "presTPS",
-    "presPart",
-    "presFPSCont",
-    "prePluralCont",
-    "presTPSCont",
-    "presPerfSimp",
-    "presPerfTPS",
-    "presPerfSimpCont",
-    "presPerfTPSCont",
-    "pastSimp",
-    "pastSimpCont",
-    "pastSimpPluralCont",
-    "pastPerf",
-    "pastPerfCont",
-    "futSimp",
-    "futCont",
-    "futPerf",
-    "futPerfCont",
-    "condSimp",
-    "condCont",
-    "condPerf",
-    "condPerfCont",
-]
-
-for verb_vals in verbs_list:
-    # If infinitive is available add to formatted verbs, else no entry created.
-    infinitive_key = verb_vals["infinitive"]
-    if infinitive_key not in verbs_formatted.keys():
-        verbs_formatted[infinitive_key] = {}
-
-        # Present
-        verbs_formatted[infinitive_key]["presSimp"] = verb_vals.get("presSimp", "")
-        verbs_formatted[infinitive_key]["presTPS"] = verb_vals.get("presTPS", "")
-        verbs_formatted[infinitive_key]["presPart"] = verb_vals.get("presPart", "")
-        verbs_formatted[infinitive_key]["presFPSCont"] = "am " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["prePluralCont"] = "are " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["presTPSCont"] = "is " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["presPerfSimp"] = "have " + verb_vals.get(
-            "pastPart", ""
-        )
-        verbs_formatted[infinitive_key]["presPerfTPS"] = "has " + verb_vals.get(
-            "pastPart", ""
-        )
-        verbs_formatted[infinitive_key]["presPerfSimpCont"] = (
-            "have been " + verb_vals.get("presPart", "")
-        )
-        verbs_formatted[infinitive_key]["presPerfTPSCont"] = (
-            "has been " + verb_vals.get("presPart", "")
-        )
-
-        # Past
-        verbs_formatted[infinitive_key]["pastSimp"] = verb_vals.get("pastSimp", "")
-        verbs_formatted[infinitive_key]["pastSimpCont"] = "was " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["pastSimpPluralCont"] = "were " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["pastPerf"] = "had " + verb_vals.get(
-            "pastPart", ""
-        )
-        verbs_formatted[infinitive_key]["pastPerfCont"] = "had been " + verb_vals.get(
-            "presPart", ""
-        )
-
-        # Future
-        verbs_formatted[infinitive_key]["futSimp"] = "will " + verb_vals.get(
-            "presSimp", ""
-        )
-        verbs_formatted[infinitive_key]["futCont"] = "will be " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["futPerf"] = "will have " + verb_vals.get(
-            "pastPart", ""
-        )
-        verbs_formatted[infinitive_key]["futPerfCont"] = (
-            "will have been " + verb_vals.get("presPart", "")
-        )
-
-        # Conditional
-        verbs_formatted[infinitive_key]["condSimp"] = "would " + verb_vals.get(
-            "presSimp", ""
-        )
-        verbs_formatted[infinitive_key]["condCont"] = "would be " + verb_vals.get(
-            "presPart", ""
-        )
-        verbs_formatted[infinitive_key]["condPerf"] = "would have " + verb_vals.get(
-            "pastPart", ""
-        )
-        verbs_formatted[infinitive_key]["condPerfCont"] = (
-            "would have been " + verb_vals.get("presPart", "")
-        )
-
-verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=verbs_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+
+def format_verbs(verbs_list: Iterable[dict]) -> dict:
+    """
+    Formats the English verbs queried from Wikidata.
+
+    Parameters
+    ----------
+        verbs_list : Iterable[dict]
+            The results of the verbs queries with one dictionary per lexeme form.
+
+    Returns
+    -------
+        dict
+            The formatted verbs sorted alphabetically.
+    """
+    verbs_formatted = {}
+
+    for verb_vals in verbs_list:
+        # If infinitive is available add to formatted verbs, else no entry created.
+        infinitive_key = verb_vals["infinitive"]
+        if infinitive_key not in verbs_formatted.keys():
+            verbs_formatted[infinitive_key] = {}
+
+            # Present
+            verbs_formatted[infinitive_key]["presSimp"] = verb_vals.get("presSimp", "")
+            verbs_formatted[infinitive_key]["presTPS"] = verb_vals.get("presTPS", "")
+            verbs_formatted[infinitive_key]["presPart"] = verb_vals.get("presPart", "")
+            verbs_formatted[infinitive_key]["presFPSCont"] = "am " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["prePluralCont"] = "are " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["presTPSCont"] = "is " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["presPerfSimp"] = "have " + verb_vals.get(
+                "pastPart", ""
+            )
+            verbs_formatted[infinitive_key]["presPerfTPS"] = "has " + verb_vals.get(
+                "pastPart", ""
+            )
+            verbs_formatted[infinitive_key]["presPerfSimpCont"] = (
+                "have been " + verb_vals.get("presPart", "")
+            )
+            verbs_formatted[infinitive_key]["presPerfTPSCont"] = (
+                "has been " + verb_vals.get("presPart", "")
+            )
+
+            # Past
+            verbs_formatted[infinitive_key]["pastSimp"] = verb_vals.get("pastSimp", "")
+            verbs_formatted[infinitive_key]["pastSimpCont"] = "was " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["pastSimpPluralCont"] = (
+                "were " + verb_vals.get("presPart", "")
+            )
+            verbs_formatted[infinitive_key]["pastPerf"] = "had " + verb_vals.get(
+                "pastPart", ""
+            )
+            verbs_formatted[infinitive_key]["pastPerfCont"] = (
+                "had been " + verb_vals.get("presPart", "")
+            )
+
+            # Future
+            verbs_formatted[infinitive_key]["futSimp"] = "will " + verb_vals.get(
+                "presSimp", ""
+            )
+            verbs_formatted[infinitive_key]["futCont"] = "will be " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["futPerf"] = "will have " + verb_vals.get(
+                "pastPart", ""
+            )
+            verbs_formatted[infinitive_key]["futPerfCont"] = (
+                "will have been " + verb_vals.get("presPart", "")
+            )
+
+            # Conditional
+            verbs_formatted[infinitive_key]["condSimp"] = "would " + verb_vals.get(
+                "presSimp", ""
+            )
+            verbs_formatted[infinitive_key]["condCont"] = "would be " + verb_vals.get(
+                "presPart", ""
+            )
+            verbs_formatted[infinitive_key]["condPerf"] = "would have " + verb_vals.get(
+                "pastPart", ""
+            )
+            verbs_formatted[infinitive_key]["condPerfCont"] = (
+                "would have been " + verb_vals.get("presPart", "")
+            )
+
+    verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
+
+    return verbs_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    verbs_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_verbs(verbs_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
@@ -22,6 +22,7 @@ Formats the French nouns queried from Wikidata using query_nouns.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import (
     export_formatted_data,
@@ -33,79 +34,103 @@ from scribe_data.utils import (
 LANGUAGE = "French"
 DATA_TYPE = "nouns"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
 
-nouns_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-nouns_formatted = {}
+def format_nouns(nouns_list: Iterable[dict]) -> dict:
+    """
+    Formats the French nouns queried from Wikidata.
 
-for noun_vals in nouns_list:
-    if "singular" in noun_vals.keys():
-        if noun_vals["singular"] not in nouns_formatted:
-            nouns_formatted[noun_vals["singular"]] = {"plural": "", "form": ""}
+    Parameters
+    ----------
+        nouns_list : Iterable[dict]
+            The results of the nouns queries with one dictionary per lexeme form.
 
-            if "gender" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]]["form"] = map_genders(
-                    noun_vals["gender"]
-                )
+    Returns
+    -------
+        dict
+            The formatted nouns sorted alphabetically.
+    """
+    nouns_formatted = {}
 
-            if "plural" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals["plural"]
+    for noun_vals in nouns_list:
+        if "singular" in noun_vals.keys():
+            if noun_vals["singular"] not in nouns_formatted:
+                nouns_formatted[noun_vals["singular"]] = {"plural": "", "form": ""}
 
-                if noun_vals["plural"] not in nouns_formatted:
-                    nouns_formatted[noun_vals["plural"]] = {
-                        "plural": "isPlural",
-                        "form": "PL",
-                    }
+                if "gender" in noun_vals.keys():
+                    nouns_formatted[noun_vals["singular"]]["form"] = map_genders(
+                        noun_vals["gender"]
+                    )
 
-                # Plural is same as singular.
-                else:
+                if "plural" in noun_vals.keys():
                     nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals[
                         "plural"
                     ]
-                    nouns_formatted[noun_vals["singular"]]["form"] = (
-                        nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
-                    )
 
-        else:
-            if "gender" in noun_vals.keys():
-                if (
-                    nouns_formatted[noun_vals["singular"]]["form"]
-                    != noun_vals["gender"]
-                ):
-                    nouns_formatted[noun_vals["singular"]]["form"] += "/" + map_genders(
-                        noun_vals["gender"]
-                    )
+                    if noun_vals["plural"] not in nouns_formatted:
+                        nouns_formatted[noun_vals["plural"]] = {
+                            "plural": "isPlural",
+                            "form": "PL",
+                        }
+
+                    # Plural is same as singular.
+                    else:
+                        nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals[
+                            "plural"
+                        ]
+                        nouns_formatted[noun_vals["singular"]]["form"] = (
+                            nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
+                        )
+
+            else:
+                if "gender" in noun_vals.keys():
+                    if (
+                        nouns_formatted[noun_vals["singular"]]["form"]
+                        != noun_vals["gender"]
+                    ):
+                        nouns_formatted[noun_vals["singular"]]["form"] += (
+                            "/" + map_genders(noun_vals["gender"])
+                        )
+
+                    elif nouns_formatted[noun_vals["singular"]]["gender"] == "":
+                        nouns_formatted[noun_vals["singular"]]["gender"] = map_genders(
+                            noun_vals["gender"]
+                        )
+
+        # Plural only noun.
+        elif "plural" in noun_vals.keys():
+            if noun_vals["plural"] not in nouns_formatted:
+                nouns_formatted[noun_vals["plural"]] = {
+                    "plural": "isPlural",
+                    "form": "PL",
+                }
+
+            # Plural is same as singular.
+            elif "singular" in noun_vals.keys():
+                nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals["plural"]
+                nouns_formatted[noun_vals["singular"]]["form"] = (
+                    nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
+                )
 
-                elif nouns_formatted[noun_vals["singular"]]["gender"] == "":
-                    nouns_formatted[noun_vals["singular"]]["gender"] = map_genders(
-                        noun_vals["gender"]
-                    )
+    for k in nouns_formatted:
+        nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
 
-    # Plural only noun.
-    elif "plural" in noun_vals.keys():
-        if noun_vals["plural"] not in nouns_formatted:
-            nouns_formatted[noun_vals["plural"]] = {"plural": "isPlural", "form": "PL"}
+    nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
 
-        # Plural is same as singular.
-        elif "singular" in noun_vals.keys():
-            nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals["plural"]
-            nouns_formatted[noun_vals["singular"]]["form"] = (
-                nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
-            )
+    return nouns_formatted
 
-for k in nouns_formatted:
-    nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
 
-nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
 
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=nouns_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+    nouns_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_nouns(nouns_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
@@ -22,69 +22,89 @@ Formats the French verbs queried from Wikidata using query_verbs.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import export_formatted_data, load_queried_data
 
 LANGUAGE = "French"
 DATA_TYPE = "verbs"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
-
-verbs_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-verbs_formatted = {}
-
-all_conjugations = [
-    "presFPS",
-    "presSPS",
-    "presTPS",
-    "presFPP",
-    "presSPP",
-    "presTPP",
-    "pretFPS",
-    "pretSPS",
-    "pretTPS",
-    "pretFPP",
-    "pretSPP",
-    "pretTPP",
-    "impFPS",
-    "impSPS",
-    "impTPS",
-    "impFPP",
-    "impSPP",
-    "impTPP",
-    "futFPS",
-    "futSPS",
-    "futTPS",
-    "futFPP",
-    "futSPP",
-    "futTPP",
-]
-
-for verb_vals in verbs_list:
-    if verb_vals["infinitive"] not in verbs_formatted:
-        verbs_formatted[verb_vals["infinitive"]] = {}
-
-        for conj in all_conjugations:
-            if conj in verb_vals.keys():
-                verbs_formatted[verb_vals["infinitive"]][conj] = verb_vals[conj]
-            else:
-                verbs_formatted[verb_vals["infinitive"]][conj] = ""
-
-    else:
-        for conj in all_conjugations:
-            if conj in verb_vals.keys():
-                verbs_formatted[verb_vals["infinitive"]][conj] = verb_vals[conj]
-
-verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=verbs_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+
+def format_verbs(verbs_list: Iterable[dict]) -> dict:
+    """
+    Formats the French verbs queried from Wikidata.
+
+    Parameters
+    ----------
+        verbs_list : Iterable[dict]
+            The results of the verbs queries with one dictionary per lexeme form.
+
+    Returns
+    -------
+        dict
+            The formatted verbs sorted alphabetically.
+    """
+    verbs_formatted = {}
+
+    all_conjugations = [
+        "presFPS",
+        "presSPS",
+        "presTPS",
+        "presFPP",
+        "presSPP",
+        "presTPP",
+        "pretFPS",
+        "pretSPS",
+        "pretTPS",
+        "pretFPP",
+        "pretSPP",
+        "pretTPP",
+        "impFPS",
+        "impSPS",
+        "impTPS",
+        "impFPP",
+        "impSPP",
+        "impTPP",
+        "futFPS",
+        "futSPS",
+        "futTPS",
+        "futFPP",
+        "futSPP",
+        "futTPP",
+    ]
+
+    for verb_vals in verbs_list:
+        if verb_vals["infinitive"] not in verbs_formatted:
+            verbs_formatted[verb_vals["infinitive"]] = {}
+
+            for conj in all_conjugations:
+                if conj in verb_vals.keys():
+                    verbs_formatted[verb_vals["infinitive"]][conj] = verb_vals[conj]
+                else:
+                    verbs_formatted[verb_vals["infinitive"]][conj] = ""
+
+        else:
+            for conj in all_conjugations:
+                if conj in verb_vals.keys():
+                    verbs_formatted[verb_vals["infinitive"]][conj] = verb_vals[conj]
+
+    verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
+
+    return verbs_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    verbs_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_verbs(verbs_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
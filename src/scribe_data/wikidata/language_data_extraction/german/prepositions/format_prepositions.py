@@ -22,6 +22,7 @@ Formats the German prepositions queried from Wikidata using query_prepositions.s
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import (
     export_formatted_data,
@@ -33,71 +34,91 @@ from scribe_data.utils import (
 LANGUAGE = "German"
 DATA_TYPE = "prepositions"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
 
-prepositions_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-
-prepositions_formatted = {}
-
-for prep_vals in prepositions_list:
-    if "preposition" in prep_vals.keys():
-        if "case" in prep_vals.keys():
-            if prep_vals["preposition"] not in prepositions_formatted:
-                prepositions_formatted[prep_vals["preposition"]] = map_cases(
-                    prep_vals["case"]
-                )
-
-            else:
-                prepositions_formatted[prep_vals["preposition"]] += "/" + map_cases(
-                    prep_vals["case"]
-                )
-
-        elif (
-            "case" not in prep_vals.keys() and prep_vals["preposition"] != "a"
-        ):  # à is the correct preposition
-            prepositions_formatted[prep_vals["preposition"]] = ""
-
-for k in prepositions_formatted:
-    prepositions_formatted[k] = order_annotations(prepositions_formatted[k])
-
-    # Contracted versions of German prepositions (ex: an + dem = am).
-contractedGermanPrepositions = {
-    "am": "Acc/Dat",
-    "ans": "Acc/Dat",
-    "aufs": "Acc/Dat",
-    "beim": "Dat",
-    "durchs": "Acc",
-    "fürs": "Acc",
-    "hinters": "Acc/Dat",
-    "hinterm": "Acc/Dat",
-    "ins": "Acc/Dat",
-    "im": "Acc/Dat",
-    "übers": "Acc/Dat",
-    "überm": "Acc/Dat",
-    "ums": "Acc",
-    "unters": "Acc/Dat",
-    "unterm": "Acc/Dat",
-    "vom": "Dat",
-    "vors": "Acc/Dat",
-    "vorm": "Acc/Dat",
-    "zum": "Dat",
-    "zur": "Dat",
-}
-
-for p in contractedGermanPrepositions:
-    if p not in prepositions_formatted:
-        prepositions_formatted[p] = contractedGermanPrepositions[p]
-
-prepositions_formatted = collections.OrderedDict(sorted(prepositions_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=prepositions_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+def format_prepositions(prepositions_list: Iterable[dict]) -> dict:
+    """
+    Formats the German prepositions queried from Wikidata.
+
+    Parameters
+    ----------
+        prepositions_list : Iterable[dict]
+            The results of the prepositions queries with one dictionary per lexeme form.
+
+    Returns
+    -------
+        dict
+            The formatted prepositions sorted alphabetically.
+    """
+    prepositions_formatted = {}
+
+    for prep_vals in prepositions_list:
+        if "preposition" in prep_vals.keys():
+            if "case" in prep_vals.keys():
+                if prep_vals["preposition"] not in prepositions_formatted:
+                    prepositions_formatted[prep_vals["preposition"]] = map_cases(
+                        prep_vals["case"]
+                    )
+
+                else:
+                    prepositions_formatted[prep_vals["preposition"]] += "/" + map_cases(
+                        prep_vals["case"]
+                    )
+
+            elif (
+                "case" not in prep_vals.keys() and prep_vals["preposition"] != "a"
+            ):  # à is the correct preposition
+                prepositions_formatted[prep_vals["preposition"]] = ""
+
+    for k in prepositions_formatted:
+        prepositions_formatted[k] = order_annotations(prepositions_formatted[k])
+
+        # Contracted versions of German prepositions (ex: an + dem = am).
+    contractedGermanPrepositions = {
+        "am": "Acc/Dat",
+        "ans": "Acc/Dat",
+        "aufs": "Acc/Dat",
+        "beim": "Dat",
+        "durchs": "Acc",
+        "fürs": "Acc",
+        "hinters": "Acc/Dat",
+        "hinterm": "Acc/Dat",
+        "ins": "Acc/Dat",
+        "im": "Acc/Dat",
+        "übers": "Acc/Dat",
+        "überm": "Acc/Dat",
+        "ums": "Acc",
+        "unters": "Acc/Dat",
+        "unterm": "Acc/Dat",
+        "vom": "Dat",
+        "vors": "Acc/Dat",
+        "vorm": "Acc/Dat",
+        "zum": "Dat",
+        "zur": "Dat",
+    }
+
+    for p in contractedGermanPrepositions:
+        if p not in prepositions_formatted:
+            prepositions_formatted[p] = contractedGermanPrepositions[p]
+
+    prepositions_formatted = collections.OrderedDict(
+        sorted(prepositions_formatted.items())
+    )
+
+    return prepositions_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    prepositions_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_prepositions(prepositions_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
@@ -22,6 +22,7 @@ Formats the Italian nouns queried from Wikidata using query_nouns.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import (
     export_formatted_data,
@@ -33,37 +34,79 @@ from scribe_data.utils import (
 LANGUAGE = "Italian"
 DATA_TYPE = "nouns"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
 
-nouns_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
+def format_nouns(nouns_list: Iterable[dict]) -> dict:
+    """
+    Formats the Italian nouns queried from Wikidata.
 
-nouns_formatted = {}
+    Parameters
+    ----------
+        nouns_list : Iterable[dict]
+            The results of the nouns queries with one dictionary per lexeme form.
 
-for noun_vals in nouns_list:
-    if "singular" in noun_vals.keys():
-        if noun_vals["singular"] not in nouns_formatted:
-            nouns_formatted[noun_vals["singular"]] = {"plural": "", "form": ""}
+    Returns
+    -------
+        dict
+            The formatted nouns sorted alphabetically.
+    """
+    nouns_formatted = {}
 
-            if "gender" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]]["form"] = map_genders(
-                    noun_vals["gender"]
-                )
+    for noun_vals in nouns_list:
+        if "singular" in noun_vals.keys():
+            if noun_vals["singular"] not in nouns_formatted:
+                nouns_formatted[noun_vals["singular"]] = {"plural": "", "form": ""}
 
-            if "plural" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals["plural"]
+                if "gender" in noun_vals.keys():
+                    nouns_formatted[noun_vals["singular"]]["form"] = map_genders(
+                        noun_vals["gender"]
+                    )
 
-                if noun_vals["plural"] not in nouns_formatted:
-                    nouns_formatted[noun_vals["plural"]] = {
-                        "plural": "isPlural",
-                        "form": "PL",
-                    }
+                if "plural" in noun_vals.keys():
+                    nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals[
+                        "plural"
+                    ]
 
-                # Plural is same as singular.
-                else:
+                    if noun_vals["plural"] not in nouns_formatted:
+                        nouns_formatted[noun_vals["plural"]] = {
+                            "plural": "isPlural",
+                            "form": "PL",
+                        }
+
+                    # Plural is same as singular.
+                    else:
+                        nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals[
+                            "plural"
+                        ]
+                        nouns_formatted[noun_vals["singular"]]["form"] = (
+                            nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
+                        )
+
+            else:
+                if "gender" in noun_vals.keys():
+                    if (
+                        nouns_formatted[noun_vals["singular"]]["form"]
+                        != noun_vals["gender"]
+                    ):
+                        nouns_formatted[noun_vals["singular"]]["form"] += (
+                            "/" + map_genders(noun_vals["gender"])
+                        )
+
+                    elif nouns_formatted[noun_vals["singular"]]["gender"] == "":
+                        nouns_formatted[noun_vals["singular"]]["gender"] = map_genders(
+                            noun_vals["gender"]
+                        )
+
+        # Plural only noun.
+        elif "plural" in noun_vals.keys():
+            if noun_vals["plural"] not in nouns_formatted:
+                nouns_formatted[noun_vals["plural"]] = {
+                    "plural": "isPlural",
+                    "form": "PL",
+                }
+
+            # Plural is same as singular.
+            else:
+                if "singular" in noun_vals.keys():
                     nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals[
                         "plural"
                     ]
@@ -71,42 +114,26 @@ for noun_vals in nouns_list:
                         nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
                     )
 
-        else:
-            if "gender" in noun_vals.keys():
-                if (
-                    nouns_formatted[noun_vals["singular"]]["form"]
-                    != noun_vals["gender"]
-                ):
-                    nouns_formatted[noun_vals["singular"]]["form"] += "/" + map_genders(
-                        noun_vals["gender"]
-                    )
+    for k in nouns_formatted:
+        nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
 
-                elif nouns_formatted[noun_vals["singular"]]["gender"] == "":
-                    nouns_formatted[noun_vals["singular"]]["gender"] = map_genders(
-                        noun_vals["gender"]
-                    )
+    nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
 
-    # Plural only noun.
-    elif "plural" in noun_vals.keys():
-        if noun_vals["plural"] not in nouns_formatted:
-            nouns_formatted[noun_vals["plural"]] = {"plural": "isPlural", "form": "PL"}
-
-        # Plural is same as singular.
-        else:
-            if "singular" in noun_vals.keys():
-                nouns_formatted[noun_vals["singular"]]["plural"] = noun_vals["plural"]
-                nouns_formatted[noun_vals["singular"]]["form"] = (
-                    nouns_formatted[noun_vals["singular"]]["form"] + "/PL"
-                )
-
-for k in nouns_formatted:
-    nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
-
-nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=nouns_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+    return nouns_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    nouns_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_nouns(nouns_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
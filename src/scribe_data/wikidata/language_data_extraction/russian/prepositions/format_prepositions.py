@@ -22,6 +22,7 @@ Formats the Russian prepositions queried from Wikidata using query_prepositions.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import (
     export_formatted_data,
@@ -33,36 +34,57 @@ from scribe_data.utils import (
 LANGUAGE = "Russian"
 DATA_TYPE = "prepositions"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
 
-prepositions_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
+def format_prepositions(prepositions_list: Iterable[dict]) -> dict:
+    """
+    Formats the Russian prepositions queried from Wikidata.
 
-prepositions_formatted = {}
+    Parameters
+    ----------
+        prepositions_list : Iterable[dict]
+            The results of the prepositions queries with one dictionary per lexeme form.
 
-for prep_vals in prepositions_list:
-    if "preposition" in prep_vals.keys() and "case" in prep_vals.keys():
-        if prep_vals["preposition"] not in prepositions_formatted:
-            prepositions_formatted[prep_vals["preposition"]] = map_cases(
-                prep_vals["case"]
-            )
+    Returns
+    -------
+        dict
+            The formatted prepositions sorted alphabetically.
+    """
+    prepositions_formatted = {}
 
-        else:
-            prepositions_formatted[prep_vals["preposition"]] += "/" + map_cases(
-                prep_vals["case"]
-            )
+    for prep_vals in prepositions_list:
+        if "preposition" in prep_vals.keys() and "case" in prep_vals.keys():
+            if prep_vals["preposition"] not in prepositions_formatted:
+                prepositions_formatted[prep_vals["preposition"]] = map_cases(
+                    prep_vals["case"]
+                )
 
-for k in prepositions_formatted:
-    prepositions_formatted[k] = order_annotations(prepositions_formatted[k])
+            else:
+                prepositions_formatted[prep_vals["preposition"]] += "/" + map_cases(
+                    prep_vals["case"]
+                )
 
-prepositions_formatted = collections.OrderedDict(sorted(prepositions_formatted.items()))
+    for k in prepositions_formatted:
+        prepositions_formatted[k] = order_annotations(prepositions_formatted[k])
 
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=prepositions_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+    prepositions_formatted = collections.OrderedDict(
+        sorted(prepositions_formatted.items())
+    )
+
+    return prepositions_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    prepositions_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_prepositions(prepositions_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
@@ -22,6 +22,7 @@ Formats the Swedish nouns queried from Wikidata using query_nouns.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import (
     export_formatted_data,
@@ -33,153 +34,174 @@ from scribe_data.utils import (
 LANGUAGE = "Swedish"
 DATA_TYPE = "nouns"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
 
-nouns_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-nouns_formatted = {}
+def format_nouns(nouns_list: Iterable[dict]) -> dict:
+    """
+    Formats the Swedish nouns queried from Wikidata.
 
-for noun_vals in nouns_list:
-    if "nomIndefSingular" in noun_vals.keys():
-        if noun_vals["nomIndefSingular"] not in nouns_formatted:
-            nouns_formatted[noun_vals["nomIndefSingular"]] = {
-                "plural": "",
-                "form": "",
-            }
+    Parameters
+    ----------
+        nouns_list : Iterable[dict]
+            The results of the nouns queries with one dictionary per lexeme form.
 
-            if "gender" in noun_vals.keys():
-                nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = map_genders(
-                    noun_vals["gender"]
-                )
+    Returns
+    -------
+        dict
+            The formatted nouns sorted alphabetically.
+    """
+    nouns_formatted = {}
 
-            if "nomIndefPlural" in noun_vals.keys():
-                nouns_formatted[noun_vals["nomIndefSingular"]]["plural"] = noun_vals[
-                    "nomIndefPlural"
-                ]
+    for noun_vals in nouns_list:
+        if "nomIndefSingular" in noun_vals.keys():
+            if noun_vals["nomIndefSingular"] not in nouns_formatted:
+                nouns_formatted[noun_vals["nomIndefSingular"]] = {
+                    "plural": "",
+                    "form": "",
+                }
 
-                if noun_vals["nomIndefPlural"] not in nouns_formatted:
-                    nouns_formatted[noun_vals["nomIndefPlural"]] = {
-                        "plural": "isPlural",
-                        "form": "PL",
-                    }
+                if "gender" in noun_vals.keys():
+                    nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = (
+                        map_genders(noun_vals["gender"])
+                    )
 
-                # Plural is same as singular.
-                else:
+                if "nomIndefPlural" in noun_vals.keys():
                     nouns_formatted[noun_vals["nomIndefSingular"]]["plural"] = (
                         noun_vals["nomIndefPlural"]
                     )
-                    nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = (
-                        nouns_formatted[noun_vals["nomIndefSingular"]]["form"] + "/PL"
-                    )
 
-        else:
-            if "gender" in noun_vals.keys():
-                if (
-                    nouns_formatted[noun_vals["nomIndefSingular"]]["form"]
-                    != noun_vals["gender"]
-                ):
-                    nouns_formatted[noun_vals["nomIndefSingular"]]["form"] += (
-                        "/" + map_genders(noun_vals["gender"])
+                    if noun_vals["nomIndefPlural"] not in nouns_formatted:
+                        nouns_formatted[noun_vals["nomIndefPlural"]] = {
+                            "plural": "isPlural",
+                            "form": "PL",
+                        }
+
+                    # Plural is same as singular.
+                    else:
+                        nouns_formatted[noun_vals["nomIndefSingular"]]["plural"] = (
+                            noun_vals["nomIndefPlural"]
+                        )
+                        nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = (
+                            nouns_formatted[noun_vals["nomIndefSingular"]]["form"]
+                            + "/PL"
+                        )
+
+            else:
+                if "gender" in noun_vals.keys():
+                    if (
+                        nouns_formatted[noun_vals["nomIndefSingular"]]["form"]
+                        != noun_vals["gender"]
+                    ):
+                        nouns_formatted[noun_vals["nomIndefSingular"]]["form"] += (
+                            "/" + map_genders(noun_vals["gender"])
+                        )
+
+                    elif nouns_formatted[noun_vals["nomIndefSingular"]]["gender"] == "":
+                        nouns_formatted[noun_vals["nomIndefSingular"]]["gender"] = (
+                            map_genders(noun_vals["gender"])
+                        )
+
+        elif "genIndefSingular" in noun_vals.keys():
+            if noun_vals["genIndefSingular"] not in nouns_formatted:
+                nouns_formatted[noun_vals["genIndefSingular"]] = {
+                    "plural": "",
+                    "form": "",
+                }
+
+                if "gender" in noun_vals.keys():
+                    nouns_formatted[noun_vals["genIndefSingular"]]["form"] = (
+                        map_genders(noun_vals["gender"])
                     )
 
-                elif nouns_formatted[noun_vals["nomIndefSingular"]]["gender"] == "":
-                    nouns_formatted[noun_vals["nomIndefSingular"]]["gender"] = (
-                        map_genders(noun_vals["gender"])
+                if "genIndefPlural" in noun_vals.keys():
+                    nouns_formatted[noun_vals["genIndefSingular"]]["plural"] = (
+                        noun_vals["genIndefPlural"]
                     )
 
-    elif "genIndefSingular" in noun_vals.keys():
-        if noun_vals["genIndefSingular"] not in nouns_formatted:
-            nouns_formatted[noun_vals["genIndefSingular"]] = {
-                "plural": "",
-                "form": "",
-            }
+                    if noun_vals["genIndefPlural"] not in nouns_formatted:
+                        nouns_formatted[noun_vals["genIndefPlural"]] = {
+                            "plural": "isPlural",
+                            "form": "PL",
+                        }
+
+                    # Plural is same as singular.
+                    else:
+                        nouns_formatted[noun_vals["genIndefSingular"]]["plural"] = (
+                            noun_vals["genIndefPlural"]
+                        )
+                        nouns_formatted[noun_vals["genIndefSingular"]]["form"] = (
+                            nouns_formatted[noun_vals["genIndefSingular"]]["form"]
+                            + "/PL"
+                        )
+
+            else:
+                if "gender" in noun_vals.keys():
+                    if (
+                        nouns_formatted[noun_vals["genIndefSingular"]]["form"]
+                        != noun_vals["gender"]
+                    ):
+                        nouns_formatted[noun_vals["genIndefSingular"]]["form"] += (
+                            "/" + map_genders(noun_vals["gender"])
+                        )
+
+                    elif nouns_formatted[noun_vals["genIndefSingular"]]["gender"] == "":
+                        nouns_formatted[noun_vals["genIndefSingular"]]["gender"] = (
+                            map_genders(noun_vals["gender"])
+                        )
+
+        # Plural only noun.
+        elif "nomIndefPlural" in noun_vals.keys():
+            if noun_vals["nomIndefPlural"] not in nouns_formatted:
+                nouns_formatted[noun_vals["nomIndefPlural"]] = {
+                    "plural": "isPlural",
+                    "form": "PL",
+                }
+
+            # Plural is same as singular.
+            else:
+                nouns_formatted[noun_vals["nomIndefSingular"]]["nomIndefPlural"] = (
+                    noun_vals["nomIndefPlural"]
+                )
+                nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = (
+                    nouns_formatted[noun_vals["nomIndefSingular"]]["form"] + "/PL"
+                )
 
-            if "gender" in noun_vals.keys():
-                nouns_formatted[noun_vals["genIndefSingular"]]["form"] = map_genders(
-                    noun_vals["gender"]
+        # Plural only noun.
+        elif "genIndefPlural" in noun_vals.keys():
+            if noun_vals["genIndefPlural"] not in nouns_formatted:
+                nouns_formatted[noun_vals["genIndefPlural"]] = {
+                    "plural": "isPlural",
+                    "form": "PL",
+                }
+
+            # Plural is same as singular.
+            else:
+                nouns_formatted[noun_vals["genIndefSingular"]]["genIndefPlural"] = (
+                    noun_vals["genIndefPlural"]
+                )
+                nouns_formatted[noun_vals["genIndefSingular"]]["form"] = (
+                    nouns_formatted[noun_vals["genIndefSingular"]]["form"] + "/PL"
                 )
 
-            if "genIndefPlural" in noun_vals.keys():
-                nouns_formatted[noun_vals["genIndefSingular"]]["plural"] = noun_vals[
-                    "genIndefPlural"
-                ]
+    for k in nouns_formatted:
+        nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
 
-                if noun_vals["genIndefPlural"] not in nouns_formatted:
-                    nouns_formatted[noun_vals["genIndefPlural"]] = {
-                        "plural": "isPlural",
-                        "form": "PL",
-                    }
+    nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
 
-                # Plural is same as singular.
-                else:
-                    nouns_formatted[noun_vals["genIndefSingular"]]["plural"] = (
-                        noun_vals["genIndefPlural"]
-                    )
-                    nouns_formatted[noun_vals["genIndefSingular"]]["form"] = (
-                        nouns_formatted[noun_vals["genIndefSingular"]]["form"] + "/PL"
-                    )
+    return nouns_formatted
 
-        else:
-            if "gender" in noun_vals.keys():
-                if (
-                    nouns_formatted[noun_vals["genIndefSingular"]]["form"]
-                    != noun_vals["gender"]
-                ):
-                    nouns_formatted[noun_vals["genIndefSingular"]]["form"] += (
-                        "/" + map_genders(noun_vals["gender"])
-                    )
 
-                elif nouns_formatted[noun_vals["genIndefSingular"]]["gender"] == "":
-                    nouns_formatted[noun_vals["genIndefSingular"]]["gender"] = (
-                        map_genders(noun_vals["gender"])
-                    )
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
 
-    # Plural only noun.
-    elif "nomIndefPlural" in noun_vals.keys():
-        if noun_vals["nomIndefPlural"] not in nouns_formatted:
-            nouns_formatted[noun_vals["nomIndefPlural"]] = {
-                "plural": "isPlural",
-                "form": "PL",
-            }
-
-        # Plural is same as singular.
-        else:
-            nouns_formatted[noun_vals["nomIndefSingular"]]["nomIndefPlural"] = (
-                noun_vals["nomIndefPlural"]
-            )
-            nouns_formatted[noun_vals["nomIndefSingular"]]["form"] = (
-                nouns_formatted[noun_vals["nomIndefSingular"]]["form"] + "/PL"
-            )
-
-    # Plural only noun.
-    elif "genIndefPlural" in noun_vals.keys():
-        if noun_vals["genIndefPlural"] not in nouns_formatted:
-            nouns_formatted[noun_vals["genIndefPlural"]] = {
-                "plural": "isPlural",
-                "form": "PL",
-            }
-
-        # Plural is same as singular.
-        else:
-            nouns_formatted[noun_vals["genIndefSingular"]]["genIndefPlural"] = (
-                noun_vals["genIndefPlural"]
-            )
-            nouns_formatted[noun_vals["genIndefSingular"]]["form"] = (
-                nouns_formatted[noun_vals["genIndefSingular"]]["form"] + "/PL"
-            )
-
-for k in nouns_formatted:
-    nouns_formatted[k]["form"] = order_annotations(nouns_formatted[k]["form"])
-
-nouns_formatted = collections.OrderedDict(sorted(nouns_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=nouns_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+    nouns_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_nouns(nouns_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
@@ -22,56 +22,76 @@ Formats the Swedish verbs queried from Wikidata using query_verbs.sparql.
 
 import argparse
 import collections
+from collections.abc import Iterable
 
 from scribe_data.utils import export_formatted_data, load_queried_data
 
 LANGUAGE = "Swedish"
 DATA_TYPE = "verbs"
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--file-path")
-args = parser.parse_args()
-
-verbs_list, data_path = load_queried_data(
-    file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
-)
-
-verbs_formatted = {}
-
-# Any verbs occurring more than once will for now be deleted.
-verbs_not_included = []
-
-all_conjugations = [
-    "activeInfinitive",
-    "imperative",
-    "activeSupine",
-    "activePresent",
-    "activePreterite",
-    "passiveInfinitive",
-    "passiveSupine",
-    "passivePresent",
-    "passivePreterite",
-]
-
-for verb_vals in verbs_list:
-    if (
-        verb_vals["activeInfinitive"] not in verbs_formatted
-        and verb_vals["activeInfinitive"] not in verbs_not_included
-    ):
-        verbs_formatted[verb_vals["activeInfinitive"]] = {
-            conj: verb_vals[conj] if conj in verb_vals.keys() else ""
-            for conj in [c for c in all_conjugations if c != "activeInfinitive"]
-        }
-
-    elif verb_vals["activeInfinitive"] in verbs_formatted:
-        verbs_not_included.append(verb_vals["activeInfinitive"])
-        del verbs_formatted[verb_vals["activeInfinitive"]]
-
-verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
-
-export_formatted_data(
-    file_path=args.file_path,
-    formatted_data=verbs_formatted,
-    language=LANGUAGE,
-    data_type=DATA_TYPE,
-)
+
+def format_verbs(verbs_list: Iterable[dict]) -> dict:
+    """
+    Formats the Swedish verbs queried from Wikidata.
+
+    Parameters
+    ----------
+        verbs_list : Iterable[dict]
+            The results of the verbs queries with one dictionary per lexeme form.
+
+    Returns
+    -------
+        dict
+            The formatted verbs sorted alphabetically.
+    """
+    verbs_formatted = {}
+
+    # Any verbs occurring more than once will for now be deleted.
+    verbs_not_included = []
+
+    all_conjugations = [
+        "activeInfinitive",
+        "imperative",
+        "activeSupine",
+        "activePresent",
+        "activePreterite",
+        "passiveInfinitive",
+        "passiveSupine",
+        "passivePresent",
+        "passivePreterite",
+    ]
+
+    for verb_vals in verbs_list:
+        if (
+            verb_vals["activeInfinitive"] not in verbs_formatted
+            and verb_vals["activeInfinitive"] not in verbs_not_included
+        ):
+            verbs_formatted[verb_vals["activeInfinitive"]] = {
+                conj: verb_vals[conj] if conj in verb_vals.keys() else ""
+                for conj in [c for c in all_conjugations if c != "activeInfinitive"]
+            }
+
+        elif verb_vals["activeInfinitive"] in verbs_formatted:
+            verbs_not_included.append(verb_vals["activeInfinitive"])
+            del verbs_formatted[verb_vals["activeInfinitive"]]
+
+    verbs_formatted = collections.OrderedDict(sorted(verbs_formatted.items()))
+
+    return verbs_formatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-path")
+    args = parser.parse_args()
+
+    verbs_list, data_path = load_queried_data(
+        file_path=args.file_path, language=LANGUAGE, data_type=DATA_TYPE
+    )
+
+    export_formatted_data(
+        file_path=args.file_path,
+        formatted_data=format_verbs(verbs_list),
+        language=LANGUAGE,
+        data_type=DATA_TYPE,
+    )
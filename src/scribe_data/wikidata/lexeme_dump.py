@@ -0,0 +1,658 @@
+"""
+Selects the data of all queries in a single pass over a Wikidata lexeme JSON dump as an alternative to WDQS.
+
+The dump's bz2 blocks are located by their bit aligned magic numbers so that worker processes can decompress and parse them independently, with lexemes that are split across blocks joined back together in the main process.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import bz2
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from tqdm.auto import tqdm
+
+from scribe_data.check.check_query_forms import (
+    extract_form_qids,
+    extract_form_rep_label,
+    extract_forms_from_sparql,
+)
+from scribe_data.utils import lexeme_form_metadata
+from scribe_data.wikidata.query_pagination import COMMENT_LINE, projected_variables
+from scribe_data.wikidata.query_scheduler import QueryGroup
+
+ENTITY_PREFIX = "http://www.wikidata.org/entity/"
+DEFAULT_BLOCKS_PER_SEGMENT = 8
+
+BLOCK_MAGIC = 0x314159265359
+END_OF_STREAM_MAGIC = 0x177245385090
+
+LANGUAGE_QID = re.compile(r"dct:language\s+wd:(Q\d+)")
+LEXICAL_CATEGORY_QID = re.compile(r"wikibase:lexicalCategory\s+wd:(Q\d+)")
+LEMMA = re.compile(r"wikibase:lemma\s+\?(\w+)")
+FORM = re.compile(
+    r"ontolex:representation\s+\?(\w+)\s*;\s*wikibase:grammaticalFeature\s+([^.]*?)\s*\."
+)
+CLAIM = re.compile(r"\?lexeme\s+wdt:(P\d+)\s+\?(\w+)")
+ENTITY_ID = re.compile(
+    r"REPLACE\s*\(\s*STR\s*\(\s*\?(\w+)\s*\)\s*,[^)]*\)\s+AS\s+\?(\w+)", re.IGNORECASE
+)
+LABEL = re.compile(r"\?(\w+)\s+rdfs:label\s+\?(\w+)")
+LANGUAGE_FILTER = re.compile(
+    r"FILTER\s*\(\s*LANG\s*\(\s*\?(\w+)\s*\)\s*=\s*\"([^\"]+)\"\s*\)", re.IGNORECASE
+)
+SERVICE_BLOCK = re.compile(r"SERVICE\s+wikibase:label\s*\{.*?\}\s*\}", re.DOTALL)
+OPTIONAL_BLOCK = re.compile(r"\s\sOPTIONAL\s*\{[^}]*\}")
+LEXEME_LANGUAGE = re.compile(rb'"language"\s*:\s*"(Q\d+)"')
+
+# Note: WDQS labels grammatical feature items in English, which the formatters map (e.g. masculine).
+FEATURE_LABELS = {
+    value["qid"]: re.sub(r"(?<!^)(?=[A-Z])", " ", value["label"]).lower()
+    for category in lexeme_form_metadata.values()
+    for value in category.values()
+}
+
+
+# MARK: Selectors
+
+
+@dataclass(frozen=True)
+class FormSelector:
+    """
+    A form of a lexeme that's selected by its grammatical features.
+    """
+
+    variable: str
+    features: frozenset[str]
+    required: bool
+    language_code: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ClaimSelector:
+    """
+    A statement of a lexeme that's selected by its property.
+    """
+
+    variable: str
+    property_id: str
+    required: bool
+
+
+@dataclass(frozen=True)
+class LexemeSelector:
+    """
+    The parts of a query that can be evaluated against the lexemes of a dump.
+    """
+
+    language: str
+    lexical_category: str
+    variables: tuple[str, ...]
+    lemma: Optional[str] = None
+    lemma_language_code: Optional[str] = None
+    forms: tuple[FormSelector, ...] = ()
+    claims: tuple[ClaimSelector, ...] = ()
+    entity_ids: tuple[tuple[str, str], ...] = ()
+    labels: tuple[tuple[str, str], ...] = ()
+
+
+def compile_query(query_file: Path) -> Optional[LexemeSelector]:
+    """
+    Derives the lexeme selection of a query from its language, lexical category, lemma, forms and statements.
+
+    OPTIONAL forms are read with the same functions that check_query_forms uses, so forms are selected by the same grammatical feature QIDs that are checked there.
+
+    Parameters
+    ----------
+        query_file : Path
+            The path to the SPARQL query.
+
+    Returns
+    -------
+        LexemeSelector or None
+            The selection of the query, or None if it doesn't select lexemes of a language and lexical category.
+    """
+    with open(query_file, encoding="utf-8") as f:
+        query = COMMENT_LINE.sub("", f.read())
+
+    language = LANGUAGE_QID.search(query)
+    lexical_category = LEXICAL_CATEGORY_QID.search(query)
+    if language is None or lexical_category is None:
+        return None
+
+    language_codes = dict(LANGUAGE_FILTER.findall(query))
+
+    forms = []
+    optional_claims = set()
+    for block in extract_forms_from_sparql(query_file) or []:
+        if (label := extract_form_rep_label(block)) and (
+            qids := extract_form_qids(block)
+        ):
+            forms.append(
+                FormSelector(
+                    variable=label,
+                    features=frozenset(qids),
+                    required=False,
+                    language_code=language_codes.get(label),
+                )
+            )
+
+        optional_claims.update(variable for _, variable in CLAIM.findall(block))
+
+    required_part = OPTIONAL_BLOCK.sub("", SERVICE_BLOCK.sub("", query))
+    for variable, features in FORM.findall(required_part):
+        forms.append(
+            FormSelector(
+                variable=variable,
+                features=frozenset(re.findall(r"wd:(Q\d+)", features)),
+                required=True,
+                language_code=language_codes.get(variable),
+            )
+        )
+
+    claims = {
+        variable: ClaimSelector(
+            variable=variable,
+            property_id=property_id,
+            required=variable not in optional_claims,
+        )
+        for property_id, variable in CLAIM.findall(query)
+    }
+
+    lemma = LEMMA.search(query)
+    service = SERVICE_BLOCK.search(query)
+
+    return LexemeSelector(
+        language=language[1],
+        lexical_category=lexical_category[1],
+        variables=tuple(projected_variables(query)),
+        lemma=lemma[1] if lemma else None,
+        lemma_language_code=language_codes.get(lemma[1]) if lemma else None,
+        forms=tuple(forms),
+        claims=tuple(claims.values()),
+        entity_ids=tuple(
+            (target, source) for source, target in ENTITY_ID.findall(query)
+        ),
+        labels=tuple(
+            (target, source)
+            for source, target in LABEL.findall(service[0] if service else "")
+        ),
+    )
+
+
+# MARK: Evaluation
+
+
+def pick_representation(
+    representations: dict, language_code: Optional[str] = None
+) -> Optional[str]:
+    """
+    Returns the spelling of a lemma or form in the given language code or its first one.
+    """
+    if language_code is not None:
+        return representations.get(language_code, {}).get("value")
+
+    return next((r["value"] for r in representations.values()), None)
+
+
+def claim_values(statements: list[dict]) -> list[str]:
+    """
+    Returns the values of the best ranked statements of a property as WDQS returns them for wdt: triples.
+    """
+    ranks = {s.get("rank", "normal") for s in statements}
+    best_rank = "preferred" if "preferred" in ranks else "normal"
+
+    values = []
+    for statement in statements:
+        snak = statement.get("mainsnak", {})
+        if statement.get("rank", "normal") != best_rank or "datavalue" not in snak:
+            continue
+
+        value = snak["datavalue"]["value"]
+        if isinstance(value, dict) and "id" in value:
+            values.append(ENTITY_PREFIX + value["id"])
+
+        elif isinstance(value, dict) and "text" in value:
+            values.append(value["text"])
+
+        else:
+            values.append(str(value))
+
+    return values
+
+
+def entity_label(value: str) -> str:
+    """
+    Returns the label that the WDQS label service gives an entity, which is its ID for entities without known labels.
+    """
+    entity_id = value.removeprefix(ENTITY_PREFIX)
+    return FEATURE_LABELS.get(entity_id, entity_id)
+
+
+def select_rows(selector: LexemeSelector, lexeme: dict) -> list[dict]:
+    """
+    Returns the rows that a query would return for a lexeme.
+
+    Forms and lemmas with several spellings give their first (or filtered) spelling, while statements with several values give a row for each as they do on WDQS.
+
+    Parameters
+    ----------
+        selector : LexemeSelector
+            The compiled query.
+
+        lexeme : dict
+            The lexeme from the dump.
+
+    Returns
+    -------
+        list[dict]
+            Rows with the values of the query's selected variables, which are empty if the lexeme doesn't match.
+    """
+    values = {"lexeme": ENTITY_PREFIX + lexeme["id"]}
+
+    if selector.lemma is not None:
+        lemma = pick_representation(
+            lexeme.get("lemmas", {}), selector.lemma_language_code
+        )
+        if lemma is None:
+            return []
+
+        values[selector.lemma] = lemma
+
+    for form_selector in selector.forms:
+        representation = None
+        for form in lexeme.get("forms", []):
+            if form_selector.features <= set(form.get("grammaticalFeatures", ())):
+                representation = pick_representation(
+                    form.get("representations", {}), form_selector.language_code
+                )
+                if representation is not None:
+                    break
+
+        if representation is not None:
+            values[form_selector.variable] = representation
+
+        elif form_selector.required:
+            return []
+
+    all_claim_values = []
+    for claim in selector.claims:
+        claim_vals = claim_values(lexeme.get("claims", {}).get(claim.property_id, []))
+        if not claim_vals and claim.required:
+            return []
+
+        all_claim_values.append(claim_vals or [None])
+
+    rows = []
+    for combination in itertools.product(*all_claim_values):
+        row_values = dict(values)
+        for claim, value in zip(selector.claims, combination):
+            if value is not None:
+                row_values[claim.variable] = value
+
+        for target, source in selector.entity_ids:
+            if source in row_values:
+                row_values[target] = row_values[source].removeprefix(ENTITY_PREFIX)
+
+        for target, source in selector.labels:
+            if source in row_values:
+                row_values[target] = entity_label(row_values[source])
+
+        rows.append({v: row_values[v] for v in selector.variables if v in row_values})
+
+    return rows
+
+
+class LexemeMatcher:
+    """
+    Evaluates all selectors against lexemes, looking up those that apply by language and lexical category.
+    """
+
+    def __init__(self, selectors: list[Optional[LexemeSelector]]) -> None:
+        """
+        Parameters
+        ----------
+            selectors : list[LexemeSelector]
+                The compiled queries, where None entries are never matched.
+        """
+        self.index = {}
+        for idx, selector in enumerate(selectors):
+            if selector is not None:
+                key = (selector.language, selector.lexical_category)
+                self.index.setdefault(key, []).append((idx, selector))
+
+        self.languages = {language.encode() for language, _ in self.index}
+
+    def match_line(self, line: bytes) -> list[tuple[int, str]]:
+        """
+        Returns the rows of a line of the dump as JSON with the index of the selector that they're for.
+        """
+        line = line.strip().rstrip(b",")
+        # Lexemes of other languages are skipped before they're parsed.
+        if (
+            not line.startswith(b"{")
+            or (language := LEXEME_LANGUAGE.search(line)) is None
+            or language[1] not in self.languages
+        ):
+            return []
+
+        lexeme = json.loads(line)
+        key = (lexeme.get("language"), lexeme.get("lexicalCategory"))
+
+        return [
+            (idx, json.dumps(row, ensure_ascii=False))
+            for idx, selector in self.index.get(key, [])
+            for row in select_rows(selector, lexeme)
+        ]
+
+
+# MARK: bz2 Blocks
+
+
+def _magic_patterns(magic: int) -> list[tuple[int, bytes]]:
+    """
+    Returns the bytes that are fixed when a 48 bit magic number starts at each of the eight bit offsets within a byte.
+    """
+    patterns = []
+    for shift in range(8):
+        n_bytes = (shift + 48 + 7) // 8
+        value = (magic << (n_bytes * 8 - shift - 48)).to_bytes(n_bytes, "big")
+        start = 1 if shift else 0
+        end = n_bytes if (shift + 48) % 8 == 0 else n_bytes - 1
+        patterns.append((shift, value[start:end]))
+
+    return patterns
+
+
+def _read_bits(data, start_bit: int, n_bits: int) -> int:
+    """
+    Returns n_bits of data starting at a bit offset as an integer.
+    """
+    first_byte = start_bit // 8
+    last_byte = (start_bit + n_bits + 7) // 8
+    value = int.from_bytes(data[first_byte:last_byte], "big")
+    trailing_bits = last_byte * 8 - start_bit - n_bits
+    return (value >> trailing_bits) & ((1 << n_bits) - 1)
+
+
+def _find_magic(data, magic: int) -> list[int]:
+    """
+    Returns the bit offsets of a magic number in data.
+    """
+    offsets = set()
+    for shift, pattern in _magic_patterns(magic):
+        idx = data.find(pattern)
+        while idx != -1:
+            bit = (idx - (1 if shift else 0)) * 8 + shift
+            if bit >= 0 and _read_bits(data, bit, 48) == magic:
+                offsets.add(bit)
+
+            idx = data.find(pattern, idx + 1)
+
+    return sorted(offsets)
+
+
+def find_bz2_blocks(data) -> list[tuple[int, int]]:
+    """
+    Locates the compressed blocks of bz2 data, including data with several concatenated streams.
+
+    Parameters
+    ----------
+        data : bytes or mmap
+            The compressed data.
+
+    Returns
+    -------
+        list[tuple[int, int]]
+            The start and end bit offsets of each block in order.
+    """
+    if data[:3] != b"BZh":
+        raise ValueError("The dump file is not bz2 compressed.")
+
+    block_starts = _find_magic(data, BLOCK_MAGIC)
+    boundaries = sorted(block_starts + _find_magic(data, END_OF_STREAM_MAGIC))
+    next_boundary = dict(zip(boundaries, boundaries[1:] + [len(data) * 8]))
+
+    return [(start, next_boundary[start]) for start in block_starts]
+
+
+def decompress_block(data, start_bit: int, end_bit: int) -> bytes:
+    """
+    Decompresses a single bz2 block by wrapping it in a stream of its own.
+
+    Parameters
+    ----------
+        data : bytes or mmap
+            The compressed data that contains the block.
+
+        start_bit : int
+            The bit offset of the block's magic number.
+
+        end_bit : int
+            The bit offset where the block ends.
+
+    Returns
+    -------
+        bytes
+            The decompressed block.
+    """
+    n_bits = end_bit - start_bit
+    block = _read_bits(data, start_bit, n_bits)
+    # The stream CRC of a stream with one block is the block's CRC, which directly follows its magic number.
+    block_crc = _read_bits(data, start_bit + 48, 32)
+
+    stream = (int.from_bytes(b"BZh9", "big") << n_bits) | block
+    stream = (stream << 80) | (END_OF_STREAM_MAGIC << 32) | block_crc
+    total_bits = 32 + n_bits + 80
+    padding = -total_bits % 8
+
+    return bz2.decompress(
+        (stream << padding).to_bytes((total_bits + padding) // 8, "big")
+    )
+
+
+# MARK: Workers
+
+
+_matcher: Optional[LexemeMatcher] = None
+
+
+def _init_worker(selectors: list[Optional[LexemeSelector]]) -> None:
+    global _matcher
+    _matcher = LexemeMatcher(selectors)
+
+
+def _match_segment(
+    args: tuple[str, list[tuple[int, int]]],
+) -> tuple[bytes, list[tuple[int, str]], Optional[bytes]]:
+    """
+    Decompresses consecutive blocks of the dump and matches the lines that are complete within them.
+
+    Returns
+    -------
+        tuple(bytes, list, bytes or None)
+            The text before the first line break, the matched rows and the text after the last line break, which is None if there's no line break.
+    """
+    dump_file, blocks = args
+    with (
+        open(dump_file, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        text = b"".join(decompress_block(data, start, end) for start, end in blocks)
+
+    if (first_break := text.find(b"\n")) == -1:
+        return text, [], None
+
+    last_break = text.rfind(b"\n")
+    rows = [
+        row
+        for line in text[first_break + 1 : last_break].split(b"\n")
+        for row in _matcher.match_line(line)
+    ]
+
+    return text[:first_break], rows, text[last_break + 1 :]
+
+
+def iter_dump_rows(
+    dump_file: Path,
+    selectors: list[Optional[LexemeSelector]],
+    workers: Optional[int] = None,
+    blocks_per_segment: int = DEFAULT_BLOCKS_PER_SEGMENT,
+) -> Iterator[tuple[int, str]]:
+    """
+    Yields the rows of all selectors for the lexemes of a dump in the order of the dump.
+
+    Parameters
+    ----------
+        dump_file : Path
+            The path to the lexeme JSON dump, which is decompressed in parallel if it's bz2 compressed.
+
+        selectors : list[LexemeSelector]
+            The compiled queries.
+
+        workers : int (default=None)
+            The number of worker processes, with None using one per CPU and 1 reading the dump in this process.
+
+        blocks_per_segment : int (default=DEFAULT_BLOCKS_PER_SEGMENT)
+            The number of bz2 blocks that are given to a worker at once.
+
+    Returns
+    -------
+        Iterator[tuple[int, str]]
+            The index of the selector and the row as JSON.
+    """
+    dump_file = Path(dump_file)
+    workers = workers or os.cpu_count() or 1
+    matcher = LexemeMatcher(selectors)
+
+    if workers == 1 or dump_file.suffix != ".bz2":
+        opener = bz2.open if dump_file.suffix == ".bz2" else open
+        with opener(dump_file, "rb") as f:
+            for line in tqdm(f, desc="Dump lexemes", unit="line", leave=False):
+                yield from matcher.match_line(line)
+
+        return
+
+    with (
+        open(dump_file, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        blocks = find_bz2_blocks(data)
+
+    segments = [
+        (str(dump_file), blocks[i : i + blocks_per_segment])
+        for i in range(0, len(blocks), blocks_per_segment)
+    ]
+
+    # Lines that cross segments are carried over and matched here once their end arrives.
+    carry = b""
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_worker, initargs=(selectors,)
+    ) as pool:
+        for head, rows, tail in tqdm(
+            pool.imap(_match_segment, segments),
+            total=len(segments),
+            desc="Dump blocks",
+            unit="segment",
+            leave=False,
+        ):
+            if tail is None:
+                carry += head
+                continue
+
+            yield from matcher.match_line(carry + head)
+            yield from rows
+            carry = tail
+
+    yield from matcher.match_line(carry)
+
+
+def run_dump(
+    groups: Iterable[QueryGroup], dump_file: Path, workers: Optional[int] = None
+) -> list[tuple[QueryGroup, list[Optional[Path]]]]:
+    """
+    Selects the results of all query groups in one pass over a dump and spools them like streamed WDQS results.
+
+    Parameters
+    ----------
+        groups : Iterable[QueryGroup]
+            The groups of queries to select results for.
+
+        dump_file : Path
+            The path to the lexeme JSON dump.
+
+        workers : int (default=None)
+            The number of worker processes (see iter_dump_rows).
+
+    Returns
+    -------
+        list[tuple[QueryGroup, list]]
+            Each group with the paths to the spooled rows of its query files, where queries that can't be evaluated are None.
+    """
+    groups = list(groups)
+    query_files = [f for group in groups for f in group.query_files]
+    selectors = [compile_query(f) for f in query_files]
+
+    for query_file, selector in zip(query_files, selectors):
+        if selector is None:
+            print(f"The query {query_file} can't be evaluated against the dump.")
+
+    spooled = []
+    files = []
+    try:
+        for selector in selectors:
+            if selector is None:
+                spooled.append(None)
+                files.append(None)
+                continue
+
+            fd, path = tempfile.mkstemp(prefix="scribe_data_", suffix=".ndjson")
+            spooled.append(Path(path))
+            files.append(os.fdopen(fd, "w", encoding="utf-8"))
+
+        for idx, row in iter_dump_rows(dump_file, selectors, workers=workers):
+            files[idx].write(row)
+            files[idx].write("\n")
+
+    except BaseException:
+        for path in spooled:
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+        raise
+
+    finally:
+        for f in files:
+            if f is not None:
+                f.close()
+
+    results = []
+    parts = iter(spooled)
+    for group in groups:
+        results.append((group, [next(parts) for _ in group.query_files]))
+
+    return results
@@ -21,23 +21,38 @@ Updates data for Scribe by running all or desired WDQS queries and formatting sc
     -->
 """
 
-import json
+import importlib
+import io
 import os
+import re
 import subprocess
 import sys
-from http.client import IncompleteRead
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from urllib.error import HTTPError
 
 from tqdm.auto import tqdm
 
+from scribe_data.serializers import (
+    export_format,
+    open_export_file,
+    parse_export_path,
+    write_data,
+)
 from scribe_data.utils import (
+    DEFAULT_JSON_EXPORT_DIR,
     LANGUAGE_DATA_EXTRACTION_DIR,
+    export_formatted_data,
     format_sublanguage_name,
     language_metadata,
     list_all_languages,
 )
-from scribe_data.wikidata.wikidata_utils import sparql
+from scribe_data.wikidata.lexeme_dump import run_dump
+from scribe_data.wikidata.query_scheduler import (
+    DEFAULT_MAX_WORKERS,
+    QueryGroup,
+    QueryScheduler,
+)
+from scribe_data.wikidata.sparql_results import JSONRowWriter, read_spooled_rows
 
 
 def execute_formatting_script(formatting_file_path, output_dir):
@@ -66,6 +81,10 @@ def execute_formatting_script(formatting_file_path, output_dir):
     env = os.environ.copy()
     env["PYTHONPATH"] = str(project_root)
 
+    # Pass the export format so that the script writes the same files as formatters run in this process.
+    env["SCRIBE_DATA_SERIALIZER"] = export_format.serializer
+    env["SCRIBE_DATA_COMPRESSION"] = export_format.compression or ""
+
     # Use subprocess to run the formatting file.
     subprocess.run(
         [python_executable, str(formatting_file_path), "--file-path", output_dir],
@@ -74,12 +93,235 @@ def execute_formatting_script(formatting_file_path, output_dir):
     )
 
 
+def get_formatter(lang: str, data_type: str):
+    """
+    Returns the formatting function for a language and data type if one can be imported.
+
+    Parameters
+    ----------
+        lang : str
+            The language directory in language_data_extraction (e.g. 'german' or 'norwegian/bokmål').
+
+        data_type : str
+            The data type to format.
+
+    Returns
+    -------
+        tuple(Callable, str) or None
+            The function format_<data_type> and the LANGUAGE of its module, or None if there is none.
+    """
+    module_name = ".".join(
+        ["scribe_data.wikidata.language_data_extraction"]
+        + lang.split("/")
+        + [data_type, f"format_{data_type}"]
+    )
+    try:
+        module = importlib.import_module(module_name)
+
+    except ModuleNotFoundError as e:
+        # Only a missing formatter means there's none, while errors within one (e.g. a missing dependency) are raised.
+        if e.name == module_name or module_name.startswith(f"{e.name}."):
+            return None
+
+        raise
+
+    formatter = getattr(module, f"format_{data_type}", None)
+    if formatter is None or not hasattr(module, "LANGUAGE"):
+        return None
+
+    return formatter, module.LANGUAGE
+
+
+def format_query_results(
+    lang: str, data_type: str, results: Iterable[dict], output_dir: str
+) -> bool:
+    """
+    Formats query results in this process and exports them to the output directory.
+
+    Parameters
+    ----------
+        lang : str
+            The language directory in language_data_extraction.
+
+        data_type : str
+            The data type of the results.
+
+        results : Iterable[dict]
+            The merged results of the data type's queries, which are only consumed if a formatter exists.
+
+        output_dir : str
+            The output directory path for results.
+
+    Returns
+    -------
+        bool
+            Whether the results were formatted, with False meaning that the formatting script should be run instead.
+    """
+    if (formatter := get_formatter(lang=lang, data_type=data_type)) is None:
+        return False
+
+    format_data_type, formatter_language = formatter
+    export_formatted_data(
+        file_path=output_dir,
+        formatted_data=format_data_type(results),
+        language=formatter_language,
+        data_type=data_type,
+    )
+
+    return True
+
+
+def export_query_results(
+    rows: Iterable[dict], export_dir: Path, data_type: str
+) -> Path:
+    """
+    Exports query results that have no formatter in this process in the configured export format.
+
+    Parameters
+    ----------
+        rows : Iterable[dict]
+            The results to export.
+
+        export_dir : Path
+            The directory of the exports of the language.
+
+        data_type : str
+            The data type of the results.
+
+    Returns
+    -------
+        Path
+            The path of the exported file.
+    """
+    export_path = export_dir / f"{data_type}{export_format.suffix}"
+    if export_format.serializer != "json":
+        return write_data(
+            export_path,
+            list(rows),
+            serializer=export_format.serializer,
+            compression=export_format.compression,
+        )
+
+    # JSON is written one row at a time so that the results never need to be in memory at once.
+    with (
+        open_export_file(export_path, compression=export_format.compression) as file,
+        io.TextIOWrapper(file, encoding="utf-8") as json_file,
+    ):
+        for _ in write_rows(rows=rows, writers=[JSONRowWriter(json_file)]):
+            pass
+
+    return export_path
+
+
+def get_query_groups(query_files: list[Path]) -> list[QueryGroup]:
+    """
+    Groups query files by the language and data type that they return data for.
+
+    Parameters
+    ----------
+        query_files : list[Path]
+            The SPARQL query files to group, including those split into parts (e.g. query_verbs_1.sparql).
+
+    Returns
+    -------
+        list[QueryGroup]
+            Groups sorted by their directory with the query parts in numeric order.
+    """
+    part_pattern = re.compile(r"_(\d+)$")
+    files_by_dir = {}
+    for f in query_files:
+        files_by_dir.setdefault(f.parent, []).append(f)
+
+    groups = []
+    for query_dir in sorted(files_by_dir):
+
+        def part_number(query_file):
+            """
+            Returns the part number of a query so that query_verbs_10 follows query_verbs_9.
+            """
+            match = part_pattern.search(query_file.stem)
+            return int(match[1]) if match else 0
+
+        groups.append(
+            QueryGroup(
+                language=format_sublanguage_name(
+                    query_dir.parent.name, language_metadata
+                ),
+                data_type=query_dir.name,
+                query_files=tuple(sorted(files_by_dir[query_dir], key=part_number)),
+            )
+        )
+
+    return groups
+
+
+def merge_query_parts(lang: str, part_results: list[Iterable[dict]]) -> Iterator[dict]:
+    """
+    Combines the results of the parts of a split query in order.
+
+    Parameters
+    ----------
+        lang : str
+            The language that the results are for.
+
+        part_results : list[Iterable[dict]]
+            The flattened results of each query part.
+
+    Returns
+    -------
+        Iterator[dict]
+            All results one after another.
+    """
+    yield from part_results[0]
+
+    for query_results in part_results[1:]:
+        for r_dict in query_results:
+            # Note: The following is so we have a breakdown of queries for German later.
+            # Note: We need auxiliary verbs to be present as we loop to get both sein and haben forms.
+            if lang == "German" and "auxiliaryVerb" not in r_dict:
+                r_dict["auxiliaryVerb"] = ""
+
+            yield r_dict
+
+
+def write_rows(rows: Iterable[dict], writers: list[JSONRowWriter]) -> Iterator[dict]:
+    """
+    Passes rows through while writing each of them, closing the writers once all rows have been passed.
+
+    Parameters
+    ----------
+        rows : Iterable[dict]
+            The rows to write.
+
+        writers : list[JSONRowWriter]
+            The writers for the files that the rows should be saved to.
+
+    Returns
+    -------
+        Iterator[dict]
+            The rows after they've been written.
+    """
+    for row in rows:
+        for writer in writers:
+            writer.write(row)
+
+        yield row
+
+    for writer in writers:
+        writer.close()
+
+
 def query_data(
     languages: str = None,
     data_type: str = None,
     output_dir: str = None,
     overwrite: bool = None,
     interactive: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    stream: bool = True,
+    page_size: int = None,
+    source: str = "wdqs",
+    dump_file: str = None,
 ):
     """
     Queries language data from the Wikidata lexicographical data.
@@ -98,6 +340,22 @@ def query_data(
         overwrite : bool (default: False)
             Whether to overwrite existing files.
 
+        max_workers : int (default: DEFAULT_MAX_WORKERS)
+            The maximum number of queries that are sent to WDQS at the same time.
+
+        stream : bool (default: True)
+            Whether responses are parsed incrementally and spooled to disk rather than loaded into memory.
+
+        page_size : int (default: None)
+            The number of rows per request for queries that are split into pages, with None querying all rows at once.
+            Pagination is opt-in as WDQS sorts the full result of a query again for each OFFSET page, so it only helps for queries that would otherwise time out.
+
+        source : str (default: wdqs)
+            Where the data comes from, either 'wdqs' or 'dump' to select it from a lexeme JSON dump.
+
+        dump_file : str (default: None)
+            The path to the lexeme JSON dump (e.g. latest-lexemes.json.bz2) if the source is 'dump'.
+
     Returns
     -------
         Formatted data from Wikidata saved in the output directory.
@@ -109,6 +367,7 @@ def query_data(
     languages_update = current_languages if languages is None else languages
     languages_update = [lang.lower() for lang in languages_update]
     data_type_update = current_data_type if data_type is None else data_type
+    output_dir = output_dir or DEFAULT_JSON_EXPORT_DIR
 
     all_language_data_extraction_files = [
         path for path in Path(LANGUAGE_DATA_EXTRACTION_DIR).rglob("*") if path.is_file()
@@ -122,39 +381,25 @@ def query_data(
         and path.name != "__init__.py"
     ]
 
-    queries_to_run = {
-        Path(
-            str(f)
-            .replace("_1.sparql", ".sparql")
-            .replace("_2.sparql", ".sparql")
-            .replace("_3.sparql", ".sparql")
-            .replace("_4.sparql", ".sparql")
-        )
-        for f in language_data_extraction_files_in_use
-        if f.name[-len(".sparql") :] == ".sparql"
-    }
-    queries_to_run = sorted(queries_to_run)
+    query_groups = get_query_groups(
+        [f for f in language_data_extraction_files_in_use if f.suffix == ".sparql"]
+    )
 
-    # MARK: Run Queries
+    # MARK: Check Existing
 
-    # Run queries and format data.
-    for q in tqdm(
-        queries_to_run,
-        desc="Data updated",
-        unit="process",
-        disable=interactive,
-    ):
-        lang = format_sublanguage_name(q.parent.parent.name, language_metadata)
-        target_type = q.parent.name
+    updated_path = output_dir[2:] if output_dir.startswith("./") else output_dir
+
+    groups_to_run = []
+    for group in query_groups:
+        lang = group.language
+        target_type = group.data_type
 
-        updated_path = output_dir[2:] if output_dir.startswith("./") else output_dir
         export_dir = Path(updated_path) / lang.capitalize()
         export_dir.mkdir(parents=True, exist_ok=True)
 
-        file_name = f"{target_type}.json"
-        file_path = export_dir / file_name
-
-        if existing_files := list(export_dir.glob(f"{target_type}*.json")):
+        if existing_files := [
+            f for f in export_dir.glob(f"{target_type}*") if parse_export_path(f)
+        ]:
             if overwrite:
                 print("Overwrite is enabled. Removing existing files ...")
                 for file in existing_files:
@@ -189,126 +434,83 @@ def query_data(
                     print(f"Skipping update for {lang} {target_type}.")
                     continue
 
-        print(f"Querying and formatting {lang} {target_type}")
+        groups_to_run.append(group)
+
+    # MARK: Run Queries
+
+    if source == "dump":
+        # All queries are evaluated in a single pass over the dump and their results are formatted as for WDQS.
+        group_results = run_dump(groups_to_run, dump_file=dump_file)
+
+    else:
+        # Queries run concurrently and each language's data is formatted as soon as all of its parts arrive.
+        scheduler = QueryScheduler(max_workers=max_workers, page_size=page_size)
+        group_results = scheduler.run(groups_to_run, stream=stream)
 
-        # Mark the query as the first in a set of queries if needed.
-        if not q.exists():
-            q = Path(str(q).replace(".sparql", "_1.sparql"))
+    for group, part_results in tqdm(
+        group_results,
+        total=len(groups_to_run),
+        desc="Data updated",
+        unit="process",
+        disable=interactive,
+    ):
+        lang = group.language
+        target_type = group.data_type
 
-        # First format the lines into a multi-line string and then pass this to SPARQLWrapper.
-        with open(q, encoding="utf-8") as file:
-            query_lines = file.readlines()
+        if any(results is None for results in part_results):
+            print(f"Skipping {lang} {target_type} as not all of its queries returned.")
+            for results in part_results:
+                if isinstance(results, Path):
+                    results.unlink(missing_ok=True)
 
-        sparql.setQuery("".join(query_lines))
+            continue
 
-        results = None
+        print(f"Formatting {lang} {target_type}")
 
-        try:
-            results = sparql.query().convert()
+        rows = merge_query_parts(
+            lang=lang,
+            part_results=[
+                read_spooled_rows(results) if isinstance(results, Path) else results
+                for results in part_results
+            ],
+        )
 
-        except HTTPError as http_err:
-            print(f"HTTPError with {q}: {http_err}")
-
-        except IncompleteRead as read_err:
-            print(f"Incomplete read error with {q}: {read_err}")
-
-        if results is None:
-            print(f"Nothing returned by the WDQS server for {q}")
-
-            # Allow for a query to be reran up to two times.
-            if queries_to_run.count(q) < 3:
-                print("The query will be retried.")
-                queries_to_run.append(q)
-
-        else:
-            # Subset the returned JSON and the individual results before saving.
-            query_results = results["results"]["bindings"]
-
-            results_final = []
-
-            for r in query_results:  # query_results is also a list
-                r_dict = {k: r[k]["value"] for k in r.keys()}
-
-                results_final.append(r_dict)
-
-            with open(
-                Path(LANGUAGE_DATA_EXTRACTION_DIR)
-                / lang
-                / target_type
-                / f"{target_type}_queried.json",
-                "w",
-                encoding="utf-8",
-            ) as f:
-                json.dump(results_final, f, ensure_ascii=False, indent=0)
-
-            if "_1" in q.name:
-                # Note: Only the first query was ran, so we need to run the second and append the json.
-                for suffix in ["_2", "_3", "_4"]:
-                    q = Path(str(q).replace("_1", suffix).replace("_2", suffix))
-
-                    if q.exists():
-                        with open(q, encoding="utf-8") as file:
-                            query_lines = file.readlines()
-                            sparql.setQuery("".join(query_lines))
-
-                            results = None
-                            try:
-                                results = sparql.query().convert()
-
-                            except HTTPError as err:
-                                print(f"HTTPError with {q}: {err}")
-
-                            if results is None:
-                                print(f"Nothing returned by the WDQS server for {q}")
-
-                                # Allow for a query to be reran up to two times.
-                                if queries_to_run.count(q) < 3:
-                                    queries_to_run.append(q)
-
-                            else:
-                                # Subset the returned JSON and the individual results before saving.
-                                query_results = results["results"]["bindings"]
-
-                                # Note: Don't rewrite results_final as we want to extend the json and combine in formatting.
-                                for r in query_results:  # query_results is also a list
-                                    r_dict = {k: r[k]["value"] for k in r.keys()}
-
-                                    # Note: The following is so we have a breakdown of queries for German later.
-                                    # Note: We need auxiliary verbs to be present as we loop to get both sein and haben forms.
-                                    if lang == "German":
-                                        r_dict_keys = list(r_dict.keys())
-                                        if "auxiliaryVerb" not in r_dict_keys:
-                                            r_dict["auxiliaryVerb"] = ""
-
-                                    results_final.append(r_dict)
-
-                                with open(
-                                    Path(LANGUAGE_DATA_EXTRACTION_DIR)
-                                    / lang
-                                    / target_type
-                                    / f"{target_type}_queried.json",
-                                    "w",
-                                    encoding="utf-8",
-                                ) as f:
-                                    json.dump(
-                                        results_final,
-                                        f,
-                                        ensure_ascii=False,
-                                        indent=0,
-                                    )
-
-            # MARK: Save Results
-
-            with open(file_path, "w", encoding="utf-8") as json_file:
-                json.dump(results_final, json_file, ensure_ascii=False, indent=0)
-
-            # Call the corresponding formatting file.
-            formatting_file_path = (
-                LANGUAGE_DATA_EXTRACTION_DIR
-                / lang
-                / target_type
-                / f"format_{target_type}.py"
+        # MARK: Save Results
+
+        # Rows are written to the queried data file as they're passed to the formatter, so all results never need to be in memory at once.
+        with open(
+            Path(LANGUAGE_DATA_EXTRACTION_DIR)
+            / lang
+            / target_type
+            / f"{target_type}_queried.json",
+            "w",
+            encoding="utf-8",
+        ) as f:
+            rows = write_rows(rows=rows, writers=[JSONRowWriter(f)])
+
+            # Formatters run in this process where possible so results don't go through a new interpreter and a JSON round-trip.
+            formatted_in_process = format_query_results(
+                lang=lang,
+                data_type=target_type,
+                results=rows,
+                output_dir=output_dir,
             )
+
+            if not formatted_in_process:
+                export_query_results(
+                    rows=rows,
+                    export_dir=Path(updated_path) / lang.capitalize(),
+                    data_type=target_type,
+                )
+
+        # Call the corresponding formatting file.
+        formatting_file_path = (
+            LANGUAGE_DATA_EXTRACTION_DIR
+            / lang
+            / target_type
+            / f"format_{target_type}.py"
+        )
+        if not formatted_in_process and formatting_file_path.is_file():
             execute_formatting_script(
                 formatting_file_path=formatting_file_path, output_dir=output_dir
             )
@@ -0,0 +1,158 @@
+"""
+Rewrites lexeme queries into ordered LIMIT/OFFSET pages so that large results don't hit the WDQS timeout.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import re
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+COMMENT_LINE = re.compile(r"^\s*#.*$", re.MULTILINE)
+SELECT_CLAUSE = re.compile(
+    r"\bSELECT\s+(?:DISTINCT\s+|REDUCED\s+)?(.*?)\bWHERE\b", re.DOTALL | re.IGNORECASE
+)
+SOLUTION_MODIFIERS = re.compile(
+    r"\b(?:LIMIT|OFFSET|ORDER\s+BY|GROUP\s+BY|HAVING)\b", re.IGNORECASE
+)
+AGGREGATES = re.compile(
+    r"\b(?:COUNT|SUM|MIN|MAX|AVG|SAMPLE|GROUP_CONCAT)\s*\(", re.IGNORECASE
+)
+VARIABLE = re.compile(r"[?$](\w+)")
+
+
+@dataclass(frozen=True)
+class PageTiming:
+    """
+    The time it took to get a page of a query and the number of rows it returned.
+    """
+
+    query_file: Path
+    page: int
+    rows: int
+    seconds: float
+
+
+def projected_variables(query: str) -> list[str]:
+    """
+    Returns the names of the variables that a query selects, including those bound with AS.
+
+    Parameters
+    ----------
+        query : str
+            The SPARQL query without comments.
+
+    Returns
+    -------
+        list[str]
+            The variable names in the order in which they're selected.
+    """
+    if (match := SELECT_CLAUSE.search(query)) is None:
+        return []
+
+    clause = match[1]
+    variables = []
+    depth = 0
+    for i, char in enumerate(clause):
+        if char == "(":
+            depth += 1
+
+        elif char == ")":
+            depth -= 1
+
+        elif char in "?$" and (var := VARIABLE.match(clause, i)):
+            # Variables in expressions are only projected if they follow AS.
+            if depth == 0 or re.search(r"\bAS\s*$", clause[:i], re.IGNORECASE):
+                variables.append(var[1])
+
+    return list(dict.fromkeys(variables))
+
+
+def paginate_query(query: str, page_size: int, page: int) -> Optional[str]:
+    """
+    Returns a page of a lexeme query ordered by the lexeme and all selected variables.
+
+    Ordering by every selected variable makes the order of the results total, so that rows of the same lexeme don't move between pages across requests.
+    Note that WDQS evaluates and sorts the full result again for each page before skipping to its OFFSET, so pages cost more in total than a single query and only help to keep each request under the timeout.
+
+    Parameters
+    ----------
+        query : str
+            The SPARQL query to paginate.
+
+        page_size : int
+            The number of rows per page.
+
+        page : int
+            The zero based index of the page.
+
+    Returns
+    -------
+        str or None
+            The query for the page, or None if the query can't be paginated safely.
+    """
+    body = COMMENT_LINE.sub("", query)
+
+    if (
+        len(re.findall(r"\bSELECT\b", body, re.IGNORECASE)) != 1
+        or SOLUTION_MODIFIERS.search(body)
+        or AGGREGATES.search(body)
+        or not re.search(r"\?lexeme\b", body)
+        or not (variables := projected_variables(body))
+    ):
+        return None
+
+    order_by = " ".join(["?lexeme"] + [f"?{v}" for v in variables if v != "lexeme"])
+
+    return (
+        f"{query.rstrip()}\n"
+        f"ORDER BY {order_by}\n"
+        f"LIMIT {page_size}\n"
+        f"OFFSET {page * page_size}\n"
+    )
+
+
+def print_page_report(page_timings: list[PageTiming]) -> None:
+    """
+    Prints how long the pages of each paginated query took to help tune the page size.
+
+    Parameters
+    ----------
+        page_timings : list[PageTiming]
+            The timings of all pages that were requested.
+    """
+    if not page_timings:
+        return
+
+    timings_by_query = {}
+    for timing in page_timings:
+        timings_by_query.setdefault(timing.query_file, []).append(timing)
+
+    print("\nPage timings (seconds):")
+    print(f"{'query':<60} {'pages':>5} {'rows':>9} {'median':>7} {'max':>7}")
+    for query_file, timings in sorted(timings_by_query.items()):
+        seconds = [t.seconds for t in timings]
+        slowest = max(timings, key=lambda t: t.seconds)
+        name = f"{query_file.parent.parent.name}/{query_file.parent.name}/{query_file.name}"
+        print(
+            f"{name:<60} {len(timings):>5} {sum(t.rows for t in timings):>9,} "
+            f"{statistics.median(seconds):>7.2f} {slowest.seconds:>7.2f} (page {slowest.page})"
+        )
@@ -0,0 +1,424 @@
+"""
+Concurrent scheduling of WDQS queries with bounded parallelism and per-endpoint rate limits.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from http.client import IncompleteRead
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+from urllib.error import HTTPError
+
+from scribe_data.wikidata.query_pagination import (
+    PageTiming,
+    paginate_query,
+    print_page_report,
+)
+from scribe_data.wikidata.sparql_results import (
+    RowCounter,
+    concatenate_spooled,
+    iter_rows,
+    remove_spooled,
+    spool_rows,
+)
+from scribe_data.wikidata.wikidata_utils import WDQS_ENDPOINT, sparql_context
+
+# Note: WDQS allows five concurrent queries per IP, so stay just below this by default.
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_REQUESTS_PER_SECOND = 2.0
+DEFAULT_TRIES = 3
+DEFAULT_PREFETCH_PAGES = 2
+
+
+@dataclass(frozen=True)
+class QueryGroup:
+    """
+    The query files that together make up the data for one language and data type.
+    """
+
+    language: str
+    data_type: str
+    query_files: tuple[Path, ...]
+
+
+class RateLimiter:
+    """
+    Spaces out the start of requests so that no more than a given number are sent per second.
+    """
+
+    def __init__(self, max_requests_per_second: Optional[float]) -> None:
+        """
+        Parameters
+        ----------
+            max_requests_per_second : float
+                The request budget, with None or a non-positive value disabling the limit.
+        """
+        self.interval = (
+            1.0 / max_requests_per_second
+            if max_requests_per_second and max_requests_per_second > 0
+            else 0.0
+        )
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Blocks until the caller is allowed to send its next request.
+        """
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if (delay := slot - now) > 0:
+            time.sleep(delay)
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    endpoint: str, max_requests_per_second: Optional[float]
+) -> RateLimiter:
+    """
+    Returns the rate limiter that is shared by all schedulers querying an endpoint.
+
+    Parameters
+    ----------
+        endpoint : str
+            The URL of the SPARQL endpoint.
+
+        max_requests_per_second : float
+            The request budget used if the endpoint does not have a limiter yet.
+
+    Returns
+    -------
+        RateLimiter
+            The limiter for the endpoint.
+    """
+    with _rate_limiters_lock:
+        if endpoint not in _rate_limiters:
+            _rate_limiters[endpoint] = RateLimiter(max_requests_per_second)
+
+        return _rate_limiters[endpoint]
+
+
+def flatten_bindings(results: dict) -> list[dict]:
+    """
+    Subsets the JSON returned by WDQS to a list of variable to value dictionaries.
+
+    Parameters
+    ----------
+        results : dict
+            The converted JSON results of a SPARQL query.
+
+    Returns
+    -------
+        list[dict]
+            One dictionary per result with the values of its bound variables.
+    """
+    return [
+        {k: r[k]["value"] for k in r.keys()} for r in results["results"]["bindings"]
+    ]
+
+
+class QueryScheduler:
+    """
+    Runs SPARQL query files concurrently and returns results grouped by language and data type.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = WDQS_ENDPOINT,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_requests_per_second: Optional[float] = DEFAULT_MAX_REQUESTS_PER_SECOND,
+        tries: int = DEFAULT_TRIES,
+        page_size: Optional[int] = None,
+        prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+    ) -> None:
+        """
+        Parameters
+        ----------
+            endpoint : str (default=WDQS_ENDPOINT)
+                The URL of the SPARQL endpoint to query.
+
+            max_workers : int (default=DEFAULT_MAX_WORKERS)
+                The maximum number of queries that are sent at the same time.
+
+            max_requests_per_second : float (default=DEFAULT_MAX_REQUESTS_PER_SECOND)
+                The rate budget for the endpoint, with None disabling the limit.
+
+            tries : int (default=DEFAULT_TRIES)
+                The number of times a query is attempted before it's marked as failed.
+
+            page_size : int (default=None)
+                The number of rows per page for queries that can be paginated, with None disabling pagination.
+
+            prefetch_pages : int (default=DEFAULT_PREFETCH_PAGES)
+                The number of pages of a query that are requested at the same time.
+        """
+        self.endpoint = endpoint
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = get_rate_limiter(endpoint, max_requests_per_second)
+        self.tries = tries
+        self.page_size = page_size
+        self.prefetch_pages = max(1, prefetch_pages)
+        self.page_timings = []
+        self._queries = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _context(self):
+        """
+        Returns the SPARQLWrapper of the current worker thread, creating it if needed.
+        """
+        if getattr(self._local, "context", None) is None:
+            self._local.context = sparql_context(self.endpoint)
+
+        return self._local.context
+
+    def _query_text(self, query_file: Path) -> str:
+        """
+        Returns the text of a query file, reading each file only once per scheduler.
+        """
+        with self._lock:
+            if query_file not in self._queries:
+                with open(query_file, encoding="utf-8") as file:
+                    self._queries[query_file] = file.read()
+
+            return self._queries[query_file]
+
+    def _execute(
+        self, query_file: Path, stream: bool = False, page: Optional[int] = None
+    ) -> tuple[Optional[Union[list[dict], Path]], int]:
+        """
+        Runs a query file or one of its pages and returns the results with their number of rows.
+        """
+        query = self._query_text(query_file)
+        if page is not None:
+            query = paginate_query(query, page_size=self.page_size, page=page)
+
+        name = query_file if page is None else f"{query_file} (page {page})"
+        context = self._context()
+        context.setQuery(query)
+
+        for attempt in range(1, self.tries + 1):
+            self.rate_limiter.wait()
+            start = time.perf_counter()
+
+            try:
+                if stream:
+                    response = context.query().response
+                    try:
+                        rows = RowCounter(iter_rows(response))
+                        results = spool_rows(rows)
+
+                    finally:
+                        response.close()
+
+                    n_rows = rows.count
+
+                else:
+                    results = flatten_bindings(context.query().convert())
+                    n_rows = len(results)
+
+                if page is not None:
+                    with self._lock:
+                        self.page_timings.append(
+                            PageTiming(
+                                query_file=query_file,
+                                page=page,
+                                rows=n_rows,
+                                seconds=time.perf_counter() - start,
+                            )
+                        )
+
+                return results, n_rows
+
+            except HTTPError as http_err:
+                print(f"HTTPError with {name}: {http_err}")
+
+            except IncompleteRead as read_err:
+                print(f"Incomplete read error with {name}: {read_err}")
+
+            if attempt < self.tries:
+                print(f"The query {name} will be retried.")
+
+        print(f"Nothing returned by the WDQS server for {name}")
+
+        return None, 0
+
+    def run_query(
+        self, query_file: Path, stream: bool = False
+    ) -> Optional[Union[list[dict], Path]]:
+        """
+        Runs a single query file without pagination and returns its flattened results.
+
+        Parameters
+        ----------
+            query_file : Path
+                The path to the SPARQL query.
+
+            stream : bool (default=False)
+                Whether to parse the response incrementally and spool its rows to a temporary file.
+
+        Returns
+        -------
+            list[dict], Path or None
+                The results of the query or the path to their spooled rows if streaming, or None if no results were returned after all tries.
+        """
+        return self._execute(query_file, stream=stream)[0]
+
+    def is_paginated(self, query_file: Path) -> bool:
+        """
+        Returns whether a query file will be fetched in pages.
+        """
+        return bool(self.page_size) and (
+            paginate_query(self._query_text(query_file), self.page_size, 0) is not None
+        )
+
+    def run(
+        self, groups: Iterable[QueryGroup], stream: bool = False
+    ) -> Iterator[tuple[QueryGroup, list[Optional[Union[list[dict], Path]]]]]:
+        """
+        Runs the queries of all groups and yields each group as soon as all of its parts have arrived.
+
+        Parameters
+        ----------
+            groups : Iterable[QueryGroup]
+                The groups of queries to run.
+
+            stream : bool (default=False)
+                Whether results are spooled to temporary files rather than returned in memory (see run_query).
+
+        Returns
+        -------
+            Iterator[tuple[QueryGroup, list]]
+                Each group with the results of its query files in order, where failed queries are None.
+        """
+        groups = list(groups)
+        self.page_timings = []
+        parts = [[_Part() for _ in g.query_files] for g in groups]
+        parts_remaining = [len(g.query_files) for g in groups]
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="wdqs"
+        ) as executor:
+            pending = {}
+
+            def submit(group_idx: int, part_idx: int, page: Optional[int]) -> None:
+                query_file = groups[group_idx].query_files[part_idx]
+                future = executor.submit(self._execute, query_file, stream, page)
+                pending[future] = (group_idx, part_idx, page)
+                parts[group_idx][part_idx].in_flight += 1
+
+            for group_idx, group in enumerate(groups):
+                for part_idx, query_file in enumerate(group.query_files):
+                    if self.is_paginated(query_file):
+                        # Pages are requested ahead so that the next page is running while the last one is processed.
+                        for _ in range(self.prefetch_pages):
+                            part = parts[group_idx][part_idx]
+                            submit(group_idx, part_idx, part.next_page)
+                            part.next_page += 1
+
+                    else:
+                        submit(group_idx, part_idx, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group_idx, part_idx, page = pending.pop(future)
+                    part = parts[group_idx][part_idx]
+                    part.in_flight -= 1
+                    results, n_rows = future.result()
+
+                    if page is None:
+                        part.pages[0] = results
+                        part.last_page = 0
+
+                    else:
+                        part.pages[page] = results
+                        # A failed or short page is the last one that's needed.
+                        if results is None or n_rows < self.page_size:
+                            part.last_page = (
+                                page
+                                if part.last_page is None
+                                else min(page, part.last_page)
+                            )
+
+                        elif part.last_page is None:
+                            submit(group_idx, part_idx, part.next_page)
+                            part.next_page += 1
+
+                    if part.last_page is None or part.in_flight:
+                        continue
+
+                    parts[group_idx][part_idx] = part.merge(stream=stream)
+                    parts_remaining[group_idx] -= 1
+
+                    if parts_remaining[group_idx] == 0:
+                        # Release the results once they've been handed off.
+                        results, parts[group_idx] = parts[group_idx], None
+                        yield groups[group_idx], results
+
+        if self.page_size:
+            print_page_report(self.page_timings)
+
+
+class _Part:
+    """
+    The pages of a query file that have arrived and the state of its pagination.
+    """
+
+    def __init__(self) -> None:
+        self.pages = {}
+        self.next_page = 0
+        self.last_page = None
+        self.in_flight = 0
+
+    def merge(self, stream: bool) -> Optional[Union[list[dict], Path]]:
+        """
+        Combines the pages up to the last one in order and discards pages past it.
+        """
+        needed = [self.pages.get(page) for page in range(self.last_page + 1)]
+        extra = [r for page, r in self.pages.items() if page > self.last_page]
+        self.pages = {}
+
+        if any(r is None for r in needed):
+            if stream:
+                remove_spooled(needed + extra)
+
+            return None
+
+        if stream:
+            remove_spooled(extra)
+            return concatenate_spooled(needed)
+
+        if len(needed) == 1:
+            return needed[0]
+
+        return [row for results in needed for row in results]
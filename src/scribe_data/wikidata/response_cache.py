@@ -0,0 +1,359 @@
+"""
+A compressed on-disk cache for SPARQL responses that's shared by all queries to Wikidata.
+
+Responses are stored under a hash of the endpoint and the normalized query text, expire after a TTL and are evicted least recently used first once the cache exceeds its size limit.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from email.message import Message
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "scribe-data"
+    / "wdqs"
+)
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 1024**3
+# The number of saved responses after which the size of the cache is checked again, with the first one being checked in each process.
+EVICT_INTERVAL = 32
+
+COMMENT_LINE = re.compile(r"^\s*#.*$", re.MULTILINE)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Removes comment lines and collapses whitespace so that formatting changes don't invalidate the cache.
+
+    Parameters
+    ----------
+        query : str
+            The SPARQL query.
+
+    Returns
+    -------
+        str
+            The query with comment lines removed and runs of whitespace replaced by single spaces.
+    """
+    return " ".join(COMMENT_LINE.sub("", query).split())
+
+
+class ResponseCache:
+    """
+    Stores gzip compressed responses on disk with a TTL and a size limit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+        refresh: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+            cache_dir : Path (default=DEFAULT_CACHE_DIR)
+                The directory that responses are saved in.
+
+            ttl_seconds : float (default=DEFAULT_TTL_SECONDS)
+                How long a response is used for before it's queried again.
+
+            max_bytes : int (default=DEFAULT_MAX_BYTES)
+                The size of the cache above which the least recently used responses are removed.
+
+            enabled : bool (default=True)
+                Whether responses are read from and written to the cache.
+
+            refresh : bool (default=False)
+                Whether cached responses are ignored and replaced by new ones.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, query: str) -> str:
+        """
+        Returns the key for the response of an endpoint to a query.
+        """
+        return hashlib.sha256(
+            f"{endpoint}\n{normalize_query(query)}".encode("utf-8")
+        ).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """
+        Returns the file that a response is saved to.
+        """
+        return self.cache_dir / key[:2] / f"{key}.gz"
+
+    def get(self, key: str) -> Optional[tuple[str, BinaryIO]]:
+        """
+        Returns a cached response if there's one that hasn't expired.
+
+        Parameters
+        ----------
+            key : str
+                The key of the response.
+
+        Returns
+        -------
+            tuple(str, BinaryIO) or None
+                The content type of the response and its body as an open file that's decompressed as it's read, or None if it needs to be queried.
+        """
+        path = self.path(key)
+        try:
+            if self.refresh or time.time() - path.stat().st_mtime > self.ttl_seconds:
+                self._count(hit=False)
+                return None
+
+            # The body is left in the open file so that large responses are streamed from disk rather than loaded into memory.
+            body = gzip.open(path, "rb")
+            try:
+                content_type = body.readline().decode("utf-8").strip()
+
+            except BaseException:
+                body.close()
+                raise
+
+        except (OSError, EOFError):
+            self._count(hit=False)
+            return None
+
+        # Note: The access time marks recent use for eviction while the modification time tracks the TTL.
+        os.utime(path, (time.time(), path.stat().st_mtime))
+        self._count(hit=True)
+
+        return content_type, body
+
+    def writer(self, key: str, content_type: str) -> "CacheWriter":
+        """
+        Returns a writer that saves a response as it's read.
+        """
+        return CacheWriter(cache=self, key=key, content_type=content_type)
+
+    def saved(self) -> None:
+        """
+        Marks that a response was saved, evicting responses on the first save of the process and every EVICT_INTERVAL saves after it.
+        """
+        with self._lock:
+            if (
+                self._writes_since_evict is not None
+                and self._writes_since_evict < EVICT_INTERVAL - 1
+            ):
+                self._writes_since_evict += 1
+                return
+
+            self._writes_since_evict = 0
+
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used responses until the cache is within its size limit.
+        """
+        entries = []
+        for path in self.cache_dir.glob("*/*.gz"):
+            try:
+                stat = path.stat()
+
+            except OSError:
+                continue
+
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def report(self) -> None:
+        """
+        Prints how many responses were taken from the cache.
+        """
+        if self.enabled and self.hits + self.misses:
+            print(
+                f"WDQS response cache: {self.hits} hits, {self.misses} misses ({self.cache_dir})"
+            )
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+
+            else:
+                self.misses += 1
+
+
+class CacheWriter:
+    """
+    Compresses a response to a temporary file and moves it into the cache once it's complete.
+    """
+
+    def __init__(self, cache: ResponseCache, key: str, content_type: str) -> None:
+        self.cache = cache
+        self.path = cache.path(key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        self._file = gzip.open(os.fdopen(fd, "wb"), "wb")
+        self._file.write(f"{content_type}\n".encode("utf-8"))
+        self._tail = b""
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        if data:
+            self._tail = (self._tail + data)[-64:]
+
+    def commit(self) -> None:
+        """
+        Saves the response if it's a complete JSON document and otherwise discards it.
+        """
+        self._file.close()
+        # Note: WDQS appends errors to responses that time out after they start, so incomplete results aren't cached.
+        if self._tail.rstrip().endswith(b"}"):
+            os.replace(self._tmp_path, self.path)
+            self.cache.saved()
+
+        else:
+            self.discard()
+
+    def discard(self) -> None:
+        self._file.close()
+        Path(self._tmp_path).unlink(missing_ok=True)
+
+
+class CachedResponse:
+    """
+    Stands in for the HTTP response of a cached query, reading its body from the open cache file.
+    """
+
+    def __init__(self, content_type: str, body: BinaryIO) -> None:
+        self._body = body
+        self._headers = Message()
+        self._headers["content-type"] = content_type
+
+    def read(self, size: int = -1) -> bytes:
+        if self._body.closed:
+            return b""
+
+        data = self._body.read(-1 if size is None else size)
+        # The file is closed once it's read completely as SPARQLWrapper doesn't close responses that it converts.
+        if not data or size is None or size < 0:
+            self._body.close()
+
+        return data
+
+    def info(self) -> Message:
+        return self._headers
+
+    def close(self) -> None:
+        self._body.close()
+
+
+class TeeResponse:
+    """
+    Passes an HTTP response through while saving it to the cache, committing it once it has been read completely.
+    """
+
+    def __init__(self, response: BinaryIO, writer: CacheWriter) -> None:
+        self.response = response
+        self.writer = writer
+        self._done = False
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            data = self.response.read(size)
+
+        except BaseException:
+            self._finish(complete=False)
+            raise
+
+        if not self._done:
+            self.writer.write(data)
+            if not data or size is None or size < 0:
+                self._finish(complete=True)
+
+        return data
+
+    def info(self):
+        return self.response.info()
+
+    def close(self) -> None:
+        # Read what's left after the bindings (usually just closing brackets) so the response can be cached.
+        try:
+            while not self._done and self.read(64 * 1024):
+                pass
+
+        finally:
+            self._finish(complete=False)
+            self.response.close()
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def _finish(self, complete: bool) -> None:
+        if self._done:
+            return
+
+        self._done = True
+        if complete:
+            self.writer.commit()
+
+        else:
+            self.writer.discard()
+
+
+response_cache = ResponseCache(
+    cache_dir=Path(os.environ.get("SCRIBE_DATA_CACHE_DIR", DEFAULT_CACHE_DIR))
+)
+
+
+def configure_response_cache(enabled: bool = True, refresh: bool = False) -> None:
+    """
+    Sets whether the shared response cache is used and whether its responses are refreshed.
+
+    Parameters
+    ----------
+        enabled : bool (default=True)
+            Whether responses are read from and written to the cache.
+
+        refresh : bool (default=False)
+            Whether cached responses are ignored and replaced by new ones.
+    """
+    response_cache.enabled = enabled
+    response_cache.refresh = refresh
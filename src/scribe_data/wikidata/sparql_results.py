@@ -0,0 +1,257 @@
+"""
+Incremental parsing of SPARQL JSON results so that rows can be processed without loading full responses.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import codecs
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from http.client import IncompleteRead
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+BINDINGS_START = re.compile(r'"results"\s*:\s*\{\s*"bindings"\s*:\s*\[')
+WHITESPACE = re.compile(r"[\s,]*")
+
+_decoder = json.JSONDecoder()
+
+
+def iter_bindings(
+    stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    Yields the bindings of a SPARQL JSON response one at a time as it's read.
+
+    Parameters
+    ----------
+        stream : BinaryIO
+            A file-like object with the response (e.g. an HTTP response).
+
+        chunk_size : int (default=DEFAULT_CHUNK_SIZE)
+            The number of bytes to read from the stream at once.
+
+    Returns
+    -------
+        Iterator[dict]
+            The bindings of the response in order.
+
+    Raises
+    ------
+        IncompleteRead
+            If the stream ends before the bindings are closed.
+    """
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    eof = False
+
+    def read_more() -> None:
+        nonlocal buffer, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += utf8_decoder.decode(chunk or b"", final=eof)
+
+    # Note: The head comes first and is small, so reading until the bindings start is found is cheap.
+    while (match := BINDINGS_START.search(buffer)) is None:
+        if eof:
+            raise IncompleteRead(buffer.encode("utf-8"))
+
+        read_more()
+
+    idx = match.end()
+    while True:
+        idx = WHITESPACE.match(buffer, idx).end()
+        if idx < len(buffer) and buffer[idx] == "]":
+            return
+
+        try:
+            binding, end = _decoder.raw_decode(buffer, idx)
+
+        except json.JSONDecodeError:
+            if eof:
+                raise IncompleteRead(buffer[idx:].encode("utf-8")) from None
+
+            # The binding is split across chunks, so drop what has been parsed and read more.
+            buffer = buffer[idx:]
+            idx = 0
+            read_more()
+            continue
+
+        yield binding
+        idx = end
+
+
+def iter_rows(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yields the rows of a SPARQL JSON response as variable to value dictionaries.
+
+    Parameters
+    ----------
+        stream : BinaryIO
+            A file-like object with the response.
+
+        chunk_size : int (default=DEFAULT_CHUNK_SIZE)
+            The number of bytes to read from the stream at once.
+
+    Returns
+    -------
+        Iterator[dict]
+            One dictionary per result with the values of its bound variables.
+    """
+    for binding in iter_bindings(stream, chunk_size=chunk_size):
+        yield {k: v["value"] for k, v in binding.items()}
+
+
+def spool_rows(rows: Iterable[dict]) -> Path:
+    """
+    Writes rows to a temporary newline delimited JSON file so they can be read back one at a time.
+
+    Parameters
+    ----------
+        rows : Iterable[dict]
+            The rows to write.
+
+    Returns
+    -------
+        Path
+            The path to the file, which the caller should delete once the rows have been read.
+    """
+    fd, path = tempfile.mkstemp(prefix="scribe_data_", suffix=".ndjson")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return Path(path)
+
+
+def read_spooled_rows(path: Path, delete: bool = True) -> Iterator[dict]:
+    """
+    Yields the rows of a file written by spool_rows.
+
+    Parameters
+    ----------
+        path : Path
+            The path to the spooled rows.
+
+        delete : bool (default=True)
+            Whether to delete the file once all rows have been read.
+
+    Returns
+    -------
+        Iterator[dict]
+            The rows in the order they were written.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    finally:
+        if delete:
+            Path(path).unlink(missing_ok=True)
+
+
+def concatenate_spooled(paths: list[Path]) -> Path:
+    """
+    Appends spooled rows to the first file in order and removes the others.
+
+    Parameters
+    ----------
+        paths : list[Path]
+            The files written by spool_rows.
+
+    Returns
+    -------
+        Path
+            The path to the file with all rows.
+    """
+    with open(paths[0], "ab") as combined:
+        for path in paths[1:]:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, combined)
+
+            path.unlink()
+
+    return paths[0]
+
+
+def remove_spooled(paths: list[Optional[Path]]) -> None:
+    """
+    Removes spooled rows that are no longer needed.
+    """
+    for path in paths:
+        if path is not None:
+            Path(path).unlink(missing_ok=True)
+
+
+class RowCounter:
+    """
+    Passes rows through while counting them.
+    """
+
+    def __init__(self, rows: Iterable[dict]) -> None:
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+class JSONRowWriter:
+    """
+    Writes rows to a file one at a time with the same output as json.dump(rows, f, ensure_ascii=False, indent=0).
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        """
+        Parameters
+        ----------
+            file : TextIO
+                The open file to write to.
+        """
+        self.file = file
+        self.rows_written = 0
+
+    def write(self, row: dict) -> None:
+        """
+        Writes a single row.
+        """
+        self.file.write("[\n" if self.rows_written == 0 else ",\n")
+        self.file.write(json.dumps(row, ensure_ascii=False, indent=0))
+        self.rows_written += 1
+
+    def close(self) -> None:
+        """
+        Closes the JSON array, leaving closing the file to the caller.
+        """
+        self.file.write("\n]" if self.rows_written else "[]")
@@ -22,6 +22,62 @@ Utility functions for accessing data from Wikidata.
 
 from SPARQLWrapper import JSON, POST, SPARQLWrapper
 
-sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-sparql.setReturnFormat(JSON)
-sparql.setMethod(POST)
+from scribe_data.wikidata.response_cache import (
+    CachedResponse,
+    TeeResponse,
+    response_cache,
+)
+
+WDQS_ENDPOINT = "https://query.wikidata.org/sparql"
+
+
+class CachedSPARQLWrapper(SPARQLWrapper):
+    """
+    A SPARQLWrapper that answers queries from the shared response cache where possible.
+    """
+
+    def _query(self):
+        """
+        Returns a cached response for the current query or one that's saved to the cache as it's read.
+        """
+        if not response_cache.enabled:
+            return super()._query()
+
+        key = response_cache.key(self.endpoint, self.queryString)
+        if cached := response_cache.get(key):
+            content_type, body = cached
+            return CachedResponse(
+                content_type=content_type, body=body
+            ), self.returnFormat
+
+        response, return_format = super()._query()
+        content_type = response.info().get("content-type", "")
+        if "json" not in content_type:
+            return response, return_format
+
+        writer = response_cache.writer(key=key, content_type=content_type)
+        return TeeResponse(response=response, writer=writer), return_format
+
+
+def sparql_context(endpoint: str = WDQS_ENDPOINT) -> SPARQLWrapper:
+    """
+    Creates a SPARQLWrapper that is configured for querying the given endpoint and uses the response cache.
+
+    Parameters
+    ----------
+        endpoint : str (default=WDQS_ENDPOINT)
+            The URL of the SPARQL endpoint to query.
+
+    Returns
+    -------
+        SPARQLWrapper
+            A wrapper returning JSON results via POST requests.
+    """
+    context = CachedSPARQLWrapper(endpoint)
+    context.setReturnFormat(JSON)
+    context.setMethod(POST)
+
+    return context
+
+
+sparql = sparql_context()
@@ -21,24 +21,28 @@ Module for downloading and creating workable files from Wikipedia dumps.
     -->
 """
 
+import bz2
 import gc
 import json
 import os
+import re
+import shutil
 import subprocess
 import time
 import xml.sax
-from itertools import chain
 from multiprocessing import Pool
-from multiprocessing.dummy import Pool as Threadpool
 from pathlib import Path
 
 import defusedxml.sax
-import mwparserfromhell
 import requests
 from bs4 import BeautifulSoup
 from tqdm.auto import tqdm
 
 from scribe_data.utils import get_language_iso
+from scribe_data.wikipedia.strip_wikitext import WIKITEXT_ENGINES, strip_code
+
+READ_CHUNK_SIZE = 1024 * 1024
+STREAMS_PER_RANGE = 10
 
 
 def download_wiki(language="en", target_dir="wiki_dump", file_limit=None, dump_id=None):
@@ -113,6 +117,17 @@ def download_wiki(language="en", target_dir="wiki_dump", file_limit=None, dump_i
         or file_present_bools[0] is not True
     )
 
+    # Indexes give the offsets of the bz2 streams of files so that they can be parsed in parallel.
+    available_files = {file[0] for file in files}
+    for f in files_to_download:
+        index_file = multistream_index_name(f)
+        index_path = target_dir / index_file
+        if index_file in available_files and not index_path.exists():
+            print(f"DL index file to {index_path}")
+            subprocess.run(
+                ["curl", "-o", index_path, dump_url + index_file], check=False
+            )
+
     if dl_files:
         for f in files_to_download:
             file_path = target_dir / f
@@ -142,7 +157,7 @@ def download_wiki(language="en", target_dir="wiki_dump", file_limit=None, dump_i
     return file_info
 
 
-def _process_article(title, text):
+def _process_article(title, text, wikitext_engine="mwparser"):
     """
     Process a wikipedia article to extract the title and text.
 
@@ -154,19 +169,236 @@ def _process_article(title, text):
         text : str
             The text to be processed.
 
+        wikitext_engine : str (default=mwparser)
+            The engine that strips the markup from the text (see WIKITEXT_ENGINES).
+
     Returns
     -------
         title, text:  string, string
             The data from the article.
     """
-    wikicode = mwparserfromhell.parse(text)
-
     title = title.strip()
-    text = wikicode.strip_code().strip()
+    text = strip_code(text, engine=wikitext_engine).strip()
 
     return title, text
 
 
+def iter_bz2_chunks(f_compressed, chunk_size=READ_CHUNK_SIZE):
+    """
+    Decompresses a bz2 file in a single streaming pass, including multistream dumps.
+
+    Parameters
+    ----------
+        f_compressed : file object
+            The compressed file opened in binary mode, whose position shows how much of it has been read.
+
+        chunk_size : int (default=READ_CHUNK_SIZE)
+            The number of decompressed bytes to yield at once.
+
+    Returns
+    -------
+        Iterator[bytes]
+            Chunks of the decompressed data.
+    """
+    with bz2.BZ2File(f_compressed) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def multistream_index_name(file_name):
+    """
+    Returns the name of the index of a multistream dump file.
+
+    Parameters
+    ----------
+        file_name : str
+            The name of the dump file (e.g. dewiki-20240101-pages-articles-multistream1.xml-p1p297012.bz2).
+
+    Returns
+    -------
+        index_name : str
+            The name of its index (e.g. dewiki-20240101-pages-articles-multistream-index1.txt-p1p297012.bz2).
+    """
+    return re.sub(r"multistream(\d*)\.xml", r"multistream-index\1.txt", file_name)
+
+
+def read_stream_offsets(index_path):
+    """
+    Reads the byte offsets of the bz2 streams of a multistream dump from its index.
+
+    Parameters
+    ----------
+        index_path : pathlib.Path
+            The path to the bz2 compressed index, each line of which is an offset, page id and title.
+
+    Returns
+    -------
+        offsets : list
+            The sorted unique offsets at which streams start.
+    """
+    offsets = set()
+    with bz2.open(index_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            offsets.add(int(line.split(":", 1)[0]))
+
+    return sorted(offsets)
+
+
+def stream_ranges(offsets, file_size, streams_per_range=STREAMS_PER_RANGE):
+    """
+    Groups the streams of a multistream dump into byte ranges that can be parsed independently.
+
+    Parameters
+    ----------
+        offsets : list
+            The sorted offsets of the streams that contain pages.
+
+        file_size : int
+            The size of the dump file in bytes.
+
+        streams_per_range : int (default=STREAMS_PER_RANGE)
+            The number of streams of about 100 pages each in a range.
+
+    Returns
+    -------
+        ranges : list of tuples
+            The start and end of each range.
+    """
+    bounds = offsets[::streams_per_range] + [file_size]
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_stream_range(args):
+    """
+    Decompresses and parses the pages of a range of streams of a multistream dump.
+
+    Parameters
+    ----------
+        args : tuple
+            The path to the dump file, the start and end of the range and the wikitext engine for pool.imap.
+
+    Returns
+    -------
+        target_articles : list
+            The titles and texts of the articles in the range.
+    """
+    input_path, start, end, wikitext_engine = args
+    with open(input_path, "rb") as f:
+        f.seek(start)
+        data = bz2.decompress(f.read(end - start))
+
+    # Ranges are lists of pages, with the first also having the siteinfo header and the last the closing tag.
+    first_page = data.find(b"<page>")
+    last_page_end = data.rfind(b"</page>")
+    if first_page == -1 or last_page_end == -1:
+        return []
+
+    handler = WikiXmlHandler(wikitext_engine=wikitext_engine)
+    defusedxml.sax.parseString(
+        b"<mediawiki>"
+        + data[first_page : last_page_end + len(b"</page>")]
+        + b"</mediawiki>",
+        handler,
+    )
+
+    return handler.target_articles
+
+
+def parse_multistream_file(
+    input_path,
+    index_path,
+    partitions_dir,
+    article_limit=None,
+    processes=None,
+    streams_per_range=STREAMS_PER_RANGE,
+    wikitext_engine="mwparser",
+    verbose=True,
+):
+    """
+    Creates the partition of a multistream dump file by parsing ranges of its streams in parallel.
+
+    Parameters
+    ----------
+        input_path : pathlib.Path
+            The path to the dump file.
+
+        index_path : pathlib.Path
+            The path to the index of the dump file.
+
+        partitions_dir : pathlib.Path
+            The path to where output file should be stored.
+
+        article_limit : int (default=None)
+            An optional article_limit of the number of articles to find.
+
+        processes : int (default=None)
+            The number of processes that parse ranges, with None using all cores.
+
+        streams_per_range : int (default=STREAMS_PER_RANGE)
+            The number of streams that a process parses at once.
+
+        wikitext_engine : str (default=mwparser)
+            The engine that strips the markup from the articles (see WIKITEXT_ENGINES).
+
+        verbose : bool (default=True)
+            Whether to show a tqdm progress bar for the process.
+
+    Returns
+    -------
+        A parsed file Wikipedia dump file with articles in the same order as iterate_and_parse_file.
+    """
+    input_path = Path(input_path)
+    partitions_dir = Path(partitions_dir)
+    partitions_dir.mkdir(parents=True, exist_ok=True)
+
+    file_name = f"{input_path.name.split('-')[-1].split('.')[-2]}.ndjson"
+    output_path = partitions_dir / file_name
+    if output_path.exists():
+        if verbose:
+            print(f"File {file_name} already exists in {partitions_dir}")
+
+        return
+
+    ranges = stream_ranges(
+        read_stream_offsets(index_path),
+        file_size=os.path.getsize(input_path),
+        streams_per_range=streams_per_range,
+    )
+
+    partial_path = partitions_dir / f"{file_name}.partial"
+    n_articles = 0
+    with (
+        Pool(processes=processes) as pool,
+        open(partial_path, "w", encoding="utf-8") as f_out,
+    ):
+        for target_articles in tqdm(
+            pool.imap(
+                parse_stream_range,
+                ((input_path, start, end, wikitext_engine) for start, end in ranges),
+            ),
+            total=len(ranges),
+            desc="Stream ranges parsed",
+            unit="range",
+            disable=not verbose,
+        ):
+            if article_limit is not None:
+                target_articles = target_articles[: article_limit - n_articles]
+
+            for ta in target_articles:
+                f_out.write(json.dumps(ta) + "\n")
+
+            n_articles += len(target_articles)
+            if article_limit is not None and n_articles >= article_limit:
+                break
+
+    os.replace(partial_path, output_path)
+
+    if verbose:
+        print(
+            f"File {file_name} with {n_articles} articles processed and saved in {partitions_dir}"
+        )
+
+
 def iterate_and_parse_file(args):
     """
     Creates partitions of desired articles.
@@ -188,54 +420,43 @@ def iterate_and_parse_file(args):
         verbose : bool (default=True)
             Whether to show a tqdm progress bar for the processes.
 
+        wikitext_engine : str
+            The engine that strips the markup from the articles (see WIKITEXT_ENGINES).
+
     Returns
     -------
         A parsed file Wikipedia dump file with articles.
     """
-    input_path, partitions_dir, article_limit, verbose = args
+    input_path, partitions_dir, article_limit, verbose, wikitext_engine = args
+    partitions_dir = Path(partitions_dir)
 
     if not partitions_dir.exists():
         print(f"Making {partitions_dir} directory for the partitions")
         os.makedirs(partitions_dir)
 
-    handler = WikiXmlHandler()
-    parser = defusedxml.sax.make_parser()
-    parser.setContentHandler(handler)
-
-    file_name = input_path.split("/")[-1].split("-")[-1].split(".")[-2]
+    file_name = Path(input_path).name.split("-")[-1].split(".")[-2]
     file_name = f"{file_name}.ndjson"
-    output_path = Path(partitions_dir) / file_name
+    output_path = partitions_dir / file_name
+    # Articles are written as they're parsed to a temporary file that's renamed once it's complete.
+    partial_path = partitions_dir / f"{file_name}.partial"
 
     if not output_path.exists():
+        f_out = open(partial_path, "w", encoding="utf-8")
+        handler = WikiXmlHandler(
+            f_out=f_out, article_limit=article_limit, wikitext_engine=wikitext_engine
+        )
+        parser = defusedxml.sax.make_parser()
+        parser.setContentHandler(handler)
+
         if article_limit is None:
+            # Progress is the share of the compressed file that's been read so it only needs to be decompressed once.
             pbar = tqdm(
-                total=len(
-                    [
-                        i
-                        for i, line in enumerate(
-                            subprocess.Popen(
-                                ["bzcat"],
-                                stdin=open(input_path, encoding="utf-8"),
-                                stdout=subprocess.PIPE,
-                            ).stdout
-                        )
-                    ]
-                ),
-                desc="Lines read",
-                unit="lines",
+                total=os.path.getsize(input_path),
+                desc="Bytes read",
+                unit="B",
+                unit_scale=True,
                 disable=not verbose,
             )
-            for line in subprocess.Popen(
-                ["bzcat"],
-                stdin=open(input_path, encoding="utf-8"),
-                stdout=subprocess.PIPE,
-            ).stdout:
-                try:
-                    parser.feed(line)
-                except StopIteration:
-                    break
-
-                pbar.update()
 
         else:
             pbar = tqdm(
@@ -244,41 +465,37 @@ def iterate_and_parse_file(args):
                 unit="article",
                 disable=not verbose,
             )
-            articles_found = 0
-            for line in subprocess.Popen(
-                ["bzcat"],
-                stdin=open(input_path, encoding="utf-8"),
-                stdout=subprocess.PIPE,
-            ).stdout:
+
+        with f_out, open(input_path, "rb") as f_compressed:
+            for chunk in iter_bz2_chunks(f_compressed, chunk_size=READ_CHUNK_SIZE):
                 try:
-                    parser.feed(line)
+                    parser.feed(chunk)
                 except StopIteration:
                     break
 
-                if len(handler.target_articles) == articles_found + 1:
-                    articles_found += 1
-                    pbar.update()
+                if article_limit is None:
+                    pbar.update(f_compressed.tell() - pbar.n)
 
-                if len(handler.target_articles) >= article_limit:
-                    break
+                else:
+                    pbar.update(handler.n_articles - pbar.n)
+                    if handler.n_articles >= article_limit:
+                        break
 
-        with open(output_path, "w", encoding="utf-8") as f_out:
-            for ta in handler.target_articles:
-                f_out.write(json.dumps(ta) + "\n")
+        pbar.close()
+        os.replace(partial_path, output_path)
 
         if verbose:
-            n_art = len(handler.target_articles)
             print(
-                f"File {file_name} with {n_art} articles processed and saved in {partitions_dir}"
+                f"File {file_name} with {handler.n_articles} articles processed and saved in {partitions_dir}"
             )
 
+        del handler
+        del parser
+        gc.collect()
+
     elif verbose:
         print(f"File {file_name} already exists in {partitions_dir}")
 
-    del handler
-    del parser
-    gc.collect()
-
     return None
 
 
@@ -289,6 +506,7 @@ def parse_to_ndjson(
     article_limit=None,
     delete_parsed_files=False,
     multicore=True,
+    wikitext_engine="mwparser",
     verbose=True,
 ):
     """
@@ -311,8 +529,11 @@ def parse_to_ndjson(
         delete_parsed_files : bool (default=False)
             Whether to delete the separate parsed files after combining them.
 
-        multicore : bool (default=True)
-            Whether to use multicore processing.
+        multicore : bool or int (default=True)
+            Whether to use multicore processing, or the number of processes to use.
+
+        wikitext_engine : str (default=mwparser)
+            Either fast to strip markup with compiled regular expressions or mwparser to fully parse articles with mwparserfromhell.
 
         verbose : bool (default=True)
             Whether to show a tqdm progress bar for the processes.
@@ -321,28 +542,32 @@ def parse_to_ndjson(
     -------
         Wikipedia dump files parsed and converted to json files.
     """
-    output_dir = "/".join(list(output_path.split("/")[:-1]))
-    if not output_dir.exists():
-        print(f"Making {output_dir} directory for the output")
-        os.makedirs(output_dir)
+    if wikitext_engine not in WIKITEXT_ENGINES:
+        raise ValueError(
+            f"Unknown wikitext engine '{wikitext_engine}'. Please use one of {WIKITEXT_ENGINES}."
+        )
 
-    if multicore:
-        num_cores = os.cpu_count()
-    elif not multicore:
-        num_cores = 1
-    elif isinstance(multicore, int):
+    if isinstance(multicore, bool):
+        num_cores = os.cpu_count() if multicore else 1
+    else:
         num_cores = multicore
 
     if output_path is None:
         timestr = time.strftime("%Y%m%d-%H%M%S")
         output_path = f"parsed_data{timestr}"
-        output_file_name = f"{output_path}.ndjson"
 
+    output_path = str(output_path)
+    if output_path[-len(".ndjson") :] != ".ndjson":
+        output_file_name = Path(f"{output_path}.ndjson")
     else:
-        if output_path[-len(".ndjson") :] != ".ndjson":
-            output_file_name = f"{output_path}.ndjson"
-        else:
-            output_file_name = output_path
+        output_file_name = Path(output_path)
+
+    output_dir = output_file_name.parent
+    if not output_dir.exists():
+        print(f"Making {output_dir} directory for the output")
+        os.makedirs(output_dir)
+
+    partitions_dir = Path(partitions_dir)
 
     if not output_file_name.exists():
         if not partitions_dir.exists():
@@ -350,14 +575,37 @@ def parse_to_ndjson(
             os.makedirs(partitions_dir)
 
         target_files = [
-            Path(input_dir) / f for f in os.listdir(input_dir) if "pages-articles" in f
+            Path(input_dir) / f
+            for f in os.listdir(input_dir)
+            if "pages-articles" in f and "multistream-index" not in f
         ]
 
+        # Files with an index use all cores by parsing their streams in parallel.
+        indexed_files = [
+            f
+            for f in target_files
+            if (f.parent / multistream_index_name(f.name)).exists()
+        ]
+        target_files = [f for f in target_files if f not in indexed_files]
+
+        if __name__ == "scribe_data.wikipedia.extract_wiki":
+            for f in indexed_files:
+                parse_multistream_file(
+                    input_path=f,
+                    index_path=f.parent / multistream_index_name(f.name),
+                    partitions_dir=partitions_dir,
+                    article_limit=article_limit,
+                    processes=num_cores,
+                    wikitext_engine=wikitext_engine,
+                    verbose=verbose,
+                )
+
         parse_inputs = zip(
             target_files,
             [partitions_dir] * len(target_files),
             [article_limit] * len(target_files),
             [False] * len(target_files),
+            [wikitext_engine] * len(target_files),
         )
 
         if __name__ == "scribe_data.wikipedia.extract_wiki":
@@ -371,33 +619,16 @@ def parse_to_ndjson(
                 ):
                     pass
 
-        def read_and_combine_json(file_path):
-            """
-            Read in json data from a file_path.
-            """
-            data = []
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    data.append(json.loads(line))
-
-            return data
-
-        threadpool = Threadpool(processes=num_cores)
-        partition_files = [
-            Path(partitions_dir) / f
-            for f in os.listdir(partitions_dir)
-            if f[-len(".ndjson") :] == ".ndjson"
-        ]
-
-        if __name__ == "scribe_data.wikipedia.extract_wiki":
-            results = threadpool.map(read_and_combine_json, partition_files)
-
-        file_list = list(chain(*results))
+        # Partitions are already ndjson, so they're concatenated in page order without being decoded.
+        partition_files = sorted(
+            partitions_dir.glob("*.ndjson"),
+            key=lambda f: [int(n) for n in re.findall(r"\d+", f.name)],
+        )
+        with open(output_file_name, "wb") as f_out:
+            for partition_file in partition_files:
+                with open(partition_file, "rb") as f_in:
+                    shutil.copyfileobj(f_in, f_out, length=READ_CHUNK_SIZE)
 
-        with open(output_file_name, "wt", encoding="utf-8") as f_out:
-            for f in file_list:
-                f_out.write(json.dumps(f) + "\n")
         print(f"File {output_file_name} with Wikipedia articles saved")
 
     else:
@@ -405,7 +636,7 @@ def parse_to_ndjson(
 
     if delete_parsed_files and partitions_dir.exists():
         print(f"Deleting {partitions_dir} directory")
-        os.system(f"rm -rf {partitions_dir}")
+        shutil.rmtree(partitions_dir)
 
     return
 
@@ -413,14 +644,29 @@ def parse_to_ndjson(
 class WikiXmlHandler(xml.sax.handler.ContentHandler):
     """
     Parse through XML data using SAX.
+
+    Parameters
+    ----------
+        f_out : file object (default=None)
+            An ndjson file that articles are written to as they're parsed, with None keeping them in target_articles.
+
+        article_limit : int (default=None)
+            An optional limit of the number of articles after which further pages are skipped.
+
+        wikitext_engine : str (default=mwparser)
+            The engine that strips the markup from the articles (see WIKITEXT_ENGINES).
     """
 
-    def __init__(self):
+    def __init__(self, f_out=None, article_limit=None, wikitext_engine="mwparser"):
         xml.sax.handler.ContentHandler.__init__(self)
         self._buffer = None
         self._values = {}
         self._current_tag = None
+        self._f_out = f_out
+        self._article_limit = article_limit
+        self._wikitext_engine = wikitext_engine
         self.target_articles = []
+        self.n_articles = 0
 
     def characters(self, content):
         """
@@ -442,12 +688,26 @@ class WikiXmlHandler(xml.sax.handler.ContentHandler):
         Closing tag of element.
         """
         if name == self._current_tag:
-            self._values[name] = " ".join(self._buffer)
+            self._values[name] = "".join(self._buffer)
 
         if name == "page":
-            target_article = _process_article(**self._values)
+            if (
+                self._article_limit is not None
+                and self.n_articles >= self._article_limit
+            ):
+                return
+
+            target_article = _process_article(
+                **self._values, wikitext_engine=self._wikitext_engine
+            )
             if target_article and (
                 "Wikipedia:" not in target_article[0]
                 and "Draft:" not in target_article[0]
             ):  # no archive files or drafts
-                self.target_articles.append(target_article)
+                if self._f_out is None:
+                    self.target_articles.append(target_article)
+
+                else:
+                    self._f_out.write(json.dumps(target_article) + "\n")
+
+                self.n_articles += 1
@@ -23,9 +23,12 @@ Module for cleaning Wikipedia based corpuses for autosuggestion generation.
 
 import json
 import re
+import sys
 import warnings
-from collections import Counter
-from itertools import chain
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
 from pathlib import Path
 from urllib.error import HTTPError
 
@@ -35,6 +38,7 @@ from tqdm.auto import tqdm
 
 from scribe_data.utils import (
     DEFAULT_JSON_EXPORT_DIR,
+    export_formatted_data,
     get_language_qid,
 )
 from scribe_data.wikidata.wikidata_utils import sparql
@@ -42,12 +46,388 @@ from scribe_data.wikidata.wikidata_utils import sparql
 warnings.filterwarnings("ignore", message=r"Passing", category=FutureWarning)
 
 
+# MARK: Clean
+
+# Words that are common in Wikipedia article markdown.
+WIKIPEDIA_MARKUP_WORDS = [
+    "nbsp",
+    "ISBN",
+    "Chr",
+    "Nr",
+    "PAGENAME",
+    "REDIRECT",
+    "REDIRECTION",
+    "WEITERLEITUNG",
+    "SORTIERUNG",
+    "REDIRECIONAMENTO",
+    "REDIRECCIÓN",
+    "OMDIRIGERING",
+    "VOLUME",
+    "fontsizeS",
+    "RINVIA",
+    "LINEAR",
+    "DateFormat",
+    "pxlink",
+    "ddmmyyyy",
+    "TimeAxis",
+    "ScaleMajor",
+    "ScaleMinor",
+    "PlotData",
+    "PlotArea",
+    "BarData",
+    "BackgroundColors",
+    "AlignBars",
+    "TextData",
+    "ImageSize",
+    "LepIndex",
+    "ITIS",
+    "INSEE",
+    "WCSP",
+    "NODC",
+    "colorblack",
+    "colorbars",
+    "alignright",
+    "alignleft",
+    "hmin",
+    "hmax",
+    "bgcolor",
+    "xy",
+    "centerpx",
+    "px",
+    "cdot",
+    "UTC",
+    "EuroMed",
+    "msg",
+    "WPProject",
+    "WPProjekt",
+]
+
+SYMBOLS_TO_REMOVE = [
+    "!",
+    "@",
+    "#",
+    "$",
+    "%",
+    "^",
+    "&",
+    "*",
+    "–",
+    # "-", we do hyphenated words later
+    "_",
+    "+",
+    "=",
+    "`",
+    "~",
+    "|",
+    "\\",
+    ";",
+    ":",
+    '"',
+    "„",
+    "“",
+    "?",
+    "/",
+    ",",
+    ".",
+    "·",
+    "«",
+    "»",
+    "(",
+    ")",
+    "[",
+    "]",
+    "{",
+    "}",
+    "\n",
+]
+
+WIKIPEDIA_NAMESPACES = [
+    # English
+    "Talk:",
+    "User:",
+    "Wikipedia:",
+    "File:",
+    "MediaWiki:",
+    "Template:",
+    "Help:",
+    "Category:",
+    "Portal:",
+    "Draft:",
+    "Topic:",
+    # French
+    "Discussion:",
+    "Utilisateur:",
+    "Catégorie:",
+    "Aide:",
+    "Portail:",
+    # German
+    "Diskussion:",
+    "Benutzer:",
+    "Kategorie:",
+    "Hilfe:",
+    # Italian
+    "Discussioni:",
+    "Discussione:",
+    "Utente:",
+    "Aiuto:",
+    "Categoria:",
+    "Portale:",
+    # Portuguese
+    "Wikipédia:",
+    "Discussão:",
+    "Usuário(a):",
+    "Ficheiro:",
+    "Predefinição:",
+    "Ajuda:",
+    "Tópico:",
+    # Russian
+    "Обсуждение:",
+    "Участник:",
+    "Википедия:",
+    "Категория:",
+    "Портал:",
+    # Spanish
+    "Discusión:",
+    "Usuario:",
+    "Archivo:",
+    "Plantilla:",
+    "Ayuda:",
+    "Categoría:",
+    # Swedish
+    "Diskussion:",
+    "Användare:",
+    "Kategori",
+    "Fil:",
+    "Mall:",
+    "Hjälp:",
+]
+
+SINGLE_LETTER_WORDS = {
+    "french": ["a", "à", "y"],
+    "german": ["à"],
+    "italian": ["a", "e", "è", "i", "o"],
+    "portuguese": ["a", "e", "é", "o"],
+    "russian": ["а", "б", "в", "ж", "и", "к", "о", "с", "у", "я"],
+    "spanish": ["a", "e", "o", "u", "y"],
+    "swedish": ["à", "å", "i", "ö"],
+}
+
+# Text between parentheses, brackets, braces and multiple equal signs, which are removed one pattern after the other.
+MARKUP_PATTERNS = [
+    re.compile(r"\([^)]*\)"),
+    re.compile(r"\[.*?\]"),
+    re.compile(r"<[^>]+>"),
+    re.compile(r"===[^>]+==="),
+    re.compile(r"==[^>]+=="),
+    re.compile(r"{{[^>]+}}"),
+    re.compile(r"{[^>]+}"),
+]
+
+# Namespaces are matched in a single pass, with earlier ones preferred where they start at the same character.
+NAMESPACE_PATTERN = re.compile("|".join(re.escape(ns) for ns in WIKIPEDIA_NAMESPACES))
+SYMBOLS_PATTERN = re.compile(
+    "[" + "".join(re.escape(s) for s in SYMBOLS_TO_REMOVE) + "]+"
+)
+WEBSITE_PATTERN = re.compile(r"http\S*")
+DECIMAL_PATTERN = re.compile(r"\d+")
+RUSSIAN_PATTERN = regex.compile(r"[+/p{Latin}]")
+
+
+@lru_cache(maxsize=None)
+def other_digits():
+    """
+    Returns the characters for which str.isdigit is True that aren't decimal digits (e.g. superscripts) and a str.translate table that removes them.
+    """
+    chars = frozenset(
+        chr(code_point)
+        for code_point in range(sys.maxunicode + 1)
+        if chr(code_point).isdigit() and not chr(code_point).isdecimal()
+    )
+
+    return chars, {ord(c): None for c in chars}
+
+
+def _collapse_spaces(t):
+    # Remove all spaces that are larger than one in length.
+    for i in range(
+        25, 0, -1
+    ):  # loop backwards to assure that smaller spaces aren't made
+        large_space = str(i * " ")
+        if large_space in t:
+            t = t.replace(large_space, " ")
+
+    return t
+
+
+def clean_text(t, language="english", words_to_remove=frozenset()):
+    """
+    Cleans and tokenizes a single text.
+
+    Parameters
+    ----------
+        t : str
+            The text to be cleaned.
+
+        language : string (default=english)
+            The lower case language of the text.
+
+        words_to_remove : set (default=frozenset())
+            Words that should be removed from the tokens in addition to Wikipedia markup words.
+
+    Returns
+    -------
+        list or None
+            The tokens of the text, or None if nothing is left of it.
+    """
+    # Remove all websites and new line markers.
+    if "http" in t:
+        websites = [
+            m.group()
+            for m in WEBSITE_PATTERN.finditer(t)
+            if m.start() == 0 or t[m.start() - 1].isspace()
+        ]
+        for w in websites:
+            t = t.replace(w, "")
+
+    for pattern in MARKUP_PATTERNS:
+        t = pattern.sub("", t)
+
+    # Remove numbers, then namespaces and then symbols as ":" is in the symbols.
+    t = DECIMAL_PATTERN.sub("", t)
+    digit_chars, digits_table = other_digits()
+    if not digit_chars.isdisjoint(t):
+        t = t.translate(digits_table)
+
+    t = NAMESPACE_PATTERN.sub("", t)
+    t = SYMBOLS_PATTERN.sub("", t)
+
+    if language == "russian":
+        t = RUSSIAN_PATTERN.sub("", t)
+
+    # Texts that are only spaces are dropped if they collapse to at most one space.
+    if not t.strip(" ") and _collapse_spaces(t) in ["", " "]:
+        return None
+
+    single_letter_words = SINGLE_LETTER_WORDS.get(language, [])
+
+    return [
+        w
+        for w in t.split()
+        if (len(w) != 1 or w in single_letter_words)
+        and w not in words_to_remove
+        and "nbsp" not in w
+        and "-" not in w
+        and "Wikipedia" not in w
+        and w != "-"
+    ]
+
+
+def _clean_chunk(texts, language, words_to_remove):
+    cleaned_texts = (clean_text(t, language, words_to_remove) for t in texts)
+    return [tokens for tokens in cleaned_texts if tokens is not None]
+
+
+def iter_clean(
+    texts,
+    language="English",
+    remove_words=None,
+    processes=1,
+    chunk_size=1000,
+    verbose=True,
+):
+    """
+    Lazily cleans and tokenizes texts, optionally in chunks that are cleaned by a pool of processes.
+
+    Parameters
+    ----------
+        texts : str or iterable
+            The texts to be cleaned and tokenized, which can be a generator such as read_article_texts.
+
+        language : string (default=English)
+            The language of the texts being cleaned.
+
+        remove_words : str or list (default=None)
+            Strings that should be removed from the text body.
+
+        processes : int (default=1)
+            The number of processes that clean chunks of texts.
+
+        chunk_size : int (default=1000)
+            The number of texts that are sent to a process at once.
+
+        verbose : bool (default=True)
+            Whether to show a tqdm progress bar for the process.
+
+    Returns
+    -------
+        Iterator[list]
+            The tokens of each text that isn't empty once cleaned, in the order of the texts.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+
+    language = language.lower()
+
+    if isinstance(remove_words, str):
+        words_to_remove = {remove_words}
+    elif remove_words is None:
+        words_to_remove = set()
+    else:
+        words_to_remove = set(remove_words)
+
+    words_to_remove.update(WIKIPEDIA_MARKUP_WORDS)
+
+    texts = tqdm(texts, desc="Articles cleaned", unit="articles", disable=not verbose)
+
+    if processes <= 1:
+        for t in texts:
+            tokens = clean_text(t, language, words_to_remove)
+            if tokens is not None:
+                yield tokens
+
+        return
+
+    # A bounded number of chunks are in flight so that memory use doesn't scale with the number of texts.
+    texts = iter(texts)
+    with Pool(processes=processes) as pool:
+        pending = deque()
+        while chunk := list(islice(texts, chunk_size)):
+            pending.append(
+                pool.apply_async(_clean_chunk, (chunk, language, words_to_remove))
+            )
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().get()
+
+        while pending:
+            yield from pending.popleft().get()
+
+
+def read_article_texts(ndjson_path):
+    """
+    Yields the texts of the articles of an ndjson file from parse_to_ndjson one line at a time.
+
+    Parameters
+    ----------
+        ndjson_path : str or Path
+            The path to the ndjson file, each line of which is a title and text.
+
+    Returns
+    -------
+        Iterator[str]
+            The text of each article.
+    """
+    with open(ndjson_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)[1]
+
+
 def clean(
     texts,
     language="English",
     remove_words=None,
     sample_size=1,
     verbose=True,
+    processes=1,
 ):
     """
     Cleans text body to prepare it for analysis.
@@ -69,6 +449,9 @@ def clean(
         verbose : bool (default=True)
             Whether to show a tqdm progress bar for the process.
 
+        processes : int (default=1)
+            The number of processes that clean the texts.
+
     Returns
     -------
         cleaned_texts : list
@@ -77,68 +460,6 @@ def clean(
     if isinstance(texts, str):
         texts = [texts]
 
-    language = language.lower()
-
-    if isinstance(remove_words, str):
-        words_to_remove = [remove_words]
-    elif remove_words is None:
-        words_to_remove = []
-
-    # Add words that are common in Wikipedia article markdown.
-    words_to_remove += [
-        "nbsp",
-        "ISBN",
-        "Chr",
-        "Nr",
-        "PAGENAME",
-        "REDIRECT",
-        "REDIRECTION",
-        "WEITERLEITUNG",
-        "SORTIERUNG",
-        "REDIRECIONAMENTO",
-        "REDIRECCIÓN",
-        "OMDIRIGERING",
-        "VOLUME",
-        "fontsizeS",
-        "RINVIA",
-        "LINEAR",
-        "DateFormat",
-        "pxlink",
-        "ddmmyyyy",
-        "TimeAxis",
-        "ScaleMajor",
-        "ScaleMinor",
-        "PlotData",
-        "PlotArea",
-        "BarData",
-        "BackgroundColors",
-        "AlignBars",
-        "TextData",
-        "ImageSize",
-        "LepIndex",
-        "ITIS",
-        "INSEE",
-        "WCSP",
-        "NODC",
-        "colorblack",
-        "colorbars",
-        "alignright",
-        "alignleft",
-        "hmin",
-        "hmax",
-        "bgcolor",
-        "xy",
-        "centerpx",
-        "px",
-        "cdot",
-        "UTC",
-        "EuroMed",
-        "msg",
-        "WPProject",
-        "WPProjekt",
-    ]
-    words_to_remove += []
-
     if sample_size < 1:
         idxs = range(len(texts))
         selected_idxs = np.random.choice(
@@ -151,171 +472,93 @@ def clean(
         texts = [texts[i] for i in selected_idxs]
         print("Random sampling finished.")
 
-    cleaned_texts = []
-    for t in tqdm(texts, desc="Articles cleaned", unit="articles", disable=not verbose):
-        # Remove all websites and new line markers.
-        websites = [word for word in t.split() if word[:4] == "http"]
-        for w in websites:
-            t = t.replace(w, "")
+    return list(
+        iter_clean(
+            texts,
+            language=language,
+            remove_words=remove_words,
+            processes=processes,
+            verbose=verbose,
+        )
+    )
 
-        # Remove all text between parentheses, brackets, braces and multiple equal signs.
-        t = re.sub(r"\([^)]*\)", "", t)
-        t = re.sub(r"\[.*?\]", "", t)
-        t = re.sub(r"<[^>]+>", "", t)
-        t = re.sub(r"===[^>]+===", "", t)
-        t = re.sub(r"==[^>]+==", "", t)
-        t = re.sub(r"{{[^>]+}}", "", t)
-        t = re.sub(r"{[^>]+}", "", t)
-
-        # Remove numbers and symbols.
-        t = "".join(c for c in t if not c.isdigit())
-
-        symbols_to_remove = [
-            "!",
-            "@",
-            "#",
-            "$",
-            "%",
-            "^",
-            "&",
-            "*",
-            "–",
-            # "-", we do hyphenated words later
-            "_",
-            "+",
-            "=",
-            "`",
-            "~",
-            "|",
-            "\\",
-            ";",
-            ":",
-            '"',
-            "„",
-            "“",
-            "?",
-            "/",
-            ",",
-            ".",
-            "·",
-            "«",
-            "»",
-            "(",
-            ")",
-            "[",
-            "]",
-            "{",
-            "}",
-            "\n",
-        ]
 
-        wikipedia_namespaces = [
-            # English
-            "Talk:",
-            "User:",
-            "Wikipedia:",
-            "File:",
-            "MediaWiki:",
-            "Template:",
-            "Help:",
-            "Category:",
-            "Portal:",
-            "Draft:",
-            "Topic:",
-            # French
-            "Discussion:",
-            "Utilisateur:",
-            "Catégorie:",
-            "Aide:",
-            "Portail:",
-            # German
-            "Diskussion:",
-            "Benutzer:",
-            "Kategorie:",
-            "Hilfe:",
-            # Italian
-            "Discussioni:",
-            "Discussione:",
-            "Utente:",
-            "Aiuto:",
-            "Categoria:",
-            "Portale:",
-            # Portuguese
-            "Wikipédia:",
-            "Discussão:",
-            "Usuário(a):",
-            "Ficheiro:",
-            "Predefinição:",
-            "Ajuda:",
-            "Tópico:",
-            # Russian
-            "Обсуждение:",
-            "Участник:",
-            "Википедия:",
-            "Категория:",
-            "Портал:",
-            # Spanish
-            "Discusión:",
-            "Usuario:",
-            "Archivo:",
-            "Plantilla:",
-            "Ayuda:",
-            "Categoría:",
-            # Swedish
-            "Diskussion:",
-            "Användare:",
-            "Kategori",
-            "Fil:",
-            "Mall:",
-            "Hjälp:",
-        ]
+# MARK: Autosuggestions
 
-        # Remove namespaces before symbols as ":" is in the symbols.
-        wikipedia_namespaces += symbols_to_remove
-        for s in wikipedia_namespaces:
-            t = t.replace(s, "")
-
-        if language == "russian":
-            # Remove Latin characters that aren't in Cyrillic.
-            t = regex.sub(r"[+/p{Latin}]", "", t)
-
-        # Remove all spaces that are larger than one in length.
-        for i in range(
-            25, 0, -1
-        ):  # loop backwards to assure that smaller spaces aren't made
-            large_space = str(i * " ")
-            if large_space in t:
-                t = t.replace(large_space, " ")
-
-        if t not in ["", " "]:
-            cleaned_texts.append(t)
-
-    single_letter_words_dict = {
-        "french": ["a", "à", "y"],
-        "german": ["à"],
-        "italian": ["a", "e", "è", "i", "o"],
-        "portuguese": ["a", "e", "é", "o"],
-        "russian": ["а", "б", "в", "ж", "и", "к", "о", "с", "у", "я"],
-        "spanish": ["a", "e", "o", "u", "y"],
-        "swedish": ["à", "å", "i", "ö"],
-    }
 
-    return [
-        [
-            w
-            for w in text.split()
-            if (len(w) != 1 or w in single_letter_words_dict[language])
-            and w not in words_to_remove
-            and "nbsp" not in w
-            and "-" not in w
-            and "Wikipedia" not in w
-            and w != "-"
-        ]
-        for text in tqdm(
-            cleaned_texts, desc="Articles checked", unit="articles", disable=not verbose
+class BigramCounts:
+    """
+    Counts of the words of a corpus and of the words that follow its most common words, which are counted in a single pass.
+
+    Parameters
+    ----------
+        text_corpus : Iterable[list]
+            The Wikipedia texts formatted for word relation extraction, which are read once so that they can be generated lazily (e.g. by iter_clean).
+
+        num_words : int (default=500)
+            The number of most common words that successors are counted for.
+    """
+
+    def __init__(self, text_corpus, num_words=500):
+        # The length of each text is recorded as its words are read so that the corpus is only iterated once.
+        text_lengths = []
+
+        def corpus_words():
+            for text in text_corpus:
+                text_lengths.append(len(text))
+                yield from text
+
+        # Words are interned as integer IDs in the order of their first occurrence.
+        vocab = {}
+        ids = np.fromiter(
+            (vocab.setdefault(w, len(vocab)) for w in corpus_words()),
+            dtype=np.int64,
         )
-        if text != ""
-    ]
+        self.words = list(vocab)
+        n_vocab = len(self.words)
+
+        # A stable sort keeps words with equal counts in order of first occurrence as Counter.most_common does.
+        word_counts = np.bincount(ids, minlength=n_vocab)
+        top_ids = np.argsort(-word_counts, kind="stable")[:num_words]
+        self.top_words = [self.words[i] for i in top_ids]
+
+        # Pairs of words that are next to each other within a text and start with a top word.
+        is_pair = np.ones(max(len(ids) - 1, 0), dtype=bool)
+        text_ends = np.cumsum(text_lengths, dtype=np.int64) - 1
+        is_pair[text_ends[(text_ends >= 0) & (text_ends < len(is_pair))]] = False
+        is_top = np.zeros(n_vocab, dtype=bool)
+        is_top[top_ids] = True
+        is_pair &= is_top[ids[:-1]]
+
+        pair_keys = ids[:-1][is_pair] * n_vocab + ids[1:][is_pair]
+        pair_keys, first_index, pair_counts = np.unique(
+            pair_keys, return_index=True, return_counts=True
+        )
+        heads = pair_keys // max(n_vocab, 1)
+
+        # Successors by head, then descending count and then first occurrence as with Counter.most_common.
+        order = np.lexsort((first_index, -pair_counts, heads))
+        self._heads = heads[order]
+        self._successors = pair_keys[order] % max(n_vocab, 1)
+        self._ids = dict(zip(self.top_words, top_ids.tolist()))
+
+    def successors(self, word):
+        """
+        Returns the words that follow a top word from most to least common.
+
+        Parameters
+        ----------
+            word : str
+                One of the top words.
+
+        Returns
+        -------
+            Iterator[str]
+                The successors of the word, with ties in order of first occurrence.
+        """
+        word_id = self._ids[word]
+        start, end = np.searchsorted(self._heads, [word_id, word_id + 1])
+        return (self.words[i] for i in self._successors[start:end].tolist())
 
 
 def gen_autosuggestions(
@@ -353,19 +596,21 @@ def gen_autosuggestions(
     -------
         Autosuggestions dictionaries for common words are saved locally or uploaded to Scribe apps.
     """
-    counter_obj = Counter(chain.from_iterable(text_corpus))
-
-    top_words = [item[0] for item in counter_obj.most_common()][:num_words]
+    bigram_counts = BigramCounts(text_corpus, num_words=num_words)
+    top_words = bigram_counts.top_words
 
     if isinstance(ignore_words, str):
-        words_to_ignore = [ignore_words]
+        words_to_ignore = {ignore_words}
     elif ignore_words is None:
-        words_to_ignore += []
+        words_to_ignore = set()
+    else:
+        words_to_ignore = set(ignore_words)
 
     print("Querying profanities to remove from suggestions.")
     # First format the lines into a multi-line string and then pass this to SPARQLWrapper.
     with open(
-        Path(__file__).parent / "query_profanity.sparql", encoding="utf-8"
+        Path(__file__).parent.parent / "wikidata" / "query_profanity.sparql",
+        encoding="utf-8",
     ) as file:
         query_lines = file.readlines()
 
@@ -380,7 +625,7 @@ def gen_autosuggestions(
     except HTTPError as err:
         print(f"HTTPError with query_profanity.sparql: {err}")
 
-    profanities = []
+    profanities = set()
 
     if results is None:
         print("Nothing returned by the WDQS server for query_profanity.sparql")
@@ -390,7 +635,7 @@ def gen_autosuggestions(
 
         for r in query_results:  # query_results is also a list
             r_dict = {k: r[k]["value"] for k in r.keys()}
-            profanities.append(r_dict["lemma"])
+            profanities.add(r_dict["lemma"])
 
         print(
             f"Queried {len(profanities)} words to be removed from autosuggest options."
@@ -400,26 +645,19 @@ def gen_autosuggestions(
     for w in tqdm(
         top_words, desc="Autosuggestions generated", unit="word", disable=not verbose
     ):
-        words_after_w = [
-            [tup[1] for tup in zip(text, text[1:]) if w == tup[0]]
-            for text in text_corpus
-        ]
-
-        flat_words_after_w = [item for sublist in words_after_w for item in sublist]
-
         autosuggestions = []
-        for tup in Counter(flat_words_after_w).most_common():
+        for successor in bigram_counts.successors(w):
             if (
-                tup[0] != w
-                and tup[0].lower() not in w.lower()
-                and tup[0] not in profanities
-                and tup[0] not in words_to_ignore
-                and tup[0] != tup[0].upper()  # no upper case suggestions
+                successor != w
+                and successor.lower() not in w.lower()
+                and successor not in profanities
+                and successor not in words_to_ignore
+                and successor != successor.upper()  # no upper case suggestions
                 # Lots of detailed articles on WWII on Wikipedia.
-                and tup[0].lower()[:4] != "nazi"
-                and tup[0].lower()[:4] != "наци"
+                and successor.lower()[:4] != "nazi"
+                and successor.lower()[:4] != "наци"
             ):
-                autosuggestions.append(tup[0])
+                autosuggestions.append(successor)
 
             if len(autosuggestions) == 3:
                 break
@@ -430,17 +668,14 @@ def gen_autosuggestions(
         print(f"Autosuggestions for {language} generated.")
 
     if update_local_data:
-        path_to_formatted_data = (
-            Path(DEFAULT_JSON_EXPORT_DIR) / language / "autosuggestions.json"
+        path_to_formatted_data = export_formatted_data(
+            file_path=DEFAULT_JSON_EXPORT_DIR,
+            formatted_data=autosuggest_dict,
+            language=language,
+            data_type="autosuggestions",
+            verbose=False,
         )
 
-        with open(
-            path_to_formatted_data,
-            "w",
-            encoding="utf-8",
-        ) as file:
-            json.dump(autosuggest_dict, file, ensure_ascii=False, indent=0)
-
         print(
             f"Autosuggestions for {language} generated and saved to '{path_to_formatted_data}'."
         )
@@ -0,0 +1,231 @@
+"""
+Functions for stripping the markup from the wikitext of Wikipedia articles.
+
+.. raw:: html
+
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import html
+import re
+
+import mwparserfromhell
+
+WIKITEXT_ENGINES = ["fast", "mwparser"]
+
+# Links to these namespaces are images or categories rather than text of the article.
+MEDIA_NAMESPACES = {
+    # English
+    "file",
+    "image",
+    "media",
+    "category",
+    # French
+    "fichier",
+    "catégorie",
+    # German
+    "datei",
+    "bild",
+    "kategorie",
+    # Italian
+    "immagine",
+    "categoria",
+    # Portuguese
+    "ficheiro",
+    "arquivo",
+    "imagem",
+    # Russian
+    "файл",
+    "изображение",
+    "категория",
+    # Spanish
+    "archivo",
+    "imagen",
+    "categoría",
+    # Swedish
+    "fil",
+    "kategori",
+}
+
+# Tags whose contents aren't text of the article, with references also being removed unlike with mwparserfromhell.
+INVISIBLE_TAGS = [
+    "categorytree",
+    "chem",
+    "gallery",
+    "graph",
+    "imagemap",
+    "inputbox",
+    "math",
+    "ref",
+    "references",
+    "score",
+    "section",
+    "syntaxhighlight",
+    "templatedata",
+    "timeline",
+]
+
+COMMENT_PATTERN = re.compile(r"<!--.*?(?:-->|\Z)", re.DOTALL)
+INVISIBLE_TAG_PATTERN = re.compile(
+    rf"<({'|'.join(INVISIBLE_TAGS)})\b[^>]*?(?:/>|>.*?</\1\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+# Innermost templates and template arguments, which are removed until none are left to remove nested ones.
+TEMPLATE_PATTERN = re.compile(r"\{\{\{[^{}]*\}\}\}|\{\{[^{}]*\}\}")
+TABLE_LINE_PATTERN = re.compile(r"^[ \t]*(\{\||\|\})", re.MULTILINE)
+# Innermost wikilinks, which are replaced until none are left so that links in image captions are replaced first.
+WIKILINK_PATTERN = re.compile(r"\[\[([^\[\]]*)\]\]")
+EXTERNAL_LINK_PATTERN = re.compile(
+    r"\[(?:[a-z]+:)?//[^\s\]]+(?:[ \t]+([^\]]*))?\]", re.IGNORECASE
+)
+HEADING_PATTERN = re.compile(r"^(=+)[ \t]*(.*?)[ \t]*\1[ \t]*$", re.MULTILINE)
+LINE_MARKUP_PATTERN = re.compile(r"^(?:[*#:;]+|-{4,})", re.MULTILINE)
+TAG_PATTERN = re.compile(r"</?[a-zA-Z][^<>]*>")
+BOLD_ITALIC_PATTERN = re.compile(r"'{2,}")
+
+
+def _remove_nested(pattern, text, repl=""):
+    """
+    Applies a pattern for the innermost of nested markup until it no longer matches.
+    """
+    n_subs = 1
+    while n_subs:
+        text, n_subs = pattern.subn(repl, text)
+
+    return text
+
+
+def _remove_tables(text):
+    """
+    Removes tables by tracking their nesting over the lines that open and close them.
+    """
+    kept = []
+    depth = 0
+    position = 0
+    for match in TABLE_LINE_PATTERN.finditer(text):
+        if match.group(1) == "{|":
+            if depth == 0:
+                kept.append(text[position : match.start()])
+
+            depth += 1
+
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                position = text.find("\n", match.end())
+                position = len(text) if position == -1 else position
+
+    if depth == 0:
+        kept.append(text[position:])
+
+    return "".join(kept)
+
+
+def _replace_wikilink(match):
+    """
+    Returns the text that a wikilink shows, with links to images and categories being removed.
+    """
+    target, pipe, label = match.group(1).partition("|")
+    namespace, colon, _ = target.partition(":")
+    if colon and namespace.strip().lower() in MEDIA_NAMESPACES:
+        return ""
+
+    return label if pipe else target
+
+
+def fast_strip_code(text):
+    """
+    Strips the markup from wikitext with compiled regular expressions rather than a full parse.
+
+    Notes
+    -----
+        The result is close to mwparserfromhell's strip_code, but templates, tables, references, images and categories are removed entirely.
+
+    Parameters
+    ----------
+        text : str
+            The wikitext of an article.
+
+    Returns
+    -------
+        text : str
+            The text of the article.
+    """
+    if "<" in text:
+        text = COMMENT_PATTERN.sub("", text)
+        text = INVISIBLE_TAG_PATTERN.sub("", text)
+
+    if "{{" in text:
+        text = _remove_nested(TEMPLATE_PATTERN, text)
+
+    if "{|" in text:
+        text = _remove_tables(text)
+
+    if "[[" in text:
+        text = _remove_nested(WIKILINK_PATTERN, text, _replace_wikilink)
+
+    if "[" in text:
+        text = EXTERNAL_LINK_PATTERN.sub(lambda m: m.group(1) or "", text)
+
+    if "=" in text:
+        text = HEADING_PATTERN.sub(r"\2", text)
+
+    text = LINE_MARKUP_PATTERN.sub("", text)
+
+    if "<" in text:
+        text = TAG_PATTERN.sub("", text)
+
+    if "''" in text:
+        text = BOLD_ITALIC_PATTERN.sub("", text)
+
+    if "&" in text:
+        text = html.unescape(text)
+
+    text = text.strip("\n")
+    while "\n\n\n" in text:
+        text = text.replace("\n\n\n", "\n\n")
+
+    return text
+
+
+def strip_code(text, engine="mwparser"):
+    """
+    Strips the markup from wikitext with the given engine.
+
+    Parameters
+    ----------
+        text : str
+            The wikitext of an article.
+
+        engine : str (default=mwparser)
+            Either fast for fast_strip_code or mwparser for a full parse with mwparserfromhell.
+
+    Returns
+    -------
+        text : str
+            The text of the article.
+    """
+    if engine == "fast":
+        return fast_strip_code(text)
+
+    elif engine == "mwparser":
+        return mwparserfromhell.parse(text).strip_code()
+
+    raise ValueError(
+        f"Unknown wikitext engine '{engine}'. Please use one of {WIKITEXT_ENGINES}."
+    )
@@ -0,0 +1,30 @@
+"""
+Tests for the check of the project's language metadata.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+from scribe_data.check.check_project_metadata import check_language_metadata
+
+
+def test_check_language_metadata(capsys):
+    # The check exits with an error if the metadata and the extraction directories differ.
+    check_language_metadata()
+
+    assert "have the correct properties" in capsys.readouterr().out
@@ -0,0 +1,161 @@
+"""
+Tests for batched translations against a local stub SPARQL endpoint.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from scribe_data.cli.db_utils.batch_translations import BatchTranslator, sparql_string
+
+# Labels of the items of the stub endpoint, with "cat" being the label of two items.
+LABELS = {
+    "Q146": {"en": "cat", "fr": "chat", "es": "gato", "de": "Katze"},
+    "Q1000": {"en": "cat", "fr": "chat (homonymie)"},
+    "Q144": {"en": "dog", "fr": "chien", "de": "Hund"},
+    "Q2": {"en": 'the "earth"', "fr": "la Terre"},
+}
+
+
+class StubSPARQLHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        query = parse_qs(body)["query"][0]
+        self.server.queries.append(query)
+
+        words = [
+            (json.loads(f'"{w}"'), lang)
+            for w, lang in re.findall(r'"((?:[^"\\]|\\.)*)"@(\w+)', query)
+        ]
+        target_langs = re.findall(r'"(\w+)"', query.split("IN (")[1])
+        bindings = [
+            {
+                "word": {"type": "literal", "value": word},
+                "item": {
+                    "type": "uri",
+                    "value": f"http://www.wikidata.org/entity/{qid}",
+                },
+                "languageCode": {"type": "literal", "value": lang},
+                "translation": {"type": "literal", "value": label},
+            }
+            for word, source_lang in words
+            for qid, labels in LABELS.items()
+            if labels.get(source_lang) == word
+            for lang, label in labels.items()
+            if lang in target_langs
+        ]
+
+        response = json.dumps({"results": {"bindings": bindings}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubSPARQLServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubSPARQLHandler)
+        self.queries = []
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubSPARQLServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def translator(stub_server):
+    endpoint = f"http://127.0.0.1:{stub_server.server_address[1]}/sparql"
+    translator = BatchTranslator(endpoint=endpoint, batch_size=2, cache_size=3)
+    yield translator
+    translator.session.close()
+
+
+def test_sparql_string_escapes_quotes():
+    assert sparql_string('a "b" \\c', "en") == '"a \\"b\\" \\\\c"@en'
+
+
+def test_translate_words_one_query_per_batch(translator, stub_server):
+    translations = translator.translate_words(
+        ["cat", "dog", "cat", "bird", 'the "earth"'], target_langs=["fr", "de"]
+    )
+
+    assert translations == {
+        "cat": {"fr": "chat", "de": "Katze"},
+        "dog": {"fr": "chien", "de": "Hund"},
+        "bird": None,
+        'the "earth"': {"fr": "la Terre"},
+    }
+    # Four distinct words in batches of two.
+    assert len(stub_server.queries) == 2
+    assert stub_server.connections == 1
+
+
+def test_translate_words_memoized(translator, stub_server):
+    translator.translate_words(["cat", "dog"])
+    translator.translate_words(["dog", "cat"])
+    assert len(stub_server.queries) == 1
+
+    # Queries for other languages aren't answered from the cache.
+    translator.translate_words(["cat"], target_langs=["es"])
+    assert len(stub_server.queries) == 2
+
+    # The least recently used word is dropped once the cache is full.
+    translator.translate_words(["bird"])
+    translator.translate_words(["cat", "dog"])
+    assert len(stub_server.queries) == 4
+    assert 'VALUES ?word { "dog"@en }' in stub_server.queries[-1]
+
+
+def test_translate_file(translator, stub_server, tmp_path):
+    phrases_file = tmp_path / "phrases.txt"
+    phrases_file.write_text("cat dog\n\ndog bird\n", encoding="utf-8")
+
+    assert translator.translate_file(phrases_file, target_langs=["fr"]) == [
+        {"phrase": "cat dog", "cat": {"fr": "chat"}, "dog": {"fr": "chien"}},
+        {
+            "phrase": "dog bird",
+            "dog": {"fr": "chien"},
+            "bird": "No translations found for 'bird'.",
+        },
+    ]
+    assert len(stub_server.queries) == 2
+    assert stub_server.connections == 1
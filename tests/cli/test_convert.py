@@ -20,17 +20,21 @@ Tests for the CLI convert functionality.
     -->
 """
 
+import csv
 import json
+import tempfile
 import unittest
 from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 from scribe_data.cli.convert import (
+    JSONObjectWriter,
     convert_to_csv_or_tsv,
     convert_to_json,
     convert_to_sqlite,
     convert_wrapper,
+    iter_json_object_items,
 )
 
 
@@ -225,7 +229,7 @@ class TestConvert(unittest.TestCase):
 
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_json(
                 language="English",
@@ -266,7 +270,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_json(
                 language="English",
@@ -303,7 +307,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_json(
                 language="English",
@@ -398,7 +402,7 @@ class TestConvert(unittest.TestCase):
 
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
 
             convert_to_csv_or_tsv(
@@ -440,7 +444,7 @@ class TestConvert(unittest.TestCase):
 
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -481,7 +485,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -522,7 +526,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -563,7 +567,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -604,7 +608,7 @@ class TestConvert(unittest.TestCase):
         mocked_open = mock_open()
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             # Prevent actual directory creation
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
@@ -647,7 +651,7 @@ class TestConvert(unittest.TestCase):
 
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -689,7 +693,7 @@ class TestConvert(unittest.TestCase):
 
         with patch("pathlib.Path.open", mocked_open), patch(
             "pathlib.Path.mkdir"
-        ) as mock_mkdir:
+        ) as mock_mkdir, patch("pathlib.Path.replace"):
             mock_mkdir.return_value = None
             convert_to_csv_or_tsv(
                 language="English",
@@ -788,7 +792,7 @@ class TestConvert(unittest.TestCase):
             convert_wrapper(
                 language="English",
                 data_type="nouns",
-                output_type="parquet",
+                output_type="xml",
                 input_file="Data/ecode.csv",
                 output_dir="/output_dir",
                 overwrite=True,
@@ -796,5 +800,170 @@ class TestConvert(unittest.TestCase):
 
         self.assertEqual(
             str(context.exception),
-            "Unsupported output type 'parquet'. Must be 'json', 'csv', 'tsv' or 'sqlite'.",
-        )
+            "Unsupported output type 'xml'. Must be 'json', 'csv', 'tsv', 'sqlite', 'parquet' or 'feather'.",
+        )
+
+
+class TestStreamingConvert(unittest.TestCase):
+    DATA = {
+        "nouns": {
+            "Haus": {"plural": "Häuser", "gender": "neuter"},
+            'Zitat "x"': {"plural": "Zitate", "gender": "neuter"},
+        },
+        "verbs": {"gehen": {"pastParticiple": "gegangen", "infinitive": "gehen"}},
+        "emoji-keywords": {
+            "katze": [
+                {"emoji": "🐱", "is_base": False, "rank": 20},
+                {"emoji": "🐈", "is_base": False, "rank": None},
+            ],
+            "hand": [{"emoji": "👋", "is_base": True, "rank": 3}],
+        },
+        "autosuggestions": {"ich": ["bin", "habe", "kann"]},
+        "prepositions": {"mit": "Dativ", "zahl": 12.5, "leer": None},
+    }
+
+    def test_iter_json_object_items(self):
+        for data in [*self.DATA.values(), {}, {"a": {"b": [1, {"c": "}"}]}}]:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+            for chunk_size in [1, 3, 7, 1024]:
+                with self.subTest(data=data, chunk_size=chunk_size):
+                    items = list(
+                        iter_json_object_items(StringIO(text), chunk_size=chunk_size)
+                    )
+                    self.assertEqual(items, list(data.items()))
+
+    def test_iter_json_object_items_invalid(self):
+        for text in ['["a"]', '{"a": 1', '{"a" 1}', '{"a": 1,}', ""]:
+            with self.subTest(text=text), self.assertRaises(json.JSONDecodeError):
+                list(iter_json_object_items(StringIO(text), chunk_size=2))
+
+    def test_json_object_writer(self):
+        for data in [*self.DATA.values(), {}]:
+            with self.subTest(data=data):
+                file = StringIO()
+                writer = JSONObjectWriter(file)
+                for key, value in data.items():
+                    writer.write(key, value)
+
+                writer.close()
+                self.assertEqual(
+                    file.getvalue(), json.dumps(data, ensure_ascii=False, indent=2)
+                )
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for dtype in ["nouns", "verbs", "emoji-keywords", "autosuggestions"]:
+                for output_type in ["csv", "tsv"]:
+                    with self.subTest(dtype=dtype, output_type=output_type):
+                        json_file = Path(tmp) / f"{dtype}.json"
+                        json_file.write_text(
+                            json.dumps(self.DATA[dtype], ensure_ascii=False),
+                            encoding="utf-8",
+                        )
+                        convert_to_csv_or_tsv(
+                            language="German",
+                            data_type=dtype,
+                            output_type=output_type,
+                            input_file=str(json_file),
+                            output_dir=Path(tmp) / output_type,
+                            overwrite=True,
+                        )
+                        convert_to_json(
+                            language="German",
+                            data_type=dtype,
+                            output_type="json",
+                            input_file=str(
+                                Path(tmp)
+                                / output_type
+                                / "German"
+                                / f"{dtype}.{output_type}"
+                            ),
+                            output_dir=Path(tmp) / "json",
+                            overwrite=True,
+                        )
+
+                        with open(
+                            Path(tmp) / "json" / "German" / f"{dtype}.json",
+                            encoding="utf-8",
+                        ) as f:
+                            converted = json.load(f)
+
+                        if dtype == "autosuggestions":
+                            # Lists of strings are written as columns that are read back as a dictionary.
+                            self.assertEqual(
+                                converted,
+                                {
+                                    "ich": {
+                                        "autosuggestion_1": "bin",
+                                        "autosuggestion_2": "habe",
+                                        "autosuggestion_3": "kann",
+                                    }
+                                },
+                            )
+
+                        else:
+                            self.assertEqual(converted, self.DATA[dtype])
+
+    def test_failed_conversion_leaves_no_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # The JSON is cut off after its first member, so parsing fails once rows have been written.
+            json_file = Path(tmp) / "nouns.json"
+            json_file.write_text(
+                '{"Haus": {"plural": "Häuser"}, "Katze": {"plural": ',
+                encoding="utf-8",
+            )
+            convert_to_csv_or_tsv(
+                language="German",
+                data_type="nouns",
+                output_type="csv",
+                input_file=str(json_file),
+                output_dir=tmp,
+                overwrite=True,
+            )
+
+            # A field that's larger than the CSV field size limit fails after the first row.
+            csv_file = Path(tmp) / "nouns.csv"
+            csv_file.write_text(
+                f"noun,plural\nHaus,Häuser\nKatze,{'x' * (csv.field_size_limit() + 1)}\n",
+                encoding="utf-8",
+            )
+            convert_to_json(
+                language="German",
+                data_type="nouns",
+                output_type="json",
+                input_file=str(csv_file),
+                output_dir=tmp,
+                overwrite=True,
+            )
+
+            self.assertEqual(list((Path(tmp) / "German").iterdir()), [])
+
+    def test_convert_to_json_scattered_emoji_keywords(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_file = Path(tmp) / "emoji_keywords.csv"
+            csv_file.write_text(
+                "word,emoji,is_base,rank\na,😀,True,1\nb,😅,False,\na,😺,False,3\n",
+                encoding="utf-8",
+            )
+            convert_to_json(
+                language="English",
+                data_type="emoji_keywords",
+                output_type="json",
+                input_file=str(csv_file),
+                output_dir=tmp,
+                overwrite=True,
+            )
+
+            with open(
+                Path(tmp) / "English" / "emoji_keywords.json", encoding="utf-8"
+            ) as f:
+                self.assertEqual(
+                    json.load(f),
+                    {
+                        "a": [
+                            {"emoji": "😀", "is_base": True, "rank": 1},
+                            {"emoji": "😺", "is_base": False, "rank": 3},
+                        ],
+                        "b": [{"emoji": "😅", "is_base": False, "rank": None}],
+                    },
+                )
@@ -39,6 +39,15 @@ class TestGetData(unittest.TestCase):
             output_dir="./test_output",
         )
 
+    @patch("scribe_data.cli.get.generate_emoji_for_all_languages")
+    def test_get_emoji_keywords_all_languages(self, generate_emoji_for_all_languages):
+        get_data(
+            data_type="emoji_keywords", all=True, output_dir="./test_output", jobs=2
+        )
+        generate_emoji_for_all_languages.assert_called_once_with(
+            output_dir="./test_output", jobs=2
+        )
+
     # MARK: Invalid Arguments
 
     def test_invalid_arguments(self):
@@ -50,7 +59,7 @@ class TestGetData(unittest.TestCase):
     @patch("scribe_data.cli.get.query_data")
     def test_get_all_data(self, mock_query_data):
         get_data(all=True)
-        mock_query_data.assert_called_once_with(None, None, None, False)
+        mock_query_data.assert_called_once_with(None, None, None, False, page_size=None)
 
     # MARK: Language and Data Type
 
@@ -63,6 +72,7 @@ class TestGetData(unittest.TestCase):
             output_dir="./test_output",
             overwrite=False,
             interactive=False,
+            page_size=None,
         )
 
     # MARK: Capitalized Language
@@ -76,6 +86,7 @@ class TestGetData(unittest.TestCase):
             output_dir="scribe_data_json_export",
             overwrite=False,
             interactive=False,
+            page_size=None,
         )
 
     # MARK: Lowercase Language
@@ -89,6 +100,7 @@ class TestGetData(unittest.TestCase):
             output_dir="scribe_data_json_export",
             overwrite=False,
             interactive=False,
+            page_size=None,
         )
 
     # MARK: Output Directory
@@ -104,6 +116,7 @@ class TestGetData(unittest.TestCase):
             output_dir="./custom_output_test",
             overwrite=False,
             interactive=False,
+            page_size=None,
         )
 
     # MARK: Overwrite is True
@@ -117,6 +130,7 @@ class TestGetData(unittest.TestCase):
             output_dir="scribe_data_json_export",
             overwrite=True,
             interactive=False,
+            page_size=None,
         )
 
     # MARK: Overwrite is False
@@ -136,4 +150,19 @@ class TestGetData(unittest.TestCase):
             output_dir="./custom_output_test",
             overwrite=False,
             interactive=False,
+            page_size=None,
+        )
+
+    # MARK: Page Size
+
+    @patch("scribe_data.cli.get.query_data")
+    def test_get_data_with_page_size(self, mock_query_data):
+        get_data(language="German", data_type="verbs", page_size=50000)
+        mock_query_data.assert_called_once_with(
+            languages=["German"],
+            data_type=["verbs"],
+            output_dir="scribe_data_json_export",
+            overwrite=False,
+            interactive=False,
+            page_size=50000,
         )
@@ -0,0 +1,103 @@
+"""
+Tests for the startup of the Scribe-Data CLI.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import scribe_data
+
+# Modules that only some subcommands need and that shouldn't be loaded to start the CLI or list data.
+HEAVY_MODULES = {
+    "meilisearch",
+    "pkg_resources",
+    "psycopg2",
+    "questionary",
+    "requests",
+    "rich",
+    "SPARQLWrapper",
+    "tqdm",
+    "scribe_data.cli.db_utils",
+    "scribe_data.load.data_to_sqlite",
+    "scribe_data.wikidata.query_data",
+}
+# Generous budgets in microseconds of cumulative import time, as imports take about 10 and 30 ms locally.
+IMPORT_BUDGETS = {"main": 150_000, "list": 300_000}
+
+
+def import_times(code):
+    """
+    Runs Python code with -X importtime and returns the cumulative import times in microseconds of the imported modules and whether they're top-level imports.
+    """
+    env = dict(os.environ, PYTHONPATH=str(Path(scribe_data.__file__).parent.parent))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                # Nested imports are indented below the module that imports them.
+                is_top_level = name[1:2] != " "
+                times[name.strip()] = (int(cumulative), is_top_level)
+
+    return times
+
+
+def is_heavy(module):
+    return any(
+        module == heavy or module.startswith(f"{heavy}.") for heavy in HEAVY_MODULES
+    )
+
+
+@pytest.mark.parametrize(
+    "command, code",
+    [
+        ("main", "import scribe_data.cli.main"),
+        (
+            "list",
+            "import sys; sys.argv = ['scribe-data', 'list', '--language']; "
+            "from scribe_data.cli.main import main; main()",
+        ),
+    ],
+)
+def test_cli_startup_import_time(command, code):
+    times = import_times(code)
+
+    assert not [module for module in times if is_heavy(module)]
+    assert (
+        sum(
+            t
+            for module, (t, is_top_level) in times.items()
+            if is_top_level and module.startswith("scribe_data")
+        )
+        < IMPORT_BUDGETS[command]
+    )
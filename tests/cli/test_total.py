@@ -24,8 +24,10 @@ import unittest
 from unittest.mock import MagicMock, call, patch
 
 from scribe_data.cli.total import (
+    get_grouped_total_lexemes,
     get_qid_by_input,
     get_total_lexemes,
+    print_total_lexemes,
 )
 
 
@@ -134,6 +136,64 @@ class TestTotalLexemes(unittest.TestCase):
         mock_print.assert_has_calls(expected_calls)
 
 
+class TestGroupedTotalLexemes(unittest.TestCase):
+    def setUp(self):
+        mock_results = MagicMock()
+        mock_results.convert.return_value = {
+            "results": {
+                "bindings": [
+                    {
+                        "language": {"value": "http://www.wikidata.org/entity/Q1860"},
+                        "category": {"value": "http://www.wikidata.org/entity/Q1084"},
+                        "total": {"value": "42000"},
+                    },
+                    {
+                        "language": {"value": "http://www.wikidata.org/entity/Q188"},
+                        "category": {"value": "http://www.wikidata.org/entity/Q24905"},
+                        "total": {"value": "7"},
+                    },
+                ]
+            }
+        }
+        patcher = patch("scribe_data.cli.total.sparql.query", return_value=mock_results)
+        self.mock_query = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("scribe_data.cli.total.sparql.setQuery")
+    def test_get_grouped_total_lexemes(self, mock_set_query):
+        totals = get_grouped_total_lexemes(
+            ["english", "German", "Martian"], ["nouns", "verbs"]
+        )
+
+        self.assertEqual(
+            totals,
+            {
+                ("english", "nouns"): 42000,
+                ("english", "verbs"): 0,
+                ("German", "nouns"): 0,
+                ("German", "verbs"): 7,
+                ("Martian", "nouns"): None,
+                ("Martian", "verbs"): None,
+            },
+        )
+        query = mock_set_query.call_args.args[0]
+        self.assertIn("VALUES ?language { wd:Q1860 wd:Q188 }", query)
+        self.assertIn("VALUES ?category { wd:Q1084 wd:Q24905 }", query)
+        self.assertIn("GROUP BY ?language ?category", query)
+
+    @patch(
+        "scribe_data.cli.total.list_all_languages", return_value=["english", "german"]
+    )
+    @patch("scribe_data.cli.total.get_datatype_list", return_value=["nouns", "verbs"])
+    def test_print_total_lexemes_all_languages_queries_once(self, *_):
+        with patch("builtins.print") as mock_print:
+            print_total_lexemes()
+
+        self.mock_query.assert_called_once()
+        mock_print.assert_any_call(f"{'English':<15} {'nouns':<25} {'42,000':<25}")
+        mock_print.assert_any_call(f"{'':<15} {'verbs':<25} {'7':<25}")
+
+
 class TestGetQidByInput(unittest.TestCase):
     def setUp(self):
         self.valid_data_types = {
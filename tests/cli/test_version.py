@@ -20,7 +20,9 @@ Tests for the CLI version functionality.
     -->
 """
 
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 import pkg_resources
@@ -78,3 +80,14 @@ class TestVersionFunctions(unittest.TestCase):
         """
         expected_message = "Scribe-Data v1.0.0 (Upgrade available: Scribe-Data v1.0.1)\nTo update: pip scribe-data --upgrade"
         self.assertEqual(get_version_message(), expected_message)
+
+    @patch("requests.get")
+    def test_get_latest_version_cached(self, mock_get):
+        mock_get.return_value.json.return_value = {"name": "Scribe-Data v1.0.1"}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = Path(tmp_dir) / "latest_version.json"
+
+            self.assertEqual(get_latest_version(cache_file), "Scribe-Data v1.0.1")
+            self.assertEqual(get_latest_version(cache_file), "Scribe-Data v1.0.1")
+
+        mock_get.assert_called_once()
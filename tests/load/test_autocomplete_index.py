@@ -0,0 +1,129 @@
+"""
+Tests for the prefix indexes of autocomplete_lexicon.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import sqlite3
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from scribe_data.load.autocomplete_index import (
+    PREFIXES_CREATE,
+    WORDS_CREATE,
+    WORDS_INDEX,
+    lookup_completions,
+    prefix_rows,
+    rank_words,
+    word_rows,
+)
+from scribe_data.load.data_to_sqlite import data_to_sqlite
+
+WORDS = ["Haus", "haben", "Hase", "hat", "Himmel", "Hausaufgabe", "Über", "übel"]
+WEIGHTS = Counter({"hat": 5, "haus": 3, "über": 2})
+
+
+@pytest.fixture
+def cursor():
+    connection = sqlite3.connect(":memory:")
+    cursor = connection.cursor()
+    ranked_words = rank_words(WORDS, WEIGHTS)
+    cursor.execute(WORDS_CREATE)
+    cursor.execute(WORDS_INDEX)
+    cursor.executemany(
+        "INSERT INTO autocomplete_words VALUES (?, ?, ?)",
+        word_rows(ranked_words, WEIGHTS),
+    )
+    cursor.execute(PREFIXES_CREATE)
+    cursor.executemany(
+        "INSERT INTO autocomplete_prefixes VALUES (?, ?)",
+        prefix_rows(ranked_words, top_k=3, max_prefix_length=2),
+    )
+    yield cursor
+    connection.close()
+
+
+def test_rank_words():
+    assert rank_words(WORDS, WEIGHTS)[:4] == ["hat", "Haus", "Über", "Hase"]
+
+
+def test_prefix_rows_keep_top_k():
+    rows = dict(prefix_rows(rank_words(WORDS, WEIGHTS), top_k=3, max_prefix_length=2))
+
+    assert json.loads(rows["h"]) == ["hat", "Haus", "Hase"]
+    assert json.loads(rows["ü"]) == ["Über", "übel"]
+    assert "hau" not in rows
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [
+        ("H", ["hat", "Haus", "Hase"]),
+        ("hA", ["hat", "Haus", "Hase"]),
+        ("Ü", ["Über", "übel"]),
+        ("hau", ["Haus", "Hausaufgabe"]),
+        ("HIMM", ["Himmel"]),
+        ("x", []),
+        ("", []),
+    ],
+)
+def test_lookup_completions(cursor, prefix, expected):
+    assert lookup_completions(cursor, prefix, max_prefix_length=2) == expected
+
+
+def test_lookup_completions_long_prefixes_use_index(cursor):
+    plan = cursor.execute(
+        "EXPLAIN QUERY PLAN SELECT word FROM autocomplete_words WHERE key >= ? AND key < ?",
+        ("hau", "hau\U0010ffff"),
+    ).fetchall()
+    assert "USING INDEX autocomplete_words_key" in plan[0][-1]
+
+
+def test_data_to_sqlite_builds_prefix_index(tmp_path):
+    json_dir = tmp_path / "json"
+    sqlite_dir = tmp_path / "sqlite"
+    (json_dir / "german").mkdir(parents=True)
+    sqlite_dir.mkdir()
+    data = {
+        "nouns": {"Haus": {"plural": "Häuser", "form": "N"}},
+        "prepositions": {"mit": "Dat"},
+        "autosuggestions": {"habe": ["ich", "das", "hat"], "hat": ["er", "es", "das"]},
+        "emoji_keywords": {"haus": [{"emoji": "🏠", "is_base": True, "rank": 1}]},
+    }
+    for data_type, values in data.items():
+        with open(
+            json_dir / "german" / f"{data_type}.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(values, f, ensure_ascii=False)
+
+    with (
+        patch("scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ),
+    ):
+        data_to_sqlite(languages=["german"])
+
+    connection = sqlite3.connect(sqlite_dir / "DELanguageData.sqlite")
+    assert lookup_completions(connection.cursor(), "ha") == ["hat", "habe", "Haus"]
+    assert lookup_completions(connection.cursor(), "scri") == ["Scribe"]
+    connection.close()
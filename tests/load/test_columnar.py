@@ -0,0 +1,201 @@
+"""
+Tests for Parquet and Feather outputs of formatted data.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+
+import pytest
+
+from scribe_data.cli.convert import convert_wrapper
+from scribe_data.load import columnar
+from scribe_data.load.columnar import columnar_to_dict, read_columnar, write_columnar
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+GENDERS = ["masculine", "feminine", "neuter"]
+DATA = {
+    "nouns": {
+        f"Wort{i}": {"plural": f"Wörter{i}", "gender": GENDERS[i % 3]}
+        for i in range(10)
+    },
+    "verbs": {
+        "gehen": {"infinitive": "gehen", "pastParticiple": "gegangen"},
+        "sein": {"infinitive": "sein"},
+    },
+    "emoji-keywords": {
+        "katze": [
+            {"emoji": "🐱", "is_base": False, "rank": 20},
+            {"emoji": "🐈", "is_base": False, "rank": None},
+        ],
+        "hand": [{"emoji": "👋", "is_base": True, "rank": 3}],
+    },
+    "autosuggestions": {"ich": ["bin", "habe", "kann"], "du": []},
+    "prepositions": {"mit": "Dativ", "zahl": 12.5},
+    "translations": {"Haus": {"en": "house", "forms": [1, {"a": "b"}]}},
+}
+
+
+@pytest.mark.parametrize("output_type", ["parquet", "feather"])
+@pytest.mark.parametrize("data_type", list(DATA))
+def test_write_columnar_round_trip(tmp_path, output_type, data_type):
+    data = DATA[data_type]
+    output_file = tmp_path / f"{data_type}.{output_type}"
+    write_columnar(
+        lambda: iter(data.items()),
+        output_file,
+        data_type=data_type,
+        output_type=output_type,
+        row_group_size=3,
+    )
+
+    assert columnar_to_dict(read_columnar(output_file)) == data
+    assert not list(tmp_path.glob("*.partial"))
+
+
+@pytest.mark.parametrize("output_type", ["parquet", "feather"])
+def test_write_columnar_types(tmp_path, output_type):
+    nouns_file = tmp_path / f"nouns.{output_type}"
+    write_columnar(
+        lambda: iter(DATA["nouns"].items()),
+        nouns_file,
+        "nouns",
+        output_type,
+        row_group_size=4,
+    )
+    emoji_file = tmp_path / f"emoji-keywords.{output_type}"
+    write_columnar(
+        lambda: iter(DATA["emoji-keywords"].items()),
+        emoji_file,
+        "emoji-keywords",
+        output_type,
+    )
+
+    nouns = read_columnar(nouns_file).schema
+    assert nouns.names == ["noun", "plural", "gender"]
+    assert nouns.field("plural").type == pa.string()
+    assert nouns.field("gender").type == pa.dictionary(pa.int32(), pa.string())
+
+    emoji_keywords = read_columnar(emoji_file)
+    assert emoji_keywords.schema.names == ["word", "emoji", "is_base", "rank"]
+    assert emoji_keywords.schema.field("is_base").type == pa.bool_()
+    assert emoji_keywords.schema.field("rank").type == pa.int64()
+    assert emoji_keywords.num_rows == 3
+
+
+def test_parquet_row_group_statistics(tmp_path):
+    output_file = tmp_path / "nouns.parquet"
+    write_columnar(
+        lambda: iter(DATA["nouns"].items()),
+        output_file,
+        "nouns",
+        "parquet",
+        row_group_size=4,
+    )
+
+    metadata = pq.ParquetFile(output_file).metadata
+    assert metadata.num_row_groups == 3
+    statistics = metadata.row_group(0).column(0).statistics
+    assert (statistics.min, statistics.max) == ("Wort0", "Wort3")
+
+    feminine = read_columnar(output_file, filters=[("gender", "=", "feminine")])
+    assert feminine.column("noun").to_pylist() == ["Wort1", "Wort4", "Wort7"]
+
+
+def test_convert_wrapper_to_parquet(tmp_path):
+    csv_file = tmp_path / "nouns.csv"
+    csv_file.write_text(
+        "noun,gender,plural\nHaus,neuter,Häuser\nKatze,feminine,Katzen\n",
+        encoding="utf-8",
+    )
+    json_file = tmp_path / "verbs.json"
+    json_file.write_text(json.dumps(DATA["verbs"]), encoding="utf-8")
+
+    convert_wrapper(
+        language="german",
+        data_type="nouns",
+        output_type="parquet",
+        input_file=str(csv_file),
+        output_dir=str(tmp_path),
+        overwrite=True,
+    )
+    convert_wrapper(
+        language="german",
+        data_type="verbs",
+        output_type="feather",
+        input_file=str(json_file),
+        output_dir=str(tmp_path),
+        overwrite=True,
+    )
+
+    assert columnar_to_dict(read_columnar(tmp_path / "German" / "nouns.parquet")) == {
+        "Haus": {"gender": "neuter", "plural": "Häuser"},
+        "Katze": {"gender": "feminine", "plural": "Katzen"},
+    }
+    assert (
+        columnar_to_dict(read_columnar(tmp_path / "German" / "verbs.feather"))
+        == DATA["verbs"]
+    )
+
+
+def test_convert_wrapper_mixed_shapes(tmp_path, capsys):
+    json_file = tmp_path / "nouns.json"
+    json_file.write_text(
+        json.dumps({"Haus": {"plural": "Häuser"}, "Katze": "Katzen"}), encoding="utf-8"
+    )
+
+    convert_wrapper(
+        language="german",
+        data_type="nouns",
+        output_type="parquet",
+        input_file=str(json_file),
+        output_dir=str(tmp_path),
+        overwrite=True,
+    )
+
+    assert "The value of 'Katze' is not an object" in capsys.readouterr().out
+    assert list((tmp_path / "German").iterdir()) == []
+
+
+@pytest.mark.parametrize("output_type", ["parquet", "feather"])
+def test_write_columnar_failure_removes_partial_file(tmp_path, output_type):
+    reads = []
+
+    def open_members():
+        # The data changes between the two passes so that a value can't be converted to the inferred type.
+        reads.append(None)
+        rank = 1 if len(reads) == 1 else "first"
+        return iter({"Haus": {"rank": 1}, "Katze": {"rank": rank}}.items())
+
+    output_file = tmp_path / f"nouns.{output_type}"
+    with pytest.raises(pa.ArrowException):
+        write_columnar(
+            open_members, output_file, data_type="nouns", output_type=output_type
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_columnar_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "pyarrow_installed", False)
+
+    with pytest.raises(ImportError, match="scribe-data\\[columnar\\]"):
+        write_columnar(lambda: iter({}.items()), tmp_path / "nouns.parquet", "nouns")
@@ -0,0 +1,347 @@
+"""
+Tests for converting JSON data into SQLite databases.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from scribe_data.load.data_to_sqlite import (
+    connect_for_build,
+    data_to_sqlite,
+    finalize_database,
+    insert_rows,
+)
+from scribe_data.load.sqlite_sync import Changeset
+from scribe_data.serializers import read_data, write_data
+
+
+def test_insert_rows_batches_and_ignores_duplicates(tmp_path):
+    connection = connect_for_build(tmp_path / "test.sqlite")
+    cursor = connection.cursor()
+    cursor.execute("CREATE TABLE nouns (noun Text, plural Text, UNIQUE(noun))")
+
+    rows = ([f"noun{i % 7}", f"plural{i}"] for i in range(20))
+    n_rows = insert_rows(cursor, "nouns", rows, n_cols=2, batch_size=3)
+    finalize_database(connection)
+
+    assert n_rows == 20
+    assert cursor.execute(
+        "SELECT noun, plural FROM nouns ORDER BY rowid"
+    ).fetchall() == [(f"noun{i}", f"plural{i}") for i in range(7)]
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "off"
+    connection.close()
+
+
+def write_json_data(json_dir):
+    data = {
+        "german": {
+            "nouns": {
+                "Haus": {"plural": "Häuser", "form": "N"},
+                "Baum": {"plural": "Bäume", "form": "M"},
+            },
+            "prepositions": {"mit": "Dat", "ohne": "Acc"},
+            "verbs": {"gehen": {"presFPS": "gehe", "pastParticiple": "gegangen"}},
+        },
+        "french": {
+            "nouns": {"maison": {"plural": "maisons", "form": "F"}},
+        },
+    }
+    for lang, data_types in data.items():
+        (json_dir / lang).mkdir(parents=True)
+        for data_type, values in data_types.items():
+            with open(
+                json_dir / lang / f"{data_type}.json", "w", encoding="utf-8"
+            ) as f:
+                json.dump(values, f, ensure_ascii=False)
+
+    translations = {
+        word: {
+            iso: f"{word}-{iso}" for iso in ["en", "fr", "it", "pt", "ru", "es", "sv"]
+        }
+        for word in ["Haus", "Baum"]
+    }
+    with open(json_dir / "german" / "translations.json", "w", encoding="utf-8") as f:
+        json.dump(translations, f)
+
+
+def dump_databases(sqlite_dir):
+    tables = {}
+    for db_path in sorted(sqlite_dir.glob("*.sqlite")):
+        connection = sqlite3.connect(db_path)
+        names = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (name,) in names:
+            tables[(db_path.name, name)] = connection.execute(
+                f"SELECT * FROM {name} ORDER BY rowid"
+            ).fetchall()
+
+        connection.close()
+
+    return tables
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_data_to_sqlite(tmp_path, jobs):
+    json_dir = tmp_path / "json"
+    sqlite_dir = tmp_path / "sqlite"
+    sqlite_dir.mkdir()
+    write_json_data(json_dir)
+
+    with (
+        patch("scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ),
+    ):
+        data_to_sqlite(languages=["german", "french"], jobs=jobs)
+
+    tables = dump_databases(sqlite_dir)
+
+    assert tables[("DELanguageData.sqlite", "nouns")] == [
+        ("Haus", "Häuser", "N"),
+        ("Baum", "Bäume", "M"),
+        ("Scribe", "Scribes", ""),
+    ]
+    assert tables[("DELanguageData.sqlite", "prepositions")] == [
+        ("mit", "Dat"),
+        ("ohne", "Acc"),
+    ]
+    assert tables[("DELanguageData.sqlite", "verbs")] == [("gehen", "gehe", "gegangen")]
+    assert tables[("FRLanguageData.sqlite", "nouns")][0] == ("maison", "maisons", "F")
+    assert tables[("TranslationData.sqlite", "german")] == [
+        (
+            "Haus",
+            "Haus-en",
+            "Haus-fr",
+            "Haus-it",
+            "Haus-pt",
+            "Haus-ru",
+            "Haus-es",
+            "Haus-sv",
+        ),
+        (
+            "Baum",
+            "Baum-en",
+            "Baum-fr",
+            "Baum-it",
+            "Baum-pt",
+            "Baum-ru",
+            "Baum-es",
+            "Baum-sv",
+        ),
+    ]
+
+
+def test_data_to_sqlite_fails_if_translations_writer_fails(tmp_path):
+    json_dir = tmp_path / "json"
+    sqlite_dir = tmp_path / "sqlite"
+    sqlite_dir.mkdir()
+    write_json_data(json_dir)
+
+    def failing_writer(messages, **kwargs):
+        raise OSError("disk full")
+
+    def many_messages(lang, current_languages, report):
+        for i in range(1000):
+            yield (lang, i)
+
+    # Workers fill the bounded translation queue after the writer exits, which must fail the build rather than hang it.
+    with (
+        patch("scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ),
+        patch("scribe_data.load.data_to_sqlite.write_translations", failing_writer),
+        patch("scribe_data.load.data_to_sqlite.translation_messages", many_messages),
+        patch("scribe_data.load.data_to_sqlite.WRITER_CHECK_SECONDS", 0.05),
+        pytest.raises(RuntimeError, match="writer process failed"),
+    ):
+        data_to_sqlite(languages=["german", "french"], jobs=2)
+
+
+@pytest.mark.parametrize("suffix", [".json.gz", ".msgpack.zst"])
+def test_data_to_sqlite_from_other_export_formats(tmp_path, suffix):
+    if suffix == ".msgpack.zst":
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zstandard")
+
+    json_dir = tmp_path / "json"
+    write_json_data(json_dir)
+
+    tables = {}
+    for name in ["json", "converted"]:
+        if name == "converted":
+            for json_file in json_dir.glob("*/*.json"):
+                write_data(
+                    json_file.with_name(json_file.name.replace(".json", suffix)),
+                    read_data(json_file),
+                )
+                json_file.unlink()
+
+        sqlite_dir = tmp_path / f"sqlite_{name}"
+        sqlite_dir.mkdir()
+        with patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)
+        ), patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ):
+            data_to_sqlite(languages=["german", "french"])
+
+        tables[name] = dump_databases(sqlite_dir)
+
+    assert tables["converted"] == tables["json"]
+    assert ("DELanguageData.sqlite", "verbs") in tables["converted"]
+
+
+def test_data_to_sqlite_incremental(tmp_path):
+    json_dir = tmp_path / "json"
+    sqlite_dir = tmp_path / "sqlite"
+    sqlite_dir.mkdir()
+    write_json_data(json_dir)
+
+    with (
+        patch("scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ),
+    ):
+        data_to_sqlite(languages=["german"])
+
+        nouns = {
+            "Haus": {"plural": "Häuser", "form": "N"},
+            "Baum": {"plural": "Baumkronen", "form": "M"},
+            "Tür": {"plural": "Türen", "form": "F"},
+        }
+        with open(json_dir / "german" / "nouns.json", "w", encoding="utf-8") as f:
+            json.dump(nouns, f, ensure_ascii=False)
+
+        with open(
+            json_dir / "german" / "prepositions.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump({"mit": "Dat"}, f)
+
+        data_to_sqlite(languages=["german"], incremental=True)
+
+    tables = dump_databases(sqlite_dir)
+    assert sorted(tables[("DELanguageData.sqlite", "nouns")]) == [
+        ("Baum", "Baumkronen", "M"),
+        ("Haus", "Häuser", "N"),
+        ("Scribe", "Scribes", ""),
+        ("Tür", "Türen", "F"),
+    ]
+    assert tables[("DELanguageData.sqlite", "prepositions")] == [("mit", "Dat")]
+
+    changeset = (sqlite_dir / "DELanguageData.changeset.sql").read_text(
+        encoding="utf-8"
+    )
+    lines = changeset.splitlines()
+    assert (lines[0], lines[-1]) == ("BEGIN TRANSACTION;", "COMMIT;")
+    assert "INSERT INTO nouns VALUES ('Tür', 'Türen', 'F');" in lines
+    assert (
+        "UPDATE nouns SET plural = 'Baumkronen', form = 'M' WHERE noun = 'Baum';"
+        in lines
+    )
+    assert "DELETE FROM prepositions WHERE preposition = 'ohne';" in lines
+    assert not any("verbs" in line for line in lines)
+
+    # The changeset brings a copy of the previous database to the updated one.
+    original_json_dir = tmp_path / "original_json"
+    original_sqlite_dir = tmp_path / "original_sqlite"
+    original_sqlite_dir.mkdir()
+    write_json_data(original_json_dir)
+
+    with (
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR",
+            str(original_json_dir),
+        ),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR",
+            str(original_sqlite_dir),
+        ),
+    ):
+        data_to_sqlite(languages=["german"])
+
+    connection = sqlite3.connect(original_sqlite_dir / "DELanguageData.sqlite")
+    connection.executescript(changeset)
+    assert sorted(connection.execute("SELECT * FROM nouns").fetchall()) == sorted(
+        tables[("DELanguageData.sqlite", "nouns")]
+    )
+    connection.close()
+
+
+def test_data_to_sqlite_incremental_rolls_back_failed_translations(tmp_path):
+    json_dir = tmp_path / "json"
+    sqlite_dir = tmp_path / "sqlite"
+    sqlite_dir.mkdir()
+    write_json_data(json_dir)
+
+    def write_translations_file(lang, translations):
+        with open(json_dir / lang / "translations.json", "w", encoding="utf-8") as f:
+            json.dump(translations, f)
+
+    isos = ["en", "de", "it", "pt", "ru", "es", "sv"]
+    write_translations_file(
+        "french", {"maison": {iso: f"maison-{iso}" for iso in isos}}
+    )
+
+    with (
+        patch("scribe_data.load.data_to_sqlite.DEFAULT_JSON_EXPORT_DIR", str(json_dir)),
+        patch(
+            "scribe_data.load.data_to_sqlite.DEFAULT_SQLITE_EXPORT_DIR", str(sqlite_dir)
+        ),
+    ):
+        data_to_sqlite(languages=["german", "french"], jobs=2)
+        translations = dump_databases(sqlite_dir)[("TranslationData.sqlite", "french")]
+
+        # French translations change while German ones are missing a language, which fails after its table is started.
+        write_translations_file(
+            "french", {"maison": {iso: f"house-{iso}" for iso in isos}}
+        )
+        write_translations_file("german", {"Haus": {"en": "house"}})
+
+        with pytest.raises(KeyError):
+            data_to_sqlite(languages=["german", "french"], jobs=2, incremental=True)
+
+    assert (
+        dump_databases(sqlite_dir)[("TranslationData.sqlite", "french")] == translations
+    )
+    assert translations[0][1] == "maison-en"
+    assert not list(sqlite_dir.glob("TranslationData.changeset.sql*"))
+
+
+def test_changeset_rejects_mismatched_placeholders(tmp_path):
+    changeset = Changeset(tmp_path / "test.changeset.sql")
+    changeset.write("UPDATE nouns SET plural = ? WHERE noun = ?", ["Häuser", "Haus"])
+
+    with pytest.raises(ValueError, match="2 placeholders but 1 values"):
+        changeset.write("UPDATE nouns SET plural = ? WHERE noun = ?", ["Häuser"])
+
+    changeset.close()
+    assert changeset.path.read_text(encoding="utf-8").splitlines() == [
+        "BEGIN TRANSACTION;",
+        "UPDATE nouns SET plural = 'Häuser' WHERE noun = 'Haus';",
+        "COMMIT;",
+    ]
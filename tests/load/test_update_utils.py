@@ -241,3 +241,23 @@ def test_check_and_return_command_line_args_three_args():
 def test_check_and_return_command_line_args_too_many_args():
     with pytest.raises(ValueError):
         _ = utils.check_and_return_command_line_args(["a", "b", "c", "d"])
+
+
+def test_language_index_is_read_only():
+    assert utils.LANGUAGE_INDEX.parents["nynorsk"] == "norwegian"
+    assert utils.LANGUAGE_INDEX.qid_to_language["Q188"] == "german"
+
+    with pytest.raises(TypeError):
+        utils.language_map["klingon"] = {"iso": "tlh", "qid": "Q10134"}
+
+
+def test_get_language_qid_of_language_with_sub_languages():
+    with pytest.raises(ValueError, match="'norwegian' has sub-languages"):
+        _ = utils.get_language_qid("Norwegian")
+
+
+def test_format_sublanguage_name_of_other_metadata():
+    metadata = {"norwegian": {"sub_languages": {"nynorsk": {"iso": "nn"}}}}
+
+    assert utils.format_sublanguage_name("Nynorsk", metadata) == "norwegian/nynorsk"
+    assert utils.list_all_languages(metadata) == ["nynorsk"]
@@ -0,0 +1,171 @@
+"""
+Tests for the serializer backends and compression of exported data.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scribe_data import serializers
+from scribe_data.cli.convert import convert_to_csv_or_tsv
+from scribe_data.serializers import (
+    configure_export_format,
+    export_format,
+    find_export_file,
+    parse_export_path,
+    read_data,
+    write_data,
+)
+from scribe_data.utils import export_formatted_data, load_queried_data
+
+DATA = {
+    "Haus": {"plural": "Häuser", "gender": "neuter"},
+    "Katze": {"plural": "Katzen", "gender": "feminine"},
+    "Zahl": {"rank": 3, "is_base": True, "emoji": None, "forms": ["a", "b"]},
+}
+PACKAGES = {"msgpack": "msgpack", "cbor": "cbor2", "zstd": "zstandard"}
+
+
+@pytest.fixture
+def default_export_format():
+    yield
+    configure_export_format()
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@pytest.mark.parametrize("serializer", ["json", "msgpack", "cbor"])
+def test_write_data_round_trip(tmp_path, serializer, compression):
+    for name in [serializer, compression]:
+        if name in PACKAGES:
+            pytest.importorskip(PACKAGES[name])
+
+    suffix = serializers.export_suffix(serializer, compression)
+    path = write_data(
+        tmp_path / f"nouns{suffix}",
+        DATA,
+        serializer=serializer,
+        compression=compression,
+    )
+    assert read_data(path) == DATA
+
+    # The format of a file can also be found from its extensions.
+    path = write_data(tmp_path / f"verbs{suffix}", DATA)
+    assert read_data(path) == DATA
+    assert parse_export_path(path) == ("verbs", serializer, compression)
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_json_backends(tmp_path, monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    fast = write_data(tmp_path / "fast.json", DATA).read_bytes()
+
+    # orjson output is written one entry at a time but matches encoding all of the data at once.
+    assert fast == orjson.dumps(DATA)
+
+    monkeypatch.setattr(serializers, "orjson_installed", False)
+    stdlib = write_data(tmp_path / "stdlib.json", DATA).read_bytes()
+
+    # The stdlib writes the same indent=0 JSON as exports did before serializers.
+    assert stdlib.decode("utf-8") == json.dumps(DATA, ensure_ascii=False, indent=0)
+    assert json.loads(fast) == json.loads(stdlib) == DATA
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_write_data_failure_keeps_previous_file(tmp_path, compression):
+    if compression in PACKAGES:
+        pytest.importorskip(PACKAGES[compression])
+
+    path = write_data(
+        tmp_path / f"nouns{serializers.export_suffix('json', compression)}", DATA
+    )
+    previous = path.read_bytes()
+
+    with pytest.raises(TypeError):
+        write_data(path, {**DATA, "Fehler": object()})
+
+    assert path.read_bytes() == previous
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("nouns.json", ("nouns", "json", None)),
+        ("emoji_keywords.json.gz", ("emoji_keywords", "json", "gzip")),
+        ("verbs.msgpack.zst", ("verbs", "msgpack", "zstd")),
+        ("nouns.csv", None),
+        (".json", None),
+    ],
+)
+def test_parse_export_path(name, expected):
+    assert parse_export_path(Path(name)) == expected
+
+
+def test_find_export_file(tmp_path):
+    assert find_export_file(tmp_path, "emoji-keywords") is None
+
+    (tmp_path / "emoji_keywords.json.gz").touch()
+    assert find_export_file(tmp_path, "emoji-keywords").name == "emoji_keywords.json.gz"
+
+    (tmp_path / "emoji_keywords.json").touch()
+    assert find_export_file(tmp_path, "emoji-keywords").name == "emoji_keywords.json"
+
+
+def test_missing_optional_package(monkeypatch):
+    monkeypatch.setattr(serializers, "msgpack_installed", False)
+
+    with pytest.raises(ImportError, match="pip install msgpack"):
+        serializers.get_serializer("msgpack")
+
+
+def test_export_formatted_data_configured_format(tmp_path, default_export_format):
+    (tmp_path / "German").mkdir()
+    export_formatted_data(tmp_path, DATA, language="German", data_type="nouns")
+    assert (tmp_path / "German" / "nouns.json").is_file()
+
+    configure_export_format(compression="gzip")
+    assert export_format.suffix == ".json.gz"
+    path = export_formatted_data(tmp_path, DATA, language="German", data_type="nouns")
+
+    # The outdated uncompressed file is removed so that the compressed one is read.
+    assert path == tmp_path / "German" / "nouns.json.gz"
+    assert [p.name for p in (tmp_path / "German").iterdir()] == ["nouns.json.gz"]
+    assert load_queried_data(tmp_path, "German", "nouns") == (DATA, path)
+
+
+def test_convert_compressed_export_to_csv(tmp_path):
+    input_file = write_data(
+        tmp_path / "nouns.json.gz", {k: DATA[k] for k in ["Haus", "Katze"]}
+    )
+
+    convert_to_csv_or_tsv(
+        language="German",
+        data_type="nouns",
+        output_type="csv",
+        input_file=str(input_file),
+        output_dir=str(tmp_path),
+        overwrite=True,
+    )
+
+    assert (tmp_path / "German" / "nouns.csv").read_text(encoding="utf-8") == (
+        "noun,gender,plural\nHaus,neuter,Häuser\nKatze,feminine,Katzen\n"
+    )
@@ -0,0 +1,143 @@
+"""
+Tests for generating emoji keywords from the prebuilt emoji keywords database.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+
+import pytest
+
+from scribe_data.unicode import process_unicode
+from scribe_data.unicode.generate_emoji_keywords import (
+    generate_emoji_for_all_languages,
+)
+from scribe_data.unicode.process_unicode import (
+    build_emoji_keywords_db,
+    gen_cldr_emoji_keywords,
+    gen_emoji_lexicon,
+    get_emoji_keywords_isos,
+    get_emoji_popularity,
+    read_emoji_keywords,
+)
+
+# Emojis that the stand-in for PyICU treats as having the Emoji_Modifier_Base property.
+MODIFIER_BASES = {"👋", "👋🏽"}
+
+ANNOTATIONS = {
+    "🐱": {"default": ["cat", "pet", "cat face"]},
+    "😸": {"default": ["cat", "grin"]},
+    "👋": {"default": ["hand", "wave"]},
+    # Skipped as a modifier base with a modifier.
+    "👋🏽": {"default": ["hand"]},
+    # Skipped as an ignored emoji.
+    "🤰": {"default": ["pregnant"]},
+    # Skipped as an unqualified emoji and a character that isn't an emoji.
+    "☺": {"default": ["smile"]},
+    "{": {"default": ["brace"]},
+}
+ANNOTATIONS_DERIVED = {"🐈": {"default": ["cat"]}}
+
+
+@pytest.fixture
+def unicode_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_unicode, "icu_installed", True)
+    monkeypatch.setattr(
+        process_unicode, "is_emoji_modifier_base", lambda c: c in MODIFIER_BASES
+    )
+
+    (tmp_path / "2021_ranked.tsv").write_text(
+        "Hex\tRank\tEmoji\n\\x{1F638}\t10\t😸\n\\x{1F431}\t20\t🐱\n", encoding="utf-8"
+    )
+    for cldr_dir, key, annotations in [
+        ("cldr-annotations-full", "annotations", ANNOTATIONS),
+        ("cldr-annotations-derived-full", "annotationsDerived", ANNOTATIONS_DERIVED),
+    ]:
+        path = tmp_path / cldr_dir / key / "en" / "annotations.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(
+            json.dumps({key: {"annotations": annotations}}), encoding="utf-8"
+        )
+
+    return tmp_path
+
+
+def test_build_emoji_keywords_db(unicode_dir, tmp_path):
+    db_path = tmp_path / "emoji_keywords.sqlite"
+    assert build_emoji_keywords_db(db_path=db_path, unicode_dir=unicode_dir) == ["en"]
+
+    keyword_dict = gen_cldr_emoji_keywords(
+        iso="en",
+        popularity_dict=get_emoji_popularity(unicode_dir),
+        unicode_dir=unicode_dir,
+    )
+    db_keyword_dict = read_emoji_keywords(iso="en", db_path=db_path)
+    assert db_keyword_dict == keyword_dict
+
+    # Keywords are read in the order of the CLDR files so that exports don't depend on whether the database exists.
+    assert list(db_keyword_dict) == list(keyword_dict)
+    assert list(keyword_dict) == ["cat", "pet", "grin", "hand", "wave"]
+    assert keyword_dict["cat"] == [
+        {"emoji": "🐱", "is_base": False, "rank": 20},
+        {"emoji": "😸", "is_base": False, "rank": 10},
+        {"emoji": "🐈", "is_base": False, "rank": None},
+    ]
+    assert keyword_dict["hand"] == [{"emoji": "👋", "is_base": True, "rank": None}]
+    assert set(keyword_dict) == {"cat", "pet", "grin", "hand", "wave"}
+
+    assert read_emoji_keywords(iso="fr", db_path=db_path) == {}
+    assert get_emoji_keywords_isos(db_path=db_path) == {"en"}
+
+
+def test_gen_emoji_lexicon_from_db(unicode_dir, tmp_path, monkeypatch):
+    db_path = tmp_path / "emoji_keywords.sqlite"
+    build_emoji_keywords_db(db_path=db_path, unicode_dir=unicode_dir)
+
+    # Reading the database doesn't need PyICU.
+    monkeypatch.setattr(process_unicode, "icu_installed", False)
+    monkeypatch.setattr(process_unicode, "DEFAULT_JSON_EXPORT_DIR", tmp_path)
+
+    keyword_dict = gen_emoji_lexicon(
+        language="english", emojis_per_keyword=2, db_path=db_path
+    )
+    assert keyword_dict["cat"] == [
+        {"emoji": "😸", "is_base": False, "rank": 10},
+        {"emoji": "🐱", "is_base": False, "rank": 20},
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_emoji_for_all_languages(unicode_dir, tmp_path, monkeypatch, jobs):
+    db_path = tmp_path / "emoji_keywords.sqlite"
+    build_emoji_keywords_db(db_path=db_path, unicode_dir=unicode_dir)
+    monkeypatch.setattr(process_unicode, "DEFAULT_JSON_EXPORT_DIR", tmp_path)
+
+    output_dir = tmp_path / "export"
+    keyword_counts = generate_emoji_for_all_languages(
+        output_dir=output_dir,
+        languages=["english", "german"],
+        jobs=jobs,
+        db_path=db_path,
+    )
+
+    assert keyword_counts == {"english": 5}
+    with open(output_dir / "English" / "emoji_keywords.json", encoding="utf-8") as f:
+        assert json.load(f)["cat"][0] == {"emoji": "😸", "is_base": False, "rank": 10}
+
+    assert not (output_dir / "German").exists()
@@ -0,0 +1,220 @@
+"""
+Tests for selecting query results from a Wikidata lexeme dump.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import bz2
+import json
+import random
+
+import pytest
+
+from scribe_data.utils import LANGUAGE_DATA_EXTRACTION_DIR
+from scribe_data.wikidata.lexeme_dump import (
+    compile_query,
+    decompress_block,
+    find_bz2_blocks,
+    iter_dump_rows,
+    run_dump,
+    select_rows,
+)
+from scribe_data.wikidata.query_scheduler import QueryGroup
+from scribe_data.wikidata.sparql_results import read_spooled_rows
+
+GERMAN_NOUNS = LANGUAGE_DATA_EXTRACTION_DIR / "german" / "nouns" / "query_nouns.sparql"
+GERMAN_VERBS = [
+    LANGUAGE_DATA_EXTRACTION_DIR / "german" / "verbs" / f"query_verbs_{i}.sparql"
+    for i in (1, 2)
+]
+
+
+def statement(value_id, rank="normal"):
+    return {
+        "mainsnak": {
+            "snaktype": "value",
+            "datavalue": {"value": {"entity-type": "item", "id": value_id}},
+        },
+        "rank": rank,
+    }
+
+
+def form(representation, *features, language="de"):
+    return {
+        "representations": {language: {"language": language, "value": representation}},
+        "grammaticalFeatures": list(features),
+    }
+
+
+def lexeme(lid, lemma, category, forms=(), claims=None, language="Q188"):
+    return {
+        "type": "lexeme",
+        "id": lid,
+        "lemmas": {"de": {"language": "de", "value": lemma}},
+        "lexicalCategory": category,
+        "language": language,
+        "claims": claims or {},
+        "forms": list(forms),
+    }
+
+
+HAUS = lexeme(
+    "L1",
+    "Haus",
+    "Q1084",
+    forms=[form("Häuser", "Q146786", "Q131105")],
+    claims={"P5185": [statement("Q1775461")]},
+)
+SEIN = lexeme(
+    "L2",
+    "sein",
+    "Q24905",
+    forms=[form("sein", "Q179230"), form("gewesen", "Q12717679")],
+    claims={"P5401": [statement("L1761"), statement("L4179")]},
+)
+NO_INFINITIVE = lexeme("L3", "gehen", "Q24905")
+
+
+def write_dump(path, lexemes, compress=bz2.compress):
+    lines = ["["] + [json.dumps(lex, ensure_ascii=False) + "," for lex in lexemes]
+    lines[-1] = lines[-1].rstrip(",")
+    path.write_bytes(compress("\n".join(lines + ["]"]).encode("utf-8") + b"\n"))
+    return path
+
+
+def padding_lexemes(n):
+    # Lexemes of other languages with random text so that the dump spans many small bz2 blocks.
+    rng = random.Random(0)
+    return [
+        lexeme(
+            f"L{1000 + i}",
+            "".join(rng.choice("abcdefghij") for _ in range(300)),
+            "Q1084",
+            language="Q1860",
+        )
+        for i in range(n)
+    ]
+
+
+# MARK: Selectors
+
+
+def test_compile_query_german_nouns():
+    selector = compile_query(GERMAN_NOUNS)
+
+    assert (selector.language, selector.lexical_category) == ("Q188", "Q1084")
+    assert selector.variables[0] == "lexemeID"
+    assert selector.lemma == "nominativeSingular"
+    assert {f.variable: f.features for f in selector.forms} == {
+        "nominativePlural": frozenset({"Q146786", "Q131105"})
+    }
+    assert ("gender", "nounGender") in selector.labels
+
+
+def test_select_rows_nouns():
+    assert select_rows(compile_query(GERMAN_NOUNS), HAUS) == [
+        {
+            "lexemeID": "L1",
+            "nominativeSingular": "Haus",
+            "nominativePlural": "Häuser",
+            "gender": "neuter",
+        }
+    ]
+
+
+def test_select_rows_required_forms_and_statement_values():
+    selector = compile_query(GERMAN_VERBS[1])
+    rows = select_rows(selector, SEIN)
+
+    assert [row["auxiliaryVerb"] for row in rows] == ["L1761", "L4179"]
+    assert all(row["pastParticiple"] == "gewesen" for row in rows)
+    assert select_rows(selector, NO_INFINITIVE) == []
+
+
+def test_select_rows_prefers_best_rank():
+    noun = lexeme(
+        "L4",
+        "See",
+        "Q1084",
+        claims={
+            "P5185": [statement("Q499327", "preferred"), statement("Q1775415")],
+        },
+    )
+    (row,) = select_rows(compile_query(GERMAN_NOUNS), noun)
+    assert row["gender"] == "masculine"
+
+
+# MARK: bz2 Blocks
+
+
+def test_find_bz2_blocks_of_concatenated_streams():
+    rng = random.Random(1)
+    raw = bytes(rng.choice(b"abcdefgh\n") for _ in range(400_000))
+    data = bz2.compress(raw[:150_000], 1) + bz2.compress(raw[150_000:], 1)
+
+    blocks = find_bz2_blocks(data)
+
+    assert len(blocks) > 2
+    assert b"".join(decompress_block(data, start, end) for start, end in blocks) == raw
+
+
+def test_find_bz2_blocks_rejects_other_files():
+    with pytest.raises(ValueError):
+        find_bz2_blocks(b"[\n]\n")
+
+
+# MARK: Dump
+
+
+def test_iter_dump_rows_parallel_matches_sequential(tmp_path):
+    lexemes = padding_lexemes(600)
+    for i, lex in enumerate((HAUS, SEIN, NO_INFINITIVE)):
+        lexemes.insert(200 * i + 1, lex)
+
+    dump_file = write_dump(
+        tmp_path / "lexemes.json.bz2", lexemes, lambda b: bz2.compress(b, 1)
+    )
+    assert len(find_bz2_blocks(dump_file.read_bytes())) > 1
+
+    selectors = [compile_query(GERMAN_NOUNS)] + [compile_query(f) for f in GERMAN_VERBS]
+    sequential = list(iter_dump_rows(dump_file, selectors, workers=1))
+    parallel = list(
+        iter_dump_rows(dump_file, selectors, workers=2, blocks_per_segment=1)
+    )
+
+    assert parallel == sequential
+    assert [idx for idx, _ in sequential] == [0, 1, 2, 2]
+
+
+def test_run_dump_spools_rows_per_query(tmp_path):
+    dump_file = write_dump(tmp_path / "lexemes.json.bz2", [HAUS, SEIN])
+    groups = [
+        QueryGroup(language="german", data_type="nouns", query_files=(GERMAN_NOUNS,)),
+        QueryGroup(
+            language="german", data_type="verbs", query_files=tuple(GERMAN_VERBS)
+        ),
+    ]
+
+    results = run_dump(groups, dump_file=dump_file, workers=2)
+
+    assert [group for group, _ in results] == groups
+    (nouns,), (verbs_1, verbs_2) = (parts for _, parts in results)
+    assert [row["lexemeID"] for row in read_spooled_rows(nouns)] == ["L1"]
+    assert [row["infinitive"] for row in read_spooled_rows(verbs_1)] == ["sein"]
+    assert len(list(read_spooled_rows(verbs_2))) == 2
@@ -0,0 +1,141 @@
+"""
+Tests for formatting queried data in process.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from scribe_data.serializers import configure_export_format, read_data
+from scribe_data.utils import LANGUAGE_DATA_EXTRACTION_DIR
+from scribe_data.wikidata.query_data import (
+    execute_formatting_script,
+    export_query_results,
+    format_query_results,
+    get_formatter,
+)
+
+GERMAN_VERBS = [
+    {"infinitive": "gehen", "presFPS": "gehe"},
+    {
+        "infinitive": "gehen",
+        "auxiliaryVerb": "L1761",
+        "pastParticiple": "gegangen",
+        "pretFPS": "ging",
+    },
+    {"infinitive": "laufen", "auxiliaryVerb": "L4179", "pastParticiple": "gelaufen"},
+    {"infinitive": "laufen", "auxiliaryVerb": "L1761", "pastParticiple": "gelaufen"},
+]
+
+
+class TestFormatQueryResults(unittest.TestCase):
+    def test_get_formatter(self):
+        formatter, language = get_formatter(lang="german", data_type="verbs")
+        self.assertEqual(formatter.__name__, "format_verbs")
+        self.assertEqual(language, "German")
+
+    def test_get_formatter_missing(self):
+        self.assertIsNone(get_formatter(lang="german", data_type="adverbs"))
+        self.assertIsNone(get_formatter(lang="klingon", data_type="nouns"))
+
+    def test_get_formatter_import_error(self):
+        # Errors raised while importing a formatter aren't taken to mean that there's no formatter.
+        for error in [
+            ModuleNotFoundError("No module named 'missing'", name="missing"),
+            ImportError("cannot import name 'format_nouns'"),
+        ]:
+            with patch(
+                "scribe_data.wikidata.query_data.importlib.import_module",
+                side_effect=error,
+            ):
+                with self.assertRaises(ImportError):
+                    get_formatter(lang="german", data_type="nouns")
+
+    def test_format_query_results(self):
+        with TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "German").mkdir()
+            self.assertTrue(
+                format_query_results(
+                    lang="german",
+                    data_type="verbs",
+                    results=GERMAN_VERBS,
+                    output_dir=tmp_dir,
+                )
+            )
+
+            with open(Path(tmp_dir) / "German" / "verbs.json", encoding="utf-8") as f:
+                verbs = json.load(f)
+
+        self.assertEqual(list(verbs), ["gehen", "laufen"])
+        self.assertEqual(verbs["gehen"]["perfFPS"], "bin gegangen")
+        self.assertEqual(verbs["laufen"]["auxiliaryVerb"], "sein/haben")
+        self.assertEqual(verbs["laufen"]["perfTPS"], "ist/hat gelaufen")
+
+    def test_format_query_results_without_formatter(self):
+        self.assertFalse(
+            format_query_results(
+                lang="german", data_type="adverbs", results=[], output_dir="unused"
+            )
+        )
+
+
+class TestExportFormat(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(configure_export_format)
+
+    def test_export_query_results(self):
+        configure_export_format(compression="gzip")
+        with TemporaryDirectory() as tmp_dir:
+            path = export_query_results(
+                rows=iter(GERMAN_VERBS), export_dir=Path(tmp_dir), data_type="verbs"
+            )
+
+            self.assertEqual(path.name, "verbs.json.gz")
+            self.assertEqual(read_data(path), GERMAN_VERBS)
+            self.assertEqual([p.name for p in Path(tmp_dir).iterdir()], [path.name])
+
+    def test_formatting_script_uses_export_format(self):
+        configure_export_format(serializer="msgpack", compression="zstd")
+        with TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "German").mkdir()
+            export_query_results(
+                rows=[{"preposition": "mit"}],
+                export_dir=Path(tmp_dir) / "German",
+                data_type="prepositions",
+            )
+            execute_formatting_script(
+                formatting_file_path=LANGUAGE_DATA_EXTRACTION_DIR
+                / "german"
+                / "prepositions"
+                / "format_prepositions.py",
+                output_dir=tmp_dir,
+            )
+
+            export_files = list((Path(tmp_dir) / "German").iterdir())
+            self.assertEqual(
+                [p.name for p in export_files], ["prepositions.msgpack.zst"]
+            )
+            prepositions = read_data(export_files[0])
+
+        self.assertEqual(prepositions["mit"], "")
+        self.assertEqual(prepositions["zum"], "Dat")
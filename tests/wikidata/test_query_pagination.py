@@ -0,0 +1,97 @@
+"""
+Tests for splitting lexeme queries into pages.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+from pathlib import Path
+
+import pytest
+
+from scribe_data.wikidata.query_pagination import (
+    PageTiming,
+    paginate_query,
+    print_page_report,
+    projected_variables,
+)
+
+QUERY = """
+# SELECT in a comment shouldn't count.
+SELECT DISTINCT
+  (REPLACE(STR(?lexeme), "http://www.wikidata.org/entity/", "") AS ?lexemeID)
+  ?lemma
+  ?gender
+
+WHERE {
+  ?lexeme dct:language wd:Q188 ;
+    wikibase:lemma ?lemma .
+  OPTIONAL { ?lexeme wdt:P5185 ?gender . }
+}
+"""
+
+
+def test_projected_variables():
+    assert projected_variables(QUERY) == ["lexemeID", "lemma", "gender"]
+
+
+def test_paginate_query():
+    paginated = paginate_query(QUERY, page_size=500, page=3)
+    assert paginated.startswith(QUERY.rstrip())
+    assert paginated.endswith(
+        "ORDER BY ?lexeme ?lexemeID ?lemma ?gender\nLIMIT 500\nOFFSET 1500\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        QUERY.replace("}\n", "}\nLIMIT 10\n"),
+        QUERY.replace("?lemma\n", "(COUNT(?lemma) AS ?total)\n"),
+        QUERY.replace("?lexeme", "?entry"),
+        "SELECT ?l WHERE { { SELECT ?l WHERE { ?l a ontolex:LexicalEntry } } }",
+    ],
+)
+def test_paginate_query_unsupported(query):
+    assert paginate_query(query, page_size=500, page=0) is None
+
+
+def test_repo_queries_can_be_paginated():
+    query_dir = (
+        Path(__file__).parent.parent.parent
+        / "src"
+        / "scribe_data"
+        / "wikidata"
+        / "language_data_extraction"
+    )
+    for query_file in query_dir.rglob("*.sparql"):
+        assert paginate_query(query_file.read_text(), 10, 1) is not None, query_file
+
+
+def test_print_page_report(capsys):
+    query_file = Path("german/nouns/query_nouns.sparql")
+    print_page_report(
+        [
+            PageTiming(query_file=query_file, page=0, rows=100, seconds=1.0),
+            PageTiming(query_file=query_file, page=1, rows=40, seconds=3.0),
+        ]
+    )
+    output = capsys.readouterr().out
+    assert "german/nouns/query_nouns.sparql" in output
+    assert "140" in output
+    assert "(page 1)" in output
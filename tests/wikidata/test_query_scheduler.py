@@ -0,0 +1,305 @@
+"""
+Tests for the concurrent WDQS query scheduler.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import io
+import json
+import re
+import threading
+import time
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+import pytest
+
+from scribe_data.wikidata.query_data import get_query_groups, merge_query_parts
+from scribe_data.wikidata.sparql_results import read_spooled_rows
+from scribe_data.wikidata.query_scheduler import (
+    QueryGroup,
+    QueryScheduler,
+    RateLimiter,
+    flatten_bindings,
+)
+
+
+def bindings(*values):
+    return {"results": {"bindings": [{"lemma": {"value": v}} for v in values]}}
+
+
+class FakeSPARQL:
+    """
+    Stands in for SPARQLWrapper and answers each query with its own text after a delay.
+    """
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = failures if failures is not None else {}
+        self.query_text = None
+
+    def setQuery(self, query):
+        self.query_text = query
+
+    def query(self):
+        return self
+
+    @property
+    def response(self):
+        return io.BytesIO(json.dumps(self.convert()).encode("utf-8"))
+
+    def convert(self):
+        with FakeSPARQL.lock:
+            FakeSPARQL.active += 1
+            FakeSPARQL.max_active = max(FakeSPARQL.max_active, FakeSPARQL.active)
+
+        try:
+            time.sleep(self.delays.get(self.query_text, 0))
+            if self.failures.get(self.query_text, 0) > 0:
+                self.failures[self.query_text] -= 1
+                raise HTTPError("url", 429, "Too Many Requests", None, None)
+
+            return bindings(self.query_text)
+
+        finally:
+            with FakeSPARQL.lock:
+                FakeSPARQL.active -= 1
+
+
+@pytest.fixture
+def query_dir(tmp_path):
+    def write(lang, data_type, name, text):
+        path = tmp_path / lang / data_type / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    return write
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeSPARQL.active = 0
+    FakeSPARQL.max_active = 0
+
+
+# MARK: Helpers
+
+
+def test_flatten_bindings():
+    results = {
+        "results": {
+            "bindings": [
+                {"lemma": {"value": "Haus"}, "gender": {"value": "Q1775415"}},
+                {"lemma": {"value": "Baum"}},
+            ]
+        }
+    }
+    assert flatten_bindings(results) == [
+        {"lemma": "Haus", "gender": "Q1775415"},
+        {"lemma": "Baum"},
+    ]
+
+
+def test_get_query_groups_orders_parts_numerically(query_dir):
+    files = [
+        query_dir("slovak", "nouns", f"query_nouns_{i}.sparql", str(i))
+        for i in (10, 2, 1)
+    ]
+    files.append(query_dir("german", "verbs", "query_verbs.sparql", "v"))
+
+    groups = get_query_groups(files)
+
+    assert [(g.language, g.data_type) for g in groups] == [
+        ("german", "verbs"),
+        ("slovak", "nouns"),
+    ]
+    assert [f.name for f in groups[1].query_files] == [
+        "query_nouns_1.sparql",
+        "query_nouns_2.sparql",
+        "query_nouns_10.sparql",
+    ]
+
+
+def test_merge_query_parts():
+    merged = merge_query_parts(
+        lang="German", part_results=[[{"lemma": "a"}], [{"lemma": "b"}]]
+    )
+    assert list(merged) == [{"lemma": "a"}, {"lemma": "b", "auxiliaryVerb": ""}]
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(max_requests_per_second=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+
+    assert time.monotonic() - start >= 4 * (1 / 20) - 0.01
+
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(max_requests_per_second=None)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+
+    assert time.monotonic() - start < 0.1
+
+
+# MARK: Scheduler
+
+
+def test_run_returns_parts_in_order_and_bounds_concurrency(query_dir):
+    groups = [
+        QueryGroup(
+            language=lang,
+            data_type="nouns",
+            query_files=tuple(
+                query_dir(lang, "nouns", f"query_nouns_{i}.sparql", f"{lang}-{i}")
+                for i in (1, 2, 3)
+            ),
+        )
+        for lang in ("a", "b", "c")
+    ]
+    # The first part of each group is the slowest so that parts finish out of order.
+    delays = {f"{lang}-1": 0.05 for lang in ("a", "b", "c")}
+
+    with patch(
+        "scribe_data.wikidata.query_scheduler.sparql_context",
+        side_effect=lambda endpoint: FakeSPARQL(delays=delays),
+    ):
+        scheduler = QueryScheduler(
+            endpoint="http://scheduler.test/order",
+            max_workers=2,
+            max_requests_per_second=None,
+        )
+        results = {group.language: parts for group, parts in scheduler.run(groups)}
+
+    assert FakeSPARQL.max_active <= 2
+    for lang in ("a", "b", "c"):
+        assert results[lang] == [[{"lemma": f"{lang}-{i}"}] for i in (1, 2, 3)]
+
+
+def test_run_query_retries_then_succeeds(query_dir, capsys):
+    query_file = query_dir("a", "verbs", "query_verbs.sparql", "retry")
+    failures = {"retry": 1}
+
+    with patch(
+        "scribe_data.wikidata.query_scheduler.sparql_context",
+        side_effect=lambda endpoint: FakeSPARQL(failures=failures),
+    ):
+        scheduler = QueryScheduler(
+            endpoint="http://scheduler.test/retry", max_requests_per_second=None
+        )
+        assert scheduler.run_query(query_file) == [{"lemma": "retry"}]
+
+    assert "will be retried" in capsys.readouterr().out
+
+
+def test_run_query_gives_up_after_tries(query_dir, capsys):
+    query_file = query_dir("a", "verbs", "query_verbs.sparql", "fail")
+
+    with patch(
+        "scribe_data.wikidata.query_scheduler.sparql_context",
+        side_effect=lambda endpoint: FakeSPARQL(failures={"fail": 5}),
+    ):
+        scheduler = QueryScheduler(
+            endpoint="http://scheduler.test/fail",
+            max_requests_per_second=None,
+            tries=2,
+        )
+        assert scheduler.run_query(query_file) is None
+
+    assert "Nothing returned by the WDQS server" in capsys.readouterr().out
+
+
+def test_run_stream_spools_rows(query_dir):
+    groups = [
+        QueryGroup(
+            language="a",
+            data_type="nouns",
+            query_files=tuple(
+                query_dir("a", "nouns", f"query_nouns_{i}.sparql", f"a-{i}")
+                for i in (1, 2)
+            ),
+        )
+    ]
+
+    with patch(
+        "scribe_data.wikidata.query_scheduler.sparql_context",
+        side_effect=lambda endpoint: FakeSPARQL(),
+    ):
+        scheduler = QueryScheduler(
+            endpoint="http://scheduler.test/stream", max_requests_per_second=None
+        )
+        ((_, parts),) = list(scheduler.run(groups, stream=True))
+
+    assert [list(read_spooled_rows(path)) for path in parts] == [
+        [{"lemma": "a-1"}],
+        [{"lemma": "a-2"}],
+    ]
+    assert not any(path.exists() for path in parts)
+
+
+class PagedFakeSPARQL(FakeSPARQL):
+    """
+    Answers paginated queries with the slice of a fixed result set given by LIMIT and OFFSET.
+    """
+
+    total_rows = 25
+
+    def convert(self):
+        limit = int(re.search(r"LIMIT (\d+)", self.query_text)[1])
+        offset = int(re.search(r"OFFSET (\d+)", self.query_text)[1])
+        values = [f"L{i}" for i in range(self.total_rows)][offset : offset + limit]
+        return bindings(*values)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_run_paginates_queries(query_dir, stream):
+    query_file = query_dir(
+        "a", "nouns", "query_nouns.sparql", "SELECT ?lemma WHERE { ?lexeme ?p ?lemma }"
+    )
+    groups = [QueryGroup(language="a", data_type="nouns", query_files=(query_file,))]
+
+    with patch(
+        "scribe_data.wikidata.query_scheduler.sparql_context",
+        side_effect=lambda endpoint: PagedFakeSPARQL(),
+    ):
+        scheduler = QueryScheduler(
+            endpoint="http://scheduler.test/pages",
+            max_workers=3,
+            max_requests_per_second=None,
+            page_size=10,
+            prefetch_pages=2,
+        )
+        ((_, (results,)),) = list(scheduler.run(groups, stream=stream))
+
+    if stream:
+        results = list(read_spooled_rows(results))
+
+    assert results == [{"lemma": f"L{i}"} for i in range(25)]
+    assert sorted(t.page for t in scheduler.page_timings)[:3] == [0, 1, 2]
+    assert [t.rows for t in sorted(scheduler.page_timings, key=lambda t: t.page)][
+        :3
+    ] == [10, 10, 5]
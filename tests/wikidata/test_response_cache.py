@@ -0,0 +1,170 @@
+"""
+Tests for the on-disk cache of WDQS responses.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import io
+import json
+import os
+import time
+from email.message import Message
+from unittest.mock import patch
+
+import pytest
+
+from scribe_data.wikidata import response_cache
+from scribe_data.wikidata.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    TeeResponse,
+)
+from scribe_data.wikidata.sparql_results import iter_rows
+from scribe_data.wikidata.wikidata_utils import sparql_context
+
+CONTENT_TYPE = "application/sparql-results+json"
+BODY = json.dumps(
+    {"head": {"vars": ["lemma"]}, "results": {"bindings": [{"lemma": {"value": "a"}}]}}
+).encode("utf-8")
+
+
+class FakeHTTPResponse(io.BytesIO):
+    def info(self):
+        headers = Message()
+        headers["content-type"] = CONTENT_TYPE
+        return headers
+
+
+def save(cache, key, body=BODY, chunk_size=-1):
+    response = TeeResponse(
+        response=FakeHTTPResponse(body),
+        writer=cache.writer(key=key, content_type=CONTENT_TYPE),
+    )
+    while response.read(chunk_size) and chunk_size > 0:
+        pass
+
+    response.close()
+
+
+def read_cached(cache, key):
+    if (cached := cache.get(key)) is None:
+        return None
+
+    content_type, body = cached
+    with body:
+        return content_type, body.read()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(cache_dir=tmp_path, ttl_seconds=60)
+
+
+def test_key_ignores_comments_and_whitespace():
+    query = "# Comment\nSELECT ?lemma\nWHERE {\n  ?l wikibase:lemma ?lemma .\n}\n"
+    assert ResponseCache.key("e", query) == ResponseCache.key(
+        "e", "SELECT ?lemma WHERE { ?l wikibase:lemma ?lemma . }"
+    )
+    assert ResponseCache.key("e", query) != ResponseCache.key("other", query)
+
+
+@pytest.mark.parametrize("chunk_size", [-1, 7])
+def test_round_trip(cache, chunk_size):
+    assert cache.get("k") is None
+    save(cache, "k", chunk_size=chunk_size)
+    assert read_cached(cache, "k") == (CONTENT_TYPE, BODY)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_partially_read_response_is_completed_on_close(cache):
+    response = TeeResponse(
+        response=FakeHTTPResponse(BODY),
+        writer=cache.writer(key="k", content_type=CONTENT_TYPE),
+    )
+    assert list(iter_rows(response, chunk_size=8)) == [{"lemma": "a"}]
+    response.close()
+    assert read_cached(cache, "k") == (CONTENT_TYPE, BODY)
+
+
+def test_incomplete_response_is_not_cached(cache):
+    save(cache, "k", body=BODY[:-5] + b"\nTimeoutException")
+    assert cache.get("k") is None
+    assert not list(cache.cache_dir.rglob("*.tmp"))
+
+
+def test_expired_and_refreshed_responses_are_missed(cache):
+    save(cache, "k")
+    path = cache.path("k")
+    os.utime(path, (time.time(), time.time() - 120))
+    assert cache.get("k") is None
+
+    save(cache, "k")
+    cache.refresh = True
+    assert cache.get("k") is None
+
+
+def test_evict_removes_least_recently_used(cache):
+    for i, key in enumerate(["old", "new"]):
+        save(cache, key)
+        os.utime(cache.path(key), (1000 + i, time.time()))
+
+    cache.max_bytes = cache.path("new").stat().st_size
+    cache.evict()
+    assert not cache.path("old").exists()
+    assert cache.path("new").exists()
+
+
+def test_cached_response_is_streamed_from_disk(cache):
+    save(cache, "k")
+    response = CachedResponse(*cache.get("k"))
+    assert not isinstance(response._body, bytes)
+    assert list(iter_rows(response, chunk_size=8)) == [{"lemma": "a"}]
+
+    response.close()
+    assert response._body.closed
+    assert response.read() == b""
+
+
+def test_evict_runs_on_first_save_and_every_interval(cache, monkeypatch):
+    monkeypatch.setattr(response_cache, "EVICT_INTERVAL", 3)
+    with patch.object(cache, "evict") as evict:
+        for i in range(7):
+            save(cache, f"k{i}")
+
+    # Saves 1, 4 and 7 check the size of the cache.
+    assert evict.call_count == 3
+
+
+def test_sparql_context_uses_cache(cache):
+    context = sparql_context("http://cache.test/sparql")
+    context.setQuery("SELECT ?lemma WHERE { ?l wikibase:lemma ?lemma }")
+
+    with (
+        patch("scribe_data.wikidata.wikidata_utils.response_cache", cache),
+        patch(
+            "SPARQLWrapper.Wrapper.SPARQLWrapper._query",
+            side_effect=lambda: (FakeHTTPResponse(BODY), "json"),
+        ) as http_query,
+    ):
+        first = context.query().convert()
+        second = context.query().convert()
+
+    assert first == second == json.loads(BODY)
+    assert http_query.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
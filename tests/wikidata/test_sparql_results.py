@@ -0,0 +1,90 @@
+"""
+Tests for incrementally parsing SPARQL JSON results.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import io
+import json
+from http.client import IncompleteRead
+
+import pytest
+
+from scribe_data.wikidata.query_scheduler import flatten_bindings
+from scribe_data.wikidata.sparql_results import (
+    JSONRowWriter,
+    iter_bindings,
+    iter_rows,
+    read_spooled_rows,
+    spool_rows,
+)
+
+RESPONSE = {
+    "head": {"vars": ["lexemeID", "lemma", "results"]},
+    "results": {
+        "bindings": [
+            {
+                "lexemeID": {"type": "uri", "value": "L1"},
+                "lemma": {"xml:lang": "de", "type": "literal", "value": "Straße"},
+            },
+            {"lemma": {"type": "literal", "value": '日本語 "quoted" ]}'}},
+            {"lemma": {"type": "literal", "value": "Ödön"}},
+        ]
+    },
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_rows_matches_flatten_bindings(chunk_size):
+    raw = json.dumps(RESPONSE, ensure_ascii=False, indent=2).encode("utf-8")
+    rows = list(iter_rows(io.BytesIO(raw), chunk_size=chunk_size))
+    assert rows == flatten_bindings(RESPONSE)
+
+
+def test_iter_bindings_empty():
+    raw = b'{"head": {"vars": []}, "results": {"bindings": []}}'
+    assert list(iter_bindings(io.BytesIO(raw))) == []
+
+
+def test_iter_bindings_truncated():
+    raw = json.dumps(RESPONSE).encode("utf-8")[:-40]
+    with pytest.raises(IncompleteRead):
+        list(iter_bindings(io.BytesIO(raw), chunk_size=16))
+
+
+def test_spool_rows_round_trip():
+    rows = flatten_bindings(RESPONSE)
+    path = spool_rows(iter(rows))
+    assert list(read_spooled_rows(path)) == rows
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("n_rows", [0, 1, 3])
+def test_json_row_writer_matches_json_dump(n_rows):
+    rows = flatten_bindings(RESPONSE)[:n_rows]
+    expected = io.StringIO()
+    json.dump(rows, expected, ensure_ascii=False, indent=0)
+
+    written = io.StringIO()
+    writer = JSONRowWriter(written)
+    for row in rows:
+        writer.write(row)
+
+    writer.close()
+    assert written.getvalue() == expected.getvalue()
@@ -0,0 +1,190 @@
+"""
+Tests for creating workable files from Wikipedia dumps.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import bz2
+import json
+from unittest.mock import patch
+
+import pytest
+
+from scribe_data.wikipedia.extract_wiki import (
+    iter_bz2_chunks,
+    iterate_and_parse_file,
+    multistream_index_name,
+    parse_multistream_file,
+    parse_to_ndjson,
+)
+
+DUMP_NAME = "dewiki-20240101-pages-articles-multistream1.xml-p1p4.bz2"
+PAGES = [
+    ("Haus", "Ein '''Haus''' ist ein [[Gebäude]]."),
+    ("Wikipedia:Hilfe", "Eine Hilfeseite."),
+    ("Baum", "Ein Baum hat {{Vorlage|Blätter}} Blätter."),
+    ("Katze", "Die Katze & der Hund."),
+]
+
+
+def page_xml(title, text):
+    return (
+        f"  <page>\n    <title>{title}</title>\n"
+        f"    <revision>\n      <text>{text.replace('&', '&amp;')}</text>\n"
+        "    </revision>\n  </page>\n"
+    )
+
+
+def write_multistream_dump(path, pages, pages_per_stream=1):
+    # Multistream dumps are concatenated bz2 streams of up to 100 pages each, with an index of their offsets.
+    header = (
+        "<mediawiki>\n  <siteinfo>\n    <sitename>Wikipedia</sitename>\n  </siteinfo>\n"
+    )
+    streams = [header.encode("utf-8")]
+    for i in range(0, len(pages), pages_per_stream):
+        streams.append(
+            "".join(page_xml(*page) for page in pages[i : i + pages_per_stream]).encode(
+                "utf-8"
+            )
+        )
+    streams.append(b"</mediawiki>\n")
+
+    compressed = [bz2.compress(stream) for stream in streams]
+    path.write_bytes(b"".join(compressed))
+
+    index_lines = []
+    offset = len(compressed[0])
+    for i, stream in enumerate(compressed[1:-1]):
+        for j, (title, _) in enumerate(
+            pages[i * pages_per_stream : (i + 1) * pages_per_stream]
+        ):
+            index_lines.append(f"{offset}:{i * pages_per_stream + j + 1}:{title}\n")
+
+        offset += len(stream)
+
+    index_path = path.parent / multistream_index_name(path.name)
+    index_path.write_bytes(bz2.compress("".join(index_lines).encode("utf-8")))
+
+    return path
+
+
+def test_iter_bz2_chunks_reads_all_streams(tmp_path):
+    dump_path = write_multistream_dump(tmp_path / DUMP_NAME, PAGES)
+
+    with open(dump_path, "rb") as f:
+        data = b"".join(iter_bz2_chunks(f, chunk_size=16))
+        assert f.tell() == dump_path.stat().st_size
+
+    assert data.startswith(b"<mediawiki>") and data.endswith(b"</mediawiki>\n")
+    assert data.count(b"<page>") == len(PAGES)
+
+
+@pytest.mark.parametrize(
+    "article_limit, expected",
+    [(None, ["Haus", "Baum", "Katze"]), (2, ["Haus", "Baum"])],
+)
+def test_iterate_and_parse_file(tmp_path, article_limit, expected):
+    dump_path = write_multistream_dump(tmp_path / DUMP_NAME, PAGES)
+    partitions_dir = tmp_path / "partitions"
+
+    # Small chunks so that pages are split across parser feeds.
+    with patch("scribe_data.wikipedia.extract_wiki.READ_CHUNK_SIZE", 64):
+        iterate_and_parse_file(
+            (str(dump_path), partitions_dir, article_limit, False, "mwparser")
+        )
+
+    with open(partitions_dir / "p1p4.ndjson", encoding="utf-8") as f:
+        articles = [json.loads(line) for line in f]
+
+    assert [title for title, _ in articles] == expected
+    assert articles[0][1] == "Ein Haus ist ein Gebäude."
+
+
+def test_multistream_index_name():
+    assert (
+        multistream_index_name(DUMP_NAME)
+        == "dewiki-20240101-pages-articles-multistream-index1.txt-p1p4.bz2"
+    )
+    assert (
+        multistream_index_name("dewiki-20240101-pages-articles-multistream.xml.bz2")
+        == "dewiki-20240101-pages-articles-multistream-index.txt.bz2"
+    )
+
+
+@pytest.mark.parametrize("wikitext_engine", ["fast", "mwparser"])
+@pytest.mark.parametrize("article_limit", [None, 5])
+def test_parse_multistream_file_matches_sequential(
+    tmp_path, article_limit, wikitext_engine
+):
+    pages = [(f"Seite {i}", f"Text & [[Link|Nummer]] {i}.") for i in range(25)]
+    pages.insert(3, ("Wikipedia:Hilfe", "Eine Hilfeseite."))
+    dump_path = write_multistream_dump(tmp_path / DUMP_NAME, pages, pages_per_stream=3)
+
+    iterate_and_parse_file(
+        (
+            str(dump_path),
+            tmp_path / "sequential",
+            article_limit,
+            False,
+            wikitext_engine,
+        )
+    )
+    parse_multistream_file(
+        dump_path,
+        index_path=tmp_path / multistream_index_name(DUMP_NAME),
+        partitions_dir=tmp_path / "parallel",
+        article_limit=article_limit,
+        processes=2,
+        streams_per_range=2,
+        wikitext_engine=wikitext_engine,
+        verbose=False,
+    )
+
+    sequential = (tmp_path / "sequential" / "p1p4.ndjson").read_text(encoding="utf-8")
+    parallel = (tmp_path / "parallel" / "p1p4.ndjson").read_text(encoding="utf-8")
+    assert parallel == sequential
+    assert len(sequential.splitlines()) == (article_limit or 25)
+    assert json.loads(sequential.splitlines()[0]) == ["Seite 0", "Text & Nummer 0."]
+
+
+def test_parse_to_ndjson_concatenates_partitions(tmp_path):
+    input_dir = tmp_path / "dump"
+    input_dir.mkdir()
+    pages = [(f"Seite {i}", f"Text {i}.") for i in range(12)]
+    write_multistream_dump(input_dir / DUMP_NAME, pages[:4])
+    unindexed_dump = write_multistream_dump(
+        input_dir / "dewiki-20240101-pages-articles-multistream2.xml-p5p12.bz2",
+        pages[4:],
+        pages_per_stream=3,
+    )
+    (input_dir / multistream_index_name(unindexed_dump.name)).unlink()
+
+    parse_to_ndjson(
+        output_path=str(tmp_path / "output" / "articles"),
+        input_dir=str(input_dir),
+        partitions_dir=str(tmp_path / "partitions"),
+        delete_parsed_files=True,
+        multicore=2,
+        verbose=False,
+    )
+
+    with open(tmp_path / "output" / "articles.ndjson", encoding="utf-8") as f:
+        assert [json.loads(line)[0] for line in f] == [title for title, _ in pages]
+
+    assert not (tmp_path / "partitions").exists()
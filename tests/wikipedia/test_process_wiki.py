@@ -0,0 +1,181 @@
+"""
+Tests for generating autosuggestions from Wikipedia texts.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import json
+import random
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from scribe_data.wikipedia.process_wiki import (
+    BigramCounts,
+    clean,
+    gen_autosuggestions,
+    iter_clean,
+    read_article_texts,
+)
+
+WORDS = ["the", "The", "house", "is", "big", "Nazis", "IS", "damn", "a", "houses"]
+
+
+def make_corpus(n_texts, seed):
+    rng = random.Random(seed)
+    return [
+        [
+            rng.choice(WORDS[: rng.randint(2, len(WORDS))])
+            for _ in range(rng.randint(0, 30))
+        ]
+        for _ in range(n_texts)
+    ]
+
+
+def rescan_autosuggestions(text_corpus, num_words, profanities, words_to_ignore):
+    # The previous implementation, which rescans the corpus for each top word.
+    counter_obj = Counter(chain.from_iterable(text_corpus))
+    top_words = [item[0] for item in counter_obj.most_common()][:num_words]
+
+    autosuggest_dict = {}
+    for w in top_words:
+        words_after_w = [
+            [tup[1] for tup in zip(text, text[1:]) if w == tup[0]]
+            for text in text_corpus
+        ]
+        flat_words_after_w = [item for sublist in words_after_w for item in sublist]
+
+        autosuggestions = []
+        for tup in Counter(flat_words_after_w).most_common():
+            if (
+                tup[0] != w
+                and tup[0].lower() not in w.lower()
+                and tup[0] not in profanities
+                and tup[0] not in words_to_ignore
+                and tup[0] != tup[0].upper()
+                and tup[0].lower()[:4] != "nazi"
+                and tup[0].lower()[:4] != "наци"
+            ):
+                autosuggestions.append(tup[0])
+
+            if len(autosuggestions) == 3:
+                break
+
+        autosuggest_dict[w] = autosuggestions
+
+    return autosuggest_dict
+
+
+@pytest.fixture
+def mock_sparql():
+    with patch("scribe_data.wikipedia.process_wiki.sparql") as mock_sparql:
+        mock_sparql.query.return_value.convert.return_value = {
+            "results": {"bindings": [{"lemma": {"value": "damn"}}]}
+        }
+        yield mock_sparql
+
+
+def test_bigram_counts_successors():
+    bigram_counts = BigramCounts(
+        [["a"], [], ["a", "b", "a", "b", "c"], ["b", "a"]], num_words=2
+    )
+
+    assert bigram_counts.top_words == ["a", "b"]
+    assert list(bigram_counts.successors("a")) == ["b"]
+    assert list(bigram_counts.successors("b")) == ["a", "c"]
+
+
+def test_bigram_counts_from_generator():
+    text_corpus = make_corpus(50, 0)
+    from_list = BigramCounts(text_corpus, num_words=6)
+    from_generator = BigramCounts((text for text in text_corpus), num_words=6)
+
+    # Bigrams aren't counted across the boundaries of texts that are generated lazily.
+    assert from_generator.top_words == from_list.top_words
+    for word in from_list.top_words:
+        assert list(from_generator.successors(word)) == list(from_list.successors(word))
+
+    bigram_counts = BigramCounts(iter([["a", "b"], ["c", "a"], ["d"]]), num_words=1)
+    assert list(bigram_counts.successors("a")) == ["b"]
+
+
+def test_bigram_counts_empty_corpus():
+    assert BigramCounts([[], []]).top_words == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("ignore_words", [None, "big", ["big", "a"]])
+def test_gen_autosuggestions_matches_rescan(mock_sparql, seed, ignore_words):
+    text_corpus = make_corpus(50, seed)
+    if isinstance(ignore_words, str):
+        words_to_ignore = [ignore_words]
+    else:
+        words_to_ignore = ignore_words or []
+
+    assert gen_autosuggestions(
+        text_corpus, num_words=6, ignore_words=ignore_words, verbose=False
+    ) == rescan_autosuggestions(
+        text_corpus,
+        num_words=6,
+        profanities=["damn"],
+        words_to_ignore=words_to_ignore,
+    )
+
+
+# MARK: Clean
+
+
+with open(Path(__file__).parent / "data" / "clean_golden.json", encoding="utf-8") as f:
+    CLEAN_GOLDEN = json.load(f)
+
+
+@pytest.mark.parametrize(
+    "case", CLEAN_GOLDEN["cases"], ids=lambda case: case["language"]
+)
+def test_clean_matches_golden_fixture(case):
+    assert (
+        clean(
+            CLEAN_GOLDEN["articles"],
+            language=case["language"],
+            remove_words=case["remove_words"],
+            verbose=False,
+        )
+        == case["expected"]
+    )
+
+
+def test_iter_clean_in_processes_matches_golden_fixture(tmp_path):
+    ndjson_path = tmp_path / "articles.ndjson"
+    with open(ndjson_path, "w", encoding="utf-8") as f:
+        for i, article in enumerate(CLEAN_GOLDEN["articles"]):
+            f.write(json.dumps([f"Article {i}", article]) + "\n")
+
+    case = CLEAN_GOLDEN["cases"][0]
+    tokens = iter_clean(
+        read_article_texts(ndjson_path),
+        language=case["language"],
+        remove_words=[case["remove_words"]],
+        processes=2,
+        chunk_size=7,
+        verbose=False,
+    )
+    assert list(tokens) == case["expected"]
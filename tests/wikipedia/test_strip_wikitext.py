@@ -0,0 +1,108 @@
+"""
+Tests for stripping the markup from the wikitext of Wikipedia articles.
+
+.. raw:: html
+    <!--
+    * Copyright (C) 2024 Scribe
+    *
+    * This program is free software: you can redistribute it and/or modify
+    * it under the terms of the GNU General Public License as published by
+    * the Free Software Foundation, either version 3 of the License, or
+    * (at your option) any later version.
+    *
+    * This program is distributed in the hope that it will be useful,
+    * but WITHOUT ANY WARRANTY; without even the implied warranty of
+    * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    * GNU General Public License for more details.
+    *
+    * You should have received a copy of the GNU General Public License
+    * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+    -->
+"""
+
+import re
+from collections import Counter
+
+import pytest
+
+from scribe_data.wikipedia.strip_wikitext import fast_strip_code, strip_code
+
+PAGES = [
+    """{{Infobox Stadt
+| Name = Berlin
+| Einwohner = {{formatnum:3850809}}
+}}
+'''Berlin''' ist die [[Hauptstadt]] der [[Deutschland|Bundesrepublik Deutschland]].<ref name="destatis">{{Internetquelle |url=https://www.destatis.de |titel=Bevölkerung}}</ref> Die Stadt liegt an der [[Spree]].
+
+== Geschichte ==
+[[Datei:Berliner Mauer.jpg|mini|Die [[Berliner Mauer]] im Jahr 1989]]
+Die Stadt wurde im 13.&nbsp;Jahrhundert gegründet.<!-- Quelle fehlt -->
+
+=== Teilung ===
+Nach dem [[Zweiter Weltkrieg|Zweiten Weltkrieg]] wurde die Stadt geteilt.<ref>Siehe [https://example.org Beispiel].</ref>
+
+{| class="wikitable"
+! Jahr !! Einwohner
+|-
+| 1900 || {{Zahl|1888848}}
+|}
+
+* Museumsinsel
+* [[Brandenburger Tor]]
+
+== Weblinks ==
+* [https://www.berlin.de Offizielle Seite]
+
+[[Kategorie:Berlin]]
+[[Kategorie:Hauptstadt in Europa]]""",
+    """'''Die Katze''' (''Felis catus'') ist ein Haustier.<ref>{{Literatur|Autor=A. Autor|Titel=Katzen}}</ref>
+
+== Merkmale ==
+Katzen haben <small>meistens</small> ein weiches Fell &amp; lange Schnurrhaare.
+
+{{Hauptartikel|Hauskatze}}
+[[File:Cat.jpg|thumb|250px|Eine Katze]]
+Sie jagen [[Maus|Mäuse]] und [[Vogel|Vögel]].""",
+    "Ein kurzer Artikel ohne Markup.",
+]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Das {{lang|de|{{{1}}}}} ist {{Infobox\n|a={{x}}\n}}gut.", "Das  ist gut."),
+        ("[[Haus]] und [[Baum|Bäume]]", "Haus und Bäume"),
+        ("[[Datei:a.jpg|mini|Ein [[Haus]]]] x", " x"),
+        ("[[Kategorie:Foo]]", ""),
+        ("vor\n{|\n|a\n{|\n|b\n|}\n|}\nnach", "vor\n\nnach"),
+        ('a<ref name="x" /> b<ref>c</ref>', "a b"),
+        ("[https://x.de Text] [https://y.de] https://z.de", "Text  https://z.de"),
+        ("== Geschichte ==\n* eins\n# zwei", "Geschichte\n eins\n zwei"),
+        ("'''fett''' und ''kursiv''<!-- c -->", "fett und kursiv"),
+        ("<div class='x'>a&nbsp;b &amp; c</div>", "a\xa0b & c"),
+        ("a\n\n\n\nb\n", "a\n\nb"),
+    ],
+)
+def test_fast_strip_code(text, expected):
+    assert fast_strip_code(text) == expected
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_fast_strip_code_matches_mwparser_text(page):
+    # The fast engine removes references, tables, images and categories that mwparserfromhell keeps, but otherwise has the same words.
+    fast_words = Counter(re.findall(r"\w+", strip_code(page, engine="fast")))
+    mwparser_words = Counter(re.findall(r"\w+", strip_code(page, engine="mwparser")))
+
+    assert not fast_words - mwparser_words
+    assert sum(fast_words.values()) >= 0.6 * sum(mwparser_words.values())
+
+
+def test_fast_strip_code_of_plain_text():
+    assert strip_code(PAGES[-1], engine="fast") == strip_code(
+        PAGES[-1], engine="mwparser"
+    )
+
+
+def test_strip_code_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown wikitext engine"):
+        strip_code("text", engine="regex")